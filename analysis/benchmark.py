@@ -0,0 +1,427 @@
+"""
+Benchmark de bout en bout du pipeline d'analyse
+
+AnalysisPipeline.execute complet contre StubAnalysisAPI (fetch-units,
+find-duplicate-candidates, create-events en local), sur des corpus
+synthétiques: longueurs variables, taux de doublons, plusieurs tenants.
+
+Rapport par scénario: p50/p99 par étape, unités/s, pic mémoire Python.
+Mesure aussi la normalisation de 10k unités: unité par unité
+(InformationUnitSchema) contre validation en bloc (UnitRecord), en temps
+et en allocations.
+Le rapport peut être sauvé comme baseline; une régression au-delà du
+seuil fait échouer le run (code de sortie 1).
+
+Usage:
+    python -m analysis.benchmark --save-baseline
+    python -m analysis.benchmark --baseline analysis/benchmark_baseline.json
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.pipelines.prepare_events import EventPreparer
+from analysis.tests.stub_api import StubAnalysisAPI
+
+DEFAULT_BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), "benchmark_baseline.json"
+)
+REGRESSION_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.25"))
+NORMALIZATION_UNITS = 10_000
+
+# Scénarios: volume, taux de doublons, tenants, longueur des contenus (mots)
+SCENARIOS = [
+    {
+        "name": "court_peu_de_doublons",
+        "units": 1000,
+        "duplicate_rate": 0.05,
+        "tenants": 1,
+        "words": (10, 60),
+    },
+    {
+        "name": "mixte_multi_tenant",
+        "units": 3000,
+        "duplicate_rate": 0.2,
+        "tenants": 3,
+        "words": (10, 400),
+    },
+    {
+        "name": "long_beaucoup_de_doublons",
+        "units": 2000,
+        "duplicate_rate": 0.4,
+        "tenants": 1,
+        "words": (300, 1200),
+    },
+]
+QUICK_SCENARIOS = [
+    {
+        "name": "rapide",
+        "units": 200,
+        "duplicate_rate": 0.2,
+        "tenants": 2,
+        "words": (10, 200),
+    }
+]
+
+LEGAL_SNIPPETS = [
+    "OQTF prononcée. Délai: 3 jours pour former un recours.",
+    "Référé-liberté devant le tribunal administratif.",
+    "Délai: 30 jours à compter de la notification.",
+    "Convocation en préfecture pour le renouvellement du titre de séjour.",
+    "Pièces complémentaires à fournir sous 15 jours.",
+    "",
+]
+SENDERS = [
+    "greffe@ta-lyon.juradm.fr",
+    "tribunal@justice.fr",
+    "contact@cabinet-avocat.fr",
+    "prefecture@interieur.gouv.fr",
+    "client@example.com",
+]
+
+
+def generate_corpus(
+    unit_count: int,
+    duplicate_rate: float,
+    tenants: int = 1,
+    words: tuple = (10, 400),
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Unités brutes (format fetch-units) et historique de doublons
+
+    Une part `duplicate_rate` des unités reprend une unité précédente du
+    même tenant, à l'identique ou légèrement modifiée; un quart des
+    contenus exacts a aussi un candidat en historique.
+    """
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+        for _ in range(5000)
+    ]
+    start = datetime(2026, 1, 1)
+
+    units: List[Dict[str, Any]] = []
+    history: Dict[str, List[Dict[str, Any]]] = {}
+    by_tenant: Dict[str, List[str]] = {}
+
+    for i in range(unit_count):
+        tenant_id = f"bench-tenant-{i % tenants}"
+        previous = by_tenant.setdefault(tenant_id, [])
+
+        if previous and rng.random() < duplicate_rate:
+            content = rng.choice(previous)
+            if rng.random() < 0.5:
+                # Quasi-doublon: quelques caractères modifiés
+                chars = list(content)
+                for _ in range(rng.randint(1, 3)):
+                    chars[rng.randrange(len(chars))] = "x"
+                content = "".join(chars)
+        else:
+            body = " ".join(
+                rng.choice(vocabulary) for _ in range(rng.randint(*words))
+            )
+            content = f"{rng.choice(LEGAL_SNIPPETS)} {body}".strip()
+
+        previous.append(content)
+        sender = rng.choice(SENDERS)
+        units.append(
+            {
+                "id": f"bench-{i:07d}",
+                "tenantId": tenant_id,
+                "source": "EMAIL",
+                "content": content,
+                "receivedAt": (start + timedelta(minutes=rng.randint(0, 60 * 24 * 30))).isoformat(),
+                "senderEmail": sender,
+            }
+        )
+
+        if rng.random() < 0.25 * duplicate_rate:
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            history[content_hash] = [
+                {
+                    "id": f"old-{i:07d}",
+                    "content_hash": content_hash,
+                    "senderEmail": sender,
+                    "reason": "same_checksum",
+                    "timeDiffSeconds": 3600,
+                }
+            ]
+
+    return {"units": units, "history": history}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile au rang le plus proche"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_scenario(scenario: Dict[str, Any], repeats: int = 5) -> Dict[str, Any]:
+    """Exécute `repeats` fois chaque tenant du scénario, puis une mesure mémoire"""
+    corpus = generate_corpus(
+        scenario["units"],
+        scenario["duplicate_rate"],
+        tenants=scenario["tenants"],
+        words=tuple(scenario["words"]),
+    )
+    tenant_ids = sorted({unit["tenantId"] for unit in corpus["units"]})
+    stage_samples: Dict[str, List[float]] = {}
+    run_seconds: List[float] = []
+    units_processed = 0
+
+    with StubAnalysisAPI(history=corpus["history"], units=corpus["units"]) as api:
+
+        def run_once() -> int:
+            processed = 0
+            for tenant_id in tenant_ids:
+                api.reset_events()
+                with AnalysisPipeline(tenant_id, api.base_url) as pipeline:
+                    result = pipeline.execute(limit=scenario["units"], persist=True)
+                processed += result.units_classified
+                for stage in result.stage_metrics:
+                    stage_samples.setdefault(stage.stage, []).append(
+                        stage.wall_seconds
+                    )
+            return processed
+
+        run_once()  # Échauffement (connexions, imports, caches)
+        stage_samples.clear()
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            units_processed = run_once()
+            run_seconds.append(time.perf_counter() - start)
+
+        # Mesure mémoire séparée: tracemalloc ralentit l'exécution
+        tracemalloc.start()
+        try:
+            run_once()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    p50_run = percentile(run_seconds, 50)
+    return {
+        "units": units_processed,
+        "tenants": len(tenant_ids),
+        "repeats": repeats,
+        "stages": {
+            name: {
+                "p50_seconds": percentile(samples, 50),
+                "p99_seconds": percentile(samples, 99),
+            }
+            for name, samples in stage_samples.items()
+        },
+        "run_p50_seconds": p50_run,
+        "run_p99_seconds": percentile(run_seconds, 99),
+        "units_per_second": units_processed / p50_run if p50_run > 0 else 0.0,
+        "peak_memory_bytes": peak_bytes,
+    }
+
+
+def measure_normalization(unit_count: int = NORMALIZATION_UNITS) -> Dict[str, Any]:
+    """
+    Normalisation d'une page de `unit_count` unités brutes
+
+    "per_unit": normalize_unit sur chaque unité (un InformationUnitSchema
+    chacune); "bulk": normalize_batch (validation en bloc, UnitRecord).
+    Par chemin: durée, blocs mémoire retenus par le résultat, pic mémoire.
+    """
+    raw_units = generate_corpus(unit_count, 0.0, words=(10, 60))["units"]
+    preparer = EventPreparer()
+    paths = {
+        "per_unit": lambda: [preparer.normalize_unit(raw) for raw in raw_units],
+        "bulk": lambda: preparer.normalize_batch(raw_units)["units"],
+    }
+
+    report: Dict[str, Any] = {"units": unit_count}
+    for name, run in paths.items():
+        run()  # Échauffement
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            units = run()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+        finally:
+            tracemalloc.stop()
+        del units
+
+        report[name] = {
+            "seconds": seconds,
+            "microseconds_per_unit": seconds / unit_count * 1_000_000,
+            "allocated_blocks": blocks,
+            "peak_memory_bytes": peak_bytes,
+        }
+
+    return report
+
+
+def run_benchmark(
+    scenarios: List[Dict[str, Any]] = SCENARIOS,
+    repeats: int = 5,
+    normalization_units: int = NORMALIZATION_UNITS,
+) -> Dict[str, Any]:
+    """Rapport complet (sérialisable en JSON)"""
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scenarios": {},
+    }
+
+    print(f"\n▶️  Normalisation: {normalization_units} unités")
+    report["normalization"] = measure_normalization(normalization_units)
+    print_normalization(report["normalization"])
+
+    for scenario in scenarios:
+        print(f"\n▶️  {scenario['name']}: {scenario['units']} unités, "
+              f"{scenario['duplicate_rate']:.0%} doublons, {scenario['tenants']} tenant(s)")
+        result = run_scenario(scenario, repeats=repeats)
+        report["scenarios"][scenario["name"]] = result
+        print_scenario(result)
+
+    return report
+
+
+def print_scenario(result: Dict[str, Any]) -> None:
+    for name, stage in result["stages"].items():
+        print(
+            f"   ⏱️  {name:<10} p50 {stage['p50_seconds'] * 1000:8.1f} ms"
+            f"   p99 {stage['p99_seconds'] * 1000:8.1f} ms"
+        )
+    print(f"   🚀 {result['units_per_second']:.0f} unités/s")
+    print(f"   💾 Pic mémoire: {result['peak_memory_bytes'] / 1024 / 1024:.1f} Mo")
+
+
+def print_normalization(result: Dict[str, Any]) -> None:
+    for name in ("per_unit", "bulk"):
+        path = result[name]
+        print(
+            f"   ⏱️  {name:<10} {path['seconds'] * 1000:8.1f} ms"
+            f"   {path['allocated_blocks']:>9} blocs"
+            f"   pic {path['peak_memory_bytes'] / 1024 / 1024:.1f} Mo"
+        )
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> List[str]:
+    """
+    Régressions par rapport à la baseline (liste vide si aucune)
+
+    Comparés: p50 de chaque étape et du run, débit et pic mémoire. Un
+    scénario absent de la baseline est ignoré.
+    """
+    regressions = []
+
+    for name, current in report["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+
+        checks = [
+            ("run p50", current["run_p50_seconds"], reference["run_p50_seconds"], True),
+            ("unités/s", current["units_per_second"], reference["units_per_second"], False),
+            ("pic mémoire", current["peak_memory_bytes"], reference["peak_memory_bytes"], True),
+        ]
+        for stage, timings in current["stages"].items():
+            reference_stage = reference["stages"].get(stage)
+            if reference_stage:
+                checks.append(
+                    (
+                        f"{stage} p50",
+                        timings["p50_seconds"],
+                        reference_stage["p50_seconds"],
+                        True,
+                    )
+                )
+
+        for metric, value, expected, lower_is_better in checks:
+            if not expected:
+                continue
+            change = (value - expected) / expected
+            if (change if lower_is_better else -change) > threshold:
+                regressions.append(
+                    f"{name}: {metric} {expected:.4g} -> {value:.4g} ({change:+.0%})"
+                )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Petit scénario unique")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Écrit le rapport comme baseline"
+    )
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--output", help="Écrit aussi le rapport JSON ici")
+    args = parser.parse_args(argv)
+
+    # Les logs INFO du pipeline fausseraient les mesures
+    logging.getLogger("analysis").setLevel(logging.WARNING)
+
+    scenarios = QUICK_SCENARIOS if args.quick else SCENARIOS
+    report = run_benchmark(
+        scenarios,
+        repeats=args.repeats,
+        normalization_units=1000 if args.quick else NORMALIZATION_UNITS,
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline écrite: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️  Pas de baseline ({args.baseline}), comparaison ignorée")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(report, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) > {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+
+    print(f"\n✅ Aucune régression > {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
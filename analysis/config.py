@@ -2,6 +2,7 @@
 Configuration et variables d'environnement pour le pipeline d'analyse
 """
 
+import logging
 import os
 from typing import Optional
 
@@ -9,6 +10,12 @@ from typing import Optional
 PIPELINE_API_BASE_URL = os.getenv("ANALYSIS_API_URL", "http://localhost:3000")
 PIPELINE_BACKEND_URL = os.getenv("ANALYSIS_BACKEND_URL", "http://localhost:5000")
 
+# Accès aux données: "api" (routes Next.js) ou "sql" (base directe, SQLAlchemy)
+PIPELINE_STORAGE = os.getenv("PIPELINE_STORAGE", "api").lower()
+PIPELINE_DATABASE_URL = (
+    os.getenv("PIPELINE_DATABASE_URL") or os.getenv("DATABASE_URL") or None
+)
+
 # Seuils des règles (customizable)
 RULE_DEADLINE_CRITICAL_DAYS = int(os.getenv("RULE_DEADLINE_CRITICAL_DAYS", "3"))
 RULE_DEADLINE_APPROACHING_DAYS = int(os.getenv("RULE_DEADLINE_APPROACHING_DAYS", "7"))
@@ -21,18 +28,101 @@ METADATA_MATCH_TIME_WINDOW_SECONDS = int(
     os.getenv("METADATA_MATCH_TIME_WINDOW_SECONDS", "300")
 )
 
+# Index MinHash/LSH (doublons intra-batch)
+DUPLICATE_LSH_NUM_PERM = int(os.getenv("DUPLICATE_LSH_NUM_PERM", "64"))
+DUPLICATE_LSH_BANDS = int(os.getenv("DUPLICATE_LSH_BANDS", "16"))
+DUPLICATE_LSH_SHINGLE_SIZE = int(os.getenv("DUPLICATE_LSH_SHINGLE_SIZE", "5"))
+
+# Historique des doublons (POST groupés) et pool HTTP
+HISTORY_LOOKUP_CHUNK_SIZE = int(os.getenv("HISTORY_LOOKUP_CHUNK_SIZE", "500"))
+# POST /api/analysis/find-duplicate-candidates/batch (à activer une fois la
+# route déployée côté Next.js; sinon 1 GET par unité)
+HISTORY_LOOKUP_BATCH = os.getenv("HISTORY_LOOKUP_BATCH", "false").lower() == "true"
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HISTORY_LOOKUP_CONCURRENCY = int(os.getenv("HISTORY_LOOKUP_CONCURRENCY", "8"))
+
+# Persistance des EventLog (chunks gzip, envoi concurrent, retries)
+PERSIST_CHUNK_SIZE = int(os.getenv("PERSIST_CHUNK_SIZE", "1000"))
+PERSIST_CHUNK_MAX_BYTES = int(os.getenv("PERSIST_CHUNK_MAX_BYTES", str(4 * 1024 * 1024)))
+PERSIST_CONCURRENCY = int(os.getenv("PERSIST_CONCURRENCY", "4"))
+PERSIST_MAX_RETRIES = int(os.getenv("PERSIST_MAX_RETRIES", "3"))
+PERSIST_BACKOFF_SECONDS = float(os.getenv("PERSIST_BACKOFF_SECONDS", "0.5"))
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Logs du pipeline (logger "analysis"); WARNING coupe les messages d'étape
+PIPELINE_LOG_LEVEL = os.getenv("PIPELINE_LOG_LEVEL", LOG_LEVEL).upper()
+logging.getLogger("analysis").setLevel(PIPELINE_LOG_LEVEL)
+# Histogrammes Prometheus par étape (si prometheus_client est installé)
+PIPELINE_PROMETHEUS_ENABLED = (
+    os.getenv("PIPELINE_PROMETHEUS_ENABLED", "true").lower() == "true"
+)
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
+# Cache de classification (scan du contenu, par content_hash)
+CLASSIFICATION_CACHE_SIZE = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "10000"))
+CLASSIFICATION_CACHE_REDIS_URL = os.getenv("CLASSIFICATION_CACHE_REDIS_URL") or None
+CLASSIFICATION_CACHE_TTL_SECONDS = int(
+    os.getenv("CLASSIFICATION_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+)
+
+# Compteur de répétitions (RULE-REPETITION-ALERT): mémoire ou Redis
+REPETITION_COUNTER_REDIS_URL = os.getenv("REPETITION_COUNTER_REDIS_URL") or None
+REPETITION_COUNTER_MAX_FINGERPRINTS = int(
+    os.getenv("REPETITION_COUNTER_MAX_FINGERPRINTS", "100000")
+)
+
 # Batch processing
 PIPELINE_BATCH_SIZE = int(os.getenv("PIPELINE_BATCH_SIZE", "100"))
 PIPELINE_TIMEOUT_SECONDS = int(os.getenv("PIPELINE_TIMEOUT_SECONDS", "300"))
 
-# Scheduling (APScheduler)
+# Classification parallèle (ProcessPoolExecutor, opt-in)
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "1"))
+PIPELINE_PARALLEL_MIN_UNITS = int(os.getenv("PIPELINE_PARALLEL_MIN_UNITS", "2000"))
+
+# Scheduling
 PIPELINE_SCHEDULE_INTERVAL_HOURS = int(
     os.getenv("PIPELINE_SCHEDULE_INTERVAL_HOURS", "4")
 )
+# Scheduler multi-tenant (file de tenants + pool de workers)
+PIPELINE_SCHEDULER_WORKERS = int(os.getenv("PIPELINE_SCHEDULER_WORKERS", "4"))
+PIPELINE_MIN_INTERVAL_SECONDS = float(
+    os.getenv("PIPELINE_MIN_INTERVAL_SECONDS", "60")
+)
+PIPELINE_MAX_INTERVAL_SECONDS = float(
+    os.getenv(
+        "PIPELINE_MAX_INTERVAL_SECONDS", str(PIPELINE_SCHEDULE_INTERVAL_HOURS * 3600)
+    )
+)
+# Unités max par run d'un tenant (0 = pas de limite): le reste au run suivant
+PIPELINE_RUN_MAX_UNITS = int(os.getenv("PIPELINE_RUN_MAX_UNITS", "5000"))
+# Au-delà de ce nombre d'unités par run, le tenant repasse à l'intervalle minimal
+PIPELINE_BACKLOG_BUSY_UNITS = int(
+    os.getenv("PIPELINE_BACKLOG_BUSY_UNITS", str(PIPELINE_BATCH_SIZE))
+)
+
+# Tenants traités par le job planifié (liste séparée par des virgules)
+PIPELINE_TENANT_IDS = [
+    tenant_id.strip()
+    for tenant_id in os.getenv("PIPELINE_TENANT_IDS", "").split(",")
+    if tenant_id.strip()
+]
+
+# Checkpoints par tenant (SQLite local): watermark + EventLog persistés
+PIPELINE_CHECKPOINT_DB = os.getenv(
+    "PIPELINE_CHECKPOINT_DB",
+    os.path.join(os.path.dirname(__file__), "checkpoints.sqlite3"),
+)
+
+# Moniteur d'échéances: attente max entre deux passages (secondes)
+DEADLINE_MONITOR_MAX_SLEEP_SECONDS = float(
+    os.getenv("DEADLINE_MONITOR_MAX_SLEEP_SECONDS", "300")
+)
+
+# Moniteur d'échéances: nouvel essai d'un EventLog non persisté (secondes)
+DEADLINE_MONITOR_RETRY_SECONDS = float(
+    os.getenv("DEADLINE_MONITOR_RETRY_SECONDS", "60")
+)
 
 # Defaults
 DEFAULT_TENANT_ID = os.getenv("DEFAULT_TENANT_ID", "default")
@@ -54,9 +144,15 @@ def get_config() -> dict:
         "api_base_url": PIPELINE_API_BASE_URL,
         "backend_url": PIPELINE_BACKEND_URL,
         "rule_deadline_critical_days": RULE_DEADLINE_CRITICAL_DAYS,
+        "rule_deadline_approaching_days": RULE_DEADLINE_APPROACHING_DAYS,
         "fuzzy_match_threshold": FUZZY_MATCH_THRESHOLD,
         "batch_size": PIPELINE_BATCH_SIZE,
+        "workers": PIPELINE_WORKERS,
         "schedule_interval_hours": PIPELINE_SCHEDULE_INTERVAL_HOURS,
+        "scheduler_workers": PIPELINE_SCHEDULER_WORKERS,
+        "tenant_ids": PIPELINE_TENANT_IDS,
+        "checkpoint_db": PIPELINE_CHECKPOINT_DB,
+        "storage": PIPELINE_STORAGE,
         "features": {
             "duplicate_detection": ENABLE_DUPLICATE_DETECTION,
             "semantic_analysis": ENABLE_SEMANTIC_ANALYSIS,
@@ -5,12 +5,18 @@ Test de performance: pipeline avec 1000+ unités
 Objectif: >100 unités/sec
 """
 
+import contextlib
+import hashlib
+import io
 import random
 import time
 from datetime import datetime, timedelta
 
+from analysis.pipelines.detect_duplicates import DuplicateChecker
+from analysis.pipelines.generate_events import EventLogger
 from analysis.pipelines.rules_engine import RuleEngine
-from analysis.schemas.models import InformationUnitSchema, PriorityEnum
+from analysis.schemas.models import EventLogSchema, InformationUnitSchema, PriorityEnum
+from analysis.tests.stub_api import StubAnalysisAPI
 
 
 def generate_test_units(count: int = 100) -> list:
@@ -117,6 +123,251 @@ def benchmark_rule_engine(unit_count: int = 1000):
     }
 
 
+def benchmark_rule_plan(unit_count: int = 10000):
+    """Benchmark plan compilé vs évaluation règle par règle (unités/sec)"""
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK: Plan de règles compilé sur {unit_count} unités")
+    print(f"{'='*60}")
+
+    units = generate_test_units(unit_count)
+    timings = {}
+
+    uncompiled, compiled = RuleEngine(compiled=False), RuleEngine()
+    for label, run in [
+        ("règle par règle", lambda: [uncompiled.apply_all_rules(u) for u in units]),
+        ("plan compilé", lambda: [compiled.apply_all_rules(u) for u in units]),
+        ("batch", lambda: compiled.apply_rules_batch(units)),
+    ]:
+        start = time.time()
+        run()
+        elapsed = time.time() - start
+        timings[label] = unit_count / elapsed if elapsed > 0 else 0
+        print(f"   {label:16s}: {elapsed:.2f}s ({timings[label]:.0f} unités/sec)")
+
+    gain = (
+        timings["plan compilé"] / timings["règle par règle"]
+        if timings["règle par règle"] > 0
+        else 0
+    )
+    batch_gain = (
+        timings["batch"] / timings["règle par règle"]
+        if timings["règle par règle"] > 0
+        else 0
+    )
+    print(f"   📊 Gain: x{gain:.2f} (plan), x{batch_gain:.2f} (batch)")
+
+    return {
+        "unit_count": unit_count,
+        "uncompiled_units_per_second": timings["règle par règle"],
+        "compiled_units_per_second": timings["plan compilé"],
+        "batch_units_per_second": timings["batch"],
+        "gain": gain,
+        "batch_gain": batch_gain,
+    }
+
+
+def generate_duplicate_corpus(count: int = 1000, duplicate_rate: float = 0.2) -> list:
+    """Générer des emails longs avec une part de doublons exacts et approchés"""
+    rng = random.Random(42)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+        for _ in range(5000)
+    ]
+    senders = ["tribunal@justice.fr", "greffe@ta-lyon.fr", "client@example.com"]
+    start = datetime.now() - timedelta(days=60)
+
+    units = []
+    for i in range(count):
+        if units and rng.random() < duplicate_rate:
+            content = rng.choice(units).content
+            if rng.random() < 0.5:
+                # Quasi-doublon: quelques caractères modifiés
+                chars = list(content)
+                for _ in range(rng.randint(1, 3)):
+                    chars[rng.randrange(len(chars))] = "x"
+                content = "".join(chars)
+        else:
+            content = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(80, 300)))
+
+        units.append(
+            InformationUnitSchema(
+                id=f"dup-{i:06d}",
+                source="EMAIL",
+                content=content,
+                content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                tenant_id="bench-tenant",
+                received_at=start + timedelta(hours=rng.randint(0, 60 * 24)),
+                source_metadata={"sender_email": rng.choice(senders)},
+            )
+        )
+
+    return units
+
+
+def benchmark_duplicate_detection(unit_count: int = 1000, all_pairs: bool = True):
+    """Benchmark doublons intra-batch: index MinHash/LSH vs toutes les paires"""
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK: Doublons intra-batch sur {unit_count} unités")
+    print(f"{'='*60}")
+
+    units = generate_duplicate_corpus(unit_count)
+    checker = DuplicateChecker()
+
+    # Les prints par paire fausseraient la mesure
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.time()
+        indexed, indexed_exact = checker.find_intra_batch_duplicates(units)
+        indexed_time = time.time() - start
+
+    print(f"   ⚡ Index LSH: {indexed_time:.2f}s, {len(indexed)} paires ({indexed_exact} exact)")
+
+    result = {
+        "unit_count": unit_count,
+        "indexed_time_seconds": indexed_time,
+        "indexed_pairs": len(indexed),
+    }
+
+    if all_pairs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.time()
+            reference, reference_exact = checker.find_intra_batch_duplicates_all_pairs(
+                units
+            )
+            all_pairs_time = time.time() - start
+
+        reference_keys = {(d.primary_unit_id, d.duplicate_unit_id) for d in reference}
+        indexed_keys = {(d.primary_unit_id, d.duplicate_unit_id) for d in indexed}
+        recall = (
+            len(reference_keys & indexed_keys) / len(reference_keys)
+            if reference_keys
+            else 1.0
+        )
+        speedup = all_pairs_time / indexed_time if indexed_time > 0 else 0
+
+        print(
+            f"   🐢 Toutes les paires: {all_pairs_time:.2f}s, {len(reference)} paires ({reference_exact} exact)"
+        )
+        print(f"   📊 Accélération: x{speedup:.1f}, rappel: {recall:.2%}")
+
+        result.update(
+            {
+                "all_pairs_time_seconds": all_pairs_time,
+                "all_pairs_pairs": len(reference),
+                "speedup": speedup,
+                "recall": recall,
+            }
+        )
+
+    return result
+
+
+def benchmark_history_lookup(unit_count: int = 1000, chunk_size: int = 500):
+    """Benchmark doublons historiques: 1 GET par unité vs POST groupés (API locale)"""
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK: Historique des doublons sur {unit_count} unités")
+    print(f"{'='*60}")
+
+    units = generate_test_units(unit_count)
+    history = {
+        unit.content_hash: [
+            {
+                "id": f"old-{i}",
+                "content_hash": unit.content_hash,
+                "senderEmail": unit.source_metadata["sender_email"],
+                "reason": "exact_hash_match",
+                "timeDiffSeconds": 120,
+            }
+        ]
+        for i, unit in enumerate(units[::10])
+    }
+    result = {"unit_count": unit_count}
+
+    with StubAnalysisAPI(history=history) as api:
+        modes = {
+            "per_unit": DuplicateChecker(api.base_url, batch_history_lookup=False),
+            "batch": DuplicateChecker(
+                api.base_url, batch_history_lookup=True, history_chunk_size=chunk_size
+            ),
+        }
+        for mode, checker in modes.items():
+            api.requests.clear()
+            start = time.time()
+            if checker.batch_history_lookup:
+                duplicates = checker._check_against_history_batch(units, "bench-tenant")
+            else:
+                duplicates = []
+                for unit in units:
+                    duplicates.extend(checker._check_against_history(unit, "bench-tenant"))
+            elapsed = time.time() - start
+
+            print(
+                f"   {mode}: {elapsed:.2f}s, {api.round_trips} requêtes,"
+                f" {len(duplicates)} doublons"
+            )
+            result[f"{mode}_time_seconds"] = elapsed
+            result[f"{mode}_round_trips"] = api.round_trips
+
+    return result
+
+
+def generate_test_events(count: int = 1000) -> list:
+    """EventLog synthétiques (taille de métadonnées réaliste)"""
+    return [
+        EventLogSchema(
+            id=f"evt-{i:07d}",
+            tenant_id="test-tenant",
+            timestamp=datetime.now(),
+            event_type="FLOW_CLASSIFIED",
+            entity_type="flow",
+            entity_id=f"unit-{i:07d}",
+            actor_type="SYSTEM",
+            metadata={
+                "final_priority": random.choice(["CRITICAL", "HIGH", "MEDIUM", "LOW"]),
+                "applied_rules": [
+                    {"rule_id": "DEADLINE_CRITICAL", "justification": "Délai de 3 jours"}
+                ],
+            },
+            checksum=hashlib.sha256(str(i).encode()).hexdigest(),
+        )
+        for i in range(count)
+    ]
+
+
+def benchmark_persist_events(event_count: int = 100000, transient_failures: int = 3):
+    """Benchmark persistance: un seul POST vs chunks gzip concurrents (API locale)"""
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK: Persistance de {event_count} EventLog")
+    print(f"{'='*60}")
+
+    events = generate_test_events(event_count)
+    result = {"event_count": event_count}
+
+    with StubAnalysisAPI() as api:
+        modes = {
+            "single": EventLogger(
+                api.base_url, chunk_size=event_count, max_chunk_bytes=2**62, concurrency=1
+            ),
+            "chunked": EventLogger(api.base_url),
+        }
+        for mode, logger in modes.items():
+            api.created_events.clear()
+            api.create_events_failures = [503] * transient_failures
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.time()
+                persisted = logger.persist_events(events, "test-tenant")
+                elapsed = time.time() - start
+
+            print(
+                f"   {mode}: {elapsed:.2f}s, {persisted['created_count']} créés,"
+                f" {len(persisted.get('chunks', []))} chunks"
+            )
+            result[f"{mode}_time_seconds"] = elapsed
+            result[f"{mode}_created"] = persisted["created_count"]
+
+    return result
+
+
 if __name__ == "__main__":
     # Tester avec différentes tailles
     for size in [100, 500, 1000]:
@@ -124,3 +375,27 @@ if __name__ == "__main__":
             result = benchmark_rule_engine(size)
         except Exception as e:
             print(f"❌ Erreur lors du test avec {size} unités: {e}")
+
+    # Plan compilé vs règle par règle
+    for size in [10000, 100000]:
+        try:
+            benchmark_rule_plan(size)
+        except Exception as e:
+            print(f"❌ Erreur benchmark plan avec {size} unités: {e}")
+
+    # Doublons: comparaison toutes paires jusqu'à 1000, index seul au-delà
+    for size in [200, 1000, 10000, 50000]:
+        try:
+            benchmark_duplicate_detection(size, all_pairs=size <= 1000)
+        except Exception as e:
+            print(f"❌ Erreur benchmark doublons avec {size} unités: {e}")
+
+    try:
+        benchmark_history_lookup(200)
+    except Exception as e:
+        print(f"❌ Erreur benchmark historique: {e}")
+
+    try:
+        benchmark_persist_events(100000)
+    except Exception as e:
+        print(f"❌ Erreur benchmark persistance: {e}")
@@ -7,23 +7,60 @@ Exports:
 - RuleEngine: Moteur d'application des règles
 - EventPreparer: Normalisation des unités
 - DuplicateChecker: Détection intelligente
+- NearDuplicateIndex: Index MinHash/LSH des quasi-doublons
 - EventLogger: Génération des EventLog
 - AnalysisPipeline: Orchestrateur complet
+- CheckpointStore: Reprise incrémentale par tenant (SQLite)
+- ClassificationCache: Cache du scan de contenu (LRU + Redis optionnel)
+- DeadlineIndex / DeadlineMonitor: Seuils d'échéance réévalués dans le temps
+- TenantScheduler: File de tenants + pool de workers
+- RepetitionCounter: Répétitions par tenant sur fenêtre glissante
+- BatchSealer: Scellement des batchs d'EventLog (Merkle chaîné)
+- SqlStorage (pipelines.storage): Mode base directe via SQLAlchemy, non
+  importé ici (dépendance chargée seulement si PIPELINE_STORAGE=sql)
 """
 
+from .checkpoints import CheckpointStore
+from .classification_cache import ClassificationCache
+from .deadline_index import DeadlineIndex, DeadlineMonitor
 from .detect_duplicates import DuplicateChecker
 from .generate_events import EventLogger
+from .merkle import BatchSealer, verify_tenant_log
+from .near_duplicates import NearDuplicateIndex
 from .pipeline import AnalysisPipeline
 from .prepare_events import EventPreparer
-from .rules_engine import DeadlineExtractor, DuplicateDetector, RuleEngine
+from .rules_engine import (
+    CompiledRulePlan,
+    DeadlineExtractor,
+    DuplicateDetector,
+    RuleEngine,
+)
+from .repetitions import (
+    MemoryRepetitionCounter,
+    RedisRepetitionCounter,
+    RepetitionCounter,
+)
+from .scheduler import TenantScheduler
 
 __version__ = "1.0.0"
 __all__ = [
     "RuleEngine",
+    "CompiledRulePlan",
     "DeadlineExtractor",
     "DuplicateDetector",
     "EventPreparer",
     "DuplicateChecker",
+    "NearDuplicateIndex",
     "EventLogger",
     "AnalysisPipeline",
+    "CheckpointStore",
+    "ClassificationCache",
+    "DeadlineIndex",
+    "DeadlineMonitor",
+    "TenantScheduler",
+    "RepetitionCounter",
+    "MemoryRepetitionCounter",
+    "RedisRepetitionCounter",
+    "BatchSealer",
+    "verify_tenant_log",
 ]
@@ -0,0 +1,805 @@
+"""
+async_pipeline.py
+
+Variante asynchrone du pipeline d'analyse (httpx.AsyncClient)
+
+- AsyncEventPreparer, AsyncDuplicateChecker, AsyncEventLogger: mêmes
+  traitements que les composants synchrones, I/O non bloquantes
+- Un seul AsyncClient (pool de connexions) partagé par les composants,
+  et éventuellement par plusieurs tenants
+- Recherches d'historique concurrentes, bornées par un sémaphore
+- Étapes CPU (doublons intra-batch, classification) exécutées hors de la
+  boucle d'événements via asyncio.to_thread
+- Mêmes options que AnalysisPipeline (checkpoints, storage, sealer,
+  deadline_index, cache): en mode base directe, les composants SQL
+  synchrones sont appelés dans un thread
+
+Utilisable directement depuis un service FastAPI:
+    async with AsyncAnalysisPipeline(tenant_id) as pipeline:
+        result = await pipeline.execute()
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from ..config import (
+    HISTORY_LOOKUP_BATCH,
+    HISTORY_LOOKUP_CHUNK_SIZE,
+    HISTORY_LOOKUP_CONCURRENCY,
+    HTTP_POOL_SIZE,
+    PIPELINE_BATCH_SIZE,
+    PIPELINE_PARALLEL_MIN_UNITS,
+    PIPELINE_WORKERS,
+)
+from ..schemas.models import (
+    ClassificationResultSchema,
+    DuplicateDetectionSchema,
+    EventLogSchema,
+    PipelineResultSchema,
+    UnitRecord,
+)
+from .checkpoints import CheckpointStore, Watermark
+from .classification_cache import ClassificationCache
+from .deadline_index import DeadlineIndex
+from .detect_duplicates import DuplicateChecker
+from .generate_events import RETRYABLE_STATUS_CODES, EventLogger, canonical_json
+from .merkle import BatchSealer
+from .metrics import StageTimer
+from .pipeline import (
+    AnalysisPipeline,
+    PageResults,
+    StreamingAccumulator,
+    _page_watermark,
+)
+from .prepare_events import EventPreparer
+from .repetitions import RepetitionCounter
+
+if TYPE_CHECKING:  # SQLAlchemy n'est requis qu'en mode PIPELINE_STORAGE=sql
+    from .storage import SqlStorage
+
+logger = logging.getLogger(__name__)
+
+
+async def _call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Attend un composant async (HTTP), ou appelle un composant sync dans un thread"""
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def create_async_client(pool_size: int = HTTP_POOL_SIZE) -> httpx.AsyncClient:
+    """AsyncClient avec pool de connexions keep-alive"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+        )
+    )
+
+
+class AsyncEventPreparer(EventPreparer):
+    """EventPreparer non bloquant"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_base_url: str = "http://localhost:3000",
+    ):
+        super().__init__(api_base_url)
+        self.client = client
+
+    async def fetch_information_units(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Charge les InformationUnit depuis l'API Next.js (cf. EventPreparer)"""
+        endpoint = f"{self.api_base_url}/api/analysis/fetch-units"
+        params = self._fetch_params(tenant_id, status, limit)
+
+        try:
+            response = await self.client.get(endpoint, params=params, timeout=30)
+            response.raise_for_status()
+            return response.json().get("units", [])
+        except httpx.HTTPError as e:
+            logger.error("❌ Erreur lors du fetch: %s", e)
+            return []
+
+    async def prepare_batch(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Exécute toute l'étape de préparation (cf. EventPreparer)"""
+        logger.info("🔄 [PREPARE] Ingestion %s (max %d)...", status, limit)
+
+        raw_units = await self.fetch_information_units(
+            tenant_id=tenant_id,
+            status=status,
+            limit=limit,
+        )
+        logger.info("   ✅ %d unités chargées", len(raw_units))
+
+        return self.normalize_batch(raw_units)
+
+    async def fetch_page(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        limit: int = PIPELINE_BATCH_SIZE,
+        cursor: Optional[str] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Charge une page d'InformationUnit (cf. EventPreparer.fetch_page)"""
+        endpoint = f"{self.api_base_url}/api/analysis/fetch-units"
+        params = self._fetch_params(tenant_id, status, limit, cursor, since)
+
+        try:
+            response = await self.client.get(endpoint, params=params, timeout=30)
+            response.raise_for_status()
+            body = response.json()
+        except httpx.HTTPError as e:
+            logger.error("❌ Erreur lors du fetch: %s", e)
+            return [], None
+
+        return body.get("units", []), body.get("nextCursor")
+
+    async def stream_pages(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Unités brutes page par page (cf. EventPreparer.stream_pages)"""
+        cursor = None
+        fetched = 0
+        page_number = 0
+
+        while max_units is None or fetched < max_units:
+            limit = page_size
+            if max_units is not None:
+                limit = min(page_size, max_units - fetched)
+
+            raw_units, cursor = await self.fetch_page(
+                tenant_id=tenant_id,
+                status=status,
+                limit=limit,
+                cursor=cursor,
+                since=since,
+            )
+            if not raw_units:
+                return
+
+            page_number += 1
+            fetched += len(raw_units)
+            logger.info(
+                "🔄 [PREPARE] Page %d: %d unités (%d au total)",
+                page_number,
+                len(raw_units),
+                fetched,
+            )
+
+            yield raw_units
+
+            if not cursor:
+                return
+
+    async def stream_batches(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Préparation page par page (cf. EventPreparer.stream_batches)"""
+        async for raw_units in self.stream_pages(
+            tenant_id, status, page_size, max_units
+        ):
+            yield self.normalize_batch(raw_units)
+
+
+class AsyncDuplicateChecker(DuplicateChecker):
+    """DuplicateChecker non bloquant, historique en requêtes concurrentes"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_base_url: str = "http://localhost:3000",
+        batch_history_lookup: bool = HISTORY_LOOKUP_BATCH,
+        history_chunk_size: int = HISTORY_LOOKUP_CHUNK_SIZE,
+        max_concurrency: int = HISTORY_LOOKUP_CONCURRENCY,
+    ):
+        """
+        Args:
+            client: AsyncClient partagé
+            max_concurrency: Requêtes d'historique simultanées au maximum
+        """
+        super().__init__(
+            api_base_url,
+            batch_history_lookup=batch_history_lookup,
+            history_chunk_size=history_chunk_size,
+        )
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def check_batch_for_duplicates(
+        self,
+        units: List[UnitRecord],
+        tenant_id: str,
+    ) -> Tuple[List[DuplicateDetectionSchema], int]:
+        """Intra-batch (hors boucle d'événements) + historique concurrent"""
+        logger.info("🔍 [DUPLICATE] Vérification %d unités...", len(units))
+
+        duplicates_found, exact_matches_count = await asyncio.to_thread(
+            self.find_intra_batch_duplicates, units
+        )
+
+        if self.batch_history_lookup:
+            duplicates_found.extend(
+                await self._check_against_history_batch(units, tenant_id)
+            )
+        else:
+            per_unit = await asyncio.gather(
+                *(self._check_against_history(unit, tenant_id) for unit in units)
+            )
+            for historical_duplicates in per_unit:
+                duplicates_found.extend(historical_duplicates)
+
+        logger.info(
+            "   ✅ %d paires détectées (%d exact)",
+            len(duplicates_found),
+            exact_matches_count,
+        )
+
+        return duplicates_found, exact_matches_count
+
+    async def _check_against_history(
+        self,
+        unit: UnitRecord,
+        tenant_id: str,
+        limit: int = 50,
+    ) -> List[DuplicateDetectionSchema]:
+        """Un GET par unité (cf. DuplicateChecker._check_against_history)"""
+        endpoint = f"{self.api_base_url}/api/analysis/find-duplicate-candidates"
+        params = self._history_params(unit, tenant_id, limit)
+
+        async with self._semaphore:
+            try:
+                response = await self.client.get(endpoint, params=params, timeout=10)
+                response.raise_for_status()
+                candidates = response.json().get("candidates", [])
+            except httpx.HTTPError as e:
+                logger.warning("   ⚠️  Erreur check historique: %s", e)
+                return []
+
+        return self._match_history_candidates(unit, candidates)
+
+    async def _check_against_history_batch(
+        self,
+        units: List[UnitRecord],
+        tenant_id: str,
+        limit: int = 50,
+    ) -> List[DuplicateDetectionSchema]:
+        """
+        POST groupés envoyés en parallèle (cf. _check_against_history_batch)
+
+        Route groupée absente (404): mode groupé désactivé, et les chunks
+        concernés repassent en GET unitaires concurrents.
+        """
+        chunk_starts = range(0, len(units), self.history_chunk_size)
+        per_chunk = await asyncio.gather(
+            *(
+                self._check_history_chunk(
+                    units[chunk_start : chunk_start + self.history_chunk_size],
+                    chunk_start,
+                    tenant_id,
+                    limit,
+                )
+                for chunk_start in chunk_starts
+            )
+        )
+
+        if any(chunk_duplicates is None for chunk_duplicates in per_chunk):
+            logger.warning(
+                "   ⚠️  POST find-duplicate-candidates/batch introuvable (404),"
+                " repli sur les GET unitaires"
+            )
+            self.batch_history_lookup = False
+
+        # Ordre de la batch conservé
+        duplicates: List[DuplicateDetectionSchema] = []
+        for chunk_start, chunk_duplicates in zip(chunk_starts, per_chunk):
+            if chunk_duplicates is None:
+                chunk = units[chunk_start : chunk_start + self.history_chunk_size]
+                per_unit = await asyncio.gather(
+                    *(
+                        self._check_against_history(unit, tenant_id, limit)
+                        for unit in chunk
+                    )
+                )
+                chunk_duplicates = [d for unit_dups in per_unit for d in unit_dups]
+            duplicates.extend(chunk_duplicates)
+        return duplicates
+
+    async def _check_history_chunk(
+        self,
+        chunk: List[UnitRecord],
+        chunk_start: int,
+        tenant_id: str,
+        limit: int,
+    ) -> Optional[List[DuplicateDetectionSchema]]:
+        """Doublons d'un chunk; None si la route groupée n'existe pas (404)"""
+        endpoint = (
+            f"{self.api_base_url}/api/analysis/find-duplicate-candidates/batch"
+        )
+        payload = self._history_batch_payload(chunk, chunk_start, tenant_id, limit)
+
+        async with self._semaphore:
+            try:
+                response = await self.client.post(endpoint, json=payload, timeout=30)
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                results = response.json().get("results", [])
+            except httpx.HTTPError as e:
+                logger.warning(
+                    "   ⚠️  Erreur check historique (unités %d-%d): %s",
+                    chunk_start,
+                    chunk_start + len(chunk) - 1,
+                    e,
+                )
+                return []
+
+        return self._match_history_results(chunk, chunk_start, results)
+
+
+class AsyncEventLogger(EventLogger):
+    """EventLogger dont la persistance est non bloquante"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_base_url: str = "http://localhost:3000",
+        **chunking: Any,
+    ):
+        """
+        Args:
+            client: AsyncClient partagé
+            chunking: chunk_size, max_chunk_bytes, concurrency, max_retries,
+                backoff_seconds (cf. EventLogger)
+        """
+        super().__init__(api_base_url, **chunking)
+        self.client = client
+
+    async def persist_events(
+        self,
+        events: List[EventLogSchema],
+        tenant_id: str,
+    ) -> Dict[str, Any]:
+        """Persiste les EventLog par chunks (cf. EventLogger.persist_events)"""
+        return await self._persist_items(
+            [self.serialize_event(event) for event in events], tenant_id
+        )
+
+    async def persist_payloads(
+        self,
+        payloads: List[Dict[str, Any]],
+        tenant_id: str,
+    ) -> Dict[str, Any]:
+        """Persiste des EventLog au format create-events (cf. EventLogger)"""
+        return await self._persist_items(
+            [canonical_json(payload) for payload in payloads], tenant_id
+        )
+
+    async def _persist_items(
+        self,
+        items: List[bytes],
+        tenant_id: str,
+    ) -> Dict[str, Any]:
+        """Envoie des EventLog déjà sérialisés, par chunks concurrents"""
+        if not items:
+            return {"success": True, "created_count": 0, "failed_count": 0}
+
+        endpoint = f"{self.api_base_url}/api/analysis/create-events"
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        chunk_results = await asyncio.gather(
+            *(
+                self._send_chunk_async(endpoint, tenant_id, index, chunk, semaphore)
+                for index, chunk in enumerate(self._chunk_items(items))
+            )
+        )
+
+        return self._report_persist_result(self._merge_chunk_results(chunk_results))
+
+    async def _send_chunk_async(
+        self,
+        endpoint: str,
+        tenant_id: str,
+        index: int,
+        chunk: List[bytes],
+        semaphore: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        """POST d'un chunk avec backoff (cf. EventLogger._send_chunk)"""
+        body, headers = self._encode_chunk(chunk, tenant_id)
+        error = ""
+
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self._backoff_delay(attempt))
+
+                try:
+                    response = await self.client.post(
+                        endpoint, content=body, headers=headers, timeout=30
+                    )
+                except httpx.HTTPError as e:
+                    error = str(e)
+                    continue
+
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    error = f"HTTP {response.status_code}"
+                    continue
+
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    return self._chunk_result(
+                        index, len(chunk), attempt + 1, error=str(e)
+                    )
+
+                return self._chunk_result(
+                    index, len(chunk), attempt + 1, result=response.json()
+                )
+
+        return self._chunk_result(index, len(chunk), self.max_retries + 1, error=error)
+
+
+class AsyncAnalysisPipeline(AnalysisPipeline):
+    """Pipeline complet awaitable, I/O sur un AsyncClient partagé"""
+
+    def __init__(
+        self,
+        tenant_id: str,
+        api_base_url: str = "http://localhost:3000",
+        client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = HISTORY_LOOKUP_CONCURRENCY,
+        workers: int = PIPELINE_WORKERS,
+        parallel_min_units: int = PIPELINE_PARALLEL_MIN_UNITS,
+        checkpoints: Optional[CheckpointStore] = None,
+        classification_cache: Optional[ClassificationCache] = None,
+        deadline_index: Optional[DeadlineIndex] = None,
+        repetition_counter: Optional[RepetitionCounter] = None,
+        storage: Optional["SqlStorage"] = None,
+        sealer: Optional[BatchSealer] = None,
+    ):
+        """
+        Args:
+            client: AsyncClient partagé (entre tenants); créé et fermé par
+                le pipeline s'il n'est pas fourni
+            max_concurrency: Requêtes d'historique simultanées au maximum
+            autres: cf. AnalysisPipeline (en mode base directe, les
+                composants HTTP ne sont pas remplacés)
+        """
+        super().__init__(
+            tenant_id,
+            api_base_url,
+            workers=workers,
+            parallel_min_units=parallel_min_units,
+            checkpoints=checkpoints,
+            classification_cache=classification_cache,
+            deadline_index=deadline_index,
+            repetition_counter=repetition_counter,
+            storage=storage,
+            sealer=sealer,
+        )
+
+        self._owns_client = client is None
+        self.client = client or create_async_client()
+
+        if self.storage is None:
+            self.preparer = AsyncEventPreparer(self.client, api_base_url)
+            self.duplicate_checker = AsyncDuplicateChecker(
+                self.client,
+                api_base_url,
+                max_concurrency=max_concurrency,
+            )
+            self.event_logger = AsyncEventLogger(self.client, api_base_url)
+
+    async def __aenter__(self) -> "AsyncAnalysisPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Ferme le client (s'il appartient au pipeline) et le pool de workers"""
+        if self._owns_client:
+            await self.client.aclose()
+        self.close()
+
+    async def execute(
+        self,
+        unit_status: str = "RECEIVED",
+        limit: int = 100,
+        persist: bool = True,
+    ) -> PipelineResultSchema:
+        """
+        Execute the complete pipeline (cf. AnalysisPipeline.execute)
+
+        Returns:
+            Résumé de l'exécution
+        """
+        start_time = time.time()
+        execution_id = self._start_execution(unit_status, limit)
+        timer = StageTimer()
+
+        # ÉTAPE 1: PRÉPARATION
+        with timer.stage("fetch") as run:
+            raw_units = await _call(
+                self.preparer.fetch_information_units,
+                tenant_id=self.tenant_id,
+                status=unit_status,
+                limit=limit,
+            )
+            run.items = len(raw_units)
+
+        with timer.stage("normalize") as run:
+            prep_result = self.preparer.normalize_batch(raw_units)
+            run.items = len(raw_units)
+
+        units = prep_result["units"]
+
+        if not units:
+            return self._empty_result(execution_id, start_time, prep_result, timer)
+
+        # Avec un sealer, la batch est enregistrée (et scellée) avant persistance
+        recording = self.sealer is not None and persist
+        page_results = await self._process_batch(
+            units, persist and not recording, timer
+        )
+        if recording:
+            await self._checkpoint_page_async(
+                execution_id, unit_status, None, page_results, timer
+            )
+        classifications, duplicates_found, events_to_persist = page_results
+
+        return self._build_result(
+            execution_id,
+            start_time,
+            prep_result,
+            classifications,
+            duplicates_found,
+            events_to_persist,
+            timer,
+        )
+
+    async def execute_streaming(
+        self,
+        unit_status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+        persist: bool = True,
+        keep_details: bool = False,
+    ) -> PipelineResultSchema:
+        """
+        Exécution page par page (cf. AnalysisPipeline.execute_streaming)
+
+        Avec `checkpoints` (et persist): même reprise que la version
+        synchrone (EventLog en attente renvoyés, watermark, unités déjà
+        traitées ignorées, page enregistrée avant sa persistance).
+        """
+        start_time = time.time()
+        execution_id = self._start_execution(unit_status, max_units)
+        accumulator = StreamingAccumulator(keep_details)
+        timer = StageTimer()
+
+        checkpointing = self.checkpoints is not None and persist
+        since = None
+        if checkpointing:
+            await self._resend_pending_events_async(timer)
+            since = await asyncio.to_thread(
+                self.checkpoints.get_watermark, self.tenant_id, unit_status
+            )
+
+        pages = self.preparer.stream_pages(
+            tenant_id=self.tenant_id,
+            status=unit_status,
+            page_size=page_size,
+            max_units=max_units,
+            since=since,
+        )
+        # Générateur synchrone (base directe): toujours lu depuis le même
+        # thread, sa connexion restant ouverte d'une page à l'autre
+        page_reader = (
+            None if inspect.isasyncgen(pages) else ThreadPoolExecutor(max_workers=1)
+        )
+
+        try:
+            while True:
+                with timer.stage("fetch") as run:
+                    raw_units = await self._next_page(pages, page_reader)
+                    run.items = len(raw_units or [])
+                if raw_units is None:
+                    break
+
+                watermark = None
+                if checkpointing:
+                    watermark = _page_watermark(raw_units)
+                    raw_units = await asyncio.to_thread(self._skip_processed, raw_units)
+
+                with timer.stage("normalize") as run:
+                    prep_result = self.preparer.normalize_batch(raw_units)
+                    run.items = len(raw_units)
+
+                page_results = None
+                if prep_result["units"]:
+                    page_results = await self._process_batch(
+                        prep_result["units"], persist and not checkpointing, timer
+                    )
+                if checkpointing:
+                    await self._checkpoint_page_async(
+                        execution_id, unit_status, watermark, page_results, timer
+                    )
+                accumulator.add_page(prep_result, page_results)
+        finally:
+            if page_reader is not None:
+                page_reader.submit(pages.close).result()
+                page_reader.shutdown()
+
+        result = accumulator.to_result(execution_id, self.tenant_id, start_time, timer)
+        self._log_summary(result)
+
+        return result
+
+    @staticmethod
+    async def _next_page(
+        pages: Any,
+        page_reader: Optional[ThreadPoolExecutor],
+    ) -> Optional[List[Dict[str, Any]]]:
+        if page_reader is None:
+            return await anext(pages, None)
+        return await asyncio.get_running_loop().run_in_executor(
+            page_reader, next, pages, None
+        )
+
+    async def _resend_pending_events_async(self, timer: StageTimer) -> None:
+        """Renvoie les EventLog en attente (cf. _resend_pending_events)"""
+        payloads = await asyncio.to_thread(
+            self.checkpoints.pending_events, self.tenant_id
+        )
+        if not payloads:
+            return
+
+        logger.info("♻️  %d EventLog en attente renvoyés", len(payloads))
+        with timer.stage("persist") as run:
+            await self._persist_payloads_async(payloads)
+            run.items = len(payloads)
+
+    async def _checkpoint_page_async(
+        self,
+        execution_id: str,
+        unit_status: str,
+        watermark: Optional[Watermark],
+        page_results: Optional[PageResults],
+        timer: StageTimer,
+    ) -> None:
+        """Enregistre la page puis persiste (cf. _checkpoint_page)"""
+        payloads = await asyncio.to_thread(
+            self._record_page, execution_id, unit_status, watermark, page_results, timer
+        )
+
+        if payloads:
+            with timer.stage("persist") as run:
+                await self._persist_payloads_async(payloads)
+                run.items = len(payloads)
+
+    async def _persist_payloads_async(self, payloads: List[Dict[str, Any]]) -> None:
+        """Persiste et marque PERSISTED les EventLog confirmés (cf. sync)"""
+        result = await _call(
+            self.event_logger.persist_payloads, payloads, self.tenant_id
+        )
+        await asyncio.to_thread(
+            self.checkpoints.mark_persisted,
+            self.tenant_id,
+            EventLogger.confirmed_event_ids(payloads, result),
+        )
+
+    async def _process_batch(
+        self,
+        units: List[UnitRecord],
+        persist: bool,
+        timer: StageTimer,
+    ) -> Tuple[
+        List[ClassificationResultSchema],
+        List[DuplicateDetectionSchema],
+        List[EventLogSchema],
+    ]:
+        """Étapes 2 à 5 sur une batch (cf. AnalysisPipeline._process_batch)"""
+        # STEP 2: DUPLICATE DETECTION
+        with timer.stage("duplicates") as run:
+            duplicates_found, exact_matches = await _call(
+                self.duplicate_checker.check_batch_for_duplicates,
+                units=units,
+                tenant_id=self.tenant_id,
+            )
+            run.items = len(units)
+
+        # STEP 3: CLASSIFICATION BY RULES (CPU, hors boucle d'événements)
+        with timer.stage("classify") as run:
+            rule_results = await asyncio.to_thread(self._classify_units, units, timer)
+            classifications = self._build_classifications(units, rule_results)
+            run.items = len(units)
+
+        if self.deadline_index is not None:
+            with timer.stage("deadlines") as run:
+                run.items = await asyncio.to_thread(self._track_deadlines, units)
+
+        # ÉTAPE 4: GÉNÉRATION DES EVENTS
+        with timer.stage("events") as run:
+            events_to_persist = self._generate_events(
+                classifications, duplicates_found
+            )
+            run.items = len(events_to_persist)
+
+        # STEP 5: PERSISTENCE
+        if persist and events_to_persist:
+            with timer.stage("persist") as run:
+                await _call(
+                    self.event_logger.persist_events,
+                    events=events_to_persist,
+                    tenant_id=self.tenant_id,
+                )
+                run.items = len(events_to_persist)
+
+        return classifications, duplicates_found, events_to_persist
+
+
+async def execute_tenants(
+    tenant_ids: List[str],
+    api_base_url: str = "http://localhost:3000",
+    client: Optional[httpx.AsyncClient] = None,
+    **execute_kwargs: Any,
+) -> List[PipelineResultSchema]:
+    """
+    Exécute le pipeline pour plusieurs tenants en parallèle
+
+    Tous les pipelines partagent le même AsyncClient (un seul pool de
+    connexions pour le process). Résultats dans l'ordre de tenant_ids.
+    """
+    shared_client = client or create_async_client()
+
+    try:
+        pipelines = [
+            AsyncAnalysisPipeline(tenant_id, api_base_url, client=shared_client)
+            for tenant_id in tenant_ids
+        ]
+        try:
+            return await asyncio.gather(
+                *(pipeline.execute(**execute_kwargs) for pipeline in pipelines)
+            )
+        finally:
+            for pipeline in pipelines:
+                await pipeline.aclose()
+    finally:
+        if client is None:
+            await shared_client.aclose()
@@ -0,0 +1,368 @@
+"""
+checkpoints.py
+
+Reprise incrémentale du pipeline, par tenant (fichier SQLite local)
+- Watermark: (receivedAt, id) de la dernière unité traitée, par statut
+- Unités déjà classifiées (jamais reclassifiées)
+- EventLog générés: PENDING jusqu'à confirmation de create-events
+- Échéances suivies par le DeadlineIndex (seuil déjà notifié)
+- Sceaux des batchs d'EventLog (BatchSealer) et feuilles de Merkle
+
+Une page est enregistrée en une transaction (watermark, unités, events
+PENDING) avant la persistance: après un crash, le run suivant renvoie les
+events PENDING (create-events ignore les id déjà insérés) et reprend
+après le watermark.
+
+Usage:
+    store = CheckpointStore()
+    pipeline = AnalysisPipeline(tenant_id, checkpoints=store)
+    pipeline.execute_streaming()
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..config import PIPELINE_CHECKPOINT_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    tenant_id   TEXT NOT NULL,
+    unit_status TEXT NOT NULL,
+    received_at TEXT NOT NULL,
+    unit_id     TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (tenant_id, unit_status)
+);
+CREATE TABLE IF NOT EXISTS processed_units (
+    tenant_id    TEXT NOT NULL,
+    unit_id      TEXT NOT NULL,
+    execution_id TEXT NOT NULL,
+    processed_at TEXT NOT NULL,
+    PRIMARY KEY (tenant_id, unit_id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    tenant_id    TEXT NOT NULL,
+    event_id     TEXT NOT NULL,
+    execution_id TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'PENDING',
+    created_at   TEXT NOT NULL,
+    persisted_at TEXT,
+    PRIMARY KEY (tenant_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_pending ON events (tenant_id, status);
+CREATE TABLE IF NOT EXISTS deadlines (
+    tenant_id     TEXT NOT NULL,
+    unit_id       TEXT NOT NULL,
+    due_date      TEXT NOT NULL,
+    deadline_data TEXT NOT NULL,
+    notified_days INTEGER,
+    PRIMARY KEY (tenant_id, unit_id)
+);
+CREATE TABLE IF NOT EXISTS batch_seals (
+    tenant_id      TEXT NOT NULL,
+    sequence       INTEGER NOT NULL,
+    merkle_root    TEXT NOT NULL,
+    previous_root  TEXT NOT NULL,
+    batch_root     TEXT NOT NULL,
+    event_count    INTEGER NOT NULL,
+    first_event_id TEXT NOT NULL,
+    last_event_id  TEXT NOT NULL,
+    sealed_at      TEXT NOT NULL,
+    PRIMARY KEY (tenant_id, sequence)
+);
+CREATE TABLE IF NOT EXISTS sealed_events (
+    tenant_id TEXT NOT NULL,
+    event_id  TEXT NOT NULL,
+    sequence  INTEGER NOT NULL,
+    position  INTEGER NOT NULL,
+    leaf      TEXT NOT NULL,
+    PRIMARY KEY (tenant_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS sealed_events_batch
+    ON sealed_events (tenant_id, sequence, position);
+"""
+
+# Limite de variables par requête SQLite (999 sur les anciennes versions)
+SQL_VARIABLES_CHUNK = 500
+
+# Sceaux lus par requête dans iter_seals
+SEALS_PAGE_SIZE = 500
+
+SEAL_COLUMNS = (
+    "tenant_id",
+    "sequence",
+    "merkle_root",
+    "previous_root",
+    "batch_root",
+    "event_count",
+    "first_event_id",
+    "last_event_id",
+    "sealed_at",
+)
+
+Watermark = Tuple[str, str]
+
+
+class CheckpointStore:
+    """Checkpoints durables du pipeline (une connexion, partagée entre threads)"""
+
+    def __init__(self, path: str = PIPELINE_CHECKPOINT_DB):
+        """
+        Args:
+            path: Fichier SQLite (":memory:" pour les tests)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_watermark(self, tenant_id: str, unit_status: str) -> Optional[Watermark]:
+        """(receivedAt, id) de la dernière unité traitée, None au premier run"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT received_at, unit_id FROM watermarks"
+                " WHERE tenant_id = ? AND unit_status = ?",
+                (tenant_id, unit_status),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def processed_ids(self, tenant_id: str, unit_ids: Iterable[str]) -> set:
+        """Sous-ensemble de `unit_ids` déjà classifié pour ce tenant"""
+        unit_ids = list(unit_ids)
+        processed = set()
+
+        with self._lock:
+            for start in range(0, len(unit_ids), SQL_VARIABLES_CHUNK):
+                chunk = unit_ids[start : start + SQL_VARIABLES_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT unit_id FROM processed_units"
+                    f" WHERE tenant_id = ? AND unit_id IN ({placeholders})",
+                    [tenant_id, *chunk],
+                )
+                processed.update(row[0] for row in rows)
+
+        return processed
+
+    def record_page(
+        self,
+        tenant_id: str,
+        unit_status: str,
+        execution_id: str,
+        watermark: Optional[Watermark],
+        unit_ids: List[str],
+        payloads: List[Dict[str, Any]],
+        seal: Optional[Dict[str, Any]] = None,
+        leaves: Sequence[Tuple[str, str]] = (),
+    ) -> None:
+        """
+        Enregistre une page traitée, en une transaction
+
+        Args:
+            watermark: (receivedAt, id) de la dernière unité de la page
+            unit_ids: Unités classifiées dans la page
+            payloads: EventLog au format create-events (statut PENDING)
+            seal: Sceau du batch (BatchSeal.to_dict()), colonnes de batch_seals
+            leaves: (event_id, feuille hex) dans l'ordre de l'arbre
+        """
+        now = datetime.now().isoformat()
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed_units"
+                " (tenant_id, unit_id, execution_id, processed_at)"
+                " VALUES (?, ?, ?, ?)",
+                [(tenant_id, unit_id, execution_id, now) for unit_id in unit_ids],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO events"
+                " (tenant_id, event_id, execution_id, payload, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        tenant_id,
+                        payload["id"],
+                        execution_id,
+                        json.dumps(payload, ensure_ascii=False),
+                        now,
+                    )
+                    for payload in payloads
+                ],
+            )
+            if watermark is not None:
+                self._conn.execute(
+                    "INSERT INTO watermarks"
+                    " (tenant_id, unit_status, received_at, unit_id, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (tenant_id, unit_status) DO UPDATE SET"
+                    " received_at = excluded.received_at,"
+                    " unit_id = excluded.unit_id,"
+                    " updated_at = excluded.updated_at",
+                    (tenant_id, unit_status, watermark[0], watermark[1], now),
+                )
+            if seal is not None:
+                self._insert_seal(seal, leaves)
+
+    def pending_events(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """EventLog enregistrés mais pas encore confirmés par create-events"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM events"
+                " WHERE tenant_id = ? AND status = 'PENDING'"
+                " ORDER BY created_at, rowid",
+                (tenant_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def mark_persisted(self, tenant_id: str, event_ids: List[str]) -> None:
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE events SET status = 'PERSISTED', persisted_at = ?"
+                " WHERE tenant_id = ? AND event_id = ?",
+                [(now, tenant_id, event_id) for event_id in event_ids],
+            )
+
+    def persisted_ids(self, tenant_id: str) -> set:
+        """Id des EventLog confirmés pour ce tenant"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event_id FROM events"
+                " WHERE tenant_id = ? AND status = 'PERSISTED'",
+                (tenant_id,),
+            )
+            return {row[0] for row in rows}
+
+    def save_deadline(
+        self,
+        tenant_id: str,
+        unit_id: str,
+        due_date: str,
+        deadline_data: Dict[str, Any],
+        notified_days: Optional[int],
+    ) -> None:
+        """Enregistre (ou remplace) l'échéance suivie d'une unité"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO deadlines"
+                " (tenant_id, unit_id, due_date, deadline_data, notified_days)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    tenant_id,
+                    unit_id,
+                    due_date,
+                    json.dumps(deadline_data, ensure_ascii=False, default=str),
+                    notified_days,
+                ),
+            )
+
+    def delete_deadline(self, tenant_id: str, unit_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM deadlines WHERE tenant_id = ? AND unit_id = ?",
+                (tenant_id, unit_id),
+            )
+
+    def load_deadlines(
+        self,
+    ) -> List[Tuple[str, str, str, Dict[str, Any], Optional[int]]]:
+        """(tenant_id, unit_id, due_date, deadline_data, notified_days) suivis"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tenant_id, unit_id, due_date, deadline_data, notified_days"
+                " FROM deadlines"
+            ).fetchall()
+        return [
+            (tenant_id, unit_id, due_date, json.loads(data), notified_days)
+            for tenant_id, unit_id, due_date, data, notified_days in rows
+        ]
+
+    def _insert_seal(
+        self, seal: Dict[str, Any], leaves: Sequence[Tuple[str, str]]
+    ) -> None:
+        """Sceau et feuilles, dans la transaction en cours"""
+        self._conn.execute(
+            f"INSERT INTO batch_seals ({', '.join(SEAL_COLUMNS)})"
+            f" VALUES ({', '.join('?' * len(SEAL_COLUMNS))})",
+            [seal[column] for column in SEAL_COLUMNS],
+        )
+        self._conn.executemany(
+            "INSERT INTO sealed_events"
+            " (tenant_id, event_id, sequence, position, leaf)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                (seal["tenant_id"], event_id, seal["sequence"], position, leaf)
+                for position, (event_id, leaf) in enumerate(leaves)
+            ],
+        )
+
+    def last_seal(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Dernier sceau du tenant, None avant le premier batch"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(SEAL_COLUMNS)} FROM batch_seals"
+                " WHERE tenant_id = ? ORDER BY sequence DESC LIMIT 1",
+                (tenant_id,),
+            ).fetchone()
+        return dict(zip(SEAL_COLUMNS, row)) if row else None
+
+    def get_seal(self, tenant_id: str, sequence: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(SEAL_COLUMNS)} FROM batch_seals"
+                " WHERE tenant_id = ? AND sequence = ?",
+                (tenant_id, sequence),
+            ).fetchone()
+        return dict(zip(SEAL_COLUMNS, row)) if row else None
+
+    def iter_seals(self, tenant_id: str) -> Iterator[Dict[str, Any]]:
+        """Sceaux du tenant par séquence croissante, SEALS_PAGE_SIZE à la fois"""
+        after = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(SEAL_COLUMNS)} FROM batch_seals"
+                    " WHERE tenant_id = ? AND sequence > ?"
+                    " ORDER BY sequence LIMIT ?",
+                    (tenant_id, after, SEALS_PAGE_SIZE),
+                ).fetchall()
+            for row in rows:
+                yield dict(zip(SEAL_COLUMNS, row))
+            if len(rows) < SEALS_PAGE_SIZE:
+                return
+            after = rows[-1][1]
+
+    def sealed_event(self, tenant_id: str, event_id: str) -> Optional[Tuple[int, int]]:
+        """(séquence du batch, position dans l'arbre) d'un EventLog scellé"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sequence, position FROM sealed_events"
+                " WHERE tenant_id = ? AND event_id = ?",
+                (tenant_id, event_id),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def batch_leaves(self, tenant_id: str, sequence: int) -> List[str]:
+        """Feuilles (hex) d'un batch scellé, dans l'ordre de l'arbre"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT leaf FROM sealed_events"
+                " WHERE tenant_id = ? AND sequence = ? ORDER BY position",
+                (tenant_id, sequence),
+            ).fetchall()
+        return [row[0] for row in rows]
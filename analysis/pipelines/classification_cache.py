@@ -0,0 +1,166 @@
+"""
+classification_cache.py
+
+Cache des résultats de classification dérivés du contenu
+- Clé: content_hash + domaine expéditeur normalisé + empreinte des règles
+- Valeur: délai en jours et patterns de procédure détectés (le scan du
+  texte); les règles dépendant de l'heure (RULE-DEADLINE-CRITICAL) sont
+  recalculées à chaque classification
+- LRU borné en mémoire, second niveau Redis optionnel (partagé entre
+  processus et instances)
+
+Les courriers type (OQTF, convocations) reçus en de nombreux exemplaires,
+tous tenants confondus, ne sont scannés qu'une fois.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ..config import (
+    CLASSIFICATION_CACHE_REDIS_URL,
+    CLASSIFICATION_CACHE_SIZE,
+    CLASSIFICATION_CACHE_TTL_SECONDS,
+)
+
+try:
+    from redis import Redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "analysis:classification:"
+
+
+def sender_domain(sender_email: Optional[str]) -> str:
+    """Domaine d'un expéditeur, en minuscules ("" si inconnu)"""
+    if not sender_email:
+        return ""
+    return sender_email.strip().lower().rsplit("@", 1)[-1].rstrip(".")
+
+
+def cache_key(content_hash: str, sender_email: Optional[str], fingerprint: str) -> str:
+    return f"{fingerprint}:{sender_domain(sender_email)}:{content_hash}"
+
+
+class ClassificationCache:
+    """LRU en mémoire + Redis optionnel; compteurs hits/misses"""
+
+    def __init__(
+        self,
+        max_entries: int = CLASSIFICATION_CACHE_SIZE,
+        redis_url: Optional[str] = CLASSIFICATION_CACHE_REDIS_URL,
+        ttl_seconds: int = CLASSIFICATION_CACHE_TTL_SECONDS,
+        redis_client: Optional[Any] = None,
+    ):
+        """
+        Args:
+            max_entries: Taille du LRU en mémoire
+            redis_url: Second niveau Redis (None = mémoire seule)
+            ttl_seconds: Durée de vie des entrées Redis
+            redis_client: Client déjà construit (remplace redis_url)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.redis = redis_client
+        if self.redis is None and redis_url and REDIS_AVAILABLE:
+            self.redis = Redis.from_url(
+                redis_url, socket_connect_timeout=2, socket_timeout=2
+            )
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._redis_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.redis_hits += 1
+            self._store(key, value)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._store(key, value)
+        self._redis_set(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            "redis_enabled": self.redis is not None,
+        }
+
+    def _store(self, key: str, value: Dict[str, Any]) -> None:
+        """Insère en tête du LRU (verrou détenu par l'appelant)"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning("⚠️  Cache Redis indisponible: %s", e)
+            return None
+        return json.loads(raw) if raw else None
+
+    def _redis_set(self, key: str, value: Dict[str, Any]) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(
+                REDIS_KEY_PREFIX + key,
+                json.dumps(value, separators=(",", ":")),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning("⚠️  Cache Redis indisponible: %s", e)
+
+
+_shared_cache: Optional[ClassificationCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[ClassificationCache]:
+    """Cache du processus, partagé par tous les pipelines (None si désactivé)"""
+    global _shared_cache
+
+    if CLASSIFICATION_CACHE_SIZE <= 0:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ClassificationCache()
+        return _shared_cache
@@ -0,0 +1,484 @@
+"""
+deadline_index.py
+
+Réévaluation des échéances pilotée par le temps
+- DeadlineIndex: tas (heapq) du prochain franchissement de seuil de chaque
+  unité (7 jours: DEADLINE_APPROACHING, 3 jours: DEADLINE_CRITICAL)
+- DeadlineMonitor: thread qui dort jusqu'au prochain franchissement, génère
+  les EventLog via EventLogger.generate_deadline_event et les persiste; un
+  seuil n'est marqué notifié qu'une fois son EventLog confirmé, sinon il est
+  réévalué après DEADLINE_MONITOR_RETRY_SECONDS
+
+Une unité n'a qu'une entrée dans le tas à la fois: chaque franchissement
+coûte O(log n), sans retraiter les unités dont aucun seuil n'est atteint.
+Les seuils suivent RULE-DEADLINE-CRITICAL: jours restants
+((due_date - now).days) <= seuil et > 0.
+
+Usage:
+    index = DeadlineIndex(store=checkpoint_store)
+    pipeline = AnalysisPipeline(tenant_id, deadline_index=index)
+    DeadlineMonitor(index, EventLogger(api_base_url)).start()
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..config import (
+    DEADLINE_MONITOR_MAX_SLEEP_SECONDS,
+    DEADLINE_MONITOR_RETRY_SECONDS,
+    RULE_DEADLINE_APPROACHING_DAYS,
+    RULE_DEADLINE_CRITICAL_DAYS,
+)
+from ..schemas.models import EventLogSchema, EventTypeEnum
+from .checkpoints import CheckpointStore
+from .generate_events import EventLogger
+
+logger = logging.getLogger(__name__)
+
+# Seuil (jours restants) → type d'EventLog et règle
+DEFAULT_THRESHOLDS = {
+    RULE_DEADLINE_APPROACHING_DAYS: (
+        EventTypeEnum.DEADLINE_APPROACHING,
+        "RULE-DEADLINE-APPROACHING",
+    ),
+    RULE_DEADLINE_CRITICAL_DAYS: (
+        EventTypeEnum.DEADLINE_CRITICAL,
+        "RULE-DEADLINE-CRITICAL",
+    ),
+}
+
+DeadlineKey = Tuple[str, str]
+
+
+class TrackedDeadline:
+    """Échéance suivie d'une unité"""
+
+    __slots__ = (
+        "tenant_id",
+        "unit_id",
+        "due_date",
+        "deadline_data",
+        "notified_days",
+        "version",
+    )
+
+    def __init__(
+        self,
+        tenant_id: str,
+        unit_id: str,
+        due_date: datetime,
+        deadline_data: Dict[str, Any],
+        notified_days: Optional[int],
+        version: int,
+    ):
+        self.tenant_id = tenant_id
+        self.unit_id = unit_id
+        self.due_date = due_date
+        self.deadline_data = deadline_data
+        self.notified_days = notified_days
+        self.version = version
+
+
+class DeadlineCrossing:
+    """Seuil franchi par une échéance (résultat de DeadlineIndex.pop_due)"""
+
+    __slots__ = ("deadline", "threshold_days", "days_remaining")
+
+    def __init__(
+        self,
+        deadline: TrackedDeadline,
+        threshold_days: int,
+        days_remaining: int,
+    ):
+        self.deadline = deadline
+        self.threshold_days = threshold_days
+        self.days_remaining = days_remaining
+
+
+def threshold_time(due_date: datetime, threshold_days: int) -> datetime:
+    """
+    Instant après lequel (due_date - now).days <= threshold_days
+
+    timedelta.days arrondit vers le bas: le seuil est franchi strictement
+    après due_date - (threshold_days + 1) jours.
+    """
+    return due_date - timedelta(days=threshold_days + 1)
+
+
+def naive_local(value: datetime) -> datetime:
+    """Datetime naïve locale (les règles comparent à datetime.now())"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+class DeadlineIndex:
+    """Tas des prochains franchissements de seuil (thread-safe)"""
+
+    def __init__(
+        self,
+        thresholds: Optional[Dict[int, Tuple[EventTypeEnum, str]]] = None,
+        store: Optional[CheckpointStore] = None,
+    ):
+        """
+        Args:
+            thresholds: Seuil en jours → (type d'EventLog, règle)
+            store: Persistance des échéances suivies (rechargées ici)
+        """
+        self.thresholds = dict(thresholds or DEFAULT_THRESHOLDS)
+        # Du plus large au plus serré (7, 3)
+        self._ordered = sorted(self.thresholds, reverse=True)
+        self.store = store
+
+        self._heap: List[Tuple[datetime, int, DeadlineKey, int]] = []
+        self._deadlines: Dict[DeadlineKey, TrackedDeadline] = {}
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+
+        if store is not None:
+            for tenant_id, unit_id, due_date, data, notified in store.load_deadlines():
+                self._track(
+                    tenant_id,
+                    unit_id,
+                    datetime.fromisoformat(due_date),
+                    data,
+                    notified,
+                )
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def add(
+        self,
+        tenant_id: str,
+        unit_id: str,
+        due_date: datetime,
+        deadline_data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Suit l'échéance d'une unité (remplace une échéance différente)
+
+        Returns:
+            False si cette échéance était déjà suivie (seuils notifiés conservés)
+        """
+        due_date = naive_local(due_date)
+        with self._condition:
+            current = self._deadlines.get((tenant_id, unit_id))
+            if current is not None and current.due_date == due_date:
+                return False
+
+            deadline = self._track(
+                tenant_id, unit_id, due_date, deadline_data or {}, None
+            )
+            self._save(deadline)
+            self._condition.notify_all()
+        return True
+
+    def remove(self, tenant_id: str, unit_id: str) -> None:
+        """Arrête le suivi (unité traitée, archivée...)"""
+        with self._condition:
+            if self._deadlines.pop((tenant_id, unit_id), None) is not None:
+                if self.store is not None:
+                    self.store.delete_deadline(tenant_id, unit_id)
+
+    def next_wake_at(self) -> Optional[datetime]:
+        """Prochain franchissement (entrées périmées retirées au passage)"""
+        with self._condition:
+            while self._heap:
+                wake_at, _, key, version = self._heap[0]
+                deadline = self._deadlines.get(key)
+                if deadline is not None and deadline.version == version:
+                    return wake_at
+                heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[DeadlineCrossing]:
+        """
+        Retire du tas les échéances dont un seuil est franchi à `now`
+
+        Si plusieurs seuils ont été franchis depuis le dernier passage (unité
+        indexée tardivement, moniteur arrêté), seul le plus serré est notifié.
+        Une échéance passée n'est plus suivie. Les franchissements renvoyés
+        restent en attente: acknowledge() une fois l'EventLog persisté,
+        reschedule() sinon.
+        """
+        now = now or datetime.now()
+        crossings: List[DeadlineCrossing] = []
+
+        with self._condition:
+            while self._heap and self._heap[0][0] < now:
+                _, _, key, version = heapq.heappop(self._heap)
+                deadline = self._deadlines.get(key)
+                if deadline is None or deadline.version != version:
+                    continue
+
+                days_remaining = (deadline.due_date - now).days
+                crossed = [
+                    threshold
+                    for threshold in self._pending_thresholds(deadline)
+                    if days_remaining <= threshold
+                ]
+                if days_remaining > 0 and crossed:
+                    crossings.append(
+                        DeadlineCrossing(deadline, min(crossed), days_remaining)
+                    )
+                elif days_remaining <= 0 or not self._schedule(deadline):
+                    self._untrack(deadline)
+
+        return crossings
+
+    def acknowledge(self, crossings: List[DeadlineCrossing]) -> None:
+        """
+        Seuils notifiés (EventLog persistés): enregistrés, puis prochain seuil
+        ou fin du suivi après le dernier
+        """
+        with self._condition:
+            for crossing in crossings:
+                deadline = crossing.deadline
+                if not self._is_tracked(deadline):
+                    continue  # remplacée ou retirée entre-temps
+
+                deadline.notified_days = crossing.threshold_days
+                if self._schedule(deadline):
+                    self._save(deadline)
+                else:
+                    self._untrack(deadline)
+
+    def reschedule(self, crossings: List[DeadlineCrossing], retry_at: datetime) -> None:
+        """Franchissements non notifiés: réévalués à `retry_at`"""
+        with self._condition:
+            for crossing in crossings:
+                deadline = crossing.deadline
+                if self._is_tracked(deadline):
+                    heapq.heappush(
+                        self._heap,
+                        (
+                            retry_at,
+                            next(self._seq),
+                            (deadline.tenant_id, deadline.unit_id),
+                            deadline.version,
+                        ),
+                    )
+
+    def wait(self, timeout: float) -> None:
+        """Attend `timeout` secondes, l'ajout d'une échéance ou wake()"""
+        with self._condition:
+            self._condition.wait(timeout)
+
+    def wake(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    def _track(
+        self,
+        tenant_id: str,
+        unit_id: str,
+        due_date: datetime,
+        deadline_data: Dict[str, Any],
+        notified_days: Optional[int],
+    ) -> TrackedDeadline:
+        """Enregistre l'échéance et pousse son prochain seuil (verrou détenu)"""
+        deadline = TrackedDeadline(
+            tenant_id,
+            unit_id,
+            due_date,
+            deadline_data,
+            notified_days,
+            version=next(self._seq),
+        )
+        self._deadlines[(tenant_id, unit_id)] = deadline
+        self._schedule(deadline)
+        return deadline
+
+    def _pending_thresholds(self, deadline: TrackedDeadline) -> List[int]:
+        """Seuils restant à notifier, du plus large au plus serré"""
+        if deadline.notified_days is None:
+            return self._ordered
+        return [t for t in self._ordered if t < deadline.notified_days]
+
+    def _schedule(self, deadline: TrackedDeadline) -> bool:
+        """Pousse le prochain seuil de l'échéance; False s'il n'y en a plus"""
+        pending = self._pending_thresholds(deadline)
+        if not pending:
+            return False
+
+        heapq.heappush(
+            self._heap,
+            (
+                threshold_time(deadline.due_date, pending[0]),
+                next(self._seq),
+                (deadline.tenant_id, deadline.unit_id),
+                deadline.version,
+            ),
+        )
+        return True
+
+    def _is_tracked(self, deadline: TrackedDeadline) -> bool:
+        return self._deadlines.get((deadline.tenant_id, deadline.unit_id)) is deadline
+
+    def _untrack(self, deadline: TrackedDeadline) -> None:
+        self._deadlines.pop((deadline.tenant_id, deadline.unit_id), None)
+        if self.store is not None:
+            self.store.delete_deadline(deadline.tenant_id, deadline.unit_id)
+
+    def _save(self, deadline: TrackedDeadline) -> None:
+        if self.store is not None:
+            self.store.save_deadline(
+                deadline.tenant_id,
+                deadline.unit_id,
+                deadline.due_date.isoformat(),
+                deadline.deadline_data,
+                deadline.notified_days,
+            )
+
+
+class DeadlineMonitor:
+    """Génère et persiste les EventLog de franchissement de seuil"""
+
+    def __init__(
+        self,
+        index: DeadlineIndex,
+        event_logger: EventLogger,
+        persist: bool = True,
+        max_sleep_seconds: float = DEADLINE_MONITOR_MAX_SLEEP_SECONDS,
+        retry_seconds: float = DEADLINE_MONITOR_RETRY_SECONDS,
+    ):
+        """
+        Args:
+            max_sleep_seconds: Attente maximale entre deux passages (borne la
+                dérive d'horloge et l'absence de franchissement)
+            retry_seconds: Délai avant de réévaluer un franchissement dont
+                l'EventLog n'a pas été confirmé par create-events
+        """
+        self.index = index
+        self.event_logger = event_logger
+        self.persist = persist
+        self.max_sleep_seconds = max_sleep_seconds
+        self.retry_seconds = retry_seconds
+        self.events_emitted = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._stop = stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, args=(stop,), name="deadline-monitor", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "✅ Moniteur d'échéances démarré: %d échéances", len(self.index)
+        )
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self.index.wake()
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def run_due(self, now: Optional[datetime] = None) -> List[EventLogSchema]:
+        """
+        Un passage: EventLog des seuils franchis à `now`, persistés par tenant
+
+        Seuls les EventLog confirmés (chunk accepté) marquent leur seuil comme
+        notifié; les autres franchissements sont réévalués `retry_seconds`
+        plus tard (et au redémarrage, le seuil n'ayant pas été enregistré).
+
+        Returns:
+            EventLog confirmés
+        """
+        now = now or datetime.now()
+        crossings = self.index.pop_due(now)
+        if not crossings:
+            return []
+
+        retry_at = now + timedelta(seconds=self.retry_seconds)
+        pending = list(crossings)
+        events: List[EventLogSchema] = []
+        try:
+            by_tenant: Dict[str, List[Tuple[DeadlineCrossing, EventLogSchema]]] = {}
+            for crossing in crossings:
+                event = self._crossing_event(crossing, now)
+                by_tenant.setdefault(event.tenant_id, []).append((crossing, event))
+
+            for tenant_id, pairs in by_tenant.items():
+                confirmed = self._persist(tenant_id, [event for _, event in pairs])
+                failed = [c for c, event in pairs if event.id not in confirmed]
+                self.index.acknowledge(
+                    [c for c, event in pairs if event.id in confirmed]
+                )
+                self.index.reschedule(failed, retry_at)
+                pending = [c for c in pending if all(c is not p for p, _ in pairs)]
+                events.extend(event for _, event in pairs if event.id in confirmed)
+
+                if failed:
+                    logger.warning(
+                        "⚠️  %d EventLog d'échéance non persistés (%s), "
+                        "nouvel essai dans %ss",
+                        len(failed),
+                        tenant_id,
+                        self.retry_seconds,
+                    )
+        finally:
+            self.index.reschedule(pending, retry_at)
+
+        self.events_emitted += len(events)
+        logger.info("⏰ %d seuils d'échéance franchis", len(events))
+        return events
+
+    def _persist(self, tenant_id: str, events: List[EventLogSchema]) -> Set[str]:
+        """Id des EventLog confirmés par create-events (tous sans persistance)"""
+        if not self.persist:
+            return {event.id for event in events}
+
+        payloads = [self.event_logger.event_payload(event) for event in events]
+        result = self.event_logger.persist_payloads(payloads, tenant_id)
+        return set(EventLogger.confirmed_event_ids(payloads, result))
+
+    def _crossing_event(
+        self, crossing: DeadlineCrossing, now: datetime
+    ) -> EventLogSchema:
+        deadline = crossing.deadline
+        event_type, rule = self.index.thresholds[crossing.threshold_days]
+
+        return self.event_logger.generate_deadline_event(
+            entity_id=deadline.unit_id,
+            deadline_data={
+                **deadline.deadline_data,
+                "rule": rule,
+                "information_unit_id": deadline.unit_id,
+                "threshold_days": crossing.threshold_days,
+                "days_remaining": crossing.days_remaining,
+                "due_date": deadline.due_date.isoformat(),
+                "evaluated_at": now.isoformat(),
+            },
+            event_type=event_type,
+            tenant_id=deadline.tenant_id,
+        )
+
+    def _loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.run_due()
+            except Exception:
+                logger.exception("❌ Moniteur d'échéances en échec")
+
+            timeout = self.max_sleep_seconds
+            wake_at = self.index.next_wake_at()
+            if wake_at is not None:
+                seconds = (wake_at - datetime.now()).total_seconds()
+                timeout = min(timeout, max(seconds, 0.0) + 0.001)
+            if not stop.is_set():
+                self.index.wait(timeout)
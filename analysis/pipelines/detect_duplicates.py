@@ -3,7 +3,7 @@ detect_duplicates.py
 
 Étape 2: Détection intelligente de doublons
 - Exact match (SHA-256)
-- Fuzzy match (similarité textuelle)
+- Fuzzy match (similarité textuelle, candidats via index MinHash/LSH)
 - Metadata match (sender + timestamp)
 
 ⚠️ IMPORTANT: Les doublons ne sont JAMAIS supprimés.
@@ -11,22 +11,74 @@ Ils sont LIÉS et une décision humaine est REQUISE.
 """
 
 import hashlib
+import logging
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
-
+from requests.adapters import HTTPAdapter
+
+from ..config import (
+    DUPLICATE_LSH_BANDS,
+    DUPLICATE_LSH_NUM_PERM,
+    DUPLICATE_LSH_SHINGLE_SIZE,
+    HISTORY_LOOKUP_BATCH,
+    HISTORY_LOOKUP_CHUNK_SIZE,
+    HTTP_POOL_SIZE,
+)
 from ..schemas.models import DuplicateDetectionSchema, InformationUnitSchema
+from .near_duplicates import NearDuplicateIndex
 from .rules_engine import DuplicateDetector
 
+logger = logging.getLogger(__name__)
+
+# Seuils du fuzzy match intra-batch
+FUZZY_MATCH_THRESHOLD = 0.95
+FUZZY_TIME_WINDOW_SECONDS = 7 * 86400
+
 
 class DuplicateChecker:
     """Détecte les doublons intelligemment"""
 
-    def __init__(self, api_base_url: str = "http://localhost:3000"):
+    def __init__(
+        self,
+        api_base_url: str = "http://localhost:3000",
+        batch_history_lookup: bool = HISTORY_LOOKUP_BATCH,
+        history_chunk_size: int = HISTORY_LOOKUP_CHUNK_SIZE,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Args:
+            api_base_url: URL de l'API Next.js
+            batch_history_lookup: Historique en POST groupés (sinon 1 GET/unité)
+            history_chunk_size: Nombre d'unités par POST groupé
+            session: Session HTTP partagée (keep-alive), créée si absente
+        """
         self.api_base_url = api_base_url
         self.detector = DuplicateDetector()
+        self.batch_history_lookup = batch_history_lookup
+        self.history_chunk_size = history_chunk_size
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        """Session HTTP partagée, créée au premier appel"""
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Session HTTP avec pool de connexions keep-alive"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def check_batch_for_duplicates(
         self,
@@ -34,41 +86,145 @@ class DuplicateChecker:
         tenant_id: str,
     ) -> Tuple[List[DuplicateDetectionSchema], int]:
         """
-        Teste chaque unité contre TOUTES les autres (dans la batch)
+        Teste chaque unité contre les autres (dans la batch)
         ET contre la base de données (historique).
 
         Returns:
             (duplicates_found, count_exact_matches)
         """
-        print(f"\n🔍 [DUPLICATE] Vérification {len(units)} unités...")
+        logger.info("🔍 [DUPLICATE] Vérification %d unités...", len(units))
+
+        # 1️⃣ Test intra-batch (index MinHash/LSH)
+        duplicates_found, exact_matches_count = self.find_intra_batch_duplicates(
+            units
+        )
+
+        # 2️⃣ Test contre historique (via API)
+        if self.batch_history_lookup:
+            duplicates_found.extend(
+                self._check_against_history_batch(units, tenant_id)
+            )
+        else:
+            for unit in units:
+                historical_duplicates = self._check_against_history(
+                    unit,
+                    tenant_id,
+                )
+                duplicates_found.extend(historical_duplicates)
+
+        logger.info(
+            "   ✅ %d paires détectées (%d exact)",
+            len(duplicates_found),
+            exact_matches_count,
+        )
 
+        return duplicates_found, exact_matches_count
+
+    def find_intra_batch_duplicates(
+        self,
+        units: List[InformationUnitSchema],
+    ) -> Tuple[List[DuplicateDetectionSchema], int]:
+        """
+        Doublons intra-batch sans comparer toutes les paires
+
+        - Exact match: regroupement par content_hash (une passe)
+        - Fuzzy match: un représentant par content_hash dans l'index
+          MinHash/LSH, puis blocage temporel (fenêtre 7 jours) et
+          vérification exacte SequenceMatcher sur les seules candidates
+
+        Même sortie que find_intra_batch_duplicates_all_pairs (mêmes paires,
+        même orientation, même ordre), au rappel LSH près pour le fuzzy.
+        """
+        hash_groups: Dict[str, List[int]] = {}
+        for index, unit in enumerate(units):
+            hash_groups.setdefault(unit.content_hash, []).append(index)
+
+        matches: List[Tuple[int, int, DuplicateDetectionSchema]] = []
+        exact_matches_count = 0
+
+        # Exact match: toutes les paires d'un même bucket de hash
+        for members in hash_groups.values():
+            for position, i in enumerate(members):
+                for j in members[position + 1 :]:
+                    exact_matches_count += 1
+                    matches.append((i, j, self._exact_match(units[i], units[j])))
+
+        # Fuzzy match: seulement entre groupes candidats de l'index
+        groups = list(hash_groups.values())
+        lsh_index = NearDuplicateIndex(
+            num_perm=DUPLICATE_LSH_NUM_PERM,
+            bands=DUPLICATE_LSH_BANDS,
+            shingle_size=DUPLICATE_LSH_SHINGLE_SIZE,
+        )
+        for group_id, members in enumerate(groups):
+            lsh_index.add(group_id, units[members[0]].content)
+
+        for group1, group2 in lsh_index.candidate_pairs():
+            # Blocage temporel avant tout calcul de similarité
+            in_window = []
+            for i in groups[group1]:
+                for j in groups[group2]:
+                    first, second = (i, j) if i < j else (j, i)
+                    time_diff = (
+                        units[second].received_at - units[first].received_at
+                    ).total_seconds()
+                    if abs(time_diff) <= FUZZY_TIME_WINDOW_SECONDS:
+                        in_window.append((first, second, time_diff, i < j))
+
+            if not in_window:
+                continue
+
+            # SequenceMatcher n'est pas symétrique: une similarité par orientation
+            similarities: Dict[bool, float] = {}
+            for first, second, time_diff, forward in in_window:
+                if forward not in similarities:
+                    similarities[forward] = self.detector.bounded_fuzzy_match(
+                        units[first].content,
+                        units[second].content,
+                        threshold=FUZZY_MATCH_THRESHOLD,
+                    )
+                similarity = similarities[forward]
+                if similarity > FUZZY_MATCH_THRESHOLD:
+                    matches.append(
+                        (
+                            first,
+                            second,
+                            self._fuzzy_match(
+                                units[first], units[second], similarity, time_diff
+                            ),
+                        )
+                    )
+
+        matches.sort(key=lambda match: (match[0], match[1]))
+
+        duplicates_found = []
+        for _, _, duplicate in matches:
+            self._log_match(duplicate)
+            duplicates_found.append(duplicate)
+
+        return duplicates_found, exact_matches_count
+
+    def find_intra_batch_duplicates_all_pairs(
+        self,
+        units: List[InformationUnitSchema],
+    ) -> Tuple[List[DuplicateDetectionSchema], int]:
+        """
+        Doublons intra-batch par comparaison de toutes les paires (O(n²))
+
+        Chemin de référence, conservé pour le benchmark et les tests
+        d'équivalence avec find_intra_batch_duplicates.
+        """
         duplicates_found = []
         exact_matches_count = 0
 
-        # 1️⃣ Test intra-batch (rapide)
         for i, unit1 in enumerate(units):
             for j, unit2 in enumerate(units[i + 1 :], i + 1):
                 # Exact match par checksum
                 if unit1.content_hash == unit2.content_hash:
                     exact_matches_count += 1
-                    duplicates_found.append(
-                        DuplicateDetectionSchema(
-                            primary_unit_id=unit1.id,
-                            duplicate_unit_id=unit2.id,
-                            detection_method="EXACT_MATCH",
-                            similarity_score=1.0,
-                            match_criteria={
-                                "content_hash_match": unit1.content_hash,
-                                "same_sender": (
-                                    unit1.source_metadata.get("sender_email")
-                                    == unit2.source_metadata.get("sender_email")
-                                ),
-                            },
-                            time_window_applied="unlimited",
-                            timestamp=datetime.now(),
-                        )
-                    )
-                    print(f"   🎯 Exact match: {unit1.id[:8]} <-> {unit2.id[:8]}")
+                    duplicate = self._exact_match(unit1, unit2)
+                    self._log_match(duplicate)
+                    duplicates_found.append(duplicate)
 
                 # Fuzzy match (95%+)
                 else:
@@ -76,43 +232,79 @@ class DuplicateChecker:
                         unit1.content,
                         unit2.content,
                     )
-                    if similarity > 0.95:
+                    if similarity > FUZZY_MATCH_THRESHOLD:
                         # Vérifier la fenêtre temporelle (7 jours max)
                         time_diff = (
                             unit2.received_at - unit1.received_at
                         ).total_seconds()
-                        if abs(time_diff) <= 7 * 86400:
-                            duplicates_found.append(
-                                DuplicateDetectionSchema(
-                                    primary_unit_id=unit1.id,
-                                    duplicate_unit_id=unit2.id,
-                                    detection_method="FUZZY_MATCH",
-                                    similarity_score=similarity,
-                                    match_criteria={
-                                        "similarity_ratio": f"{similarity:.2%}",
-                                        "time_diff_hours": (time_diff / 3600),
-                                    },
-                                    time_window_applied="7_days",
-                                    timestamp=datetime.now(),
-                                )
-                            )
-                            print(
-                                f"   🔄 Fuzzy match {similarity:.1%}: {unit1.id[:8]} <-> {unit2.id[:8]}"
+                        if abs(time_diff) <= FUZZY_TIME_WINDOW_SECONDS:
+                            duplicate = self._fuzzy_match(
+                                unit1, unit2, similarity, time_diff
                             )
+                            self._log_match(duplicate)
+                            duplicates_found.append(duplicate)
 
-        # 2️⃣ Test contre historique (via API)
-        for unit in units:
-            historical_duplicates = self._check_against_history(
-                unit,
-                tenant_id,
-            )
-            duplicates_found.extend(historical_duplicates)
+        return duplicates_found, exact_matches_count
 
-        print(
-            f"   ✅ {len(duplicates_found)} paires détectées ({exact_matches_count} exact)"
+    @staticmethod
+    def _exact_match(
+        unit1: InformationUnitSchema,
+        unit2: InformationUnitSchema,
+    ) -> DuplicateDetectionSchema:
+        """Paire EXACT_MATCH (même checksum)"""
+        return DuplicateDetectionSchema(
+            primary_unit_id=unit1.id,
+            duplicate_unit_id=unit2.id,
+            detection_method="EXACT_MATCH",
+            similarity_score=1.0,
+            match_criteria={
+                "content_hash_match": unit1.content_hash,
+                "same_sender": (
+                    unit1.source_metadata.get("sender_email")
+                    == unit2.source_metadata.get("sender_email")
+                ),
+            },
+            time_window_applied="unlimited",
+            timestamp=datetime.now(),
         )
 
-        return duplicates_found, exact_matches_count
+    @staticmethod
+    def _fuzzy_match(
+        unit1: InformationUnitSchema,
+        unit2: InformationUnitSchema,
+        similarity: float,
+        time_diff: float,
+    ) -> DuplicateDetectionSchema:
+        """Paire FUZZY_MATCH (similarité > 95%, fenêtre 7 jours)"""
+        return DuplicateDetectionSchema(
+            primary_unit_id=unit1.id,
+            duplicate_unit_id=unit2.id,
+            detection_method="FUZZY_MATCH",
+            similarity_score=similarity,
+            match_criteria={
+                "similarity_ratio": f"{similarity:.2%}",
+                "time_diff_hours": (time_diff / 3600),
+            },
+            time_window_applied="7_days",
+            timestamp=datetime.now(),
+        )
+
+    @staticmethod
+    def _log_match(duplicate: DuplicateDetectionSchema) -> None:
+        """Une ligne par paire: DEBUG (chemin chaud)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        primary = duplicate.primary_unit_id[:8]
+        secondary = duplicate.duplicate_unit_id[:8]
+        if duplicate.detection_method == "EXACT_MATCH":
+            logger.debug("   🎯 Exact match: %s <-> %s", primary, secondary)
+        else:
+            logger.debug(
+                "   🔄 Fuzzy match %.1f%%: %s <-> %s",
+                duplicate.similarity_score * 100,
+                primary,
+                secondary,
+            )
 
     def _check_against_history(
         self,
@@ -129,8 +321,27 @@ class DuplicateChecker:
         3. Retourne les matches
         """
         endpoint = f"{self.api_base_url}/api/analysis/find-duplicate-candidates"
+        params = self._history_params(unit, tenant_id, limit)
+
+        try:
+            response = self.session.get(endpoint, params=params, timeout=10)
+            response.raise_for_status()
+
+            candidates = response.json().get("candidates", [])
+            return self._match_history_candidates(unit, candidates)
+
+        except requests.RequestException as e:
+            logger.warning("   ⚠️  Erreur check historique: %s", e)
+            return []
 
-        params = {
+    @staticmethod
+    def _history_params(
+        unit: InformationUnitSchema,
+        tenant_id: str,
+        limit: int,
+    ) -> Dict[str, Any]:
+        """Query string de GET /api/analysis/find-duplicate-candidates"""
+        return {
             "tenantId": tenant_id,
             "contentHash": unit.content_hash,
             "senderEmail": (unit.source_metadata.get("sender_email", "")),
@@ -138,52 +349,163 @@ class DuplicateChecker:
             "limit": limit,
         }
 
-        try:
-            response = requests.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
+    def _match_history_candidates(
+        self,
+        unit: InformationUnitSchema,
+        candidates: List[Dict[str, Any]],
+    ) -> List[DuplicateDetectionSchema]:
+        duplicates = [self._history_match(unit, candidate) for candidate in candidates]
 
-            candidates = response.json().get("candidates", [])
+        if duplicates:
+            logger.debug(
+                "   🔗 %d match(es) historique pour %s", len(duplicates), unit.id[:8]
+            )
 
-            duplicates = []
-            for candidate in candidates:
-                duplicate = DuplicateDetectionSchema(
-                    primary_unit_id=candidate["id"],
-                    duplicate_unit_id=unit.id,
-                    detection_method=(
-                        "EXACT_MATCH"
-                        if candidate["content_hash"] == unit.content_hash
-                        else "METADATA_MATCH"
-                    ),
-                    similarity_score=(
-                        1.0 if candidate["content_hash"] == unit.content_hash else 0.85
-                    ),
-                    match_criteria={
-                        "reason": candidate.get("reason"),
-                        "sender_match": (
-                            candidate.get("senderEmail")
-                            == unit.source_metadata.get("sender_email")
-                        ),
-                        "time_window_seconds": candidate.get("timeDiffSeconds"),
-                    },
-                    time_window_applied=(
-                        "5_minutes"
-                        if candidate.get("timeDiffSeconds", 999999) <= 300
-                        else "7_days"
-                    ),
-                    timestamp=datetime.now(),
-                )
-                duplicates.append(duplicate)
+        return duplicates
+
+    def _check_against_history_batch(
+        self,
+        units: List[InformationUnitSchema],
+        tenant_id: str,
+        limit: int = 50,
+    ) -> List[DuplicateDetectionSchema]:
+        """
+        Vérifie toute la batch contre l'historique en POST groupés
+
+        Endpoint: POST /api/analysis/find-duplicate-candidates/batch
+        Body: {"tenantId", "limit", "queries": [{"key", "contentHash",
+               "senderEmail", "receivedAt"}]}
+        Réponse: {"results": [{"key", "candidates": [...]}]}
+
+        Les candidats sont rattachés localement aux unités par "key"
+        (index de l'unité dans la batch). Un chunk en erreur est ignoré,
+        comme un appel unitaire en erreur. Si la route n'existe pas (404),
+        le mode groupé est désactivé et la suite passe en GET unitaires.
+        """
+        endpoint = (
+            f"{self.api_base_url}/api/analysis/find-duplicate-candidates/batch"
+        )
+        duplicates: List[DuplicateDetectionSchema] = []
+
+        for chunk_start in range(0, len(units), self.history_chunk_size):
+            chunk = units[chunk_start : chunk_start + self.history_chunk_size]
+            payload = self._history_batch_payload(chunk, chunk_start, tenant_id, limit)
 
-            if duplicates:
-                print(
-                    f"   🔗 {len(duplicates)} match(es) historique pour {unit.id[:8]}"
+            try:
+                response = self.session.post(endpoint, json=payload, timeout=30)
+                if response.status_code == 404:
+                    return duplicates + self._fall_back_to_per_unit(
+                        units[chunk_start:], tenant_id, limit
+                    )
+                response.raise_for_status()
+                results = response.json().get("results", [])
+            except requests.RequestException as e:
+                logger.warning(
+                    "   ⚠️  Erreur check historique (unités %d-%d): %s",
+                    chunk_start,
+                    chunk_start + len(chunk) - 1,
+                    e,
                 )
+                continue
 
-            return duplicates
+            duplicates.extend(
+                self._match_history_results(chunk, chunk_start, results)
+            )
 
-        except requests.RequestException as e:
-            print(f"   ⚠️  Erreur check historique: {e}")
-            return []
+        return duplicates
+
+    def _fall_back_to_per_unit(
+        self,
+        units: List[InformationUnitSchema],
+        tenant_id: str,
+        limit: int,
+    ) -> List[DuplicateDetectionSchema]:
+        """Route groupée absente: GET unitaires pour les unités restantes"""
+        logger.warning(
+            "   ⚠️  POST find-duplicate-candidates/batch introuvable (404),"
+            " repli sur les GET unitaires"
+        )
+        self.batch_history_lookup = False
+
+        duplicates: List[DuplicateDetectionSchema] = []
+        for unit in units:
+            duplicates.extend(self._check_against_history(unit, tenant_id, limit))
+        return duplicates
+
+    @staticmethod
+    def _history_batch_payload(
+        chunk: List[InformationUnitSchema],
+        chunk_start: int,
+        tenant_id: str,
+        limit: int,
+    ) -> Dict[str, Any]:
+        """Corps de POST /api/analysis/find-duplicate-candidates/batch"""
+        return {
+            "tenantId": tenant_id,
+            "limit": limit,
+            "queries": [
+                {
+                    "key": str(chunk_start + offset),
+                    "contentHash": unit.content_hash,
+                    "senderEmail": unit.source_metadata.get("sender_email", ""),
+                    "receivedAt": unit.received_at.isoformat(),
+                }
+                for offset, unit in enumerate(chunk)
+            ],
+        }
+
+    def _match_history_results(
+        self,
+        chunk: List[InformationUnitSchema],
+        chunk_start: int,
+        results: List[Dict[str, Any]],
+    ) -> List[DuplicateDetectionSchema]:
+        """Rattache les candidats d'un chunk à leurs unités par "key" """
+        candidates_by_key: Dict[str, List[Dict[str, Any]]] = {
+            result["key"]: result.get("candidates", []) for result in results
+        }
+
+        # Ordre de la batch conservé, comme en mode unitaire
+        duplicates: List[DuplicateDetectionSchema] = []
+        for offset, unit in enumerate(chunk):
+            candidates = candidates_by_key.get(str(chunk_start + offset), [])
+            if candidates:
+                duplicates.extend(self._match_history_candidates(unit, candidates))
+
+        return duplicates
+
+    @staticmethod
+    def _history_match(
+        unit: InformationUnitSchema,
+        candidate: Dict[str, Any],
+    ) -> DuplicateDetectionSchema:
+        """Paire entre une unité historique (primaire) et l'unité courante"""
+        return DuplicateDetectionSchema(
+            primary_unit_id=candidate["id"],
+            duplicate_unit_id=unit.id,
+            detection_method=(
+                "EXACT_MATCH"
+                if candidate["content_hash"] == unit.content_hash
+                else "METADATA_MATCH"
+            ),
+            similarity_score=(
+                1.0 if candidate["content_hash"] == unit.content_hash else 0.85
+            ),
+            match_criteria={
+                "reason": candidate.get("reason"),
+                "sender_match": (
+                    candidate.get("senderEmail")
+                    == unit.source_metadata.get("sender_email")
+                ),
+                "time_window_seconds": candidate.get("timeDiffSeconds"),
+            },
+            time_window_applied=(
+                "5_minutes"
+                if candidate.get("timeDiffSeconds", 999999) <= 300
+                else "7_days"
+            ),
+            timestamp=datetime.now(),
+        )
 
     def propose_linkage(
         self,
@@ -214,7 +536,7 @@ class DuplicateChecker:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
                 json=payload,
                 timeout=10,
@@ -222,7 +544,9 @@ class DuplicateChecker:
             response.raise_for_status()
             return True
         except requests.RequestException as e:
-            print(f"❌ Erreur proposal linkage {primary_id} <-> {duplicate_id}: {e}")
+            logger.error(
+                "❌ Erreur proposal linkage %s <-> %s: %s", primary_id, duplicate_id, e
+            )
             return False
 
     def get_linkage_status(
@@ -249,9 +573,9 @@ class DuplicateChecker:
         params = {"tenantId": tenant_id, "unitId": unit_id}
 
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = self.session.get(endpoint, params=params, timeout=10)
             response.raise_for_status()
             return response.json().get("status", {})
         except requests.RequestException as e:
-            print(f"⚠️  Erreur get_linkage_status: {e}")
+            logger.warning("⚠️  Erreur get_linkage_status: %s", e)
             return {}
@@ -4,17 +4,34 @@ generate_events.py
 Étape finale: Génération des EventLog immuables
 - Crée les EventLog pour chaque décision
 - Enrichit avec justification complète
-- Signe avec checksum SHA-256
-- Transmet à l'API Next.js pour insertion Prisma
+- Signe avec checksum SHA-256 du JSON canonique (à la demande: un dry-run
+  ne sérialise rien)
+- Transmet à l'API Next.js pour insertion Prisma (metadata réutilisée telle
+  que sérialisée pour le checksum)
 """
 
+import gzip
 import hashlib
 import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
-
+from requests.adapters import HTTPAdapter
+
+from ..config import (
+    HTTP_POOL_SIZE,
+    PERSIST_BACKOFF_SECONDS,
+    PERSIST_CHUNK_MAX_BYTES,
+    PERSIST_CHUNK_SIZE,
+    PERSIST_CONCURRENCY,
+    PERSIST_MAX_RETRIES,
+)
 from ..schemas.models import (
     ActorTypeEnum,
     ClassificationResultSchema,
@@ -23,27 +40,87 @@ from ..schemas.models import (
     EventTypeEnum,
 )
 
+logger = logging.getLogger(__name__)
+
+# Réponses transitoires: le chunk est renvoyé après backoff
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def canonical_json(value: Any) -> bytes:
+    """
+    JSON canonique: clés triées (converties en str), compact, UTF-8
+
+    orjson seul (dépendance requise): ces octets sont signés, un second
+    sérialiseur donnerait d'autres octets (1e16/1e+16, NaN/null, dates).
+    """
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
 
 class EventLogger:
     """Génère et persiste les EventLog immuables"""
 
-    def __init__(self, api_base_url: str = "http://localhost:3000"):
+    def __init__(
+        self,
+        api_base_url: str = "http://localhost:3000",
+        session: Optional[requests.Session] = None,
+        chunk_size: int = PERSIST_CHUNK_SIZE,
+        max_chunk_bytes: int = PERSIST_CHUNK_MAX_BYTES,
+        concurrency: int = PERSIST_CONCURRENCY,
+        max_retries: int = PERSIST_MAX_RETRIES,
+        backoff_seconds: float = PERSIST_BACKOFF_SECONDS,
+    ):
+        """
+        Args:
+            api_base_url: URL de l'API Next.js
+            session: Session HTTP partagée (créée à la demande sinon)
+            chunk_size: EventLog par requête create-events au maximum
+            max_chunk_bytes: Taille JSON (non compressée) d'un chunk au maximum
+            concurrency: Chunks envoyés simultanément
+            max_retries: Nouvelles tentatives par chunk (erreurs transitoires)
+            backoff_seconds: Base du backoff exponentiel (avec jitter)
+        """
         self.api_base_url = api_base_url
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = self._create_session(max(HTTP_POOL_SIZE, self.concurrency))
+        return self._session
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """Session HTTP avec pool de connexions keep-alive"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def generate_classification_event(
         self,
         classification: ClassificationResultSchema,
         tenant_id: str,
+        sign: bool = True,
     ) -> EventLogSchema:
         """
         Génère un EventLog pour une classification
 
         EventType: FLOW_CLASSIFIED
+
+        Args:
+            sign: Calcule le checksum tout de suite; sinon à la
+                persistance (cf. sign_event)
         """
         # Construit la justification
         justification = {
-            "base_priority": classification.base_priority.value,
-            "final_priority": classification.final_priority.value,
+            "base_priority": classification.base_priority,
+            "final_priority": classification.final_priority,
             "priority_score": classification.priority_score,
             "applied_rules": [
                 {
@@ -69,11 +146,7 @@ class EventLogger:
             "pipeline_version": "1.0",
         }
 
-        # Sérialise et signe
-        metadata_json = json.dumps(metadata, sort_keys=True)
-        checksum = hashlib.sha256(metadata_json.encode()).hexdigest()
-
-        return EventLogSchema(
+        event = EventLogSchema(
             id=self._generate_event_id(),
             tenant_id=tenant_id,
             timestamp=datetime.now(),
@@ -84,19 +157,20 @@ class EventLogger:
             actor_id=None,
             metadata=metadata,
             immutable=True,
-            checksum=checksum,
             previous_event_id=None,
         )
+        return self.sign_event(event) if sign else event
 
     def generate_duplicate_event(
         self,
         duplicate: DuplicateDetectionSchema,
         tenant_id: str,
+        sign: bool = True,
     ) -> EventLogSchema:
         """
         Génère un EventLog pour une détection de doublon
 
-        EventType: DUPLICATE_DETECTED
+        EventType: DUPLICATE_DETECTED (sign: cf. generate_classification_event)
         """
         justification = {
             "detection_method": duplicate.detection_method,
@@ -121,10 +195,7 @@ class EventLogger:
             "source": "duplicate_detector",
         }
 
-        metadata_json = json.dumps(metadata, sort_keys=True)
-        checksum = hashlib.sha256(metadata_json.encode()).hexdigest()
-
-        return EventLogSchema(
+        event = EventLogSchema(
             id=self._generate_event_id(),
             tenant_id=tenant_id,
             timestamp=duplicate.timestamp,
@@ -135,9 +206,9 @@ class EventLogger:
             actor_id=None,
             metadata=metadata,
             immutable=True,
-            checksum=checksum,
             previous_event_id=None,
         )
+        return self.sign_event(event) if sign else event
 
     def generate_deadline_event(
         self,
@@ -168,24 +239,35 @@ class EventLogger:
             "source": "deadline_monitor",
         }
 
-        metadata_json = json.dumps(metadata, sort_keys=True)
-        checksum = hashlib.sha256(metadata_json.encode()).hexdigest()
-
-        return EventLogSchema(
-            id=self._generate_event_id(),
-            tenant_id=tenant_id,
-            timestamp=datetime.now(),
-            event_type=event_type,
-            entity_type="deadline",
-            entity_id=entity_id,
-            actor_type=ActorTypeEnum.SYSTEM,
-            actor_id=None,
-            metadata=metadata,
-            immutable=True,
-            checksum=checksum,
-            previous_event_id=None,
+        return self.sign_event(
+            EventLogSchema(
+                id=self._generate_event_id(),
+                tenant_id=tenant_id,
+                timestamp=datetime.now(),
+                event_type=event_type,
+                entity_type="deadline",
+                entity_id=entity_id,
+                actor_type=ActorTypeEnum.SYSTEM,
+                actor_id=None,
+                metadata=metadata,
+                immutable=True,
+                previous_event_id=None,
+            )
         )
 
+    @staticmethod
+    def metadata_json(event: EventLogSchema) -> bytes:
+        """JSON canonique de metadata, sérialisé au premier appel seulement"""
+        if event._metadata_json is None:
+            event._metadata_json = canonical_json(event.metadata)
+        return event._metadata_json
+
+    def sign_event(self, event: EventLogSchema) -> EventLogSchema:
+        """Checksum SHA-256 du JSON canonique de metadata (si absent)"""
+        if not event.checksum:
+            event.checksum = hashlib.sha256(self.metadata_json(event)).hexdigest()
+        return event
+
     def persist_events(
         self,
         events: List[EventLogSchema],
@@ -194,67 +276,269 @@ class EventLogger:
         """
         Persiste les EventLog dans Prisma (via API Next.js)
 
-        Endpoint: POST /api/analysis/create-events
+        Endpoint: POST /api/analysis/create-events, un appel par chunk
+        (corps gzip), jusqu'à `concurrency` chunks en parallèle. Un chunk
+        en échec transitoire est renvoyé seul; l'API ignore les id déjà
+        insérés, un renvoi est donc sans effet de bord.
 
         Returns:
             {
                 "success": bool,
                 "created_count": int,
                 "failed_count": int,
-                "errors": [...]
+                "errors": [...],
+                "chunks": [{chunk, events, attempts, created_count, failed_count, errors}]
             }
         """
-        if not events:
+        return self._persist_items(
+            [self.serialize_event(event) for event in events], tenant_id
+        )
+
+    def persist_payloads(
+        self,
+        payloads: List[Dict[str, Any]],
+        tenant_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Persiste des EventLog déjà mis au format de create-events
+
+        Sert au renvoi d'événements conservés tels quels (ex: checkpoints).
+        Même résultat que persist_events.
+        """
+        return self._persist_items(
+            [canonical_json(payload) for payload in payloads], tenant_id
+        )
+
+    def _persist_items(self, items: List[bytes], tenant_id: str) -> Dict[str, Any]:
+        """Envoie des EventLog déjà sérialisés, par chunks"""
+        if not items:
             return {"success": True, "created_count": 0, "failed_count": 0}
 
         endpoint = f"{self.api_base_url}/api/analysis/create-events"
+        chunks = self._chunk_items(items)
+
+        if self.concurrency <= 1 or len(chunks) == 1:
+            chunk_results = [
+                self._send_chunk(endpoint, tenant_id, index, chunk)
+                for index, chunk in enumerate(chunks)
+            ]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(chunks))
+            ) as executor:
+                chunk_results = list(
+                    executor.map(
+                        lambda item: self._send_chunk(endpoint, tenant_id, *item),
+                        enumerate(chunks),
+                    )
+                )
+
+        return self._report_persist_result(self._merge_chunk_results(chunk_results))
+
+    def _send_chunk(
+        self,
+        endpoint: str,
+        tenant_id: str,
+        index: int,
+        chunk: List[bytes],
+    ) -> Dict[str, Any]:
+        """POST d'un chunk, renvoyé avec backoff sur erreur transitoire"""
+        body, headers = self._encode_chunk(chunk, tenant_id)
+        error = ""
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._backoff_delay(attempt))
+
+            try:
+                response = self.session.post(
+                    endpoint, data=body, headers=headers, timeout=30
+                )
+            except requests.RequestException as e:
+                error = str(e)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                error = f"HTTP {response.status_code}"
+                continue
+
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as e:
+                # 4xx: le même corps échouerait de nouveau
+                return self._chunk_result(index, len(chunk), attempt + 1, error=str(e))
+
+            return self._chunk_result(
+                index, len(chunk), attempt + 1, result=response.json()
+            )
 
-        payload = {
-            "tenantId": tenant_id,
-            "events": [
-                {
-                    "id": event.id,
-                    "timestamp": event.timestamp.isoformat(),
-                    "eventType": event.event_type.value,
-                    "entityType": event.entity_type,
-                    "entityId": event.entity_id,
-                    "actorType": event.actor_type.value,
-                    "actorId": event.actor_id,
-                    "metadata": event.metadata,
-                    "immutable": event.immutable,
-                    "checksum": event.checksum,
-                    "previousEventId": event.previous_event_id,
-                }
-                for event in events
-            ],
+        return self._chunk_result(index, len(chunk), self.max_retries + 1, error=error)
+
+    def _chunk_items(self, items: List[bytes]) -> List[List[bytes]]:
+        """
+        Regroupe des EventLog sérialisés en chunks bornés en nombre
+        (chunk_size) et en octets (max_chunk_bytes)
+        """
+        chunks: List[List[bytes]] = []
+        current: List[bytes] = []
+        current_bytes = 0
+
+        for item in items:
+            if current and (
+                len(current) >= self.chunk_size
+                or current_bytes + len(item) > self.max_chunk_bytes
+            ):
+                chunks.append(current)
+                current, current_bytes = [], 0
+
+            current.append(item)
+            current_bytes += len(item) + 1
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    @staticmethod
+    def _encode_chunk(
+        chunk: List[bytes],
+        tenant_id: str,
+    ) -> Tuple[bytes, Dict[str, str]]:
+        """Corps gzip de POST /api/analysis/create-events (événements déjà sérialisés)"""
+        body = b"".join(
+            [
+                b'{"tenantId":',
+                json.dumps(tenant_id).encode("utf-8"),
+                b',"events":[',
+                b",".join(chunk),
+                b"]}",
+            ]
+        )
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
         }
+        return gzip.compress(body, compresslevel=6), headers
 
-        try:
-            response = requests.post(
-                endpoint,
-                json=payload,
-                timeout=30,
-            )
-            response.raise_for_status()
+    def event_payload(self, event: EventLogSchema) -> Dict[str, Any]:
+        """Représentation d'un EventLog attendue par create-events (signé)"""
+        return {
+            **self._envelope(self.sign_event(event)),
+            "metadata": event.metadata,
+        }
 
-            result = response.json()
-            print(f"\n✅ EventLog: {result.get('created_count', 0)} créés")
+    def serialize_event(self, event: EventLogSchema) -> bytes:
+        """
+        event_payload sérialisé, metadata reprise du JSON canonique déjà
+        calculé pour le checksum (pas de seconde sérialisation)
+        """
+        envelope = canonical_json(self._envelope(self.sign_event(event)))
+        return b"".join(
+            [envelope[:-1], b',"metadata":', self.metadata_json(event), b"}"]
+        )
 
-            if result.get("failed_count", 0) > 0:
-                print(f"⚠️  {result.get('failed_count', 0)} erreurs d'insertion")
-                for error in result.get("errors", []):
-                    print(f"   - {error}")
+    @staticmethod
+    def _envelope(event: EventLogSchema) -> Dict[str, Any]:
+        """Champs de create-events hors metadata"""
+        return {
+            "id": event.id,
+            "timestamp": event.timestamp.isoformat(),
+            "eventType": event.event_type,
+            "entityType": event.entity_type,
+            "entityId": event.entity_id,
+            "actorType": event.actor_type,
+            "actorId": event.actor_id,
+            "immutable": event.immutable,
+            "checksum": event.checksum,
+            "previousEventId": event.previous_event_id,
+        }
 
-            return result
+    def _backoff_delay(self, attempt: int) -> float:
+        """Backoff exponentiel, full jitter"""
+        return random.uniform(0, self.backoff_seconds * 2 ** (attempt - 1))
 
-        except requests.RequestException as e:
-            print(f"❌ Erreur persistence EventLog: {e}")
+    @staticmethod
+    def _chunk_result(
+        index: int,
+        event_count: int,
+        attempts: int,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if result is None:
             return {
-                "success": False,
+                "chunk": index,
+                "events": event_count,
+                "attempts": attempts,
                 "created_count": 0,
-                "failed_count": len(events),
-                "errors": [str(e)],
+                "failed_count": event_count,
+                "errors": [error],
             }
+        return {
+            "chunk": index,
+            "events": event_count,
+            "attempts": attempts,
+            "created_count": result.get("created_count", 0),
+            "failed_count": result.get("failed_count", 0),
+            "errors": result.get("errors", []),
+        }
+
+    @staticmethod
+    def confirmed_event_ids(
+        payloads: List[Dict[str, Any]],
+        result: Dict[str, Any],
+    ) -> List[str]:
+        """
+        Id des événements dont le chunk a été accepté sans erreur
+
+        Les chunks suivent l'ordre des payloads; un chunk partiellement en
+        échec n'est pas confirmé (il sera renvoyé, sans doublon côté API).
+        """
+        confirmed: List[str] = []
+        offset = 0
+        for chunk in result.get("chunks", []):
+            end = offset + chunk["events"]
+            if chunk["failed_count"] == 0 and not chunk["errors"]:
+                confirmed.extend(payload["id"] for payload in payloads[offset:end])
+            offset = end
+        return confirmed
+
+    @staticmethod
+    def _merge_chunk_results(chunk_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        failed_count = sum(chunk["failed_count"] for chunk in chunk_results)
+        return {
+            "success": failed_count == 0,
+            "created_count": sum(chunk["created_count"] for chunk in chunk_results),
+            "failed_count": failed_count,
+            "errors": [
+                f"chunk {chunk['chunk']}: {error}"
+                for chunk in chunk_results
+                for error in chunk["errors"]
+            ],
+            "chunks": chunk_results,
+        }
+
+    @staticmethod
+    def _report_persist_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        chunks = result.get("chunks", [])
+        logger.info(
+            "✅ EventLog: %d créés (%d chunks)",
+            result.get("created_count", 0),
+            len(chunks),
+        )
+
+        retried = [chunk for chunk in chunks if chunk["attempts"] > 1]
+        if retried:
+            logger.info("   🔁 %d chunks renvoyés", len(retried))
+
+        if result.get("failed_count", 0) > 0:
+            logger.warning(
+                "⚠️  %d erreurs d'insertion", result.get("failed_count", 0)
+            )
+            for error in result.get("errors", []):
+                logger.warning("   - %s", error)
+
+        return result
 
     @staticmethod
     def _generate_event_id() -> str:
@@ -0,0 +1,380 @@
+"""
+merkle.py
+
+Scellement des EventLog persistés par batch (arbre de Merkle chaîné)
+- Feuille: SHA-256 de (id, previousEventId, checksum) de l'EventLog
+- Racine de batch: racine de Merkle chaînée à celle du batch précédent
+  du tenant, batch_root = H(0x02 || previous_root || merkle_root)
+- previousEventId: chaque EventLog pointe sur le précédent du tenant
+
+Les nœuds suivent RFC 6962 (préfixes 0x00 feuille, 0x01 nœud, nœud
+impair remonté tel quel). Une preuve d'inclusion contient O(log n)
+hashes; verify_tenant_log contrôle un log complet en une passe, en
+mémoire constante (pile de log2(n) racines partielles par batch).
+
+Usage:
+    sealer = BatchSealer(store=checkpoint_store)
+    pipeline = AnalysisPipeline(
+        tenant_id, checkpoints=checkpoint_store, sealer=sealer
+    )
+    proof = sealer.inclusion_proof(tenant_id, event_id)
+    report = verify_tenant_log(store.iter_seals(tenant_id), event_payloads)
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..schemas.models import EventLogSchema
+from .checkpoints import CheckpointStore
+from .generate_events import canonical_json
+
+logger = logging.getLogger(__name__)
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+CHAIN_PREFIX = b"\x02"
+
+# Racine "précédente" du premier batch d'un tenant
+GENESIS_ROOT = "0" * 64
+
+# Côté du hash frère dans une preuve d'inclusion
+ProofStep = Tuple[str, str]  # ("left" | "right", hash hex)
+
+
+def leaf_hash(event_id: str, previous_event_id: Optional[str], checksum: str) -> bytes:
+    """Feuille d'un EventLog (le checksum couvre déjà metadata)"""
+    return hashlib.sha256(
+        LEAF_PREFIX + canonical_json([event_id, previous_event_id, checksum])
+    ).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def chain_root(previous_root: str, merkle_root: str) -> str:
+    """Racine de batch: racine de Merkle chaînée à la racine précédente"""
+    return hashlib.sha256(
+        CHAIN_PREFIX + bytes.fromhex(previous_root) + bytes.fromhex(merkle_root)
+    ).hexdigest()
+
+
+class MerkleTree:
+    """Arbre de Merkle d'un batch (niveaux conservés pour les preuves)"""
+
+    def __init__(self, leaves: List[bytes]):
+        if not leaves:
+            raise ValueError("Arbre de Merkle vide")
+
+        self.levels: List[List[bytes]] = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [
+                node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)
+            ]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0].hex()
+
+    def proof(self, index: int) -> List[ProofStep]:
+        """Hashes frères de la feuille `index` jusqu'à la racine, O(log n)"""
+        if not 0 <= index < len(self.levels[0]):
+            raise IndexError(f"Feuille {index} hors de l'arbre")
+
+        path: List[ProofStep] = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                side = "left" if sibling < index else "right"
+                path.append((side, level[sibling].hex()))
+            index //= 2
+        return path
+
+
+def verify_inclusion(leaf: bytes, path: List[ProofStep], merkle_root: str) -> bool:
+    """Recalcule la racine depuis la feuille et sa preuve"""
+    node = leaf
+    for side, sibling in path:
+        sibling_bytes = bytes.fromhex(sibling)
+        node = (
+            node_hash(sibling_bytes, node)
+            if side == "left"
+            else node_hash(node, sibling_bytes)
+        )
+    return node.hex() == merkle_root
+
+
+class StreamingRoot:
+    """
+    Racine de Merkle calculée feuille par feuille
+
+    Pile de sous-arbres complets (au plus log2(n) + 1 hashes): même racine
+    que MerkleTree, sans garder les feuilles.
+    """
+
+    __slots__ = ("_stack", "count")
+
+    def __init__(self):
+        self._stack: List[Tuple[int, bytes]] = []  # (hauteur, hash)
+        self.count = 0
+
+    def add(self, leaf: bytes) -> None:
+        height, node = 0, leaf
+        while self._stack and self._stack[-1][0] == height:
+            node = node_hash(self._stack.pop()[1], node)
+            height += 1
+        self._stack.append((height, node))
+        self.count += 1
+
+    @property
+    def root(self) -> str:
+        if not self._stack:
+            raise ValueError("Arbre de Merkle vide")
+        node = self._stack[-1][1]
+        for _, left in reversed(self._stack[:-1]):
+            node = node_hash(left, node)
+        return node.hex()
+
+
+class BatchSeal:
+    """Sceau d'un batch d'EventLog persisté"""
+
+    __slots__ = (
+        "tenant_id",
+        "sequence",
+        "merkle_root",
+        "previous_root",
+        "batch_root",
+        "event_count",
+        "first_event_id",
+        "last_event_id",
+        "sealed_at",
+    )
+
+    def __init__(
+        self,
+        tenant_id: str,
+        sequence: int,
+        merkle_root: str,
+        previous_root: str,
+        batch_root: str,
+        event_count: int,
+        first_event_id: str,
+        last_event_id: str,
+        sealed_at: str,
+    ):
+        self.tenant_id = tenant_id
+        self.sequence = sequence
+        self.merkle_root = merkle_root
+        self.previous_root = previous_root
+        self.batch_root = batch_root
+        self.event_count = event_count
+        self.first_event_id = first_event_id
+        self.last_event_id = last_event_id
+        self.sealed_at = sealed_at
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BatchSeal":
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchSeal(tenant_id={self.tenant_id!r}, sequence={self.sequence},"
+            f" batch_root={self.batch_root[:12]}…)"
+        )
+
+
+class BatchSealer:
+    """
+    Scelle chaque batch d'EventLog avant sa persistance
+
+    Le dernier sceau de chaque tenant est gardé en mémoire (relu du store
+    au premier batch); sceaux et feuilles sont enregistrés dans le store,
+    dans la transaction de la page (preuves d'inclusion).
+    """
+
+    def __init__(self, store: CheckpointStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._heads: Dict[str, Optional[BatchSeal]] = {}
+
+    def prepare(
+        self, tenant_id: str, events: List[EventLogSchema]
+    ) -> Tuple[BatchSeal, List[Tuple[str, str]]]:
+        """
+        Chaîne les EventLog (previous_event_id) et construit le sceau du
+        batch, sans l'enregistrer
+
+        Le sceau et ses feuilles (event_id, feuille hex) sont enregistrés
+        avec la page (CheckpointStore.record_page), puis commit() avance la
+        tête du tenant. Les events doivent être signés (checksum) et non
+        encore chaînés.
+        """
+        if not events:
+            raise ValueError("Batch vide: rien à sceller")
+        unsigned = [event.id for event in events if not event.checksum]
+        if unsigned:
+            raise ValueError(f"EventLog non signés: {unsigned[:5]}")
+
+        with self._lock:
+            head = self._head(tenant_id)
+
+        previous_event_id = head.last_event_id if head else None
+        leaves = []
+        for event in events:
+            event.previous_event_id = previous_event_id
+            leaves.append(leaf_hash(event.id, previous_event_id, event.checksum))
+            previous_event_id = event.id
+
+        previous_root = head.batch_root if head else GENESIS_ROOT
+        merkle_root = MerkleTree(leaves).root
+        seal = BatchSeal(
+            tenant_id=tenant_id,
+            sequence=head.sequence + 1 if head else 0,
+            merkle_root=merkle_root,
+            previous_root=previous_root,
+            batch_root=chain_root(previous_root, merkle_root),
+            event_count=len(events),
+            first_event_id=events[0].id,
+            last_event_id=events[-1].id,
+            sealed_at=datetime.now().isoformat(),
+        )
+        return seal, [(event.id, leaf.hex()) for event, leaf in zip(events, leaves)]
+
+    def commit(self, seal: BatchSeal) -> None:
+        """Avance la tête du tenant sur un sceau de prepare() enregistré"""
+        with self._lock:
+            head = self._head(seal.tenant_id)
+            if seal.sequence != (head.sequence + 1 if head else 0):
+                raise ValueError(
+                    f"Sceau {seal.sequence} hors séquence pour {seal.tenant_id}"
+                )
+            self._heads[seal.tenant_id] = seal
+
+        logger.info(
+            "🔏 Batch %d scellé (%d EventLog, racine %s…)",
+            seal.sequence,
+            seal.event_count,
+            seal.batch_root[:12],
+        )
+
+    def inclusion_proof(
+        self, tenant_id: str, event_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Preuve d'inclusion d'un EventLog dans son batch (None si non scellé)
+
+        Returns:
+            {event_id, sequence, position, leaf, path, merkle_root,
+             previous_root, batch_root}
+        """
+        location = self.store.sealed_event(tenant_id, event_id)
+        if location is None:
+            return None
+
+        sequence, position = location
+        seal = BatchSeal.from_dict(self.store.get_seal(tenant_id, sequence))
+        leaves = [
+            bytes.fromhex(leaf) for leaf in self.store.batch_leaves(tenant_id, sequence)
+        ]
+        return {
+            "event_id": event_id,
+            "sequence": sequence,
+            "position": position,
+            "leaf": leaves[position].hex(),
+            "path": MerkleTree(leaves).proof(position),
+            "merkle_root": seal.merkle_root,
+            "previous_root": seal.previous_root,
+            "batch_root": seal.batch_root,
+        }
+
+    def _head(self, tenant_id: str) -> Optional[BatchSeal]:
+        if tenant_id not in self._heads:
+            last = self.store.last_seal(tenant_id)
+            self._heads[tenant_id] = BatchSeal.from_dict(last) if last else None
+        return self._heads[tenant_id]
+
+
+def verify_proof(proof: Dict[str, Any]) -> bool:
+    """Vérifie une preuve de inclusion_proof (feuille → racine de batch)"""
+    return verify_inclusion(
+        bytes.fromhex(proof["leaf"]), proof["path"], proof["merkle_root"]
+    ) and proof["batch_root"] == chain_root(
+        proof["previous_root"], proof["merkle_root"]
+    )
+
+
+def verify_tenant_log(
+    seals: Iterable[Dict[str, Any]],
+    events: Iterable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Vérifie le log d'un tenant en une passe, mémoire constante
+
+    Args:
+        seals: Sceaux du tenant par séquence croissante (store.iter_seals)
+        events: EventLog au format create-events, dans l'ordre de la chaîne
+            previousEventId (ordre de persistance)
+
+    Contrôles: checksum de chaque metadata, chaînage previousEventId,
+    racine de Merkle de chaque batch, chaînage des racines de batch.
+
+    Returns:
+        {"valid": bool, "batches": int, "events": int, "error": str | None}
+    """
+    events = iter(events)
+    report: Dict[str, Any] = {"valid": False, "batches": 0, "events": 0, "error": None}
+    previous_root, previous_event_id = GENESIS_ROOT, None
+
+    def fail(error: str) -> Dict[str, Any]:
+        report["error"] = error
+        logger.warning("❌ Log du tenant invalide: %s", error)
+        return report
+
+    for seal_data in seals:
+        seal = BatchSeal.from_dict(seal_data)
+        if seal.sequence != report["batches"]:
+            return fail(f"Sceau {report['batches']} manquant")
+        if seal.previous_root != previous_root:
+            return fail(f"Batch {seal.sequence}: chaînage des racines rompu")
+
+        streaming = StreamingRoot()
+        for event in events:
+            if event.get("previousEventId") != previous_event_id:
+                return fail(f"EventLog {event.get('id')}: previousEventId rompu")
+            checksum = hashlib.sha256(canonical_json(event["metadata"])).hexdigest()
+            if checksum != event.get("checksum"):
+                return fail(f"EventLog {event.get('id')}: checksum invalide")
+
+            streaming.add(leaf_hash(event["id"], previous_event_id, checksum))
+            previous_event_id = event["id"]
+            report["events"] += 1
+            if streaming.count == seal.event_count:
+                break
+
+        if streaming.count != seal.event_count:
+            return fail(f"Batch {seal.sequence}: EventLog manquants")
+        if streaming.root != seal.merkle_root:
+            return fail(f"Batch {seal.sequence}: racine de Merkle invalide")
+        if chain_root(previous_root, seal.merkle_root) != seal.batch_root:
+            return fail(f"Batch {seal.sequence}: racine de batch invalide")
+
+        previous_root = seal.batch_root
+        report["batches"] += 1
+
+    extra = next(events, None)
+    if extra is not None:
+        return fail(f"EventLog {extra.get('id')} hors de tout batch scellé")
+
+    report["valid"] = True
+    return report
@@ -0,0 +1,163 @@
+"""
+metrics.py
+
+Instrumentation du pipeline par étape
+- StageTimer: temps mur, temps CPU, volume et pic RSS de chaque étape
+- Histogrammes Prometheus (si prometheus_client est installé)
+- Un enregistrement de log structuré par étape (champs dans `extra`)
+- Compteurs libres de l'exécution (ex: hits/misses du cache de classification)
+
+Usage:
+    timer = StageTimer()
+    with timer.stage("classify") as run:
+        results = classify(units)
+        run.items = len(units)
+    result.stage_metrics = timer.metrics()
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from ..config import PIPELINE_PROMETHEUS_ENABLED
+from ..schemas.models import StageMetricsSchema
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
+
+logger = logging.getLogger(__name__)
+
+
+if Histogram is not None and PIPELINE_PROMETHEUS_ENABLED:
+    STAGE_WALL_SECONDS = Histogram(
+        "analysis_pipeline_stage_seconds",
+        "Temps mur d'une étape du pipeline d'analyse",
+        ["stage"],
+    )
+    STAGE_CPU_SECONDS = Histogram(
+        "analysis_pipeline_stage_cpu_seconds",
+        "Temps CPU d'une étape du pipeline d'analyse",
+        ["stage"],
+    )
+    STAGE_ITEMS = Histogram(
+        "analysis_pipeline_stage_items",
+        "Éléments traités par une étape du pipeline d'analyse",
+        ["stage"],
+        buckets=(1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+    )
+    PIPELINE_COUNTERS = Counter(
+        "analysis_pipeline_counter",
+        "Compteurs du pipeline d'analyse (cache de classification, etc.)",
+        ["counter"],
+    )
+else:
+    STAGE_WALL_SECONDS = STAGE_CPU_SECONDS = STAGE_ITEMS = None
+    PIPELINE_COUNTERS = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pic de mémoire résidente du process (None si non mesurable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageRun:
+    """Exécution en cours d'une étape; l'appelant renseigne `items`"""
+
+    __slots__ = ("items",)
+
+    def __init__(self):
+        self.items = 0
+
+
+class StageTimer:
+    """Mesures cumulées par étape, dans l'ordre de première exécution"""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Ajoute `value` au compteur `name` de l'exécution"""
+        if not value:
+            return
+        self._counters[name] = self._counters.get(name, 0) + value
+        if PIPELINE_COUNTERS is not None:
+            PIPELINE_COUNTERS.labels(counter=name).inc(value)
+
+    def counters(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRun]:
+        run = StageRun()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            yield run
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._record(name, wall, cpu, run.items)
+
+    def _record(self, name: str, wall: float, cpu: float, items: int) -> None:
+        peak = peak_rss_bytes()
+        stage = self._stages.setdefault(
+            name,
+            {"calls": 0, "wall": 0.0, "cpu": 0.0, "items": 0, "peak_rss": None},
+        )
+        stage["calls"] += 1
+        stage["wall"] += wall
+        stage["cpu"] += cpu
+        stage["items"] += items
+        if peak is not None:
+            stage["peak_rss"] = max(stage["peak_rss"] or 0, peak)
+
+        if STAGE_WALL_SECONDS is not None:
+            STAGE_WALL_SECONDS.labels(stage=name).observe(wall)
+            STAGE_CPU_SECONDS.labels(stage=name).observe(cpu)
+            STAGE_ITEMS.labels(stage=name).observe(items)
+
+        logger.debug(
+            "⏱️  [%s] %.3fs (CPU %.3fs), %d éléments",
+            name,
+            wall,
+            cpu,
+            items,
+            extra={
+                "stage": name,
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "items": items,
+                "peak_rss_bytes": peak,
+            },
+        )
+
+    def metrics(self) -> List[StageMetricsSchema]:
+        return [
+            StageMetricsSchema(
+                stage=name,
+                calls=stage["calls"],
+                wall_seconds=stage["wall"],
+                cpu_seconds=stage["cpu"],
+                items=stage["items"],
+                items_per_second=(
+                    stage["items"] / stage["wall"] if stage["wall"] > 0 else 0.0
+                ),
+                peak_rss_bytes=stage["peak_rss"],
+            )
+            for name, stage in self._stages.items()
+        ]
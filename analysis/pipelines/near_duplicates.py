@@ -0,0 +1,134 @@
+"""
+near_duplicates.py
+
+Index MinHash + LSH pour la détection de quasi-doublons
+- Shingling par k-grammes de caractères
+- Signature MinHash en une passe (one-permutation hashing + densification)
+- LSH par bandes: seules les paires candidates sont comparées exactement
+
+L'index ne décide jamais seul: il réduit l'espace de recherche, la
+vérification finale reste faite par SequenceMatcher (DuplicateDetector).
+"""
+
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+_HASH_MASK = (1 << 64) - 1
+_EMPTY_BIN = _HASH_MASK
+
+
+class NearDuplicateIndex:
+    """Index LSH sur signatures MinHash (candidats de quasi-doublons)"""
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+    ):
+        """
+        Args:
+            num_perm: Taille de la signature MinHash
+            bands: Nombre de bandes LSH (num_perm doit en être un multiple)
+            shingle_size: Taille des k-grammes de caractères
+        """
+        if num_perm <= 0 or bands <= 0 or num_perm % bands != 0:
+            raise ValueError(
+                f"num_perm ({num_perm}) doit être un multiple de bands ({bands})"
+            )
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def shingles(self, text: str) -> Set[int]:
+        """k-grammes de caractères (texte normalisé) hachés sur 64 bits"""
+        normalized = " ".join(text.split()).lower()
+        k = self.shingle_size
+
+        if len(normalized) <= k:
+            return {hash(normalized) & _HASH_MASK}
+
+        return {
+            hash(normalized[i : i + k]) & _HASH_MASK
+            for i in range(len(normalized) - k + 1)
+        }
+
+    def signature(self, text: str) -> List[int]:
+        """
+        Signature MinHash en une seule passe sur les shingles
+
+        Chaque hash est réparti dans un des num_perm bins; on garde le
+        minimum par bin. Les bins vides sont densifiés par rotation
+        (emprunt au prochain bin non vide), ce qui garde une probabilité
+        de collision par bin égale à la similarité de Jaccard.
+        """
+        num_perm = self.num_perm
+        signature = [_EMPTY_BIN] * num_perm
+
+        for value in self.shingles(text):
+            bin_index = value % num_perm
+            bin_value = value // num_perm
+            if bin_value < signature[bin_index]:
+                signature[bin_index] = bin_value
+
+        if _EMPTY_BIN in signature:
+            signature = self._densify(signature)
+
+        return signature
+
+    def _densify(self, signature: List[int]) -> List[int]:
+        """Remplit les bins vides depuis le prochain bin non vide (circulaire)"""
+        num_perm = self.num_perm
+        densified = list(signature)
+
+        for index, value in enumerate(signature):
+            if value != _EMPTY_BIN:
+                continue
+            for offset in range(1, num_perm):
+                borrowed = signature[(index + offset) % num_perm]
+                if borrowed != _EMPTY_BIN:
+                    # L'offset distingue les valeurs empruntées des valeurs natives
+                    densified[index] = borrowed + offset * (_HASH_MASK // num_perm)
+                    break
+
+        return densified
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Ajoute un document à l'index"""
+        signature = self.signature(text)
+        rows = self.rows
+
+        for band, buckets in enumerate(self._buckets):
+            band_key = tuple(signature[band * rows : (band + 1) * rows])
+            buckets[band_key].append(key)
+
+        self._size += 1
+
+    def candidate_pairs(self) -> Set[Tuple[Hashable, Hashable]]:
+        """
+        Paires candidates (partageant au moins une bande)
+
+        Les paires sont ordonnées (clé la plus petite en premier) pour
+        être comparables entre bandes.
+        """
+        pairs: Set[Tuple[Hashable, Hashable]] = set()
+
+        for buckets in self._buckets:
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                for position, key1 in enumerate(members):
+                    for key2 in members[position + 1 :]:
+                        pairs.add((key1, key2) if key1 < key2 else (key2, key1))
+
+        return pairs
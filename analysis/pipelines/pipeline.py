@@ -11,19 +11,121 @@ Flow:
 5. Persistence in Prisma via Next.js API
 """
 
+import logging
+import math
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
-
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..config import (
+    PIPELINE_BATCH_SIZE,
+    PIPELINE_PARALLEL_MIN_UNITS,
+    PIPELINE_STORAGE,
+    PIPELINE_WORKERS,
+    RULE_REPETITION_WINDOW_DAYS,
+)
 from ..schemas.models import (
     ClassificationResultSchema,
+    DuplicateDetectionSchema,
     EventLogSchema,
     PipelineResultSchema,
+    PriorityEnum,
+    RuleApplicationSchema,
+    UnitRecord,
 )
+from .checkpoints import CheckpointStore, Watermark
+from .classification_cache import ClassificationCache, get_shared_cache
+from .deadline_index import DeadlineIndex
 from .detect_duplicates import DuplicateChecker
 from .generate_events import EventLogger, create_event_audit_report
+from .merkle import BatchSeal, BatchSealer
+from .metrics import StageTimer
 from .prepare_events import EventPreparer
-from .rules_engine import DeadlineExtractor, RuleEngine
+from .repetitions import RepetitionCounter, get_shared_counter
+from .rules_engine import DEADLINE_EXTRACTOR, RuleEngine
+
+if TYPE_CHECKING:  # SQLAlchemy n'est requis qu'en mode PIPELINE_STORAGE=sql
+    from .storage import SqlStorage
+
+logger = logging.getLogger(__name__)
+
+# (classifications, doublons, EventLog) d'une batch
+PageResults = Tuple[
+    List[ClassificationResultSchema],
+    List[DuplicateDetectionSchema],
+    List[EventLogSchema],
+]
+
+
+class StreamingAccumulator:
+    """Compteurs (et détails optionnels) d'une exécution page par page"""
+
+    def __init__(self, keep_details: bool = False):
+        self.keep_details = keep_details
+        self.units_ingested = 0
+        self.units_normalized = 0
+        self.units_classified = 0
+        self.duplicates_detected = 0
+        self.events_generated = 0
+        self.errors: List[Dict[str, str]] = []
+        self.classifications: List[ClassificationResultSchema] = []
+        self.duplicates: List[DuplicateDetectionSchema] = []
+        self.events: List[EventLogSchema] = []
+
+    def add_page(
+        self,
+        prep_result: Dict[str, Any],
+        page_results: Optional[
+            Tuple[
+                List[ClassificationResultSchema],
+                List[DuplicateDetectionSchema],
+                List[EventLogSchema],
+            ]
+        ],
+    ) -> None:
+        """Ajoute une page préparée et (si non vide) ses résultats"""
+        self.units_ingested += prep_result["count"]
+        self.units_normalized += len(prep_result["units"])
+        self.errors.extend(prep_result["errors"])
+
+        if page_results is None:
+            return
+
+        classifications, duplicates, events = page_results
+        self.units_classified += len(classifications)
+        self.duplicates_detected += len(duplicates)
+        self.events_generated += len(events)
+
+        if self.keep_details:
+            self.classifications.extend(classifications)
+            self.duplicates.extend(duplicates)
+            self.events.extend(events)
+
+    def to_result(
+        self,
+        execution_id: str,
+        tenant_id: str,
+        start_time: float,
+        timer: StageTimer,
+    ) -> PipelineResultSchema:
+        return PipelineResultSchema(
+            execution_id=execution_id,
+            tenant_id=tenant_id,
+            timestamp=datetime.now(),
+            units_ingested=self.units_ingested,
+            units_normalized=self.units_normalized,
+            units_classified=self.units_classified,
+            classifications=self.classifications,
+            duplicates_detected=self.duplicates_detected,
+            duplicates=self.duplicates,
+            events_generated=self.events_generated,
+            events=self.events,
+            processing_time_seconds=time.time() - start_time,
+            stage_metrics=timer.metrics(),
+            counters=timer.counters(),
+            errors=self.errors,
+        )
 
 
 class AnalysisPipeline:
@@ -33,16 +135,87 @@ class AnalysisPipeline:
         self,
         tenant_id: str,
         api_base_url: str = "http://localhost:3000",
+        workers: int = PIPELINE_WORKERS,
+        parallel_min_units: int = PIPELINE_PARALLEL_MIN_UNITS,
+        checkpoints: Optional[CheckpointStore] = None,
+        classification_cache: Optional[ClassificationCache] = None,
+        deadline_index: Optional[DeadlineIndex] = None,
+        repetition_counter: Optional[RepetitionCounter] = None,
+        storage: Optional["SqlStorage"] = None,
+        sealer: Optional[BatchSealer] = None,
     ):
+        """
+        Args:
+            tenant_id: Tenant à traiter
+            api_base_url: URL de l'API Next.js
+            workers: Processus de classification (1 = en process)
+            parallel_min_units: En dessous, classification en process
+                (le coût de pickling dominerait)
+            checkpoints: Reprise incrémentale de execute_streaming
+                (watermark, unités traitées, EventLog en attente)
+            classification_cache: Cache du scan de contenu (par défaut
+                le cache du processus, cf. CLASSIFICATION_CACHE_SIZE)
+            deadline_index: Suivi des échéances détectées (seuils 7/3 jours
+                réévalués par un DeadlineMonitor, sans reclassification)
+            repetition_counter: Comptage des répétitions sur la fenêtre
+                glissante (par défaut le compteur du processus, Redis si
+                REPETITION_COUNTER_REDIS_URL est défini)
+            storage: Accès direct à la base (lecture des InformationUnit,
+                historique des doublons, écriture des EventLog); par défaut
+                celui du processus si PIPELINE_STORAGE=sql, sinon l'API
+            sealer: Scellement de chaque batch persisté (arbre de Merkle
+                chaîné au batch précédent, previous_event_id renseigné);
+                requiert `checkpoints`, le store du sealer: le sceau est
+                enregistré dans la transaction de la page
+        """
+        if sealer is not None and checkpoints is None:
+            raise ValueError("sealer requiert checkpoints")
+        if sealer is not None and sealer.store is not checkpoints:
+            raise ValueError("sealer et checkpoints doivent partager le même store")
+
         self.tenant_id = tenant_id
         self.api_base_url = api_base_url
+        self.workers = workers
+        self.parallel_min_units = parallel_min_units
+        self.checkpoints = checkpoints
+        self.deadline_index = deadline_index
+        self.sealer = sealer
+        if repetition_counter is None:
+            repetition_counter = get_shared_counter()
+        self.repetition_counter = repetition_counter
 
         # Initialize components
         self.preparer = EventPreparer(api_base_url)
-        self.rule_engine = RuleEngine()
+        if classification_cache is None:
+            classification_cache = get_shared_cache()
+        self.rule_engine = RuleEngine(cache=classification_cache)
         self.duplicate_checker = DuplicateChecker(api_base_url)
         self.event_logger = EventLogger(api_base_url)
 
+        if storage is None and PIPELINE_STORAGE == "sql":
+            from .storage import get_shared_storage
+
+            storage = get_shared_storage()
+        self.storage = storage
+        if storage is not None:
+            self.preparer = storage.event_preparer()
+            self.duplicate_checker = storage.duplicate_checker()
+            self.event_logger = storage.event_logger()
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "AnalysisPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Arrête le pool de processus de classification (s'il existe)"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
     def execute(
         self,
         unit_status: str = "RECEIVED",
@@ -61,77 +234,350 @@ class AnalysisPipeline:
             Résumé de l'exécution
         """
         start_time = time.time()
-        execution_id = f"exec_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-        print(f"\n{'='*60}")
-        print(f"🚀 PIPELINE DÉMARRÉ: {execution_id}")
-        print(f"   Tenant: {self.tenant_id}")
-        print(f"   Status: {unit_status}, Limit: {limit}")
-        print(f"{'='*60}")
+        execution_id = self._start_execution(unit_status, limit)
+        timer = StageTimer()
 
         # ========================================
         # ÉTAPE 1: PRÉPARATION
         # ========================================
 
-        prep_result = self.preparer.prepare_batch(
+        with timer.stage("fetch") as run:
+            raw_units = self.preparer.fetch_information_units(
+                tenant_id=self.tenant_id,
+                status=unit_status,
+                limit=limit,
+            )
+            run.items = len(raw_units)
+
+        with timer.stage("normalize") as run:
+            prep_result = self.preparer.normalize_batch(raw_units)
+            run.items = len(raw_units)
+
+        units = prep_result["units"]
+
+        if not units:
+            return self._empty_result(execution_id, start_time, prep_result, timer)
+
+        # Avec un sealer, la batch est enregistrée (et scellée) avant persistance
+        recording = self.sealer is not None and persist
+        page_results = self._process_batch(units, persist and not recording, timer)
+        if recording:
+            self._checkpoint_page(execution_id, unit_status, None, page_results, timer)
+        classifications, duplicates_found, events_to_persist = page_results
+
+        # ========================================
+        # RÉSUMÉ
+        # ========================================
+
+        return self._build_result(
+            execution_id,
+            start_time,
+            prep_result,
+            classifications,
+            duplicates_found,
+            events_to_persist,
+            timer,
+        )
+
+    def execute_streaming(
+        self,
+        unit_status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+        persist: bool = True,
+        keep_details: bool = False,
+    ) -> PipelineResultSchema:
+        """
+        Exécute le pipeline page par page (gros volumes)
+
+        Chaque page passe par les étapes 2 à 5 puis est libérée: la mémoire
+        reste bornée à une page. Les doublons intra-batch sont cherchés dans
+        la page; d'une page à l'autre, seule la recherche historique s'applique.
+
+        Avec `checkpoints` (et persist): les EventLog en attente d'un run
+        précédent sont renvoyés, seules les unités après le watermark sont
+        chargées, les unités déjà traitées sont ignorées, et chaque page est
+        enregistrée avant sa persistance.
+
+        Args:
+            page_size: Unités par page de fetch-units
+            max_units: Arrêt après ce nombre d'unités (None = tout le statut)
+            keep_details: Conserver classifications/doublons/events dans le
+                résultat (sinon seulement les compteurs)
+        """
+        start_time = time.time()
+        execution_id = self._start_execution(unit_status, max_units)
+        accumulator = StreamingAccumulator(keep_details)
+        timer = StageTimer()
+
+        checkpointing = self.checkpoints is not None and persist
+        since = None
+        if checkpointing:
+            self._resend_pending_events(timer)
+            since = self.checkpoints.get_watermark(self.tenant_id, unit_status)
+
+        pages = self.preparer.stream_pages(
             tenant_id=self.tenant_id,
             status=unit_status,
-            limit=limit,
+            page_size=page_size,
+            max_units=max_units,
+            since=since,
         )
 
-        units = prep_result["units"]
+        while True:
+            with timer.stage("fetch") as run:
+                raw_units = next(pages, None)
+                run.items = len(raw_units or [])
+            if raw_units is None:
+                break
+
+            watermark = None
+            if checkpointing:
+                watermark = _page_watermark(raw_units)
+                raw_units = self._skip_processed(raw_units)
+
+            with timer.stage("normalize") as run:
+                prep_result = self.preparer.normalize_batch(raw_units)
+                run.items = len(raw_units)
+
+            page_results = None
+            if prep_result["units"]:
+                page_results = self._process_batch(
+                    prep_result["units"], persist and not checkpointing, timer
+                )
+            if checkpointing:
+                self._checkpoint_page(
+                    execution_id, unit_status, watermark, page_results, timer
+                )
+            accumulator.add_page(prep_result, page_results)
+
+        result = accumulator.to_result(execution_id, self.tenant_id, start_time, timer)
+        self._log_summary(result)
 
-        if not units:
-            print("⚠️  Aucune unité à traiter, pipeline terminé.")
-            return PipelineResultSchema(
-                execution_id=execution_id,
-                tenant_id=self.tenant_id,
-                timestamp=datetime.now(),
-                units_ingested=0,
-                units_normalized=0,
-                units_classified=0,
-                classifications=[],
-                duplicates_detected=0,
-                duplicates=[],
-                events_generated=0,
-                events=[],
-                processing_time_seconds=time.time() - start_time,
-                errors=prep_result["errors"],
-            )
+        return result
+
+    def _process_batch(
+        self,
+        units: List[UnitRecord],
+        persist: bool,
+        timer: StageTimer,
+    ) -> Tuple[
+        List[ClassificationResultSchema],
+        List[DuplicateDetectionSchema],
+        List[EventLogSchema],
+    ]:
+        """Étapes 2 à 5 sur une batch d'unités normalisées"""
 
         # ========================================
         # STEP 2: DUPLICATE DETECTION
         # ========================================
 
-        duplicates_found, exact_matches = (
-            self.duplicate_checker.check_batch_for_duplicates(
-                units=units,
-                tenant_id=self.tenant_id,
+        with timer.stage("duplicates") as run:
+            duplicates_found, exact_matches = (
+                self.duplicate_checker.check_batch_for_duplicates(
+                    units=units,
+                    tenant_id=self.tenant_id,
+                )
             )
-        )
+            run.items = len(units)
 
         # ========================================
         # STEP 3: CLASSIFICATION BY RULES
         # ========================================
 
-        classifications = []
+        with timer.stage("classify") as run:
+            rule_results = self._classify_units(units, timer)
+            classifications = self._build_classifications(units, rule_results)
+            run.items = len(units)
 
-        for unit in units:
-            # Enrichment: Semantic deadline detection
-            deadline_data = self._extract_deadline_from_content(unit.content)
+        if self.deadline_index is not None:
+            with timer.stage("deadlines") as run:
+                run.items = self._track_deadlines(units)
 
-            # Enrichissement: Métadonnées supplémentaires
-            metadata = {
-                **unit.source_metadata,
-                "deadline": deadline_data,
-                "repetition_count": self._get_repetition_count(unit.id, self.tenant_id),
-            }
+        # ========================================
+        # ÉTAPE 4: GÉNÉRATION DES EVENTS
+        # ========================================
 
-            # Rules application
-            final_priority, applied_rules, priority_score = (
-                self.rule_engine.apply_all_rules(unit, metadata)
+        with timer.stage("events") as run:
+            events_to_persist = self._generate_events(
+                classifications, duplicates_found
             )
+            run.items = len(events_to_persist)
+
+        # ========================================
+        # STEP 5: PERSISTENCE
+        # ========================================
+
+        if persist and events_to_persist:
+            with timer.stage("persist") as run:
+                self.event_logger.persist_events(
+                    events=events_to_persist,
+                    tenant_id=self.tenant_id,
+                )
+                run.items = len(events_to_persist)
+
+        return classifications, duplicates_found, events_to_persist
+
+    def _track_deadlines(self, units: List[UnitRecord]) -> int:
+        """Ajoute à l'index les échéances détectées; renvoie leur nombre"""
+        tracked = 0
+        for unit, deadline in zip(units, self.rule_engine.detect_deadlines(units)):
+            if deadline is not None:
+                due_date, deadline_data = deadline
+                self.deadline_index.add(
+                    self.tenant_id, unit.id, due_date, deadline_data
+                )
+                tracked += 1
+        return tracked
+
+    def _prepare_seal(
+        self, events: List[EventLogSchema], timer: StageTimer
+    ) -> Tuple[Optional[BatchSeal], List[Tuple[str, str]]]:
+        """Signe et chaîne les EventLog d'une batch: (sceau, feuilles) ou (None, [])"""
+        if self.sealer is None or not events:
+            return None, []
+
+        with timer.stage("seal") as run:
+            for event in events:
+                self.event_logger.sign_event(event)
+            run.items = len(events)
+            return self.sealer.prepare(self.tenant_id, events)
+
+    def _resend_pending_events(self, timer: StageTimer) -> None:
+        """Renvoie les EventLog enregistrés mais non confirmés (run interrompu)"""
+        payloads = self.checkpoints.pending_events(self.tenant_id)
+        if not payloads:
+            return
+
+        logger.info("♻️  %d EventLog en attente renvoyés", len(payloads))
+        with timer.stage("persist") as run:
+            self._persist_payloads(payloads)
+            run.items = len(payloads)
+
+    def _skip_processed(self, raw_units: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Retire les unités déjà classifiées lors d'un run précédent"""
+        processed = self.checkpoints.processed_ids(
+            self.tenant_id, [unit.get("id") for unit in raw_units]
+        )
+        if not processed:
+            return raw_units
+
+        logger.info("⏭️  %d unités déjà traitées ignorées", len(processed))
+        return [unit for unit in raw_units if unit.get("id") not in processed]
 
+    def _checkpoint_page(
+        self,
+        execution_id: str,
+        unit_status: str,
+        watermark: Optional[Watermark],
+        page_results: Optional[PageResults],
+        timer: StageTimer,
+    ) -> None:
+        """
+        Enregistre la page (watermark, unités, EventLog PENDING) puis persiste
+
+        Un crash après l'enregistrement laisse des EventLog PENDING, renvoyés
+        au run suivant: create-events ignore les id déjà insérés.
+        """
+        payloads = self._record_page(
+            execution_id, unit_status, watermark, page_results, timer
+        )
+
+        if payloads:
+            with timer.stage("persist") as run:
+                self._persist_payloads(payloads)
+                run.items = len(payloads)
+
+    def _record_page(
+        self,
+        execution_id: str,
+        unit_status: str,
+        watermark: Optional[Watermark],
+        page_results: Optional[PageResults],
+        timer: StageTimer,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scelle et enregistre une page (sceau compris, une transaction);
+        renvoie les EventLog à persister
+        """
+        classifications, _, events = page_results or ([], [], [])
+        seal, leaves = self._prepare_seal(events, timer)
+        payloads = [self.event_logger.event_payload(event) for event in events]
+
+        self.checkpoints.record_page(
+            tenant_id=self.tenant_id,
+            unit_status=unit_status,
+            execution_id=execution_id,
+            watermark=watermark,
+            unit_ids=[c.information_unit_id for c in classifications],
+            payloads=payloads,
+            seal=seal.to_dict() if seal is not None else None,
+            leaves=leaves,
+        )
+        if seal is not None:
+            self.sealer.commit(seal)
+        return payloads
+
+    def _persist_payloads(self, payloads: List[Dict[str, Any]]) -> None:
+        """Persiste et marque PERSISTED les EventLog dont le chunk est confirmé"""
+        result = self.event_logger.persist_payloads(payloads, self.tenant_id)
+        self.checkpoints.mark_persisted(
+            self.tenant_id, EventLogger.confirmed_event_ids(payloads, result)
+        )
+
+    def _start_execution(self, unit_status: str, limit: Optional[int]) -> str:
+        """Génère l'execution_id et affiche la bannière de démarrage"""
+        execution_id = f"exec_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        logger.info(
+            "🚀 PIPELINE DÉMARRÉ: %s (tenant %s, status %s, limit %s)",
+            execution_id,
+            self.tenant_id,
+            unit_status,
+            limit or "∞",
+            extra={"execution_id": execution_id, "tenant_id": self.tenant_id},
+        )
+
+        return execution_id
+
+    def _empty_result(
+        self,
+        execution_id: str,
+        start_time: float,
+        prep_result: Dict[str, Any],
+        timer: StageTimer,
+    ) -> PipelineResultSchema:
+        """Résultat d'une exécution sans unité à traiter"""
+        logger.info("⚠️  Aucune unité à traiter, pipeline terminé.")
+        return PipelineResultSchema(
+            execution_id=execution_id,
+            tenant_id=self.tenant_id,
+            timestamp=datetime.now(),
+            units_ingested=0,
+            units_normalized=0,
+            units_classified=0,
+            classifications=[],
+            duplicates_detected=0,
+            duplicates=[],
+            events_generated=0,
+            events=[],
+            processing_time_seconds=time.time() - start_time,
+            stage_metrics=timer.metrics(),
+            counters=timer.counters(),
+            errors=prep_result["errors"],
+        )
+
+    def _build_classifications(
+        self,
+        units: List[UnitRecord],
+        rule_results: List[Tuple[PriorityEnum, List[RuleApplicationSchema], int]],
+    ) -> List[ClassificationResultSchema]:
+        """Crée un ClassificationResultSchema par unité classée"""
+        classifications = []
+
+        for unit, (final_priority, applied_rules, priority_score) in zip(
+            units, rule_results
+        ):
             # Create classification result
             classification = ClassificationResultSchema(
                 information_unit_id=unit.id,
@@ -149,12 +595,21 @@ class AnalysisPipeline:
 
             classifications.append(classification)
 
-        print(f"\n✅ {len(classifications)} unités classifiées")
+        logger.info("✅ %d unités classifiées", len(classifications))
 
-        # ========================================
-        # ÉTAPE 4: GÉNÉRATION DES EVENTS
-        # ========================================
+        return classifications
 
+    def _generate_events(
+        self,
+        classifications: List[ClassificationResultSchema],
+        duplicates_found: List[DuplicateDetectionSchema],
+    ) -> List[EventLogSchema]:
+        """
+        EventLog de classification puis de doublon
+
+        Non signés: metadata n'est sérialisée (checksum, corps HTTP) qu'à la
+        persistance; un dry-run n'en paie pas le coût.
+        """
         events_to_persist: List[EventLogSchema] = []
 
         # Events de classification
@@ -162,6 +617,7 @@ class AnalysisPipeline:
             event = self.event_logger.generate_classification_event(
                 classification,
                 self.tenant_id,
+                sign=False,
             )
             events_to_persist.append(event)
 
@@ -170,27 +626,25 @@ class AnalysisPipeline:
             event = self.event_logger.generate_duplicate_event(
                 duplicate,
                 self.tenant_id,
+                sign=False,
             )
             events_to_persist.append(event)
 
-        print(f"\n✅ {len(events_to_persist)} EventLog générés")
+        logger.info("✅ %d EventLog générés", len(events_to_persist))
 
-        # ========================================
-        # STEP 5: PERSISTENCE
-        # ========================================
-
-        persist_result = {"created_count": 0, "failed_count": 0}
-
-        if persist and events_to_persist:
-            persist_result = self.event_logger.persist_events(
-                events=events_to_persist,
-                tenant_id=self.tenant_id,
-            )
-
-        # ========================================
-        # RÉSUMÉ
-        # ========================================
+        return events_to_persist
 
+    def _build_result(
+        self,
+        execution_id: str,
+        start_time: float,
+        prep_result: Dict[str, Any],
+        classifications: List[ClassificationResultSchema],
+        duplicates_found: List[DuplicateDetectionSchema],
+        events_to_persist: List[EventLogSchema],
+        timer: StageTimer,
+    ) -> PipelineResultSchema:
+        """Assemble le résultat final et journalise le résumé"""
         processing_time = time.time() - start_time
 
         result = PipelineResultSchema(
@@ -198,7 +652,7 @@ class AnalysisPipeline:
             tenant_id=self.tenant_id,
             timestamp=datetime.now(),
             units_ingested=prep_result["count"],
-            units_normalized=len(units),
+            units_normalized=len(prep_result["units"]),
             units_classified=len(classifications),
             classifications=classifications,
             duplicates_detected=len(duplicates_found),
@@ -206,76 +660,221 @@ class AnalysisPipeline:
             events_generated=len(events_to_persist),
             events=events_to_persist,
             processing_time_seconds=processing_time,
+            stage_metrics=timer.metrics(),
+            counters=timer.counters(),
             errors=prep_result["errors"],
         )
 
-        # Affiche le résumé
-        self._print_summary(result)
+        self._log_summary(result)
 
         return result
 
+    def _classify_units(
+        self,
+        units: List[UnitRecord],
+        timer: Optional[StageTimer] = None,
+    ) -> List[Tuple[PriorityEnum, List[RuleApplicationSchema], int]]:
+        """
+        Enrichit puis classe les unités, en process ou dans le pool
+
+        Le mode parallèle découpe la batch en chunks (ordre conservé par
+        executor.map); la configuration des règles est transmise une seule
+        fois à chaque worker, à son démarrage. Les hits/misses du cache de
+        classification sont ajoutés aux compteurs de `timer`. Les
+        répétitions de la batch sont enregistrées et comptées en une passe.
+        """
+        repetition_counts = self.repetition_counter.observe_batch(
+            self.tenant_id, units
+        )
+
+        if self.workers <= 1 or len(units) < self.parallel_min_units:
+            engine = self.rule_engine
+            hits, misses = engine.cache_hits, engine.cache_misses
+            rule_results = _classify_with_engine(engine, units, repetition_counts)
+            _count_cache(
+                timer, engine.cache_hits - hits, engine.cache_misses - misses
+            )
+            return rule_results
+
+        # ~4 chunks par worker pour lisser les écarts de durée
+        chunk_size = math.ceil(len(units) / (self.workers * 4))
+        chunks = [
+            (
+                units[start : start + chunk_size],
+                repetition_counts[start : start + chunk_size],
+            )
+            for start in range(0, len(units), chunk_size)
+        ]
+
+        rule_results = []
+        for chunk_results, hits, misses in self._get_executor().map(
+            _classify_chunk, chunks
+        ):
+            rule_results.extend(chunk_results)
+            _count_cache(timer, hits, misses)
+
+        return rule_results
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_classification_worker,
+                initargs=(
+                    self.rule_engine.deadline_patterns,
+                    self.rule_engine.actor_types,
+                    self.rule_engine.cache is not None,
+                ),
+            )
+        return self._executor
+
     def _extract_deadline_from_content(self, content: str) -> Dict[str, Any]:
         """Extrait les informations de délai du contenu"""
-        extractor = DeadlineExtractor()
-        extracted = extractor.extract_deadlines(content)
-
-        if extracted:
-            return {
-                "detected": True,
-                "extractions": extracted,
-            }
-
-        return {"detected": False}
-
-    def _get_repetition_count(self, unit_id: str, tenant_id: str) -> int:
-        """Récupère le nombre de fois que cette unité (ou similaire) a été vue"""
-        # Implémentation simplifiée: appel à l'API
-        # En réalité, ce serait une requête à la DB
-        return 1
-
-    def _print_summary(self, result: PipelineResultSchema) -> None:
-        """Affiche un résumé formaté"""
-        print(f"\n{'='*60}")
-        print(f"📊 RÉSUMÉ DE L'EXÉCUTION")
-        print(f"{'='*60}")
-        print(f"Execution ID: {result.execution_id}")
-        print(f"Timestamp: {result.timestamp.isoformat()}")
-        print(f"\n📥 Ingestion:")
-        print(f"   - Unités ingérées: {result.units_ingested}")
-        print(f"   - Unités normalisées: {result.units_normalized}")
-        print(f"\n🔍 Classification:")
-        print(f"   - Unités classifiées: {result.units_classified}")
+        return _extract_deadline_metadata(content)
+
+    def _log_summary(self, result: PipelineResultSchema) -> None:
+        """Résumé de l'exécution: un enregistrement INFO (champs dans `extra`)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
         # Répartition par priorité
         priority_counts = {}
         for classification in result.classifications:
-            priority = classification.final_priority.value
+            priority = classification.final_priority
             priority_counts[priority] = priority_counts.get(priority, 0) + 1
 
+        lines = [
+            f"📊 RÉSUMÉ DE L'EXÉCUTION {result.execution_id}",
+            f"   📥 Unités ingérées: {result.units_ingested}, normalisées: {result.units_normalized}",
+            f"   🔍 Unités classifiées: {result.units_classified}",
+        ]
         for priority in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]:
             count = priority_counts.get(priority, 0)
             if count > 0:
-                print(f"     • {priority}: {count}")
-
-        print(f"\n🔗 Doublons:")
-        print(f"   - Détectés: {result.duplicates_detected}")
-
-        print(f"\n📝 EventLog:")
-        print(f"   - Générés: {result.events_generated}")
-
-        if result.events:
-            print(f"   - Persistés: {result.events_generated}")
-
-        print(f"\n⏱️  Temps total: {result.processing_time_seconds:.2f}s")
+                lines.append(f"     • {priority}: {count}")
+        lines.append(f"   🔗 Doublons détectés: {result.duplicates_detected}")
+        lines.append(f"   📝 EventLog générés: {result.events_generated}")
+
+        for stage in result.stage_metrics:
+            lines.append(
+                f"   ⏱️  {stage.stage}: {stage.wall_seconds:.3f}s"
+                f" (CPU {stage.cpu_seconds:.3f}s), {stage.items} éléments,"
+                f" {stage.items_per_second:.0f}/s"
+            )
+        lines.append(f"   ⏱️  Temps total: {result.processing_time_seconds:.2f}s")
+        for name, value in result.counters.items():
+            lines.append(f"   🔢 {name}: {value}")
 
         if result.errors:
-            print(f"\n⚠️  Erreurs ({len(result.errors)}):")
+            lines.append(f"   ⚠️  Erreurs ({len(result.errors)}):")
             for error in result.errors[:5]:  # Top 5
-                print(f"   - {error.get('error', 'Unknown')}")
+                lines.append(f"   - {error.get('error', 'Unknown')}")
             if len(result.errors) > 5:
-                print(f"   ... et {len(result.errors) - 5} de plus")
+                lines.append(f"   ... et {len(result.errors) - 5} de plus")
+
+        logger.info(
+            "\n".join(lines),
+            extra={
+                "execution_id": result.execution_id,
+                "tenant_id": result.tenant_id,
+                "units_classified": result.units_classified,
+                "duplicates_detected": result.duplicates_detected,
+                "events_generated": result.events_generated,
+                "processing_time_seconds": result.processing_time_seconds,
+                "stage_metrics": [stage.model_dump() for stage in result.stage_metrics],
+                "counters": result.counters,
+            },
+        )
 
-        print(f"{'='*60}\n")
+
+# ===========================
+# Classification (en process ou dans un worker)
+# ===========================
+
+# RuleEngine du worker, construit une fois par _init_classification_worker
+_worker_engine: Optional[RuleEngine] = None
+
+
+def _page_watermark(raw_units: List[Dict[str, Any]]) -> Optional[Watermark]:
+    """(receivedAt, id) le plus récent d'une page brute"""
+    keys = [
+        (unit["receivedAt"], unit["id"])
+        for unit in raw_units
+        if unit.get("receivedAt") and unit.get("id")
+    ]
+    return max(keys) if keys else None
+
+
+def _extract_deadline_metadata(content: str) -> Dict[str, Any]:
+    """Extrait les informations de délai du contenu"""
+    extracted = DEADLINE_EXTRACTOR.extract_deadlines(content)
+
+    if extracted:
+        return {
+            "detected": True,
+            "extractions": extracted,
+        }
+
+    return {"detected": False}
+
+
+def _classify_with_engine(
+    engine: RuleEngine,
+    units: List[UnitRecord],
+    repetition_counts: List[int],
+) -> List[Tuple[PriorityEnum, List[RuleApplicationSchema], int]]:
+    """Enrichissement (délai sémantique, répétitions) + règles sur une batch"""
+    metadata_list = [
+        {
+            "deadline": _extract_deadline_metadata(unit.content),
+            "repetition_count": repetition_count,
+            "repetition_window_days": RULE_REPETITION_WINDOW_DAYS,
+        }
+        for unit, repetition_count in zip(units, repetition_counts)
+    ]
+
+    # Rules application (whole batch, merged with unit.source_metadata)
+    return engine.apply_rules_batch(units, metadata_list)
+
+
+def _count_cache(timer: Optional[StageTimer], hits: int, misses: int) -> None:
+    if timer is not None:
+        timer.count("classification_cache_hits", hits)
+        timer.count("classification_cache_misses", misses)
+
+
+def _init_classification_worker(
+    deadline_patterns: Dict[str, Dict[str, Any]],
+    actor_types: Dict[str, Dict[str, Any]],
+    use_cache: bool = False,
+) -> None:
+    """
+    Initializer du pool: compile les règles une fois par worker
+
+    Avec `use_cache`, chaque worker a son LRU (le niveau Redis, s'il est
+    configuré, est partagé).
+    """
+    global _worker_engine
+
+    engine = RuleEngine(cache=get_shared_cache() if use_cache else None)
+    engine.deadline_patterns = deadline_patterns
+    engine.actor_types = actor_types
+    engine.compile_plan()
+    _worker_engine = engine
+
+
+def _classify_chunk(
+    chunk: Tuple[List[UnitRecord], List[int]],
+) -> Tuple[List[Tuple[PriorityEnum, List[RuleApplicationSchema], int]], int, int]:
+    """Résultats du chunk + hits/misses du cache du worker pendant le chunk"""
+    units, repetition_counts = chunk
+    hits, misses = _worker_engine.cache_hits, _worker_engine.cache_misses
+    rule_results = _classify_with_engine(_worker_engine, units, repetition_counts)
+    return (
+        rule_results,
+        _worker_engine.cache_hits - hits,
+        _worker_engine.cache_misses - misses,
+    )
 
 
 # ===========================
@@ -284,6 +883,8 @@ class AnalysisPipeline:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Configuration
     TENANT_ID = "test_tenant_001"
     API_BASE_URL = "http://localhost:3000"
@@ -10,12 +10,20 @@ prepare_events.py
 
 import hashlib
 import json
+import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
+from pydantic import TypeAdapter, ValidationError
 
-from ..schemas.models import InformationUnitSchema
+from ..config import PIPELINE_BATCH_SIZE
+from ..schemas.models import InformationUnitSchema, RawUnitPayload, UnitRecord
+
+logger = logging.getLogger(__name__)
+
+# Validation d'une page entière en un appel (pydantic-core)
+RAW_UNITS_ADAPTER = TypeAdapter(List[RawUnitPayload])
 
 
 class EventPreparer:
@@ -46,20 +54,69 @@ class EventPreparer:
             Liste de dictionnaires bruts
         """
         endpoint = f"{self.api_base_url}/api/analysis/fetch-units"
-        params = {
-            "tenantId": tenant_id,
-            "status": status,
-            "limit": limit,
-        }
+        params = self._fetch_params(tenant_id, status, limit)
 
         try:
             response = requests.get(endpoint, params=params, timeout=30)
             response.raise_for_status()
             return response.json().get("units", [])
         except requests.RequestException as e:
-            print(f"❌ Erreur lors du fetch: {e}")
+            logger.error("❌ Erreur lors du fetch: %s", e)
             return []
 
+    def fetch_page(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        limit: int = PIPELINE_BATCH_SIZE,
+        cursor: Optional[str] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Charge une page d'InformationUnit (pagination par curseur)
+
+        GET /api/analysis/fetch-units?tenantId=X&status=RECEIVED&limit=100&cursor=<id>
+
+        Args:
+            since: Watermark (receivedAt, id): seules les unités suivantes,
+                par ordre croissant (cf. checkpoints.py)
+
+        Returns:
+            (unités brutes, curseur de la page suivante ou None)
+        """
+        endpoint = f"{self.api_base_url}/api/analysis/fetch-units"
+        params = self._fetch_params(tenant_id, status, limit, cursor, since)
+
+        try:
+            response = requests.get(endpoint, params=params, timeout=30)
+            response.raise_for_status()
+            body = response.json()
+        except requests.RequestException as e:
+            logger.error("❌ Erreur lors du fetch: %s", e)
+            return [], None
+
+        return body.get("units", []), body.get("nextCursor")
+
+    @staticmethod
+    def _fetch_params(
+        tenant_id: str,
+        status: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Query string de GET /api/analysis/fetch-units"""
+        params = {
+            "tenantId": tenant_id,
+            "status": status,
+            "limit": limit,
+        }
+        if cursor:
+            params["cursor"] = cursor
+        if since:
+            params["afterReceivedAt"], params["afterId"] = since
+        return params
+
     def normalize_unit(self, raw_unit: Dict[str, Any]) -> InformationUnitSchema:
         """
         Normalise une unité brute en schéma standard
@@ -122,6 +179,7 @@ class EventPreparer:
         if raw_unit.get("source") == "EMAIL":
             metadata["sender_email"] = raw_unit.get("senderEmail")
             metadata["sender_name"] = raw_unit.get("senderName")
+            metadata["subject"] = raw_unit.get("subject")
             metadata["email_headers"] = raw_unit.get("headers")  # SPF, DKIM, etc.
 
         # Upload: extract uploader info
@@ -153,12 +211,12 @@ class EventPreparer:
         Returns:
             {
                 "count": int,
-                "units": [InformationUnitSchema],
+                "units": [UnitRecord],
                 "errors": [],
                 "timestamp": datetime
             }
         """
-        print(f"\n🔄 [PREPARE] Ingestion {status} (max {limit})...")
+        logger.info("🔄 [PREPARE] Ingestion %s (max %d)...", status, limit)
 
         # Charge les unités brutes
         raw_units = self.fetch_information_units(
@@ -166,15 +224,97 @@ class EventPreparer:
             status=status,
             limit=limit,
         )
-        print(f"   ✅ {len(raw_units)} unités chargées")
+        logger.info("   ✅ %d unités chargées", len(raw_units))
+
+        return self.normalize_batch(raw_units)
+
+    def stream_pages(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt fetch-units de curseur en curseur (unités brutes, par page)
 
-        # Normalise chaque unité
+        Args:
+            page_size: Unités par requête
+            max_units: Arrêt après ce nombre d'unités (None = tout le statut)
+            since: Watermark (receivedAt, id) à partir duquel reprendre
+        """
+        cursor = None
+        fetched = 0
+        page_number = 0
+
+        while max_units is None or fetched < max_units:
+            limit = page_size
+            if max_units is not None:
+                limit = min(page_size, max_units - fetched)
+
+            raw_units, cursor = self.fetch_page(
+                tenant_id=tenant_id,
+                status=status,
+                limit=limit,
+                cursor=cursor,
+                since=since,
+            )
+            if not raw_units:
+                return
+
+            page_number += 1
+            fetched += len(raw_units)
+            logger.info(
+                "🔄 [PREPARE] Page %d: %d unités (%d au total)",
+                page_number,
+                len(raw_units),
+                fetched,
+            )
+
+            yield raw_units
+
+            if not cursor:
+                return
+
+    def stream_batches(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Préparation page par page (mémoire bornée à une page)
+
+        Produit, pour chaque page de stream_pages, le même dictionnaire
+        que prepare_batch.
+        """
+        for raw_units in self.stream_pages(tenant_id, status, page_size, max_units):
+            yield self.normalize_batch(raw_units)
+
+    def normalize_batch(self, raw_units: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Normalise des unités brutes déjà chargées (cf. prepare_batch)
+
+        La page est validée en bloc (RAW_UNITS_ADAPTER) et produit des
+        UnitRecord; seules les unités rejetées repassent par normalize_unit
+        (dates tolérantes, erreurs par unité).
+        """
         normalized_units = []
         errors = []
 
+        validated, rejected = self._validate_page(raw_units)
+        now = datetime.now()
+
         for i, raw_unit in enumerate(raw_units):
             try:
-                normalized = self.normalize_unit(raw_unit)
+                if i in rejected:
+                    normalized = UnitRecord.from_schema(self.normalize_unit(raw_unit))
+                else:
+                    normalized = self._record_from_payload(
+                        next(validated), raw_unit, now
+                    )
                 normalized_units.append(normalized)
             except Exception as e:
                 errors.append(
@@ -183,19 +323,61 @@ class EventPreparer:
                         "error": str(e),
                     }
                 )
-                print(f"   ⚠️  Erreur normalisation unit {i+1}: {e}")
+                logger.warning("   ⚠️  Erreur normalisation unit %d: %s", i + 1, e)
 
-        print(f"   ✅ {len(normalized_units)} unités normalisées")
+        logger.info("   ✅ %d unités normalisées", len(normalized_units))
         if errors:
-            print(f"   ⚠️  {len(errors)} erreurs")
+            logger.warning("   ⚠️  %d erreurs", len(errors))
 
         return {
             "count": len(normalized_units),
             "units": normalized_units,
             "errors": errors,
-            "timestamp": datetime.now(),
+            "timestamp": now,
         }
 
+    @staticmethod
+    def _validate_page(
+        raw_units: List[Dict[str, Any]],
+    ) -> Tuple[Iterator[RawUnitPayload], set]:
+        """
+        (unités validées dans l'ordre, index des unités rejetées)
+
+        Une erreur ne dit que les index fautifs: les autres unités sont
+        revalidées en bloc.
+        """
+        try:
+            return iter(RAW_UNITS_ADAPTER.validate_python(raw_units)), set()
+        except ValidationError as e:
+            rejected = {
+                error["loc"][0] for error in e.errors() if error["loc"]
+            } or set(range(len(raw_units)))
+
+        valid = [unit for i, unit in enumerate(raw_units) if i not in rejected]
+        return iter(RAW_UNITS_ADAPTER.validate_python(valid)), rejected
+
+    def _record_from_payload(
+        self,
+        payload: RawUnitPayload,
+        raw_unit: Dict[str, Any],
+        now: datetime,
+    ) -> UnitRecord:
+        """Même normalisation que normalize_unit, sans modèle Pydantic"""
+        content = payload.get("content", "").strip()
+
+        return UnitRecord(
+            id=payload.get("id", ""),
+            tenant_id=payload.get("tenantId", ""),
+            source=payload.get("source", "MANUAL"),
+            content=content,
+            content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            received_at=payload.get("receivedAt") or now,
+            classified_at=payload.get("classifiedAt") or now,
+            analyzed_at=payload.get("analyzedAt") or now,
+            source_metadata=self._extract_source_metadata(raw_unit),
+            linked_workspace_id=payload.get("linkedWorkspaceId"),
+        )
+
 
 # ===========================
 # Utilitaire: Valeur par défaut
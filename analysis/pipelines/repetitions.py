@@ -0,0 +1,313 @@
+"""
+repetitions.py
+
+Comptage des répétitions de documents (RULE-REPETITION-ALERT)
+- Empreintes d'une unité: content_hash, et objet normalisé + domaine
+  expéditeur si l'objet est connu
+- Fenêtre glissante de RULE_REPETITION_WINDOW_DAYS jours, par tenant
+- MemoryRepetitionCounter: compteurs en anneau (un seau par jour), LRU borné
+- RedisRepetitionCounter: un HyperLogLog par (tenant, empreinte, jour),
+  partagé entre processus et instances
+
+Les deux implémentations enregistrent une batch en une passe (un pipeline
+Redis) et répondent en O(fenêtre) = O(1) par empreinte. Une unité déjà
+enregistrée n'est pas recomptée (run rejoué, dry-run).
+
+Usage:
+    counter = get_shared_counter()
+    counts = counter.observe_batch(tenant_id, units)
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import (
+    REPETITION_COUNTER_MAX_FINGERPRINTS,
+    REPETITION_COUNTER_REDIS_URL,
+    RULE_REPETITION_WINDOW_DAYS,
+)
+from ..schemas.models import InformationUnitSchema
+from .classification_cache import sender_domain
+
+try:
+    from redis import Redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "analysis:repetition:"
+
+# "RE: TR: Fwd:" en tête d'objet
+SUBJECT_PREFIX = re.compile(r"^(?:\s*(?:re|tr|fw|fwd|aw|wg)\s*:\s*)+", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_subject(subject: Optional[str]) -> str:
+    """Objet sans préfixes de réponse/transfert, en minuscules"""
+    if not subject:
+        return ""
+    subject = SUBJECT_PREFIX.sub("", subject)
+    return WHITESPACE.sub(" ", subject).strip().lower()
+
+
+def document_fingerprints(unit: InformationUnitSchema) -> List[str]:
+    """Empreintes d'une unité (le compte retenu est le maximum)"""
+    fingerprints = [f"c:{unit.content_hash}"]
+
+    metadata = unit.source_metadata or {}
+    subject = normalize_subject(metadata.get("subject"))
+    if subject:
+        digest = hashlib.sha256(subject.encode("utf-8")).hexdigest()[:32]
+        domain = sender_domain(metadata.get("sender_email"))
+        fingerprints.append(f"s:{domain}:{digest}")
+
+    return fingerprints
+
+
+def epoch_day(value: datetime) -> int:
+    """Jour calendaire de la datetime (numéro du seau)"""
+    return value.toordinal()
+
+
+class RepetitionCounter(ABC):
+    """Interface commune: enregistrement et comptage par batch"""
+
+    def __init__(self, window_days: int = RULE_REPETITION_WINDOW_DAYS):
+        self.window_days = max(1, window_days)
+
+    def observe_batch(
+        self,
+        tenant_id: str,
+        units: List[InformationUnitSchema],
+    ) -> List[int]:
+        """
+        Enregistre la batch puis renvoie, pour chaque unité, le nombre
+        d'unités de même empreinte sur la fenêtre se terminant le jour de sa
+        réception (unité et reste de la batch compris)
+        """
+        observations = [
+            (unit.id, document_fingerprints(unit), epoch_day(unit.received_at))
+            for unit in units
+        ]
+        self.record(tenant_id, observations)
+        return self.counts(
+            tenant_id, [(fingerprints, day) for _, fingerprints, day in observations]
+        )
+
+    @abstractmethod
+    def record(
+        self,
+        tenant_id: str,
+        observations: List[Tuple[str, List[str], int]],
+    ) -> None:
+        """(unit_id, empreintes, jour) de chaque unité"""
+
+    @abstractmethod
+    def counts(
+        self,
+        tenant_id: str,
+        queries: List[Tuple[List[str], int]],
+    ) -> List[int]:
+        """Maximum, sur les empreintes, du compte de la fenêtre finissant au jour"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, "window_days": self.window_days}
+
+
+class MemoryRepetitionCounter(RepetitionCounter):
+    """Un anneau de `window_days` seaux journaliers par (tenant, empreinte)"""
+
+    def __init__(
+        self,
+        window_days: int = RULE_REPETITION_WINDOW_DAYS,
+        max_fingerprints: int = REPETITION_COUNTER_MAX_FINGERPRINTS,
+    ):
+        """
+        Args:
+            max_fingerprints: Anneaux conservés (LRU), et autant d'unités
+                mémorisées pour ne pas les recompter
+        """
+        super().__init__(window_days)
+        self.max_fingerprints = max_fingerprints
+        # (tenant, empreinte) → (comptes, jour de chaque seau)
+        self._rings: "OrderedDict[Tuple[str, str], Tuple[List[int], List[int]]]" = (
+            OrderedDict()
+        )
+        self._seen: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    def record(
+        self,
+        tenant_id: str,
+        observations: List[Tuple[str, List[str], int]],
+    ) -> None:
+        with self._lock:
+            for unit_id, fingerprints, day in observations:
+                seen_key = (tenant_id, unit_id)
+                if seen_key in self._seen:
+                    self._seen.move_to_end(seen_key)
+                    continue
+                self._seen[seen_key] = None
+                if len(self._seen) > self.max_fingerprints:
+                    self._seen.popitem(last=False)
+
+                for fingerprint in fingerprints:
+                    self._increment((tenant_id, fingerprint), day)
+
+    def counts(
+        self,
+        tenant_id: str,
+        queries: List[Tuple[List[str], int]],
+    ) -> List[int]:
+        with self._lock:
+            return [
+                max(
+                    (self._window_count((tenant_id, fp), day) for fp in fingerprints),
+                    default=0,
+                )
+                for fingerprints, day in queries
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "fingerprints": len(self._rings)}
+
+    def _increment(self, key: Tuple[str, str], day: int) -> None:
+        """+1 dans le seau du jour (verrou détenu par l'appelant)"""
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = (
+                [0] * self.window_days,
+                [0] * self.window_days,
+            )
+            if len(self._rings) > self.max_fingerprints:
+                self._rings.popitem(last=False)
+        self._rings.move_to_end(key)
+
+        counts, days = ring
+        slot = day % self.window_days
+        if days[slot] != day:
+            if days[slot] > day:
+                return  # Plus ancien que la fenêtre conservée
+            counts[slot], days[slot] = 0, day
+        counts[slot] += 1
+
+    def _window_count(self, key: Tuple[str, str], day: int) -> int:
+        ring = self._rings.get(key)
+        if ring is None:
+            return 0
+
+        counts, days = ring
+        oldest = day - self.window_days
+        return sum(
+            count
+            for count, bucket_day in zip(counts, days)
+            if oldest < bucket_day <= day
+        )
+
+
+class RedisRepetitionCounter(RepetitionCounter):
+    """HyperLogLog par (tenant, empreinte, jour), expiré après la fenêtre"""
+
+    def __init__(
+        self,
+        window_days: int = RULE_REPETITION_WINDOW_DAYS,
+        redis_url: Optional[str] = REPETITION_COUNTER_REDIS_URL,
+        redis_client: Optional[Any] = None,
+    ):
+        """
+        Args:
+            redis_url: URL Redis (ignorée si redis_client est fourni)
+            redis_client: Client déjà construit
+        """
+        super().__init__(window_days)
+        self.redis = redis_client
+        if self.redis is None:
+            self.redis = Redis.from_url(
+                redis_url, socket_connect_timeout=2, socket_timeout=2
+            )
+        # Un seau reste lisible pendant toute la fenêtre qui le contient
+        self.ttl_seconds = (self.window_days + 1) * 24 * 3600
+
+    def record(
+        self,
+        tenant_id: str,
+        observations: List[Tuple[str, List[str], int]],
+    ) -> None:
+        members: Dict[str, List[str]] = {}
+        for unit_id, fingerprints, day in observations:
+            for fingerprint in fingerprints:
+                key = self._key(tenant_id, fingerprint, day)
+                members.setdefault(key, []).append(unit_id)
+        if not members:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key, unit_ids in members.items():
+            pipe.pfadd(key, *unit_ids)
+            pipe.expire(key, self.ttl_seconds)
+        try:
+            pipe.execute()
+        except Exception as e:
+            logger.warning("⚠️  Compteur de répétitions Redis indisponible: %s", e)
+
+    def counts(
+        self,
+        tenant_id: str,
+        queries: List[Tuple[List[str], int]],
+    ) -> List[int]:
+        pipe = self.redis.pipeline(transaction=False)
+        sizes = []
+        for fingerprints, day in queries:
+            sizes.append(len(fingerprints))
+            for fingerprint in fingerprints:
+                # Union des seaux de la fenêtre (PFCOUNT multi-clés)
+                pipe.pfcount(
+                    *(
+                        self._key(tenant_id, fingerprint, bucket_day)
+                        for bucket_day in range(day - self.window_days + 1, day + 1)
+                    )
+                )
+        if not sizes:
+            return []
+        try:
+            results = iter(pipe.execute())
+        except Exception as e:
+            logger.warning("⚠️  Compteur de répétitions Redis indisponible: %s", e)
+            return [1] * len(queries)  # L'unité elle-même
+
+        return [
+            max((next(results) for _ in range(size)), default=0) for size in sizes
+        ]
+
+    @staticmethod
+    def _key(tenant_id: str, fingerprint: str, day: int) -> str:
+        return f"{REDIS_KEY_PREFIX}{tenant_id}:{fingerprint}:{day}"
+
+
+_shared_counter: Optional[RepetitionCounter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_counter() -> RepetitionCounter:
+    """Compteur du processus: Redis si configuré et disponible, sinon mémoire"""
+    global _shared_counter
+
+    with _shared_lock:
+        if _shared_counter is None:
+            if REPETITION_COUNTER_REDIS_URL and REDIS_AVAILABLE:
+                _shared_counter = RedisRepetitionCounter()
+            else:
+                _shared_counter = MemoryRepetitionCounter()
+        return _shared_counter
@@ -8,12 +8,16 @@ Each rule is:
 - Legal (with juridical reference)
 """
 
+import bisect
 import hashlib
+import json
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from difflib import SequenceMatcher
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from ..schemas.models import (
     InformationUnitSchema,
@@ -21,6 +25,22 @@ from ..schemas.models import (
     PriorityEnum,
     RuleApplicationSchema,
 )
+from .classification_cache import ClassificationCache, cache_key
+
+# Score clampé (0-3) → priorité
+PRIORITY_BY_SCORE = {
+    0: PriorityEnum.LOW,
+    1: PriorityEnum.MEDIUM,
+    2: PriorityEnum.HIGH,
+    3: PriorityEnum.CRITICAL,
+}
+PRIORITY_TABLE = np.array(
+    [PRIORITY_BY_SCORE[score] for score in range(4)],
+    dtype=object,
+)
+
+# À incrémenter quand le scan du contenu change (invalide le cache)
+SCAN_VERSION = 1
 
 
 class RuleApplicationsList(list):
@@ -49,10 +69,116 @@ class RuleApplicationsList(list):
         return super().__contains__(item)
 
 
+class CompiledRulePlan:
+    """Plan d'exécution compilé des règles textuelles.
+
+    Construit une fois par RuleEngine:
+    - Les patterns de procédure qui sont de simples alternatives littérales
+      ("OQTF|obligation de quitter le territoire") deviennent des
+      recherches de sous-chaînes sur le texte mis en minuscules une seule
+      fois; les autres sont précompilés.
+    - Le délai en jours n'est cherché que si "jour" apparaît dans le texte.
+    - Les domaines d'acteurs sont aplatis en une table ordonnée par
+      priorité, en minuscules.
+
+    Les résultats sont identiques à l'évaluation règle par règle.
+    """
+
+    DAYS_REGEX = re.compile(r"\b(\d{1,3})\s*jours?\b", re.IGNORECASE)
+
+    # Caractères pour lesquels re.IGNORECASE et str.lower() divergent
+    # (ı ~ i, ſ ~ s, İ → "i̇", µ ~ μ): leur présence désactive les
+    # recherches littérales au profit des regex compilées.
+    FOLD_GUARD = re.compile("[\u00b5\u0130\u0131\u017f]")
+    _REGEX_SPECIALS = set(".^$*+?{}[]\\|()")
+
+    def __init__(
+        self,
+        deadline_patterns: Dict[str, Dict[str, Any]],
+        actor_types: Dict[str, Dict[str, Any]],
+    ):
+        self.patterns: List[Tuple[str, Optional[Tuple[str, ...]], "re.Pattern"]] = [
+            (
+                name,
+                self._literal_alternatives(config["regex"]),
+                re.compile(config["regex"], re.IGNORECASE),
+            )
+            for name, config in deadline_patterns.items()
+        ]
+
+        # Seuls les acteurs avec un boost non nul peuvent produire la règle:
+        # le premier domaine trouvé (ordre de déclaration) l'emporte
+        self.actor_domains: Tuple[Tuple[str, str, int], ...] = tuple(
+            (domain.lower(), actor, config["priority_boost"])
+            for actor, config in actor_types.items()
+            if config["priority_boost"] != 0
+            for domain in config["domains"]
+        )
+
+    @classmethod
+    def _literal_alternatives(cls, regex: str) -> Optional[Tuple[str, ...]]:
+        """Alternatives en minuscules si la regex n'est qu'un OU de littéraux"""
+        alternatives = regex.split("|")
+        for alternative in alternatives:
+            if not alternative or cls._REGEX_SPECIALS.intersection(alternative):
+                return None
+            if cls.FOLD_GUARD.search(alternative) or any(
+                ord(char) >= 0x250 for char in alternative
+            ):
+                return None
+        return tuple(alternative.lower() for alternative in alternatives)
+
+    def scan_content(self, content: str) -> Tuple[Optional[int], List[str]]:
+        """
+        Délai en jours et patterns de procédure d'un contenu
+
+        Returns:
+            (premier nombre de jours détecté ou None, patterns détectés
+             dans l'ordre de déclaration)
+        """
+        lowered = content.lower()
+        literal_safe = self.FOLD_GUARD.search(content) is None
+
+        first_days: Optional[int] = None
+        if not literal_safe or "jour" in lowered:
+            day_match = self.DAYS_REGEX.search(content)
+            if day_match:
+                first_days = int(day_match.group(1))
+
+        detected = []
+        for name, literals, regex in self.patterns:
+            if literals is not None and literal_safe:
+                matched = any(literal in lowered for literal in literals)
+            else:
+                matched = regex.search(content) is not None
+            if matched:
+                detected.append(name)
+
+        return first_days, detected
+
+    def match_actor(self, sender_email: str) -> Optional[Tuple[str, int]]:
+        """Premier acteur (ordre de déclaration) dont un domaine apparaît"""
+        for domain, actor, priority_boost in self.actor_domains:
+            if domain in sender_email:
+                return actor, priority_boost
+        return None
+
+
 class RuleEngine:
     """Legal rules application engine"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        compiled: bool = True,
+        cache: Optional[ClassificationCache] = None,
+    ):
+        """
+        Args:
+            compiled: Utilise le plan compilé (sinon évaluation règle par
+                règle, conservée comme référence pour le benchmark)
+            cache: Cache du scan de contenu (par content_hash, domaine
+                expéditeur et empreinte des règles)
+        """
         self.rules = {
             "RULE-DEADLINE-CRITICAL": self.rule_deadline_critical,
             "RULE-ACTOR-TYPE-PRIORITY": self.rule_actor_type_priority,
@@ -112,6 +238,111 @@ class RuleEngine:
             },
         }
 
+        # Variantes batch (une règle sans variante est appliquée unité par unité)
+        self.batch_rules = {
+            "RULE-DEADLINE-CRITICAL": self._batch_deadline_critical,
+            "RULE-ACTOR-TYPE-PRIORITY": self._batch_actor_type_priority,
+            "RULE-DEADLINE-SEMANTIC": self._batch_deadline_semantic,
+            "RULE-REPETITION-ALERT": self._batch_repetition_alert,
+        }
+
+        self.compiled = compiled
+        self.plan: Optional[CompiledRulePlan] = None
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fingerprint = self._rules_fingerprint()
+        # Scans du contenu en cours: la dernière unité, ou toute la batch
+        self._scan_memo: Dict[str, Tuple[Optional[int], List[str]]] = {}
+        self._in_batch = False
+        if compiled:
+            self.compile_plan()
+
+    def compile_plan(self) -> CompiledRulePlan:
+        """(Re)compile le plan après modification des patterns ou acteurs"""
+        self.plan = CompiledRulePlan(self.deadline_patterns, self.actor_types)
+        self.fingerprint = self._rules_fingerprint()
+        self._scan_memo.clear()
+        return self.plan
+
+    def _rules_fingerprint(self) -> str:
+        """Empreinte des règles et de leur configuration (clé du cache)"""
+        config = json.dumps(
+            {
+                "scan_version": SCAN_VERSION,
+                "rules": list(self.rules),
+                "deadline_patterns": self.deadline_patterns,
+                "actor_types": self.actor_types,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]
+
+    def _cache_key(
+        self,
+        unit: InformationUnitSchema,
+        metadata: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        if self.cache is None or not unit.content_hash:
+            return None
+        return cache_key(
+            unit.content_hash, (metadata or {}).get("sender_email"), self.fingerprint
+        )
+
+    def _scan_content(
+        self,
+        content: str,
+        key: Optional[str] = None,
+    ) -> Tuple[Optional[int], List[str]]:
+        """
+        (jours détectés, patterns de procédure détectés) pour un contenu
+
+        Les règles d'une même unité (ou d'une même batch) partagent le même
+        scan du texte; avec une clé de cache, le scan n'est fait qu'une fois
+        pour tous les exemplaires d'un contenu.
+        """
+        result = self._scan_memo.get(content)
+        if result is None:
+            result = self._cached_scan(content, key)
+            if not self._in_batch:
+                self._scan_memo.clear()
+            self._scan_memo[content] = result
+        return result
+
+    def _cached_scan(
+        self,
+        content: str,
+        key: Optional[str],
+    ) -> Tuple[Optional[int], List[str]]:
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached["days"], cached["patterns"]
+            self.cache_misses += 1
+
+        result = self._scan_uncached(content)
+        if key is not None:
+            self.cache.set(key, {"days": result[0], "patterns": result[1]})
+        return result
+
+    def _scan_uncached(self, content: str) -> Tuple[Optional[int], List[str]]:
+        if self.plan is not None:
+            result = self.plan.scan_content(content)
+        else:
+            day_match = re.search(r"\b(\d{1,3})\s*jours?\b", content, re.IGNORECASE)
+            result = (
+                int(day_match.group(1)) if day_match else None,
+                [
+                    name
+                    for name, config in self.deadline_patterns.items()
+                    if re.search(config["regex"], content, re.IGNORECASE)
+                ],
+            )
+
+        return result
+
     def apply_all_rules(
         self,
         unit: InformationUnitSchema,
@@ -137,16 +368,204 @@ class RuleEngine:
 
         # Convert score to enum
         priority_score = max(0, min(3, priority_score))  # Clamp 0-3
-        priority_map = {
-            0: PriorityEnum.LOW,
-            1: PriorityEnum.MEDIUM,
-            2: PriorityEnum.HIGH,
-            3: PriorityEnum.CRITICAL,
-        }
-        final_priority = priority_map[priority_score]
+        final_priority = PRIORITY_BY_SCORE[priority_score]
 
         return final_priority, applied_rules, priority_score
 
+    def apply_rules_batch(
+        self,
+        units: List[InformationUnitSchema],
+        metadata_list: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[Tuple[PriorityEnum, List[RuleApplicationSchema], int]]:
+        """
+        Apply ALL rules to a batch of information units
+
+        Chaque règle est évaluée sur toute la batch (une règle à la fois):
+        les scans de contenu et la détection d'acteur sont mutualisés entre
+        unités identiques, les jours restants et les compteurs de répétition
+        sont comparés en tableaux NumPy, les boosts sont cumulés dans un
+        tableau NumPy et le clamp/mapping des priorités est fait en une
+        opération.
+
+        Gain mesuré (load_test.benchmark_rule_plan, 20 000 unités): x1.4 à
+        x1.7 sur l'évaluation règle par règle, du même ordre que le plan
+        compilé seul. Le coût restant est par unité et non vectorisable:
+        métadonnées (_build_metadata) et construction des
+        RuleApplicationSchema pydantic des règles appliquées.
+
+        Returns:
+            Un (final_priority, applied_rules, priority_score) par unité,
+            identique à apply_all_rules
+        """
+        self._in_batch = True
+        try:
+            return self._apply_rules_batch(units, metadata_list)
+        finally:
+            self._in_batch = False
+            self._scan_memo.clear()
+
+    def _apply_rules_batch(
+        self,
+        units: List[InformationUnitSchema],
+        metadata_list: Optional[List[Optional[Dict[str, Any]]]],
+    ) -> List[Tuple[PriorityEnum, List[RuleApplicationSchema], int]]:
+        count = len(units)
+        if metadata_list is None:
+            metadata_list = [None] * count
+
+        metadatas = [
+            self._build_metadata(unit, metadata)
+            for unit, metadata in zip(units, metadata_list)
+        ]
+
+        applied = [RuleApplicationsList() for _ in range(count)]
+        scores = np.ones(count, dtype=np.int64)  # MEDIUM = 1
+
+        for rule_id, rule_func in self.rules.items():
+            batch_func = self.batch_rules.get(rule_id)
+            if batch_func is not None:
+                results = batch_func(units, metadatas)
+            else:
+                results = [
+                    rule_func(unit, metadata)
+                    for unit, metadata in zip(units, metadatas)
+                ]
+
+            scores += np.fromiter(
+                (result.priority_boost if result else 0 for result in results),
+                dtype=np.int64,
+                count=count,
+            )
+            for rules, result in zip(applied, results):
+                if result:
+                    rules.append(result)
+
+        # Clamp 0-3 et conversion en enum pour toute la batch
+        scores = np.clip(scores, 0, 3)
+        priorities = PRIORITY_TABLE[scores]
+
+        return [
+            (priority, rules, score)
+            for priority, rules, score in zip(
+                priorities.tolist(), applied, scores.tolist()
+            )
+        ]
+
+    def _batch_deadline_critical(
+        self,
+        units: List[InformationUnitSchema],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[Optional[RuleApplicationSchema]]:
+        """RULE-DEADLINE-CRITICAL sur une batch (jours restants en un calcul NumPy)"""
+        results: List[Optional[RuleApplicationSchema]] = [None] * len(units)
+        parsed: Dict[str, datetime] = {}
+        indices: List[int] = []
+        due_dates: List[datetime] = []
+
+        for index, (unit, metadata) in enumerate(zip(units, metadatas)):
+            if not metadata or "deadline" not in metadata:
+                continue
+            due_date = metadata["deadline"].get("due_date")
+            if not due_date:
+                continue
+            if isinstance(due_date, str):
+                if due_date not in parsed:
+                    parsed[due_date] = datetime.fromisoformat(due_date)
+                due_date = parsed[due_date]
+            if due_date.tzinfo is not None:
+                # Hors NumPy (datetime64 sans fuseau): même chemin qu'en unitaire
+                results[index] = self.rule_deadline_critical(unit, metadata)
+                continue
+            indices.append(index)
+            due_dates.append(due_date)
+
+        if not indices:
+            return results
+
+        now = np.datetime64(datetime.now(), "us")
+        days_remaining = (
+            np.array(due_dates, dtype="datetime64[us]") - now
+        ) // np.timedelta64(1, "D")
+        critical = (days_remaining <= 3) & (days_remaining > 0)
+
+        for position in np.flatnonzero(critical).tolist():
+            index = indices[position]
+            deadline_data = metadatas[index]["deadline"]
+            results[index] = self._critical_result(
+                deadline_data, due_dates[position], int(days_remaining[position])
+            )
+
+        return results
+
+    def _batch_actor_type_priority(
+        self,
+        units: List[InformationUnitSchema],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[Optional[RuleApplicationSchema]]:
+        """RULE-ACTOR-TYPE-PRIORITY sur une batch (un calcul par expéditeur)"""
+        actors: Dict[str, Tuple[str, int]] = {}
+        results: List[Optional[RuleApplicationSchema]] = []
+
+        for metadata in metadatas:
+            if not metadata or "sender_email" not in metadata:
+                results.append(None)
+                continue
+
+            sender_email = metadata.get("sender_email", "").lower()
+            actor = actors.get(sender_email)
+            if actor is None:
+                actor = actors[sender_email] = self._detect_actor(sender_email)
+
+            results.append(self._actor_result(actor[0], actor[1], sender_email))
+
+        return results
+
+    def _batch_deadline_semantic(
+        self,
+        units: List[InformationUnitSchema],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[Optional[RuleApplicationSchema]]:
+        """RULE-DEADLINE-SEMANTIC sur une batch (un scan par contenu distinct)"""
+        patterns_by_content: Dict[str, List[str]] = {}
+        results: List[Optional[RuleApplicationSchema]] = []
+
+        for unit, metadata in zip(units, metadatas):
+            pattern_names = patterns_by_content.get(unit.content)
+            if pattern_names is None:
+                pattern_names = self._scan_content(
+                    unit.content, self._cache_key(unit, metadata)
+                )[1]
+                patterns_by_content[unit.content] = pattern_names
+
+            results.append(
+                self._semantic_result(pattern_names) if pattern_names else None
+            )
+
+        return results
+
+    def _batch_repetition_alert(
+        self,
+        units: List[InformationUnitSchema],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[Optional[RuleApplicationSchema]]:
+        """RULE-REPETITION-ALERT sur une batch (seuil comparé en NumPy)"""
+        results: List[Optional[RuleApplicationSchema]] = [None] * len(units)
+        counts = np.fromiter(
+            (
+                metadata.get("repetition_count", 0)
+                if metadata and "repetition_count" in metadata
+                else 0
+                for metadata in metadatas
+            ),
+            dtype=np.int64,
+            count=len(metadatas),
+        )
+
+        for index in np.flatnonzero(counts >= 2).tolist():
+            results[index] = self._repetition_result(metadatas[index])
+
+        return results
+
     def _build_metadata(
         self,
         unit: InformationUnitSchema,
@@ -166,23 +585,30 @@ class RuleEngine:
             merged.update(metadata)
 
         if "deadline" not in merged:
-            extracted_deadline = self._extract_deadline_from_content(unit.content)
+            extracted_deadline = self._extract_deadline_from_content(
+                unit.content, self._cache_key(unit, merged)
+            )
             if extracted_deadline:
                 merged["deadline"] = extracted_deadline
 
         return merged
 
-    def _extract_deadline_from_content(self, content: str) -> Optional[Dict[str, Any]]:
-        """Extraction simple de délai relatif dans le texte (ex: '3 jours')."""
-        if not content:
-            return None
+    def _extract_deadline_from_content(
+        self,
+        content: str,
+        key: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extraction simple de délai relatif dans le texte (ex: '3 jours').
 
-        day_match = re.search(r"\b(\d{1,3})\s*jours?\b", content, re.IGNORECASE)
-        if not day_match:
+        Seul le nombre de jours vient du scan (éventuellement en cache):
+        l'échéance est recalculée à partir de l'heure courante.
+        """
+        if not content:
             return None
 
-        days = int(day_match.group(1))
-        if days <= 0:
+        days, _ = self._scan_content(content, key)
+        if days is None or days <= 0:
             return None
 
         return {
@@ -192,6 +618,59 @@ class RuleEngine:
             "source": "content_regex",
         }
 
+    def detect_deadlines(
+        self,
+        units: List[InformationUnitSchema],
+    ) -> List[Optional[Tuple[datetime, Dict[str, Any]]]]:
+        """
+        Échéance absolue de chaque unité (suivie par le DeadlineIndex)
+
+        - deadline.due_date des métadonnées source si présente
+        - sinon réception + délai en jours détecté dans le texte
+
+        Returns:
+            Un (due_date, deadline_data) ou None par unité
+        """
+        self._in_batch = True
+        try:
+            return [self._unit_deadline(unit) for unit in units]
+        finally:
+            self._in_batch = False
+            self._scan_memo.clear()
+
+    def _unit_deadline(
+        self,
+        unit: InformationUnitSchema,
+    ) -> Optional[Tuple[datetime, Dict[str, Any]]]:
+        source_metadata = unit.source_metadata or {}
+        declared = source_metadata.get("deadline")
+        if isinstance(declared, dict) and declared.get("due_date"):
+            due_date = declared["due_date"]
+            if isinstance(due_date, str):
+                due_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
+            data = {k: v for k, v in declared.items() if k != "due_date"}
+            return due_date, {"source": "source_metadata", **data}
+
+        if not unit.content:
+            return None
+        days, pattern_names = self._scan_content(
+            unit.content, self._cache_key(unit, source_metadata)
+        )
+        if days is None or days <= 0:
+            return None
+
+        data = {
+            "reference_date": unit.received_at.isoformat(),
+            "days_detected": days,
+            "source": "content_regex",
+        }
+        if pattern_names:
+            pattern_config = self.deadline_patterns[pattern_names[0]]
+            data["procedure_type"] = pattern_config["procedure_type"]
+            data["legal_basis"] = pattern_config["legal_basis"]
+
+        return unit.received_at + timedelta(days=days), data
+
     # =============================
     # RULE 1: CRITICAL DEADLINE (3 days)
     # =============================
@@ -220,23 +699,31 @@ class RuleEngine:
         days_remaining = (due_date - datetime.now()).days
 
         if days_remaining <= 3 and days_remaining > 0:
-            return RuleApplicationSchema(
-                rule_id="RULE-DEADLINE-CRITICAL",
-                rule_name="Critical deadline (≤3 days)",
-                matched=True,
-                priority_boost=2,
-                legal_basis=deadline_data.get("legal_basis"),
-                justification={
-                    "days_remaining": days_remaining,
-                    "due_date": due_date.isoformat(),
-                    "procedure_type": deadline_data.get("procedure_type"),
-                    "reference_date": deadline_data.get("reference_date"),
-                },
-                confidence_score=1.0,
-            )
+            return self._critical_result(deadline_data, due_date, days_remaining)
 
         return None
 
+    @staticmethod
+    def _critical_result(
+        deadline_data: Dict[str, Any],
+        due_date: datetime,
+        days_remaining: int,
+    ) -> RuleApplicationSchema:
+        return RuleApplicationSchema(
+            rule_id="RULE-DEADLINE-CRITICAL",
+            rule_name="Critical deadline (≤3 days)",
+            matched=True,
+            priority_boost=2,
+            legal_basis=deadline_data.get("legal_basis"),
+            justification={
+                "days_remaining": days_remaining,
+                "due_date": due_date.isoformat(),
+                "procedure_type": deadline_data.get("procedure_type"),
+                "reference_date": deadline_data.get("reference_date"),
+            },
+            confidence_score=1.0,
+        )
+
     # =============================
     # RULE 2: ACTOR TYPE
     # =============================
@@ -256,20 +743,37 @@ class RuleEngine:
             return None
 
         sender_email = metadata.get("sender_email", "").lower()
+        actor_type, priority_boost = self._detect_actor(sender_email)
 
-        # Détection du type d'acteur
+        return self._actor_result(actor_type, priority_boost, sender_email)
+
+    def _detect_actor(self, sender_email: str) -> Tuple[str, int]:
+        """(type d'acteur, boost) pour un email expéditeur en minuscules"""
         actor_type = "CLIENT"
         priority_boost = 0
 
-        for actor, config in self.actor_types.items():
-            for domain in config["domains"]:
-                if domain.lower() in sender_email:
-                    actor_type = actor
-                    priority_boost = config["priority_boost"]
+        if self.plan is not None:
+            actor_match = self.plan.match_actor(sender_email)
+            if actor_match:
+                actor_type, priority_boost = actor_match
+        else:
+            for actor, config in self.actor_types.items():
+                for domain in config["domains"]:
+                    if domain.lower() in sender_email:
+                        actor_type = actor
+                        priority_boost = config["priority_boost"]
+                        break
+                if priority_boost != 0:
                     break
-            if priority_boost != 0:
-                break
 
+        return actor_type, priority_boost
+
+    @staticmethod
+    def _actor_result(
+        actor_type: str,
+        priority_boost: int,
+        sender_email: str,
+    ) -> Optional[RuleApplicationSchema]:
         if priority_boost == 0:
             return None
 
@@ -299,20 +803,27 @@ class RuleEngine:
         RULE-DEADLINE-SEMANTIC:
         Détecte les patterns de délais légaux dans le contenu textuel
         """
-        detected_patterns = []
+        _, pattern_names = self._scan_content(
+            unit.content, self._cache_key(unit, metadata)
+        )
+        return self._semantic_result(pattern_names)
 
-        for pattern_name, pattern_config in self.deadline_patterns.items():
-            regex = pattern_config["regex"]
+    def _semantic_result(
+        self,
+        pattern_names: List[str],
+    ) -> Optional[RuleApplicationSchema]:
+        detected_patterns = []
 
-            if re.search(regex, unit.content, re.IGNORECASE):
-                detected_patterns.append(
-                    {
-                        "pattern": pattern_name,
-                        "legal_basis": pattern_config["legal_basis"],
-                        "legal_days": pattern_config["legal_days"],
-                        "procedure_type": pattern_config["procedure_type"],
-                    }
-                )
+        for pattern_name in pattern_names:
+            pattern_config = self.deadline_patterns[pattern_name]
+            detected_patterns.append(
+                {
+                    "pattern": pattern_name,
+                    "legal_basis": pattern_config["legal_basis"],
+                    "legal_days": pattern_config["legal_days"],
+                    "procedure_type": pattern_config["procedure_type"],
+                }
+            )
 
         if not detected_patterns:
             return None
@@ -349,24 +860,28 @@ class RuleEngine:
         if not metadata or "repetition_count" not in metadata:
             return None
 
+        if metadata.get("repetition_count", 0) >= 2:
+            return self._repetition_result(metadata)
+
+        return None
+
+    @staticmethod
+    def _repetition_result(metadata: Dict[str, Any]) -> RuleApplicationSchema:
         repetition_count = metadata.get("repetition_count", 0)
         repetition_window = metadata.get("repetition_window_days", 30)
 
-        if repetition_count >= 2:
-            return RuleApplicationSchema(
-                rule_id="RULE-REPETITION-ALERT",
-                rule_name=f"Répétition détectée ({repetition_count}x)",
-                matched=True,
-                priority_boost=1,
-                justification={
-                    "repetition_count": repetition_count,
-                    "window_days": repetition_window,
-                    "alert": "MULTIPLE_INSTANCES",
-                },
-                confidence_score=1.0,
-            )
-
-        return None
+        return RuleApplicationSchema(
+            rule_id="RULE-REPETITION-ALERT",
+            rule_name=f"Répétition détectée ({repetition_count}x)",
+            matched=True,
+            priority_boost=1,
+            justification={
+                "repetition_count": repetition_count,
+                "window_days": repetition_window,
+                "alert": "MULTIPLE_INSTANCES",
+            },
+            confidence_score=1.0,
+        )
 
 
 # ===========================
@@ -374,37 +889,160 @@ class RuleEngine:
 # ===========================
 
 
+# Mois en toutes lettres (avec et sans accents) → numéro
+FRENCH_MONTHS = {
+    "janvier": 1,
+    "février": 2,
+    "fevrier": 2,
+    "mars": 3,
+    "avril": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7,
+    "août": 8,
+    "aout": 8,
+    "septembre": 9,
+    "octobre": 10,
+    "novembre": 11,
+    "décembre": 12,
+    "decembre": 12,
+}
+
+# Mots-clés de procédure (familles de RuleEngine.deadline_patterns)
+PROCEDURE_KEYWORDS = {
+    "obligation de quitter le territoire": "OQTF",
+    "oqtf": "OQTF",
+    "recours contentieux": "RECOURS_CONTENTIEUX",
+    "référé": "RECOURS_CONTENTIEUX",
+    "refere": "RECOURS_CONTENTIEUX",
+    "tribunal administratif": "RECOURS_CONTENTIEUX",
+    "appel": "APPEL",
+    "cour administrative d'appel": "APPEL",
+    "caa": "APPEL",
+}
+
+# Marge de contexte (caractères) de chaque côté, si demandée
+CONTEXT_MARGIN = 100
+
+
+def _alternation(words: Iterable[str]) -> str:
+    """Alternative regex, plus longs d'abord (ex: "cour ... d'appel" > "appel")"""
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
 class DeadlineExtractor:
-    """Extrait les délais légaux du texte"""
+    """
+    Extrait les dates d'échéance du texte
 
-    # Patterns pour extraction de dates
-    DATE_PATTERNS = [
-        r"(\d{1,2})/(\d{1,2})/(\d{4})",  # JJ/MM/AAAA
-        r"(\d{4})-(\d{1,2})-(\d{1,2})",  # AAAA-MM-JJ
-        r"(\d{1,2})\s+(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})",  # JJ mois AAAA
-    ]
+    Un seul scan (dates JJ/MM/AAAA, AAAA-MM-JJ, "JJ mois AAAA" et mots-clés
+    de procédure dans une même regex compilée une fois); chaque date est
+    convertie en `date` et rattachée au mot-clé le plus proche.
+    """
 
-    @staticmethod
-    def extract_deadlines(content: str) -> List[Dict[str, Any]]:
-        """Extrait tous les délais détectés"""
-        extracted = []
+    def __init__(
+        self,
+        months: Dict[str, int] = FRENCH_MONTHS,
+        procedure_keywords: Dict[str, str] = PROCEDURE_KEYWORDS,
+    ):
+        self.months = {name.lower(): number for name, number in months.items()}
+        self.procedure_keywords = {
+            keyword.lower(): procedure
+            for keyword, procedure in procedure_keywords.items()
+        }
+        self.scanner = re.compile(
+            r"\b(?:"
+            r"(?P<d1>\d{1,2})/(?P<m1>\d{1,2})/(?P<y1>\d{4})"
+            r"|(?P<y2>\d{4})-(?P<m2>\d{1,2})-(?P<d2>\d{1,2})"
+            rf"|(?P<d3>\d{{1,2}})(?:er)?\s+(?P<m3>{_alternation(self.months)})"
+            r"\s+(?P<y3>\d{4})"
+            rf"|(?P<keyword>{_alternation(self.procedure_keywords)})"
+            r")\b",
+            re.IGNORECASE,
+        )
 
-        # Cherche les patterns de délai + date
-        for date_pattern in DeadlineExtractor.DATE_PATTERNS:
-            matches = re.finditer(date_pattern, content, re.IGNORECASE)
-            for match in matches:
-                extracted.append(
-                    {
-                        "matched_text": match.group(0),
-                        "position": match.start(),
-                        "context": content[
-                            max(0, match.start() - 100) : match.end() + 100
-                        ],
-                    }
-                )
+    def extract_deadlines(
+        self,
+        content: str,
+        with_context: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Dates détectées, dans l'ordre du texte
+
+        Args:
+            with_context: Ajouter "context" (±CONTEXT_MARGIN caractères)
+
+        Returns:
+            [{date, matched_text, position, procedure_type, keyword,
+              keyword_distance}] (procédure None sans mot-clé dans le texte);
+            les dates impossibles (ex: 31/02) sont ignorées
+        """
+        dates: List[Tuple[date, re.Match]] = []
+        keywords: List[Tuple[int, int, str]] = []  # (début, fin, mot-clé)
+
+        for match in self.scanner.finditer(content):
+            keyword = match.group("keyword")
+            if keyword is not None:
+                keywords.append((match.start(), match.end(), keyword.lower()))
+                continue
+
+            parsed = self._parse_date(match)
+            if parsed is not None:
+                dates.append((parsed, match))
+
+        extracted = []
+        for parsed, match in dates:
+            keyword, distance = self._nearest_keyword(keywords, match)
+            entry = {
+                "date": parsed,
+                "matched_text": match.group(0),
+                "position": match.start(),
+                "procedure_type": self.procedure_keywords.get(keyword),
+                "keyword": keyword,
+                "keyword_distance": distance,
+            }
+            if with_context:
+                start = max(0, match.start() - CONTEXT_MARGIN)
+                entry["context"] = content[start : match.end() + CONTEXT_MARGIN]
+            extracted.append(entry)
 
         return extracted
 
+    def _parse_date(self, match: re.Match) -> Optional[date]:
+        if match.group("d1") is not None:
+            day, month, year = match.group("d1", "m1", "y1")
+        elif match.group("y2") is not None:
+            year, month, day = match.group("y2", "m2", "d2")
+        else:
+            day, year = match.group("d3", "y3")
+            month = self.months[match.group("m3").lower()]
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _nearest_keyword(
+        keywords: List[Tuple[int, int, str]],
+        match: re.Match,
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """Mot-clé le plus proche (écart entre les deux spans), bisect sur les débuts"""
+        if not keywords:
+            return None, None
+
+        index = bisect.bisect_left(keywords, (match.start(),))
+        best: Tuple[Optional[str], Optional[int]] = (None, None)
+        for start, end, keyword in keywords[max(0, index - 1) : index + 1]:
+            distance = (
+                match.start() - end if end <= match.start() else start - match.end()
+            )
+            if best[1] is None or distance < best[1]:
+                best = (keyword, distance)
+        return best
+
+
+# Extracteur du processus (regex compilée une fois)
+DEADLINE_EXTRACTOR = DeadlineExtractor()
+
 
 class DuplicateDetector:
     """Détecte les doublons par checksum et fuzzy matching"""
@@ -422,6 +1060,27 @@ class DuplicateDetector:
         ratio = SequenceMatcher(None, content1, content2).ratio()
         return ratio
 
+    @staticmethod
+    def bounded_fuzzy_match(
+        content1: str,
+        content2: str,
+        threshold: float = 0.95,
+    ) -> float:
+        """
+        Fuzzy match avec coupure précoce
+
+        real_quick_ratio() et quick_ratio() sont des bornes supérieures de
+        ratio(): si l'une d'elles ne dépasse pas le seuil, le ratio exact
+        ne peut pas le dépasser non plus et on retourne 0.0 sans le calculer.
+        Au-dessus du seuil, le résultat est identique à fuzzy_match().
+        """
+        matcher = SequenceMatcher(None, content1, content2)
+        if matcher.real_quick_ratio() <= threshold:
+            return 0.0
+        if matcher.quick_ratio() <= threshold:
+            return 0.0
+        return matcher.ratio()
+
     @staticmethod
     def metadata_match(
         metadata1: Dict[str, Any],
@@ -0,0 +1,364 @@
+"""
+scheduler.py
+
+Exécution planifiée du pipeline pour de nombreux tenants
+- File des tenants dus (FIFO): round-robin équitable, un tenant y figure
+  au plus une fois
+- Pool de workers de taille configurable
+- Jamais deux runs simultanés pour un même tenant (un déclenchement
+  pendant un run est rejoué à sa fin)
+- Intervalle adaptatif par tenant selon le volume traité au dernier run
+- status(): profondeur de file, retard et backlog par tenant
+
+Usage:
+    scheduler = TenantScheduler(run_tenant, ["tenant_001", "tenant_002"])
+    scheduler.start()
+    scheduler.trigger("tenant_001")
+    scheduler.status()
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from ..config import (
+    PIPELINE_BACKLOG_BUSY_UNITS,
+    PIPELINE_MAX_INTERVAL_SECONDS,
+    PIPELINE_MIN_INTERVAL_SECONDS,
+    PIPELINE_SCHEDULER_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+IDLE = "idle"
+QUEUED = "queued"
+RUNNING = "running"
+
+
+class TenantState:
+    """Planification et dernier run d'un tenant"""
+
+    __slots__ = (
+        "tenant_id",
+        "state",
+        "interval",
+        "next_run_at",
+        "rerun",
+        "runs",
+        "failures",
+        "last_started_at",
+        "last_finished_at",
+        "last_duration",
+        "last_units",
+        "last_error",
+    )
+
+    def __init__(self, tenant_id: str, next_run_at: float, interval: float):
+        self.tenant_id = tenant_id
+        self.state = IDLE
+        self.interval = interval
+        self.next_run_at = next_run_at
+        self.rerun = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started_at: Optional[float] = None
+        self.last_finished_at: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_units: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+
+class TenantScheduler:
+    """File de tenants + pool de workers (threads)"""
+
+    def __init__(
+        self,
+        run_tenant: Callable[[str], int],
+        tenant_ids: Iterable[str] = (),
+        workers: int = PIPELINE_SCHEDULER_WORKERS,
+        min_interval: float = PIPELINE_MIN_INTERVAL_SECONDS,
+        max_interval: float = PIPELINE_MAX_INTERVAL_SECONDS,
+        busy_units: int = PIPELINE_BACKLOG_BUSY_UNITS,
+        tick_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            run_tenant: Exécute le pipeline d'un tenant, renvoie le nombre
+                d'unités traitées (sert à adapter l'intervalle)
+            workers: Runs simultanés (tous tenants confondus)
+            min_interval: Intervalle d'un tenant avec du backlog (secondes)
+            max_interval: Intervalle d'un tenant sans activité (secondes)
+            busy_units: Unités par run au-delà desquelles le tenant
+                repasse à l'intervalle minimal
+            tick_seconds: Période de recherche des tenants dus
+        """
+        self.run_tenant = run_tenant
+        self.workers = max(1, workers)
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.busy_units = busy_units
+        self.tick_seconds = tick_seconds
+        self.clock = clock
+
+        self._tenants: Dict[str, TenantState] = {}
+        self._ready: Deque[str] = deque()
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        for tenant_id in tenant_ids:
+            self.add_tenant(tenant_id)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stop.is_set()
+
+    def start(self) -> None:
+        """Démarre le dispatcher et les workers (sans effet si déjà démarré)"""
+        if self.running:
+            return
+
+        # Nouvel événement: des threads d'un stop(wait=False) ne repartent pas
+        self._stop = stop = threading.Event()
+        self._threads = [
+            threading.Thread(
+                target=self._dispatch_loop,
+                args=(stop,),
+                name="pipeline-dispatcher",
+                daemon=True,
+            )
+        ] + [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(stop,),
+                name=f"pipeline-worker-{i}",
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        logger.info(
+            "✅ Scheduler démarré: %d tenants, %d workers",
+            len(self._tenants),
+            self.workers,
+        )
+
+    def stop(self, wait: bool = True) -> None:
+        """Arrête la planification; les runs en cours vont à leur terme"""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+        logger.info("⏹️  Scheduler arrêté")
+
+    def add_tenant(self, tenant_id: str) -> None:
+        """Ajoute un tenant, dû immédiatement"""
+        with self._condition:
+            if tenant_id not in self._tenants:
+                self._tenants[tenant_id] = TenantState(
+                    tenant_id, self.clock(), self.min_interval
+                )
+
+    def remove_tenant(self, tenant_id: str) -> None:
+        """Retire un tenant (un run en cours va à son terme)"""
+        with self._condition:
+            self._tenants.pop(tenant_id, None)
+            if tenant_id in self._ready:
+                self._ready.remove(tenant_id)
+
+    def trigger(self, tenant_id: str) -> bool:
+        """
+        Demande un run au plus tôt (tenant ajouté si inconnu)
+
+        Returns:
+            False si un run est déjà en file ou en cours (il sera rejoué)
+        """
+        with self._condition:
+            state = self._tenants.get(tenant_id)
+            if state is None:
+                state = self._tenants[tenant_id] = TenantState(
+                    tenant_id, self.clock(), self.min_interval
+                )
+
+            if state.state == RUNNING:
+                state.rerun = True
+                return False
+            if state.state == QUEUED:
+                return False
+
+            state.next_run_at = self.clock()
+            self._enqueue(state)
+            return True
+
+    def run_pending(self) -> int:
+        """
+        Exécute dans le thread appelant les tenants dus (cron, tests)
+
+        Returns:
+            Nombre de runs effectués
+        """
+        self._dispatch_due()
+        runs = 0
+        while self._run_next():
+            runs += 1
+        return runs
+
+    def status(self) -> Dict[str, Any]:
+        """Profondeur de file, retard et dernier run de chaque tenant"""
+        now = self.clock()
+        with self._condition:
+            tenants = [
+                self._tenant_status(state, now) for state in self._tenants.values()
+            ]
+            queue_depth = len(self._ready)
+
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queue_depth": queue_depth,
+            "active_runs": sum(t["state"] == RUNNING for t in tenants),
+            "max_lag_seconds": max((t["lag_seconds"] for t in tenants), default=0.0),
+            "tenants": tenants,
+        }
+
+    def _tenant_status(self, state: TenantState, now: float) -> Dict[str, Any]:
+        lag = 0.0
+        if state.state != RUNNING:
+            lag = max(0.0, now - state.next_run_at)
+
+        return {
+            "tenant_id": state.tenant_id,
+            "state": state.state,
+            "queue_depth": int(state.state == QUEUED) + int(state.rerun),
+            "lag_seconds": lag,
+            "interval_seconds": state.interval,
+            "next_run_at": _isoformat(state.next_run_at),
+            "backlog_units": state.last_units,
+            "runs": state.runs,
+            "failures": state.failures,
+            "last_started_at": _isoformat(state.last_started_at),
+            "last_duration_seconds": state.last_duration,
+            "last_error": state.last_error,
+        }
+
+    def _enqueue(self, state: TenantState) -> None:
+        """Met un tenant en fin de file (verrou détenu par l'appelant)"""
+        state.state = QUEUED
+        self._ready.append(state.tenant_id)
+        self._condition.notify()
+
+    def _dispatch_due(self) -> None:
+        """Met en file les tenants dus, du plus en retard au moins en retard"""
+        now = self.clock()
+        with self._condition:
+            due = sorted(
+                (
+                    state
+                    for state in self._tenants.values()
+                    if state.state == IDLE and state.next_run_at <= now
+                ),
+                key=lambda state: state.next_run_at,
+            )
+            for state in due:
+                self._enqueue(state)
+
+    def _dispatch_loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self._dispatch_due()
+            stop.wait(self.tick_seconds)
+
+    def _worker_loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self._run_next(stop)
+
+    def _run_next(self, stop: Optional[threading.Event] = None) -> bool:
+        """
+        Exécute le prochain tenant de la file; False si aucun
+
+        Sans `stop`, n'attend pas qu'un tenant soit mis en file.
+        """
+        with self._condition:
+            while not self._ready:
+                if stop is None or stop.is_set():
+                    return False
+                self._condition.wait(self.tick_seconds)
+
+            state = self._tenants[self._ready.popleft()]
+            state.state = RUNNING
+            state.rerun = False
+            state.last_started_at = self.clock()
+
+        units, error = None, None
+        try:
+            units = self.run_tenant(state.tenant_id)
+        except Exception as e:
+            error = str(e)
+            logger.exception("❌ Run du tenant %s en échec", state.tenant_id)
+
+        self._finish(state, units, error)
+        return True
+
+    def _finish(
+        self,
+        state: TenantState,
+        units: Optional[int],
+        error: Optional[str],
+    ) -> None:
+        """Adapte l'intervalle et replanifie le tenant"""
+        now = self.clock()
+        with self._condition:
+            state.runs += 1
+            state.last_finished_at = now
+            state.last_duration = now - state.last_started_at
+            state.last_units = units
+            state.last_error = error
+            if error is not None:
+                state.failures += 1
+
+            state.interval = self._next_interval(state.interval, units)
+            state.next_run_at = now if state.rerun else now + state.interval
+            state.state = IDLE
+
+            if state.rerun and state.tenant_id in self._tenants:
+                self._enqueue(state)
+
+        logger.info(
+            "⏱️  Tenant %s: %s unités en %.2fs, prochain run dans %.0fs",
+            state.tenant_id,
+            units if units is not None else "?",
+            state.last_duration,
+            state.interval,
+            extra={
+                "tenant_id": state.tenant_id,
+                "units": units,
+                "duration_seconds": state.last_duration,
+                "interval_seconds": state.interval,
+            },
+        )
+
+    def _next_interval(self, interval: float, units: Optional[int]) -> float:
+        """
+        Backlog (>= busy_units): intervalle minimal; rien de neuf ou échec:
+        intervalle doublé; sinon: intervalle divisé par deux
+        """
+        if units is None or units == 0:
+            return min(self.max_interval, interval * 2)
+        if units >= self.busy_units:
+            return self.min_interval
+        return max(self.min_interval, interval / 2)
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
@@ -0,0 +1,560 @@
+"""
+storage.py
+
+Mode base directe (PIPELINE_STORAGE=sql): lecture des InformationUnit et
+écriture des EventLog via SQLAlchemy, sans passer par l'API Next.js
+- SqlEventPreparer: curseur serveur (stream_results), une requête pour
+  tout le statut, découpée en pages
+- SqlDuplicateChecker: candidats historiques par chunk en une requête
+  indexée (contentHash)
+- SqlEventLogger: insertion groupée (executemany), id déjà insérés
+  ignorés (ON CONFLICT DO NOTHING), comme create-events
+
+Les unités brutes et les résultats de persistance ont le même format que
+les endpoints HTTP: le reste du pipeline (normalisation, checkpoints) est
+inchangé. Les tables et types enum sont ceux des migrations Prisma
+("InformationUnit", "event_logs"); create_schema() ne sert qu'au
+développement local.
+
+Usage:
+    storage = SqlStorage("postgresql+psycopg://...")
+    pipeline = AnalysisPipeline(tenant_id, storage=storage)
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..config import PIPELINE_BATCH_SIZE, PIPELINE_DATABASE_URL
+from ..schemas.models import (
+    ActorTypeEnum,
+    DuplicateDetectionSchema,
+    EventLogSchema,
+    EventTypeEnum,
+    InformationUnitSchema,
+)
+from .detect_duplicates import DuplicateChecker
+from .generate_events import EventLogger
+from .prepare_events import EventPreparer
+
+logger = logging.getLogger(__name__)
+
+# Candidats historiques par contentHash (comme find-duplicate-candidates)
+HISTORY_CANDIDATES_PER_HASH = 10
+
+metadata = sa.MetaData()
+
+
+def _prisma_enum(name: str, values: Tuple[str, ...]) -> sa.types.TypeEngine:
+    """
+    Enum Postgres `name` des migrations Prisma: lié avec un cast vers le
+    type natif, jamais créé ni supprimé ici (VARCHAR hors Postgres)
+    """
+    return sa.Enum(*values, name=name, native_enum=False).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+# Valeurs des CREATE TYPE de prisma/migrations/20260209000000_init
+INFORMATION_UNIT_SOURCES = ("EMAIL", "UPLOAD", "API", "MANUAL", "SCAN", "FAX")
+INFORMATION_UNIT_STATUSES = (
+    "RECEIVED",
+    "CLASSIFIED",
+    "ANALYZED",
+    "INCOMPLETE",
+    "AMBIGUOUS",
+    "HUMAN_ACTION_REQUIRED",
+    "RESOLVED",
+    "CLOSED",
+)
+
+# Table "InformationUnit" (schema.prisma, migration 20260209000000_init)
+information_units = sa.Table(
+    "InformationUnit",
+    metadata,
+    sa.Column("id", sa.String, primary_key=True),
+    sa.Column("tenantId", sa.String, nullable=False),
+    sa.Column(
+        "source",
+        _prisma_enum("InformationUnitSource", INFORMATION_UNIT_SOURCES),
+        nullable=False,
+    ),
+    sa.Column("content", sa.Text, nullable=False),
+    sa.Column("contentHash", sa.String, nullable=False),
+    sa.Column(
+        "currentStatus",
+        _prisma_enum("InformationUnitStatus", INFORMATION_UNIT_STATUSES),
+        nullable=False,
+        default="RECEIVED",
+    ),
+    sa.Column("sourceMetadata", sa.Text),
+    sa.Column("linkedWorkspaceId", sa.String),
+    sa.Column("receivedAt", sa.DateTime, nullable=False),
+    sa.Column("createdAt", sa.DateTime, nullable=False, default=sa.func.now()),
+    # @updatedAt: fourni par le client (Prisma), pas de DEFAULT en base
+    sa.Column("updatedAt", sa.DateTime, nullable=False, default=sa.func.now()),
+    sa.Index("InformationUnit_tenantId_currentStatus_idx", "tenantId", "currentStatus"),
+    sa.Index("InformationUnit_contentHash_idx", "contentHash"),
+)
+
+# Table "event_logs" (migrations_legacy_20260209/..._add_eventlog_immutable;
+# pas de modèle EventLog dans schema.prisma). Le pipeline n'écrit que les
+# valeurs de EventTypeEnum / ActorTypeEnum, incluses dans les enums Postgres.
+event_logs = sa.Table(
+    "event_logs",
+    metadata,
+    sa.Column("id", sa.String, primary_key=True),
+    sa.Column("tenantId", sa.String, nullable=False),
+    sa.Column("timestamp", sa.DateTime, nullable=False),
+    sa.Column(
+        "eventType",
+        _prisma_enum("EventType", tuple(e.value for e in EventTypeEnum)),
+        nullable=False,
+    ),
+    sa.Column("entityType", sa.String, nullable=False),
+    sa.Column("entityId", sa.String, nullable=False),
+    sa.Column(
+        "actorType",
+        _prisma_enum("ActorType", tuple(e.value for e in ActorTypeEnum)),
+        nullable=False,
+    ),
+    sa.Column("actorId", sa.String),
+    sa.Column(
+        "metadata",
+        sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+        nullable=False,
+    ),
+    sa.Column("immutable", sa.Boolean, nullable=False, default=True),
+    sa.Column("checksum", sa.String, nullable=False),
+    sa.Column("previousEventId", sa.String),
+    sa.Index("event_logs_tenantId_idx", "tenantId"),
+)
+
+
+def create_schema(engine: sa.Engine) -> None:
+    """
+    Crée les tables (développement local; en production: migrations Prisma,
+    qui créent aussi les types enum Postgres)
+    """
+    metadata.create_all(engine)
+
+
+def _iso_utc(value: datetime) -> str:
+    """Date au format de fetch-units (toISOString: UTC, suffixe Z)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (
+        value.astimezone(timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def _parse_utc(value: str) -> datetime:
+    """Datetime naïve UTC (colonnes DateTime de Prisma) depuis une chaîne ISO"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _source_metadata(raw: Optional[str]) -> Dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _enable_sqlite_wal(dbapi_connection: Any, connection_record: Any) -> None:
+    """WAL: un lecteur ouvert ne bloque pas l'écriture des EventLog"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+class SqlStorage:
+    """Engine SQLAlchemy partagé et composants du mode base directe"""
+
+    def __init__(self, engine_or_url: Any = PIPELINE_DATABASE_URL):
+        """
+        Args:
+            engine_or_url: Engine existant ou URL SQLAlchemy
+        """
+        if isinstance(engine_or_url, sa.Engine):
+            self.engine = engine_or_url
+        else:
+            if not engine_or_url:
+                raise ValueError("PIPELINE_DATABASE_URL requis en mode sql")
+            self.engine = sa.create_engine(engine_or_url, pool_pre_ping=True)
+
+        if self.engine.dialect.name == "sqlite":
+            # Curseur de stream_pages ouvert pendant les écritures de la page
+            sa.event.listen(self.engine, "connect", _enable_sqlite_wal)
+
+    def event_preparer(self) -> "SqlEventPreparer":
+        return SqlEventPreparer(self.engine)
+
+    def duplicate_checker(self) -> "SqlDuplicateChecker":
+        return SqlDuplicateChecker(self.engine)
+
+    def event_logger(self) -> "SqlEventLogger":
+        return SqlEventLogger(self.engine)
+
+    def dispose(self) -> None:
+        self.engine.dispose()
+
+
+class SqlEventPreparer(EventPreparer):
+    """EventPreparer lisant InformationUnit directement"""
+
+    def __init__(self, engine: sa.Engine):
+        super().__init__(api_base_url=str(engine.url))
+        self.engine = engine
+
+    def fetch_information_units(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Unités du statut, les plus récentes d'abord (cf. fetch-units)"""
+        query = self._units_query(tenant_id, status).limit(limit)
+        try:
+            with self.engine.connect() as conn:
+                return [self._raw_unit(row, tenant_id) for row in conn.execute(query)]
+        except SQLAlchemyError as e:
+            logger.error("❌ Erreur lors du fetch: %s", e)
+            return []
+
+    def fetch_page(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        limit: int = PIPELINE_BATCH_SIZE,
+        cursor: Optional[str] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Page par keyset (receivedAt, id) après l'unité `cursor`"""
+        try:
+            with self.engine.connect() as conn:
+                query = self._units_query(tenant_id, status, since)
+                if cursor:
+                    query = self._after_cursor(conn, query, cursor, since)
+                rows = conn.execute(query.limit(limit)).all()
+        except SQLAlchemyError as e:
+            logger.error("❌ Erreur lors du fetch: %s", e)
+            return [], None
+
+        units = [self._raw_unit(row, tenant_id) for row in rows]
+        next_cursor = units[-1]["id"] if len(units) == limit else None
+        return units, next_cursor
+
+    def stream_pages(
+        self,
+        tenant_id: str,
+        status: str = "RECEIVED",
+        page_size: int = PIPELINE_BATCH_SIZE,
+        max_units: Optional[int] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Une seule requête sur curseur serveur, lue par pages de `page_size`
+
+        La connexion reste ouverte pendant le parcours (le pipeline traite
+        chaque page avant de demander la suivante).
+        """
+        query = self._units_query(tenant_id, status, since)
+        if max_units is not None:
+            query = query.limit(max_units)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=page_size
+            ).execute(query)
+            for page_number, rows in enumerate(result.partitions(page_size), 1):
+                logger.info(
+                    "🔄 [PREPARE] Page %d: %d unités (base directe)",
+                    page_number,
+                    len(rows),
+                )
+                yield [self._raw_unit(row, tenant_id) for row in rows]
+
+    @staticmethod
+    def _units_query(
+        tenant_id: str,
+        status: str,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> sa.Select:
+        """
+        Unités du tenant et du statut; après le watermark `since` par ordre
+        croissant, sinon les plus récentes d'abord (comme fetch-units)
+        """
+        units = information_units.c
+        query = sa.select(
+            units.id,
+            units.source,
+            units.content,
+            units.contentHash,
+            units.receivedAt,
+            units.sourceMetadata,
+            units.linkedWorkspaceId,
+        ).where(units.tenantId == tenant_id, units.currentStatus == status)
+
+        if since:
+            received_at = _parse_utc(since[0])
+            query = query.where(
+                sa.or_(
+                    units.receivedAt > received_at,
+                    sa.and_(units.receivedAt == received_at, units.id > since[1]),
+                )
+            )
+            return query.order_by(units.receivedAt.asc(), units.id.asc())
+
+        return query.order_by(units.receivedAt.desc(), units.id.desc())
+
+    @staticmethod
+    def _after_cursor(
+        conn: sa.Connection,
+        query: sa.Select,
+        cursor: str,
+        since: Optional[Tuple[str, str]],
+    ) -> sa.Select:
+        """Restreint `query` aux unités qui suivent l'unité `cursor`"""
+        units = information_units.c
+        received_at = conn.execute(
+            sa.select(units.receivedAt).where(units.id == cursor)
+        ).scalar()
+        if received_at is None:
+            return query
+
+        if since:
+            return query.where(
+                sa.or_(
+                    units.receivedAt > received_at,
+                    sa.and_(units.receivedAt == received_at, units.id > cursor),
+                )
+            )
+        return query.where(
+            sa.or_(
+                units.receivedAt < received_at,
+                sa.and_(units.receivedAt == received_at, units.id < cursor),
+            )
+        )
+
+    @staticmethod
+    def _raw_unit(row: sa.Row, tenant_id: str) -> Dict[str, Any]:
+        """
+        Unité brute au format de fetch-units, avec l'expéditeur et l'objet
+        de sourceMetadata à plat (clés lues par _extract_source_metadata)
+        """
+        source_metadata = _source_metadata(row.sourceMetadata)
+        return {
+            "id": row.id,
+            "tenantId": tenant_id,
+            "source": row.source,
+            "content": row.content,
+            "contentHash": row.contentHash,
+            "receivedAt": _iso_utc(row.receivedAt),
+            "sourceMetadata": row.sourceMetadata,
+            "linkedWorkspaceId": row.linkedWorkspaceId,
+            "senderEmail": source_metadata.get("sender_email"),
+            "senderName": source_metadata.get("sender_name"),
+            "subject": source_metadata.get("subject"),
+        }
+
+
+class SqlDuplicateChecker(DuplicateChecker):
+    """DuplicateChecker cherchant l'historique directement en base"""
+
+    def __init__(self, engine: sa.Engine, **kwargs: Any):
+        super().__init__(api_base_url=str(engine.url), **kwargs)
+        self.engine = engine
+
+    def _check_against_history(
+        self,
+        unit: InformationUnitSchema,
+        tenant_id: str,
+        limit: int = 50,
+    ) -> List[DuplicateDetectionSchema]:
+        return self._check_against_history_batch([unit], tenant_id, limit)
+
+    def _check_against_history_batch(
+        self,
+        units: List[InformationUnitSchema],
+        tenant_id: str,
+        limit: int = 50,
+    ) -> List[DuplicateDetectionSchema]:
+        """Une requête IN (contentHash...) par chunk; l'unité elle-même exclue"""
+        duplicates: List[DuplicateDetectionSchema] = []
+        per_hash = min(limit, HISTORY_CANDIDATES_PER_HASH)
+
+        for chunk_start in range(0, len(units), self.history_chunk_size):
+            chunk = units[chunk_start : chunk_start + self.history_chunk_size]
+            try:
+                rows_by_hash = self._candidates_by_hash(chunk, tenant_id)
+            except SQLAlchemyError as e:
+                logger.warning(
+                    "   ⚠️  Erreur check historique (unités %d-%d): %s",
+                    chunk_start,
+                    chunk_start + len(chunk) - 1,
+                    e,
+                )
+                continue
+
+            for unit in chunk:
+                candidates = [
+                    self._candidate(unit, row)
+                    for row in rows_by_hash.get(unit.content_hash, [])
+                    if row.id != unit.id
+                ][:per_hash]
+                if candidates:
+                    duplicates.extend(self._match_history_candidates(unit, candidates))
+
+        return duplicates
+
+    def _candidates_by_hash(
+        self,
+        chunk: List[InformationUnitSchema],
+        tenant_id: str,
+    ) -> Dict[str, List[sa.Row]]:
+        units = information_units.c
+        query = sa.select(
+            units.id, units.contentHash, units.sourceMetadata, units.receivedAt
+        ).where(
+            units.tenantId == tenant_id,
+            units.contentHash.in_({unit.content_hash for unit in chunk}),
+        )
+
+        rows_by_hash: Dict[str, List[sa.Row]] = {}
+        with self.engine.connect() as conn:
+            for row in conn.execute(query):
+                rows_by_hash.setdefault(row.contentHash, []).append(row)
+        return rows_by_hash
+
+    @staticmethod
+    def _candidate(unit: InformationUnitSchema, row: sa.Row) -> Dict[str, Any]:
+        """Candidat au format de find-duplicate-candidates"""
+        received_at = unit.received_at
+        if received_at.tzinfo is not None:
+            received_at = received_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return {
+            "id": row.id,
+            "content_hash": row.contentHash,
+            "senderEmail": _source_metadata(row.sourceMetadata).get("sender_email"),
+            "receivedAt": _iso_utc(row.receivedAt),
+            "reason": "exact_hash_match",
+            "timeDiffSeconds": abs((received_at - row.receivedAt).total_seconds()),
+        }
+
+
+class SqlEventLogger(EventLogger):
+    """EventLogger insérant les EventLog directement en base"""
+
+    def __init__(self, engine: sa.Engine, **kwargs: Any):
+        super().__init__(api_base_url=str(engine.url), **kwargs)
+        self.engine = engine
+        self._insert = self._insert_ignoring_existing(engine.dialect.name)
+
+    def persist_events(
+        self,
+        events: List[EventLogSchema],
+        tenant_id: str,
+    ) -> Dict[str, Any]:
+        return self.persist_payloads(
+            [self.event_payload(event) for event in events], tenant_id
+        )
+
+    def persist_payloads(
+        self,
+        payloads: List[Dict[str, Any]],
+        tenant_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Un INSERT groupé (executemany) et une transaction par chunk
+
+        Même résultat que EventLogger.persist_payloads (chunks compris):
+        checkpoints et confirmed_event_ids fonctionnent à l'identique.
+        """
+        if not payloads:
+            return {"success": True, "created_count": 0, "failed_count": 0}
+
+        size = self.chunk_size
+        chunk_results = [
+            self._insert_chunk(index, tenant_id, payloads[start : start + size])
+            for index, start in enumerate(range(0, len(payloads), size))
+        ]
+        return self._report_persist_result(self._merge_chunk_results(chunk_results))
+
+    def _insert_chunk(
+        self,
+        index: int,
+        tenant_id: str,
+        chunk: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        rows = [self._row(payload, tenant_id) for payload in chunk]
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(self._insert, rows)
+        except SQLAlchemyError as e:
+            return self._chunk_result(index, len(chunk), 1, error=str(e))
+
+        # rowcount: lignes réellement insérées (-1 si le driver l'ignore)
+        created = result.rowcount if result.rowcount >= 0 else len(chunk)
+        return self._chunk_result(
+            index, len(chunk), 1, result={"created_count": created, "failed_count": 0}
+        )
+
+    @staticmethod
+    def _insert_ignoring_existing(dialect_name: str) -> sa.Insert:
+        """INSERT qui ignore les id déjà présents (renvoi idempotent)"""
+        if dialect_name == "postgresql":
+            return postgresql.insert(event_logs).on_conflict_do_nothing(
+                index_elements=["id"]
+            )
+        if dialect_name == "sqlite":
+            return sqlite.insert(event_logs).on_conflict_do_nothing(
+                index_elements=["id"]
+            )
+        return event_logs.insert().prefix_with("IGNORE")  # MySQL / MariaDB
+
+    @staticmethod
+    def _row(payload: Dict[str, Any], tenant_id: str) -> Dict[str, Any]:
+        """Ligne EventLog depuis le format de create-events"""
+        return {
+            "id": payload["id"],
+            "tenantId": tenant_id,
+            "timestamp": _parse_utc(payload["timestamp"]),
+            "eventType": payload["eventType"],
+            "entityType": payload["entityType"],
+            "entityId": payload["entityId"],
+            "actorType": payload["actorType"],
+            "actorId": payload["actorId"],
+            "metadata": payload["metadata"],
+            "immutable": payload["immutable"],
+            "checksum": payload["checksum"],
+            "previousEventId": payload["previousEventId"],
+        }
+
+
+_shared_storage: Optional[SqlStorage] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_storage() -> SqlStorage:
+    """Storage du processus (un pool de connexions pour tous les pipelines)"""
+    global _shared_storage
+
+    with _shared_lock:
+        if _shared_storage is None:
+            _shared_storage = SqlStorage(PIPELINE_DATABASE_URL)
+        return _shared_storage
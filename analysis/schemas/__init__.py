@@ -12,7 +12,9 @@ from .models import (
     JustificationSchema,
     PipelineResultSchema,
     PriorityEnum,
+    RawUnitPayload,
     RuleApplicationSchema,
+    UnitRecord,
 )
 
 __all__ = [
@@ -20,6 +22,8 @@ __all__ = [
     "EventTypeEnum",
     "PriorityEnum",
     "InformationUnitSchema",
+    "RawUnitPayload",
+    "UnitRecord",
     "RuleApplicationSchema",
     "ClassificationResultSchema",
     "DuplicateDetectionSchema",
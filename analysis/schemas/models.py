@@ -11,7 +11,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from typing_extensions import TypedDict
 
 
 class ActorTypeEnum(str, Enum):
@@ -63,6 +64,84 @@ class InformationUnitSchema(BaseModel):
     model_config = ConfigDict(use_enum_values=True)
 
 
+class RawUnitPayload(TypedDict, total=False):
+    """Unité brute de fetch-units (validée en bloc par TypeAdapter)"""
+
+    id: str
+    tenantId: str
+    source: str
+    content: str
+    receivedAt: Optional[datetime]
+    classifiedAt: Optional[datetime]
+    analyzedAt: Optional[datetime]
+    linkedWorkspaceId: Optional[str]
+
+
+class UnitRecord:
+    """
+    Unité normalisée interne au pipeline (__slots__, sans validation)
+
+    Mêmes attributs que InformationUnitSchema; to_schema() à la frontière
+    de l'API.
+    """
+
+    __slots__ = (
+        "id",
+        "tenant_id",
+        "source",
+        "content",
+        "content_hash",
+        "received_at",
+        "classified_at",
+        "analyzed_at",
+        "source_metadata",
+        "linked_workspace_id",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        tenant_id: str,
+        source: str,
+        content: str,
+        content_hash: str,
+        received_at: datetime,
+        classified_at: Optional[datetime] = None,
+        analyzed_at: Optional[datetime] = None,
+        source_metadata: Optional[Dict[str, Any]] = None,
+        linked_workspace_id: Optional[str] = None,
+    ):
+        self.id = id
+        self.tenant_id = tenant_id
+        self.source = source
+        self.content = content
+        self.content_hash = content_hash
+        self.received_at = received_at
+        self.classified_at = classified_at
+        self.analyzed_at = analyzed_at
+        self.source_metadata = source_metadata
+        self.linked_workspace_id = linked_workspace_id
+
+    @classmethod
+    def from_schema(cls, unit: InformationUnitSchema) -> "UnitRecord":
+        return cls(**{name: getattr(unit, name) for name in cls.__slots__})
+
+    def to_schema(self) -> InformationUnitSchema:
+        return InformationUnitSchema(
+            **{name: getattr(self, name) for name in self.__slots__}
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UnitRecord):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f"UnitRecord(id={self.id!r}, tenant_id={self.tenant_id!r})"
+
+
 class RuleApplicationSchema(BaseModel):
     """Résultat d'application d'une règle"""
 
@@ -131,9 +210,12 @@ class EventLogSchema(BaseModel):
 
     # Immuabilité
     immutable: bool = True
-    checksum: str  # SHA-256
+    checksum: str = ""  # SHA-256 du JSON canonique de metadata ("" = non signé)
     previous_event_id: Optional[str] = None
 
+    # JSON canonique de metadata, sérialisé une fois (checksum + corps HTTP)
+    _metadata_json: Optional[bytes] = PrivateAttr(default=None)
+
     model_config = ConfigDict(use_enum_values=True)
 
 
@@ -158,6 +240,18 @@ class JustificationSchema(BaseModel):
     validation_status: Optional[str] = None  # AUTO_CONFIDENCE_HIGH, PENDING_REVIEW
 
 
+class StageMetricsSchema(BaseModel):
+    """Mesures d'une étape du pipeline (cumulées sur les pages en streaming)"""
+
+    stage: str  # 'fetch', 'normalize', 'duplicates', 'classify', 'events', 'persist'
+    calls: int
+    wall_seconds: float
+    cpu_seconds: float  # CPU du process (hors workers de classification)
+    items: int
+    items_per_second: float
+    peak_rss_bytes: Optional[int] = None  # Pic RSS du process en fin d'étape
+
+
 class PipelineResultSchema(BaseModel):
     """Résultat complet d'une exécution du pipeline"""
 
@@ -183,6 +277,9 @@ class PipelineResultSchema(BaseModel):
 
     # Métriques
     processing_time_seconds: float
+    stage_metrics: List[StageMetricsSchema] = []
+    # ex: classification_cache_hits / classification_cache_misses
+    counters: Dict[str, int] = {}
     errors: List[Dict[str, str]] = []
 
     model_config = ConfigDict(use_enum_values=True)
@@ -0,0 +1,38 @@
+"""
+factories.py
+
+Fabrique d'InformationUnitSchema partagée par les tests du pipeline
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from analysis.schemas.models import InformationUnitSchema
+
+
+def make_unit(
+    unit_id: str,
+    content: str,
+    received_at: Optional[datetime] = None,
+    source_metadata: Optional[Dict[str, Any]] = None,
+    tenant_id: str = "tenant1",
+    content_hash: Optional[str] = None,
+) -> InformationUnitSchema:
+    """
+    Unité normalisée de test
+
+    Par défaut: reçue maintenant, sans métadonnées source, content_hash =
+    SHA-256 du contenu (comme prepare_events)
+    """
+    return InformationUnitSchema(
+        id=unit_id,
+        source="EMAIL",
+        content=content,
+        content_hash=(
+            content_hash or hashlib.sha256(content.encode("utf-8")).hexdigest()
+        ),
+        tenant_id=tenant_id,
+        received_at=received_at or datetime.now(),
+        source_metadata=source_metadata or {},
+    )
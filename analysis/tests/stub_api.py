@@ -0,0 +1,226 @@
+"""
+stub_api.py
+
+Serveur HTTP local qui simule les endpoints /api/analysis/* de Next.js
+(tests et benchmarks, sans base de données ni réseau)
+"""
+
+import gzip
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class StubAnalysisAPI:
+    """Stand-in de l'API Next.js, démarré dans un thread local"""
+
+    def __init__(
+        self,
+        history: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        units: Optional[List[Dict[str, Any]]] = None,
+        batch_route: bool = True,
+    ):
+        """
+        Args:
+            history: Candidats historiques indexés par content_hash
+            units: Unités brutes servies par fetch-units (format Next.js)
+            batch_route: Sert POST find-duplicate-candidates/batch (404 sinon)
+        """
+        self.history = history or {}
+        self.units = units or []
+        self.batch_route = batch_route
+        self.created_events: List[Dict[str, Any]] = []
+        self._created_ids = set()
+        # Statuts HTTP renvoyés (dans l'ordre) par les prochains create-events
+        self.create_events_failures: List[int] = []
+        self._lock = threading.Lock()
+        self.requests = Counter()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.requests.values())
+
+    def __enter__(self) -> "StubAnalysisAPI":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def find_candidates(self, content_hash: str) -> List[Dict[str, Any]]:
+        return self.history.get(content_hash, [])
+
+    def reset_events(self) -> None:
+        with self._lock:
+            self.created_events.clear()
+            self._created_ids.clear()
+
+    def fetch_units(
+        self,
+        status: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        since: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Page de fetch-units; le curseur est l'id de la dernière unité servie
+
+        Avec `since` (watermark receivedAt, id): unités suivantes uniquement,
+        par ordre croissant.
+        """
+        matching = [
+            u
+            for u in self.units
+            if u.get("status", "RECEIVED") == status
+            and (tenant_id is None or u.get("tenantId", tenant_id) == tenant_id)
+        ]
+        if since:
+            matching = sorted(
+                (u for u in matching if (u["receivedAt"], u["id"]) > tuple(since)),
+                key=lambda u: (u["receivedAt"], u["id"]),
+            )
+        start = 0
+        if cursor:
+            start = next(
+                (i + 1 for i, u in enumerate(matching) if u["id"] == cursor),
+                len(matching),
+            )
+        page = matching[start : start + limit]
+        next_cursor = page[-1]["id"] if len(page) == limit else None
+        return {"count": len(page), "units": page, "nextCursor": next_cursor}
+
+    def create_events(self, events: List[Dict[str, Any]]) -> Optional[int]:
+        """Insère les événements (id déjà vus ignorés); statut d'échec injecté sinon"""
+        with self._lock:
+            if self.create_events_failures:
+                return self.create_events_failures.pop(0)
+            for event in events:
+                if event["id"] not in self._created_ids:
+                    self._created_ids.add(event["id"])
+                    self.created_events.append(event)
+        return None
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, body: Dict[str, Any], status: int = 200) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                return json.loads(body or b"{}")
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                api.requests[("GET", url.path)] += 1
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+                if url.path == "/api/analysis/find-duplicate-candidates":
+                    candidates = api.find_candidates(params.get("contentHash", ""))
+                    self._send_json({"candidates": candidates})
+                elif url.path == "/api/analysis/fetch-units":
+                    page = api.fetch_units(
+                        params.get("status", "RECEIVED"),
+                        int(params.get("limit", 100)),
+                        params.get("cursor"),
+                        params.get("tenantId"),
+                        (
+                            (params["afterReceivedAt"], params["afterId"])
+                            if "afterReceivedAt" in params
+                            else None
+                        ),
+                    )
+                    self._send_json(page)
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                api.requests[("POST", url.path)] += 1
+                body = self._read_json()
+
+                if (
+                    url.path == "/api/analysis/find-duplicate-candidates/batch"
+                    and api.batch_route
+                ):
+                    results = [
+                        {
+                            "key": query["key"],
+                            "candidates": api.find_candidates(query["contentHash"]),
+                        }
+                        for query in body.get("queries", [])
+                    ]
+                    self._send_json({"results": results})
+                elif url.path == "/api/analysis/create-events":
+                    events = body.get("events", [])
+                    failure = api.create_events(events)
+                    if failure:
+                        self._send_json({"error": "injected"}, status=failure)
+                    else:
+                        self._send_json(
+                            {
+                                "success": True,
+                                "created_count": len(events),
+                                "failed_count": 0,
+                            }
+                        )
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+        return Handler
+
+
+def make_raw_units(count: int, tenant_id: str = "tenant1") -> List[Dict[str, Any]]:
+    """Unités brutes au format de fetch-units"""
+    contents = [
+        "OQTF prononcée. Délai: 3 jours pour appel.",
+        "Référé devant le tribunal administratif.",
+        "Bonjour, pièces jointes.",
+    ]
+    return [
+        {
+            "id": f"unit-{i:04d}",
+            "tenantId": tenant_id,
+            "source": "EMAIL",
+            "content": f"{contents[i % len(contents)]} Dossier {i}.",
+            "receivedAt": "2026-02-01T10:00:00Z",
+            "senderEmail": "greffe@justice.fr",
+        }
+        for i in range(count)
+    ]
@@ -0,0 +1,151 @@
+"""
+test_async_pipeline.py
+
+Tests du pipeline asynchrone (httpx.AsyncClient) contre StubAnalysisAPI
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from analysis.pipelines.async_pipeline import (  # noqa: E402
+    AsyncAnalysisPipeline,
+    AsyncDuplicateChecker,
+    create_async_client,
+    execute_tenants,
+)
+from analysis.pipelines.checkpoints import CheckpointStore  # noqa: E402
+from analysis.pipelines.detect_duplicates import DuplicateChecker  # noqa: E402
+from analysis.pipelines.pipeline import AnalysisPipeline  # noqa: E402
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units  # noqa: E402
+from analysis.tests.test_history_lookup import (  # noqa: E402
+    as_tuples,
+    make_history,
+    make_units,
+)
+
+
+class TestAsyncHistoryLookup:
+    """Tests pour AsyncDuplicateChecker"""
+
+    def test_concurrent_chunks_match_sync_lookup(self):
+        units = make_units(200)
+
+        async def run(base_url):
+            async with create_async_client() as client:
+                checker = AsyncDuplicateChecker(
+                    client,
+                    base_url,
+                    batch_history_lookup=True,
+                    history_chunk_size=32,
+                    max_concurrency=4,
+                )
+                return await checker._check_against_history_batch(units, "tenant1")
+
+        with StubAnalysisAPI(history=make_history(200)) as api:
+            expected = DuplicateChecker(
+                api.base_url, batch_history_lookup=True, history_chunk_size=32
+            )._check_against_history_batch(units, "tenant1")
+            duplicates = asyncio.run(run(api.base_url))
+
+        assert as_tuples(duplicates) == as_tuples(expected)
+        assert len(duplicates) == 20
+
+    def test_missing_batch_route_falls_back_to_get(self):
+        units = make_units(40)
+
+        async def run(base_url):
+            async with create_async_client() as client:
+                checker = AsyncDuplicateChecker(
+                    client, base_url, batch_history_lookup=True, history_chunk_size=16
+                )
+                duplicates = await checker._check_against_history_batch(
+                    units, "tenant1"
+                )
+                return duplicates, checker.batch_history_lookup
+
+        with StubAnalysisAPI(history=make_history(40), batch_route=False) as api:
+            duplicates, batch_mode = asyncio.run(run(api.base_url))
+            gets = api.requests[("GET", "/api/analysis/find-duplicate-candidates")]
+
+        assert [d.duplicate_unit_id for d in duplicates] == [
+            "unit-0000",
+            "unit-0010",
+            "unit-0020",
+            "unit-0030",
+        ]
+        assert batch_mode is False
+        assert gets == 40
+
+
+class TestAsyncAnalysisPipeline:
+    """Tests pour AsyncAnalysisPipeline.execute"""
+
+    def test_execute_matches_sync_pipeline(self):
+        async def run(base_url):
+            async with AsyncAnalysisPipeline("tenant1", base_url) as pipeline:
+                return await pipeline.execute(persist=True)
+
+        with StubAnalysisAPI(units=make_raw_units(30)) as api:
+            expected = AnalysisPipeline("tenant1", api.base_url).execute(persist=False)
+            result = asyncio.run(run(api.base_url))
+            created = len(api.created_events)
+
+        assert result.units_classified == expected.units_classified == 30
+        assert result.events_generated == expected.events_generated
+        assert result.duplicates_detected == expected.duplicates_detected
+        assert created == result.events_generated
+
+    def test_tenants_share_one_client(self):
+        units = make_raw_units(10, "tenant1") + make_raw_units(7, "tenant2")
+        with StubAnalysisAPI(units=units) as api:
+            results = asyncio.run(
+                execute_tenants(["tenant1", "tenant2"], api.base_url, persist=False)
+            )
+
+        assert [r.units_classified for r in results] == [10, 7]
+
+    def test_execute_streaming_pages(self):
+        async def run(base_url):
+            async with AsyncAnalysisPipeline("tenant1", base_url) as pipeline:
+                return await pipeline.execute_streaming(page_size=25, persist=False)
+
+        with StubAnalysisAPI(units=make_raw_units(60)) as api:
+            result = asyncio.run(run(api.base_url))
+            fetches = api.requests[("GET", "/api/analysis/fetch-units")]
+
+        assert result.units_classified == 60
+        assert fetches == 3
+
+    def test_execute_streaming_checkpoints_and_resumes(self):
+        async def run(base_url, store):
+            async with AsyncAnalysisPipeline(
+                "tenant1", base_url, checkpoints=store
+            ) as pipeline:
+                return await pipeline.execute_streaming(page_size=25)
+
+        units = make_raw_units(60)
+        with StubAnalysisAPI(units=units) as api, CheckpointStore(":memory:") as store:
+            api.create_events_failures = [503] * 4  # premier chunk en échec
+            first = asyncio.run(run(api.base_url, store))
+            pending = len(store.pending_events("tenant1"))
+
+            units.extend(
+                dict(unit, id=f"new-{i:04d}", receivedAt="2026-02-02T10:00:00Z")
+                for i, unit in enumerate(make_raw_units(5))
+            )
+            second = asyncio.run(run(api.base_url, store))
+            created = len(api.created_events)
+
+            assert store.pending_events("tenant1") == []
+
+        assert first.units_classified == 60
+        assert pending > 0
+        assert second.units_classified == 5
+        assert created == first.events_generated + second.events_generated
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
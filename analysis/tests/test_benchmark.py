@@ -0,0 +1,120 @@
+"""
+test_benchmark.py
+
+Tests du benchmark de bout en bout (corpus, percentiles, baseline)
+"""
+
+import pytest
+
+from analysis.benchmark import (
+    compare_to_baseline,
+    generate_corpus,
+    measure_normalization,
+    percentile,
+    run_scenario,
+)
+
+
+def make_report(run_p50=1.0, units_per_second=1000.0, classify_p50=0.5):
+    return {
+        "scenarios": {
+            "s1": {
+                "run_p50_seconds": run_p50,
+                "units_per_second": units_per_second,
+                "peak_memory_bytes": 10_000_000,
+                "stages": {"classify": {"p50_seconds": classify_p50, "p99_seconds": 1}},
+            }
+        }
+    }
+
+
+class TestCorpus:
+    """Tests pour generate_corpus"""
+
+    def test_deterministic_and_split_by_tenant(self):
+        first = generate_corpus(300, 0.3, tenants=3)
+        second = generate_corpus(300, 0.3, tenants=3)
+
+        assert first == second
+        tenants = {unit["tenantId"] for unit in first["units"]}
+        assert tenants == {"bench-tenant-0", "bench-tenant-1", "bench-tenant-2"}
+
+    def test_duplicate_rate(self):
+        units = generate_corpus(1000, 0.4)["units"]
+        distinct = len({unit["content"] for unit in units})
+
+        assert distinct < 900
+
+
+class TestBaseline:
+    """Tests pour percentile et compare_to_baseline"""
+
+    def test_percentile_nearest_rank(self):
+        values = [5, 1, 4, 2, 3]
+        assert percentile(values, 50) == 3
+        assert percentile(values, 99) == 5
+        assert percentile([], 50) == 0.0
+
+    def test_no_regression_within_threshold(self):
+        current = make_report(run_p50=1.1, units_per_second=910)
+        assert compare_to_baseline(current, make_report(), threshold=0.2) == []
+
+    def test_slower_stage_is_a_regression(self):
+        current = make_report(classify_p50=0.8)
+        regressions = compare_to_baseline(current, make_report(), threshold=0.2)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("s1: classify p50")
+
+    def test_lower_throughput_is_a_regression(self):
+        current = make_report(units_per_second=500)
+        regressions = compare_to_baseline(current, make_report(), threshold=0.2)
+
+        assert [r.split(" ")[1] for r in regressions] == ["unités/s"]
+
+    def test_improvement_is_not_a_regression(self):
+        current = make_report(run_p50=0.5, units_per_second=3000, classify_p50=0.1)
+        assert compare_to_baseline(current, make_report()) == []
+
+
+class TestNormalization:
+    """Tests pour measure_normalization"""
+
+    def test_bulk_path_allocates_less(self):
+        result = measure_normalization(500)
+
+        assert result["units"] == 500
+        bulk, per_unit = result["bulk"], result["per_unit"]
+        assert bulk["allocated_blocks"] < per_unit["allocated_blocks"]
+        assert bulk["microseconds_per_unit"] > 0
+
+
+class TestRunScenario:
+    """Test de fumée d'un scénario complet contre StubAnalysisAPI"""
+
+    def test_small_scenario(self):
+        scenario = {
+            "name": "test",
+            "units": 60,
+            "duplicate_rate": 0.2,
+            "tenants": 2,
+            "words": (5, 30),
+        }
+        result = run_scenario(scenario, repeats=2)
+
+        assert result["units"] == 60
+        assert result["tenants"] == 2
+        assert set(result["stages"]) == {
+            "fetch",
+            "normalize",
+            "duplicates",
+            "classify",
+            "events",
+            "persist",
+        }
+        assert result["units_per_second"] > 0
+        assert result["peak_memory_bytes"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,140 @@
+"""
+test_checkpoints.py
+
+Tests de la reprise incrémentale (CheckpointStore) et de
+AnalysisPipeline.execute_streaming avec checkpoints
+"""
+
+import pytest
+
+from analysis.pipelines.checkpoints import CheckpointStore
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+
+def run_pipeline(api, store, **kwargs):
+    with AnalysisPipeline("tenant1", api.base_url, checkpoints=store) as pipeline:
+        return pipeline.execute_streaming(page_size=25, **kwargs)
+
+
+class TestCheckpointStore:
+    """Tests pour CheckpointStore"""
+
+    def test_page_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "checkpoints.sqlite3")
+        with CheckpointStore(path) as store:
+            store.record_page(
+                "tenant1",
+                "RECEIVED",
+                "exec_1",
+                ("2026-02-01T10:00:00Z", "unit-0001"),
+                ["unit-0000", "unit-0001"],
+                [{"id": "evt-1"}, {"id": "evt-2"}],
+            )
+            store.mark_persisted("tenant1", ["evt-1"])
+
+        with CheckpointStore(path) as store:
+            assert store.get_watermark("tenant1", "RECEIVED") == (
+                "2026-02-01T10:00:00Z",
+                "unit-0001",
+            )
+            assert store.get_watermark("tenant2", "RECEIVED") is None
+            assert store.processed_ids("tenant1", ["unit-0001", "unit-0002"]) == {
+                "unit-0001"
+            }
+            assert store.pending_events("tenant1") == [{"id": "evt-2"}]
+            assert store.persisted_ids("tenant1") == {"evt-1"}
+
+    def test_watermark_is_updated(self):
+        with CheckpointStore(":memory:") as store:
+            for unit_id in ["unit-0001", "unit-0002"]:
+                store.record_page(
+                    "tenant1", "RECEIVED", "exec_1", ("t", unit_id), [unit_id], []
+                )
+
+            assert store.get_watermark("tenant1", "RECEIVED") == ("t", "unit-0002")
+
+
+class TestIncrementalPipeline:
+    """Tests pour AnalysisPipeline.execute_streaming(checkpoints=...)"""
+
+    def test_second_run_processes_only_new_units(self):
+        units = make_raw_units(60)
+        with StubAnalysisAPI(units=units) as api, CheckpointStore(":memory:") as store:
+            first = run_pipeline(api, store)
+            again = run_pipeline(api, store)
+            units.extend(
+                dict(unit, id=f"new-{i:04d}", receivedAt="2026-02-02T10:00:00Z")
+                for i, unit in enumerate(make_raw_units(10))
+            )
+            incremental = run_pipeline(api, store)
+            created = len(api.created_events)
+            pending = store.pending_events("tenant1")
+
+        assert first.units_classified == 60
+        assert again.units_classified == 0
+        assert incremental.units_classified == 10
+        assert created == first.events_generated + incremental.events_generated
+        assert pending == []
+
+    def test_resume_after_crash(self):
+        with StubAnalysisAPI(units=make_raw_units(100)) as api:
+            with CheckpointStore(":memory:") as store:
+                crashing = AnalysisPipeline(
+                    "tenant1", api.base_url, checkpoints=store
+                )
+                persist_payloads = crashing.event_logger.persist_payloads
+                calls = []
+
+                def crash_on_second_page(payloads, tenant_id):
+                    calls.append(len(payloads))
+                    if len(calls) == 2:
+                        raise RuntimeError("crash")
+                    return persist_payloads(payloads, tenant_id)
+
+                crashing.event_logger.persist_payloads = crash_on_second_page
+                with pytest.raises(RuntimeError):
+                    crashing.execute_streaming(page_size=25)
+
+                pending = len(store.pending_events("tenant1"))
+                resumed = run_pipeline(api, store)
+                created_ids = [event["id"] for event in api.created_events]
+                persisted = store.persisted_ids("tenant1")
+                processed = store.processed_ids(
+                    "tenant1", [unit["id"] for unit in make_raw_units(100)]
+                )
+
+        # Page 2 enregistrée mais non persistée: renvoyée, pas reclassifiée
+        assert pending == calls[1]
+        assert resumed.units_classified == 50
+        assert len(processed) == 100
+        assert len(created_ids) == len(set(created_ids))
+        assert set(created_ids) == persisted
+
+    def test_failed_chunk_stays_pending_and_is_resent(self):
+        with StubAnalysisAPI(units=make_raw_units(25)) as api:
+            api.create_events_failures = [400]
+            with CheckpointStore(":memory:") as store:
+                first = run_pipeline(api, store)
+                pending = len(store.pending_events("tenant1"))
+                run_pipeline(api, store)
+                pending_after = len(store.pending_events("tenant1"))
+            created = len(api.created_events)
+
+        assert pending == first.events_generated
+        assert pending_after == 0
+        assert created == first.events_generated
+
+    def test_dry_run_does_not_checkpoint(self):
+        with StubAnalysisAPI(units=make_raw_units(30)) as api:
+            with CheckpointStore(":memory:") as store:
+                run_pipeline(api, store, persist=False)
+                watermark = store.get_watermark("tenant1", "RECEIVED")
+                again = run_pipeline(api, store, persist=False)
+
+        assert watermark is None
+        assert again.units_classified == 30
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,162 @@
+"""
+test_classification_cache.py
+
+Tests du cache de classification (ClassificationCache) et de son
+utilisation par RuleEngine et AnalysisPipeline
+"""
+
+import pytest
+
+from analysis.pipelines.classification_cache import (
+    ClassificationCache,
+    cache_key,
+    sender_domain,
+)
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.pipelines.rules_engine import RuleEngine
+from analysis.tests.factories import make_unit
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+CONTENTS = [
+    "OQTF prononcée. Délai: 3 jours pour appel.",
+    "Convocation devant le tribunal administratif. Délai: 30 jours.",
+    "Bonjour, pièces jointes.",
+]
+SENDERS = ["greffe@justice.fr", "contact@cabinet-avocat.fr", "client@example.com"]
+
+
+def make_units(count: int):
+    return [
+        make_unit(
+            f"unit-{i:04d}",
+            CONTENTS[i % len(CONTENTS)],
+            source_metadata={"sender_email": SENDERS[i % len(SENDERS)]},
+            tenant_id=f"tenant{i % 2}",
+        )
+        for i in range(count)
+    ]
+
+
+def summarize(rule_results):
+    return [
+        (priority, score, [(rule.rule_id, rule.priority_boost) for rule in rules])
+        for priority, rules, score in rule_results
+    ]
+
+
+class FakeRedis:
+    """Client Redis minimal (get/set) en mémoire"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8")
+
+
+class TestClassificationCache:
+    """Tests pour ClassificationCache"""
+
+    def test_sender_domain_normalization(self):
+        assert sender_domain(" Greffe@TA-Lyon.Juradm.fr. ") == "ta-lyon.juradm.fr"
+        assert sender_domain(None) == ""
+        assert cache_key("h", "a@Justice.fr", "v1") == cache_key("h", "b@justice.fr", "v1")
+
+    def test_lru_eviction_and_counters(self):
+        cache = ClassificationCache(max_entries=2, redis_url=None)
+        cache.set("a", {"days": 1, "patterns": []})
+        cache.set("b", {"days": 2, "patterns": []})
+        assert cache.get("a") is not None  # "b" devient le moins récent
+        cache.set("c", {"days": 3, "patterns": []})
+
+        assert cache.get("b") is None
+        assert cache.get("c") == {"days": 3, "patterns": []}
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+        assert len(cache) == 2
+
+    def test_redis_second_tier(self):
+        redis = FakeRedis()
+        ClassificationCache(redis_client=redis).set("k", {"days": 3, "patterns": ["OQTF"]})
+        other_process = ClassificationCache(redis_client=redis)
+
+        assert other_process.get("k") == {"days": 3, "patterns": ["OQTF"]}
+        assert other_process.get("k") is not None
+        assert other_process.stats()["redis_hits"] == 1
+        assert other_process.stats()["hits"] == 1
+
+
+class TestRuleEngineCache:
+    """Tests pour RuleEngine(cache=...)"""
+
+    def test_cached_results_match_uncached(self):
+        units = make_units(30)
+        engine = RuleEngine(cache=ClassificationCache(redis_url=None))
+
+        first = engine.apply_rules_batch(units)
+        second = engine.apply_rules_batch(units)
+        expected = RuleEngine().apply_rules_batch(units)
+
+        assert summarize(first) == summarize(second) == summarize(expected)
+        # Un scan par (contenu, domaine) distinct, puis uniquement des hits
+        assert engine.cache_misses == 3
+        assert engine.cache_hits == 3
+
+    def test_single_unit_path_uses_cache(self):
+        unit = make_units(1)[0]
+        cache = ClassificationCache(redis_url=None)
+
+        first = RuleEngine(cache=cache).apply_all_rules(unit)
+        engine = RuleEngine(cache=cache)
+        second = engine.apply_all_rules(unit)
+
+        # Échéance recalculée à partir du nombre de jours mis en cache
+        assert summarize([first]) == summarize([second])
+        assert "DEADLINE_CRITICAL" in second[1]
+        assert (engine.cache_hits, engine.cache_misses) == (1, 0)
+
+    def test_rules_change_invalidates_entries(self):
+        cache = ClassificationCache(redis_url=None)
+        units = make_units(3)
+        original = RuleEngine(cache=cache).apply_rules_batch(units)
+
+        engine = RuleEngine(cache=cache)
+        engine.deadline_patterns["OQTF"]["regex"] = "jamais présent"
+        engine.compile_plan()
+        results = engine.apply_rules_batch(units)
+
+        assert engine.cache_hits == 0
+        assert summarize(results[:1]) != summarize(original[:1])
+        assert summarize(results) == summarize(_uncached_like(engine, units))
+
+
+def _uncached_like(engine, units):
+    reference = RuleEngine()
+    reference.deadline_patterns = engine.deadline_patterns
+    reference.compile_plan()
+    return reference.apply_rules_batch(units)
+
+
+class TestPipelineCacheCounters:
+    """Compteurs du cache dans PipelineResultSchema"""
+
+    def test_counters_reported(self):
+        cache = ClassificationCache(redis_url=None)
+        with StubAnalysisAPI(units=make_raw_units(30)) as api:
+            first = AnalysisPipeline(
+                "tenant1", api.base_url, classification_cache=cache
+            ).execute(persist=False)
+            second = AnalysisPipeline(
+                "tenant1", api.base_url, classification_cache=cache
+            ).execute(persist=False)
+
+        assert first.counters["classification_cache_misses"] == 30
+        assert second.counters["classification_cache_hits"] == 30
+        assert "classification_cache_misses" not in second.counters
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
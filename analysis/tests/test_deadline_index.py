@@ -0,0 +1,256 @@
+"""
+test_deadline_index.py
+
+Tests de l'index des échéances (DeadlineIndex), du moniteur
+(DeadlineMonitor) et du suivi des échéances par AnalysisPipeline
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from analysis.pipelines.checkpoints import CheckpointStore
+from analysis.pipelines.deadline_index import (
+    DeadlineIndex,
+    DeadlineMonitor,
+    threshold_time,
+)
+from analysis.pipelines.generate_events import EventLogger
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.pipelines.rules_engine import RuleEngine
+from analysis.tests.factories import make_unit
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+class RecordingLogger:
+    """EventLogger dont la persistance est enregistrée en mémoire"""
+
+    def __init__(self, errors=None):
+        self._logger = EventLogger("http://localhost:0")
+        self.persisted = []
+        self.errors = list(errors or [])
+
+    def generate_deadline_event(self, **kwargs):
+        return self._logger.generate_deadline_event(**kwargs)
+
+    def event_payload(self, event):
+        return self._logger.event_payload(event)
+
+    def persist_payloads(self, payloads, tenant_id):
+        """Un chunk par appel; en échec tant que `errors` n'est pas vide"""
+        errors = [self.errors.pop(0)] if self.errors else []
+        if not errors:
+            self.persisted.append((tenant_id, list(payloads)))
+        failed_count = len(payloads) if errors else 0
+        return {
+            "success": not errors,
+            "created_count": len(payloads) - failed_count,
+            "failed_count": failed_count,
+            "errors": errors,
+            "chunks": [
+                {
+                    "chunk": 0,
+                    "events": len(payloads),
+                    "attempts": 1,
+                    "created_count": len(payloads) - failed_count,
+                    "failed_count": failed_count,
+                    "errors": errors,
+                }
+            ],
+        }
+
+
+class TestDeadlineIndex:
+    """Tests pour DeadlineIndex"""
+
+    def test_thresholds_match_critical_rule(self):
+        due = NOW + timedelta(days=10)
+        critical = threshold_time(due, 3)
+
+        assert (due - critical).days == 4
+        assert (due - (critical + timedelta(seconds=1))).days == 3
+
+    def test_wakes_only_at_threshold_crossings(self):
+        index = DeadlineIndex()
+        index.add("tenant1", "unit-a", NOW + timedelta(days=10), {})
+        index.add("tenant1", "unit-b", NOW + timedelta(days=30), {})
+
+        assert index.pop_due(NOW) == []
+        assert index.next_wake_at() == NOW + timedelta(days=2)
+
+        approaching = index.pop_due(NOW + timedelta(days=2, seconds=1))
+        index.acknowledge(approaching)
+        assert [(c.deadline.unit_id, c.threshold_days) for c in approaching] == [
+            ("unit-a", 7)
+        ]
+        assert index.pop_due(NOW + timedelta(days=5)) == []
+
+        critical = index.pop_due(NOW + timedelta(days=6, seconds=1))
+        index.acknowledge(critical)
+        assert [(c.deadline.unit_id, c.threshold_days) for c in critical] == [
+            ("unit-a", 3)
+        ]
+        assert critical[0].days_remaining == 3
+        # Dernier seuil notifié: seule unit-b reste suivie
+        assert len(index) == 1
+
+    def test_late_registration_notifies_tightest_threshold_only(self):
+        index = DeadlineIndex()
+        index.add("tenant1", "unit-a", NOW + timedelta(days=2, hours=1), {})
+        index.add("tenant1", "unit-past", NOW - timedelta(days=1), {})
+
+        crossings = index.pop_due(NOW)
+        # Seuil en attente de confirmation: toujours suivi
+        assert len(index) == 1
+        index.acknowledge(crossings)
+
+        assert [(c.deadline.unit_id, c.threshold_days) for c in crossings] == [
+            ("unit-a", 3)
+        ]
+        assert len(index) == 0
+
+    def test_same_due_date_is_idempotent_new_one_resets(self):
+        index = DeadlineIndex()
+        due = NOW + timedelta(days=10)
+        index.add("tenant1", "unit-a", due, {})
+        index.acknowledge(index.pop_due(NOW + timedelta(days=2, seconds=1)))
+
+        assert index.add("tenant1", "unit-a", due, {}) is False
+        assert index.pop_due(NOW + timedelta(days=2, seconds=2)) == []
+
+        assert index.add("tenant1", "unit-a", due + timedelta(days=5), {}) is True
+        crossings = index.pop_due(NOW + timedelta(days=7, seconds=1))
+        assert [c.threshold_days for c in crossings] == [7]
+
+    def test_notified_thresholds_survive_restart(self, tmp_path):
+        path = str(tmp_path / "checkpoints.sqlite3")
+        due = NOW + timedelta(days=10)
+        with CheckpointStore(path) as store:
+            index = DeadlineIndex(store=store)
+            index.add("tenant1", "unit-a", due, {"procedure_type": "OQTF"})
+            index.acknowledge(index.pop_due(NOW + timedelta(days=2, seconds=1)))
+
+        with CheckpointStore(path) as store:
+            index = DeadlineIndex(store=store)
+            assert index.next_wake_at() == threshold_time(due, 3)
+            crossings = index.pop_due(NOW + timedelta(days=7))
+
+        assert [c.threshold_days for c in crossings] == [3]
+        assert crossings[0].deadline.deadline_data == {"procedure_type": "OQTF"}
+
+    def test_unacknowledged_crossing_is_not_recorded(self, tmp_path):
+        path = str(tmp_path / "checkpoints.sqlite3")
+        due = NOW + timedelta(days=10)
+        with CheckpointStore(path) as store:
+            index = DeadlineIndex(store=store)
+            index.add("tenant1", "unit-a", due, {})
+            assert len(index.pop_due(NOW + timedelta(days=2, seconds=1))) == 1
+
+        with CheckpointStore(path) as store:
+            crossings = DeadlineIndex(store=store).pop_due(
+                NOW + timedelta(days=2, seconds=2)
+            )
+
+        assert [c.threshold_days for c in crossings] == [7]
+
+
+class TestDeadlineMonitor:
+    """Tests pour DeadlineMonitor"""
+
+    def test_emits_deadline_events_per_tenant(self):
+        index = DeadlineIndex()
+        index.add("tenant1", "unit-a", NOW + timedelta(days=5), {"legal_basis": "X"})
+        index.add("tenant2", "unit-b", NOW + timedelta(days=2, hours=1), {})
+        event_logger = RecordingLogger()
+
+        events = DeadlineMonitor(index, event_logger).run_due(NOW)
+
+        by_unit = {event.entity_id: event for event in events}
+        assert by_unit["unit-a"].event_type == "DEADLINE_APPROACHING"
+        assert by_unit["unit-b"].event_type == "DEADLINE_CRITICAL"
+        assert by_unit["unit-a"].entity_type == "deadline"
+        justification = by_unit["unit-b"].metadata["justification"]
+        assert justification["rule"] == "RULE-DEADLINE-CRITICAL"
+        assert justification["days_remaining"] == 2
+        assert sorted(tenant for tenant, _ in event_logger.persisted) == [
+            "tenant1",
+            "tenant2",
+        ]
+
+    def test_failed_persistence_retries_crossing(self):
+        index = DeadlineIndex()
+        index.add("tenant1", "unit-a", NOW + timedelta(days=5), {})
+        event_logger = RecordingLogger(errors=["HTTP 503"])
+        monitor = DeadlineMonitor(index, event_logger, retry_seconds=60)
+
+        assert monitor.run_due(NOW) == []
+        assert len(index) == 1
+        assert index.next_wake_at() == NOW + timedelta(seconds=60)
+        assert monitor.run_due(NOW + timedelta(seconds=30)) == []
+
+        events = monitor.run_due(NOW + timedelta(seconds=61))
+
+        assert [event.entity_id for event in events] == ["unit-a"]
+        assert monitor.events_emitted == 1
+        assert [tenant for tenant, _ in event_logger.persisted] == ["tenant1"]
+        assert monitor.run_due(NOW + timedelta(seconds=122)) == []
+
+    def test_background_thread_wakes_on_new_deadline(self):
+        index = DeadlineIndex()
+        event_logger = RecordingLogger()
+        monitor = DeadlineMonitor(index, event_logger, max_sleep_seconds=5)
+        monitor.start()
+        try:
+            index.add("tenant1", "unit-a", datetime.now() + timedelta(days=2), {})
+            for _ in range(100):
+                if monitor.events_emitted:
+                    break
+                index.wait(0.01)
+        finally:
+            monitor.stop()
+
+        assert monitor.events_emitted == 1
+
+
+class TestPipelineDeadlineTracking:
+    """Suivi des échéances par RuleEngine et AnalysisPipeline"""
+
+    def test_detect_deadlines(self):
+        units = [
+            make_unit("unit-a", "OQTF prononcée. Délai: 30 jours.", NOW),
+            make_unit(
+                "unit-b",
+                "Rappel de votre dossier.",
+                NOW,
+                source_metadata={
+                    "deadline": {"due_date": "2026-03-05T00:00:00", "rule": "X"}
+                },
+            ),
+            make_unit("unit-c", "Bonjour, pièces jointes.", NOW),
+        ]
+
+        deadlines = RuleEngine().detect_deadlines(units)
+
+        due_date, data = deadlines[0]
+        assert due_date == NOW + timedelta(days=30)
+        assert data["procedure_type"] == "OQTF"
+        assert data["days_detected"] == 30
+        assert deadlines[1][0] == datetime(2026, 3, 5)
+        assert deadlines[1][1]["source"] == "source_metadata"
+        assert deadlines[2] is None
+
+    def test_pipeline_tracks_detected_deadlines(self):
+        index = DeadlineIndex()
+        with StubAnalysisAPI(units=make_raw_units(30)) as api:
+            result = AnalysisPipeline(
+                "tenant1", api.base_url, deadline_index=index
+            ).execute(persist=False)
+
+        stages = {stage.stage: stage.items for stage in result.stage_metrics}
+        assert stages["deadlines"] == len(index) > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
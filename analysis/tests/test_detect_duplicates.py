@@ -0,0 +1,100 @@
+"""
+test_detect_duplicates.py
+
+Tests unitaires pour la détection de doublons intra-batch
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from analysis.pipelines.detect_duplicates import DuplicateChecker
+from analysis.pipelines.near_duplicates import NearDuplicateIndex
+from analysis.tests.factories import make_unit
+
+
+def greffe_unit(unit_id: str, content: str, received_at: datetime):
+    return make_unit(
+        unit_id, content, received_at, {"sender_email": "greffe@justice.fr"}
+    )
+
+
+def as_tuples(duplicates):
+    return [
+        (
+            d.primary_unit_id,
+            d.duplicate_unit_id,
+            d.detection_method,
+            d.similarity_score,
+            d.match_criteria,
+        )
+        for d in duplicates
+    ]
+
+
+class TestNearDuplicateIndex:
+    """Tests pour NearDuplicateIndex"""
+
+    def test_invalid_band_configuration(self):
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=64, bands=10)
+
+    def test_identical_texts_are_candidates(self):
+        index = NearDuplicateIndex()
+        index.add(0, "Notification OQTF. Délai de recours: 30 jours.")
+        index.add(1, "Notification OQTF. Délai de recours: 30 jours.")
+        index.add(2, "Convocation à l'audience du tribunal administratif.")
+
+        assert (0, 1) in index.candidate_pairs()
+
+
+class TestIntraBatchDuplicates:
+    """Tests pour DuplicateChecker.find_intra_batch_duplicates"""
+
+    def test_matches_all_pairs_reference(self):
+        """L'index LSH produit les mêmes paires que la comparaison exhaustive"""
+        rng = random.Random(7)
+        vocabulary = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6))
+            for _ in range(500)
+        ]
+        start = datetime(2026, 1, 1)
+
+        units = []
+        for i in range(60):
+            if units and rng.random() < 0.4:
+                content = rng.choice(units).content
+                if rng.random() < 0.5:
+                    content = content + " x"
+            else:
+                content = " ".join(rng.choice(vocabulary) for _ in range(60))
+            units.append(
+                greffe_unit(f"unit-{i:03d}", content, start + timedelta(days=i % 10))
+            )
+
+        checker = DuplicateChecker()
+        indexed, indexed_exact = checker.find_intra_batch_duplicates(units)
+        reference, reference_exact = checker.find_intra_batch_duplicates_all_pairs(
+            units
+        )
+
+        assert indexed_exact == reference_exact
+        assert as_tuples(indexed) == as_tuples(reference)
+
+    def test_fuzzy_match_outside_time_window(self):
+        """Quasi-doublon hors fenêtre de 7 jours → pas de FUZZY_MATCH"""
+        content = "Décision du tribunal administratif. " * 20
+        units = [
+            greffe_unit("unit-a", content, datetime(2026, 1, 1)),
+            greffe_unit("unit-b", content + "!", datetime(2026, 1, 20)),
+        ]
+
+        duplicates, exact = DuplicateChecker().find_intra_batch_duplicates(units)
+
+        assert exact == 0
+        assert duplicates == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
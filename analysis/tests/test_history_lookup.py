@@ -0,0 +1,124 @@
+"""
+test_history_lookup.py
+
+Tests de la recherche de doublons historiques (unitaire vs POST groupés)
+contre le serveur local StubAnalysisAPI
+"""
+
+from datetime import datetime
+
+import pytest
+
+from analysis.pipelines.detect_duplicates import DuplicateChecker
+from analysis.tests.factories import make_unit
+from analysis.tests.stub_api import StubAnalysisAPI
+
+UNIT_COUNT = 200
+
+
+def make_units(count: int):
+    return [
+        make_unit(
+            f"unit-{i:04d}",
+            f"Courrier {i}",
+            received_at=datetime(2026, 2, 1, 10, 0, 0),
+            source_metadata={"sender_email": "greffe@justice.fr"},
+            content_hash=f"hash-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_history(count: int):
+    """Une unité sur dix a un doublon exact en historique"""
+    return {
+        f"hash-{i}": [
+            {
+                "id": f"old-{i:04d}",
+                "content_hash": f"hash-{i}",
+                "senderEmail": "greffe@justice.fr",
+                "reason": "same_checksum",
+                "timeDiffSeconds": 120,
+            }
+        ]
+        for i in range(0, count, 10)
+    }
+
+
+def as_tuples(duplicates):
+    return [
+        (d.primary_unit_id, d.duplicate_unit_id, d.detection_method, d.match_criteria)
+        for d in duplicates
+    ]
+
+
+class TestHistoryLookup:
+    """Tests pour DuplicateChecker._check_against_history_batch"""
+
+    def test_batch_lookup_matches_per_unit_lookup(self):
+        units = make_units(UNIT_COUNT)
+
+        with StubAnalysisAPI(history=make_history(UNIT_COUNT)) as api:
+            per_unit = DuplicateChecker(api.base_url, batch_history_lookup=False)
+            per_unit_duplicates = []
+            for unit in units:
+                per_unit_duplicates.extend(
+                    per_unit._check_against_history(unit, "tenant1")
+                )
+            per_unit_round_trips = api.round_trips
+
+            api.requests.clear()
+
+            batched = DuplicateChecker(
+                api.base_url, batch_history_lookup=True, history_chunk_size=64
+            )
+            batched_duplicates = batched._check_against_history_batch(
+                units, "tenant1"
+            )
+            batched_round_trips = api.round_trips
+
+        assert as_tuples(batched_duplicates) == as_tuples(per_unit_duplicates)
+        assert len(batched_duplicates) == UNIT_COUNT // 10
+        assert per_unit_round_trips == UNIT_COUNT
+        assert batched_round_trips == 4  # ceil(200 / 64)
+
+    def test_batch_lookup_is_opt_in(self):
+        assert DuplicateChecker().batch_history_lookup is False
+
+    def test_missing_batch_route_falls_back_to_get(self):
+        units = make_units(30)
+
+        with StubAnalysisAPI(history=make_history(30), batch_route=False) as api:
+            checker = DuplicateChecker(
+                api.base_url, batch_history_lookup=True, history_chunk_size=10
+            )
+            duplicates = checker._check_against_history_batch(units, "tenant1")
+            requests = dict(api.requests)
+
+        assert [d.duplicate_unit_id for d in duplicates] == [
+            "unit-0000",
+            "unit-0010",
+            "unit-0020",
+        ]
+        assert checker.batch_history_lookup is False
+        assert requests == {
+            ("POST", "/api/analysis/find-duplicate-candidates/batch"): 1,
+            ("GET", "/api/analysis/find-duplicate-candidates"): 30,
+        }
+
+    def test_failed_chunk_is_skipped(self):
+        units = make_units(10)
+
+        with StubAnalysisAPI() as api:
+            api.stop()  # connexion refusée: erreur réseau, pas 404
+            checker = DuplicateChecker(
+                "http://127.0.0.1:9", batch_history_lookup=True, history_chunk_size=5
+            )
+            duplicates = checker._check_against_history_batch(units, "tenant1")
+
+        assert duplicates == []
+        assert checker.batch_history_lookup is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
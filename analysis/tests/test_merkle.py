@@ -0,0 +1,205 @@
+"""
+test_merkle.py
+
+Tests du scellement des batchs d'EventLog (MerkleTree, StreamingRoot,
+BatchSealer) et de la vérification d'un log de tenant
+"""
+
+import hashlib
+import math
+import sqlite3
+
+import pytest
+
+from analysis.pipelines.checkpoints import CheckpointStore
+from analysis.pipelines.merkle import (
+    GENESIS_ROOT,
+    BatchSealer,
+    MerkleTree,
+    StreamingRoot,
+    verify_inclusion,
+    verify_proof,
+    verify_tenant_log,
+)
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+
+def chain_order(payloads):
+    """EventLog reçus (chunks concurrents) remis dans l'ordre previousEventId"""
+    by_previous = {payload["previousEventId"]: payload for payload in payloads}
+    ordered, previous = [], None
+    while previous in by_previous:
+        ordered.append(by_previous[previous])
+        previous = ordered[-1]["id"]
+    return ordered
+
+
+@pytest.fixture
+def store():
+    with CheckpointStore(":memory:") as store:
+        yield store
+
+
+@pytest.fixture
+def sealed_log(store):
+    """Deux runs scellés (3 batchs) et les EventLog reçus par l'API"""
+    sealer = BatchSealer(store)
+    with StubAnalysisAPI(units=make_raw_units(50)) as api:
+        for limit in (30, 20):
+            with AnalysisPipeline(
+                "tenant1", api.base_url, checkpoints=store, sealer=sealer
+            ) as pipeline:
+                pipeline.execute_streaming(page_size=20, max_units=limit)
+        payloads = chain_order(api.created_events)
+        assert len(payloads) == len(api.created_events)
+    return sealer, payloads
+
+
+class TestMerkleTree:
+    """Tests pour MerkleTree et StreamingRoot"""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 33])
+    def test_proofs_and_streaming_root(self, count):
+        leaves = [hashlib.sha256(str(i).encode()).digest() for i in range(count)]
+        tree = MerkleTree(leaves)
+        streaming = StreamingRoot()
+        for leaf in leaves:
+            streaming.add(leaf)
+
+        assert streaming.root == tree.root
+        for index, leaf in enumerate(leaves):
+            path = tree.proof(index)
+            assert len(path) <= math.ceil(math.log2(count))
+            assert verify_inclusion(leaf, path, tree.root)
+        if count > 1:
+            assert not verify_inclusion(leaves[0], tree.proof(count - 1), tree.root)
+
+
+class TestBatchSealer:
+    """Tests pour BatchSealer dans le pipeline"""
+
+    def test_batches_are_chained(self, store, sealed_log):
+        _, payloads = sealed_log
+        seals = list(store.iter_seals("tenant1"))
+
+        assert [seal["sequence"] for seal in seals] == [0, 1, 2]
+        assert seals[0]["previous_root"] == GENESIS_ROOT
+        assert seals[1]["previous_root"] == seals[0]["batch_root"]
+        assert sum(seal["event_count"] for seal in seals) == len(payloads)
+        assert payloads[0]["previousEventId"] is None
+
+    def test_inclusion_proof(self, store, sealed_log):
+        sealer, payloads = sealed_log
+        seal = store.get_seal("tenant1", 1)
+        ids = [payload["id"] for payload in payloads]
+        event_id = ids[ids.index(seal["first_event_id"]) + 3]
+
+        proof = sealer.inclusion_proof("tenant1", event_id)
+
+        assert (proof["sequence"], proof["position"]) == (1, 3)
+        assert len(proof["path"]) <= math.ceil(math.log2(seal["event_count"]))
+        assert proof["batch_root"] == seal["batch_root"]
+        assert verify_proof(proof)
+        assert sealer.inclusion_proof("tenant1", "inconnu") is None
+
+    def test_head_reloaded_from_store(self, store, sealed_log):
+        sealer = BatchSealer(store)
+        seal = sealer._head("tenant1")
+
+        assert seal.sequence == 2
+        assert seal.last_event_id == sealed_log[1][-1]["id"]
+
+    def test_seal_recorded_with_page(self, store):
+        sealer = BatchSealer(store)
+        assert sealer._head("tenant1") is None
+        # Sceau 0 déjà présent: l'enregistrement de la page échoue
+        store._conn.execute(
+            "INSERT INTO batch_seals VALUES ('tenant1', 0, '', '', '', 0, '', '', '')"
+        )
+
+        with StubAnalysisAPI(units=make_raw_units(10)) as api:
+            pipeline = AnalysisPipeline(
+                "tenant1", api.base_url, checkpoints=store, sealer=sealer
+            )
+            with pytest.raises(sqlite3.IntegrityError):
+                pipeline.execute_streaming(page_size=10)
+            created = len(api.created_events)
+
+        # Rien d'enregistré ni de persisté, tête inchangée
+        assert created == 0
+        assert store.pending_events("tenant1") == []
+        assert store.processed_ids("tenant1", ["unit-0000"]) == set()
+        assert store.batch_leaves("tenant1", 0) == []
+        assert sealer._head("tenant1") is None
+
+    def test_execute_records_sealed_batch(self, store):
+        sealer = BatchSealer(store)
+        with StubAnalysisAPI(units=make_raw_units(10)) as api:
+            AnalysisPipeline(
+                "tenant1", api.base_url, checkpoints=store, sealer=sealer
+            ).execute()
+            created = len(api.created_events)
+
+        seal = store.get_seal("tenant1", 0)
+        assert seal["event_count"] == created > 0
+        assert store.pending_events("tenant1") == []
+        assert sealer._head("tenant1").batch_root == seal["batch_root"]
+
+    def test_sealer_requires_checkpoints(self, store):
+        with pytest.raises(ValueError):
+            AnalysisPipeline("tenant1", sealer=BatchSealer(store))
+        with CheckpointStore(":memory:") as other:
+            with pytest.raises(ValueError):
+                AnalysisPipeline(
+                    "tenant1", checkpoints=other, sealer=BatchSealer(store)
+                )
+
+
+class TestVerifyTenantLog:
+    """Tests pour verify_tenant_log"""
+
+    def test_valid_log(self, store, sealed_log):
+        _, payloads = sealed_log
+
+        report = verify_tenant_log(store.iter_seals("tenant1"), iter(payloads))
+
+        assert report == {
+            "valid": True,
+            "batches": 3,
+            "events": len(payloads),
+            "error": None,
+        }
+
+    def test_tampered_metadata(self, store, sealed_log):
+        _, payloads = sealed_log
+        payloads[7]["metadata"]["rule_id"] = "RULE-FORGED"
+
+        report = verify_tenant_log(store.iter_seals("tenant1"), payloads)
+
+        assert report["valid"] is False
+        assert "checksum" in report["error"]
+
+    def test_removed_event(self, store, sealed_log):
+        _, payloads = sealed_log
+
+        report = verify_tenant_log(
+            store.iter_seals("tenant1"), payloads[:12] + payloads[13:]
+        )
+
+        assert report["valid"] is False
+        assert "previousEventId" in report["error"]
+
+    def test_forged_batch(self, store, sealed_log):
+        _, payloads = sealed_log
+        seals = list(store.iter_seals("tenant1"))
+        seals[1]["merkle_root"] = seals[0]["merkle_root"]
+
+        report = verify_tenant_log(seals, payloads)
+
+        assert report["valid"] is False
+        assert report["batches"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
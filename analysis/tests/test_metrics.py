@@ -0,0 +1,101 @@
+"""
+test_metrics.py
+
+Tests de l'instrumentation par étape (StageTimer, stage_metrics)
+"""
+
+import logging
+import time
+
+import pytest
+
+from analysis.pipelines.metrics import StageTimer
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+PIPELINE_STAGES = ["fetch", "normalize", "duplicates", "classify", "events", "persist"]
+
+
+class TestStageTimer:
+    """Tests pour StageTimer"""
+
+    def test_stage_is_measured(self):
+        timer = StageTimer()
+
+        with timer.stage("classify") as run:
+            sum(i * i for i in range(200_000))
+            run.items = 10
+
+        (stage,) = timer.metrics()
+        assert stage.stage == "classify"
+        assert stage.calls == 1
+        assert stage.items == 10
+        assert stage.wall_seconds > 0
+        assert stage.cpu_seconds > 0
+        assert stage.items_per_second == pytest.approx(10 / stage.wall_seconds)
+
+    def test_repeated_stage_accumulates(self):
+        timer = StageTimer()
+
+        for items in (3, 4):
+            with timer.stage("fetch") as run:
+                time.sleep(0.01)
+                run.items = items
+        with timer.stage("normalize"):
+            pass
+
+        fetch, normalize = timer.metrics()
+        assert (fetch.stage, fetch.calls, fetch.items) == ("fetch", 2, 7)
+        assert fetch.wall_seconds >= 0.02
+        assert normalize.items == 0
+
+    def test_stage_recorded_on_error(self):
+        timer = StageTimer()
+
+        with pytest.raises(ValueError):
+            with timer.stage("persist"):
+                raise ValueError("boom")
+
+        assert [stage.stage for stage in timer.metrics()] == ["persist"]
+
+
+class TestPipelineStageMetrics:
+    """Tests pour PipelineResultSchema.stage_metrics"""
+
+    def test_execute_reports_every_stage(self):
+        with StubAnalysisAPI(units=make_raw_units(40)) as api:
+            result = AnalysisPipeline("tenant1", api.base_url).execute(limit=40)
+
+        stages = {stage.stage: stage for stage in result.stage_metrics}
+        assert list(stages) == PIPELINE_STAGES
+        assert stages["fetch"].items == 40
+        assert stages["classify"].items == 40
+        assert stages["persist"].items == result.events_generated
+
+    def test_streaming_accumulates_pages(self):
+        with StubAnalysisAPI(units=make_raw_units(50)) as api:
+            result = AnalysisPipeline("tenant1", api.base_url).execute_streaming(
+                page_size=20, persist=False
+            )
+
+        stages = {stage.stage: stage for stage in result.stage_metrics}
+        assert "persist" not in stages
+        # 3 pages + la lecture finale qui termine le générateur
+        assert stages["fetch"].calls == 4
+        assert stages["classify"].calls == 3
+        assert stages["classify"].items == 50
+
+    def test_summary_is_one_structured_record(self, caplog):
+        with StubAnalysisAPI(units=make_raw_units(10)) as api:
+            with caplog.at_level(logging.INFO, logger="analysis"):
+                result = AnalysisPipeline("tenant1", api.base_url).execute(
+                    persist=False
+                )
+
+        (summary,) = [r for r in caplog.records if hasattr(r, "stage_metrics")]
+        assert summary.execution_id == result.execution_id
+        assert [s["stage"] for s in summary.stage_metrics] == PIPELINE_STAGES[:-1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
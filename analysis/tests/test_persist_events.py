@@ -0,0 +1,166 @@
+"""
+test_persist_events.py
+
+Tests de la persistance des EventLog par chunks (gzip, retries)
+contre le serveur local StubAnalysisAPI
+"""
+
+from datetime import datetime
+
+import pytest
+
+import hashlib
+import json
+
+from analysis.pipelines.generate_events import EventLogger, canonical_json
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.schemas.models import EventLogSchema
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+CREATE_EVENTS = ("POST", "/api/analysis/create-events")
+
+
+def make_events(count: int):
+    return [
+        EventLogSchema(
+            id=f"evt-{i:05d}",
+            tenant_id="tenant1",
+            timestamp=datetime(2026, 2, 1, 10, 0, 0),
+            event_type="FLOW_CLASSIFIED",
+            entity_type="flow",
+            entity_id=f"unit-{i:05d}",
+            actor_type="SYSTEM",
+            metadata={"final_priority": "MEDIUM", "note": "é" * 20},
+            checksum=f"{i:064x}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_logger(base_url: str, **kwargs) -> EventLogger:
+    options = {"chunk_size": 100, "concurrency": 4, "backoff_seconds": 0.01}
+    options.update(kwargs)
+    return EventLogger(base_url, **options)
+
+
+class TestPersistEvents:
+    """Tests pour EventLogger.persist_events"""
+
+    def test_all_chunks_persisted(self):
+        with StubAnalysisAPI() as api:
+            result = make_logger(api.base_url).persist_events(
+                make_events(1050), "tenant1"
+            )
+            calls = api.requests[CREATE_EVENTS]
+            stored_ids = sorted(event["id"] for event in api.created_events)
+
+        assert result["success"] is True
+        assert result["created_count"] == 1050
+        assert [chunk["events"] for chunk in result["chunks"]] == [100] * 10 + [50]
+        assert calls == 11
+        assert stored_ids == [f"evt-{i:05d}" for i in range(1050)]
+
+    def test_chunks_bounded_by_bytes(self):
+        with StubAnalysisAPI() as api:
+            logger = make_logger(api.base_url, chunk_size=1000, max_chunk_bytes=2000)
+            payloads = [logger.event_payload(event) for event in make_events(50)]
+            result = logger.persist_payloads(payloads, "tenant1")
+            calls = api.requests[CREATE_EVENTS]
+
+        sizes = [len(canonical_json(payload)) + 1 for payload in payloads]
+        counts = [chunk["events"] for chunk in result["chunks"]]
+        starts = [sum(counts[:i]) for i in range(len(counts))]
+
+        assert result["created_count"] == 50
+        assert calls == len(counts) > 1
+        assert all(
+            sum(sizes[start : start + count]) <= 2000
+            for start, count in zip(starts, counts)
+        )
+
+    def test_transient_errors_are_retried(self):
+        with StubAnalysisAPI() as api:
+            api.create_events_failures = [503, 502]
+            result = make_logger(api.base_url, concurrency=1).persist_events(
+                make_events(300), "tenant1"
+            )
+            calls = api.requests[CREATE_EVENTS]
+
+        assert result["success"] is True
+        assert result["created_count"] == 300
+        assert result["chunks"][0]["attempts"] == 3
+        assert calls == 5
+
+    def test_client_error_fails_only_its_chunk(self):
+        with StubAnalysisAPI() as api:
+            api.create_events_failures = [400]
+            result = make_logger(api.base_url, concurrency=1).persist_events(
+                make_events(300), "tenant1"
+            )
+            stored = len(api.created_events)
+
+        assert result["success"] is False
+        assert result["failed_count"] == 100
+        assert result["created_count"] == 200
+        assert result["chunks"][0]["attempts"] == 1
+        assert stored == 200
+
+    def test_confirmed_event_ids_skip_failed_chunk(self):
+        events = make_events(300)
+        with StubAnalysisAPI() as api:
+            api.create_events_failures = [400]
+            logger = make_logger(api.base_url, concurrency=1)
+            result = logger.persist_events(events, "tenant1")
+
+        payloads = [logger.event_payload(event) for event in events]
+        confirmed = EventLogger.confirmed_event_ids(payloads, result)
+
+        assert confirmed == [event.id for event in events[100:]]
+
+    def test_retries_exhausted(self):
+        with StubAnalysisAPI() as api:
+            api.create_events_failures = [503] * 3
+            result = make_logger(api.base_url, max_retries=2).persist_events(
+                make_events(50), "tenant1"
+            )
+
+        assert result["failed_count"] == 50
+        assert result["chunks"][0]["attempts"] == 3
+        assert result["errors"] == ["chunk 0: HTTP 503"]
+
+
+class TestLazySigning:
+    """Checksum et corps HTTP depuis une seule sérialisation de metadata"""
+
+    def test_serialized_event_reuses_canonical_metadata(self):
+        logger = make_logger("http://unused")
+        event = make_events(1)[0]
+        event.checksum = ""
+
+        item = json.loads(logger.serialize_event(event))
+
+        canonical = canonical_json(event.metadata)
+        assert event.checksum == hashlib.sha256(canonical).hexdigest()
+        assert item == logger.event_payload(event)
+
+    def test_canonical_json_bytes(self):
+        value = {"b": 1e16, 2: "x", "a": datetime(2026, 2, 1, 10), "n": float("nan")}
+
+        assert canonical_json(value) == (
+            b'{"2":"x","a":"2026-02-01T10:00:00","b":1e16,"n":null}'
+        )
+        assert canonical_json({"note": "é"}) == '{"note":"é"}'.encode("utf-8")
+
+    def test_dry_run_events_are_signed_only_when_persisted(self):
+        with StubAnalysisAPI(units=make_raw_units(10)) as api:
+            dry_run = AnalysisPipeline("tenant1", api.base_url).execute(persist=False)
+            persisted = AnalysisPipeline("tenant1", api.base_url).execute()
+            stored = {event["id"]: event for event in api.created_events}
+
+        assert all(event.checksum == "" for event in dry_run.events)
+        for event in persisted.events:
+            assert stored[event.id]["checksum"] == event.checksum != ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
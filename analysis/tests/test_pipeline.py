@@ -0,0 +1,61 @@
+"""
+test_pipeline.py
+
+Tests de l'orchestrateur AnalysisPipeline
+"""
+
+import pytest
+
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.tests.factories import make_unit
+
+
+def make_units(count: int):
+    contents = [
+        "OQTF prononcée. Délai: 3 jours pour appel.",
+        "Courrier administratif du 15/02/2026. Délai: 30 jours.",
+        "Référé devant le tribunal administratif.",
+        "Bonjour, pièces jointes.",
+    ]
+    senders = ["tribunal@justice.fr", "contact@cabinet-avocat.fr", "client@example.com"]
+    return [
+        make_unit(
+            f"unit-{i:04d}",
+            contents[i % len(contents)],
+            source_metadata={"sender_email": senders[i % len(senders)]},
+            content_hash=f"hash-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def summarize(rule_results):
+    return [
+        (priority, score, [rule.rule_id for rule in rules])
+        for priority, rules, score in rule_results
+    ]
+
+
+class TestParallelClassification:
+    """Tests pour le mode workers=N de la classification"""
+
+    def test_parallel_matches_in_process(self):
+        units = make_units(50)
+
+        in_process = AnalysisPipeline("tenant1")._classify_units(units)
+        with AnalysisPipeline("tenant1", workers=2, parallel_min_units=1) as pipeline:
+            parallel = pipeline._classify_units(units)
+            assert pipeline._executor is not None
+
+        assert summarize(parallel) == summarize(in_process)
+
+    def test_small_batch_stays_in_process(self):
+        pipeline = AnalysisPipeline("tenant1", workers=4, parallel_min_units=100)
+
+        pipeline._classify_units(make_units(10))
+
+        assert pipeline._executor is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
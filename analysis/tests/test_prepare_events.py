@@ -0,0 +1,70 @@
+"""
+test_prepare_events.py
+
+Tests de la normalisation en bloc (EventPreparer.normalize_batch,
+RAW_UNITS_ADAPTER) et des UnitRecord
+"""
+
+import pickle
+
+import pytest
+
+from analysis.pipelines.prepare_events import EventPreparer
+from analysis.schemas.models import InformationUnitSchema, UnitRecord
+from analysis.tests.stub_api import make_raw_units
+
+
+@pytest.fixture
+def preparer():
+    return EventPreparer("http://localhost:0")
+
+
+class TestNormalizeBatch:
+    """Tests pour EventPreparer.normalize_batch"""
+
+    def test_bulk_path_matches_normalize_unit(self, preparer):
+        raw_units = make_raw_units(20)
+        raw_units[0]["subject"] = "Convocation"
+
+        result = preparer.normalize_batch(raw_units)
+
+        assert result["count"] == 20
+        for raw_unit, record in zip(raw_units, result["units"]):
+            expected = preparer.normalize_unit(raw_unit)
+            assert isinstance(record, UnitRecord)
+            for name in UnitRecord.__slots__:
+                if name not in ("classified_at", "analyzed_at"):
+                    assert getattr(record, name) == getattr(expected, name), name
+
+    def test_rejected_units_fall_back_to_per_unit_path(self, preparer):
+        raw_units = make_raw_units(4)
+        raw_units[1]["receivedAt"] = "pas une date"
+        raw_units[2]["content"] = None
+
+        result = preparer.normalize_batch(raw_units)
+
+        # Date illisible tolérée (comme normalize_unit), contenu absent rejeté
+        assert [unit.id for unit in result["units"]] == [
+            "unit-0000",
+            "unit-0001",
+            "unit-0003",
+        ]
+        assert [error["unit_id"] for error in result["errors"]] == ["unit-0002"]
+
+
+class TestUnitRecord:
+    """Tests pour UnitRecord"""
+
+    def test_schema_round_trip_and_pickle(self, preparer):
+        record = preparer.normalize_batch(make_raw_units(1))["units"][0]
+
+        schema = record.to_schema()
+
+        assert isinstance(schema, InformationUnitSchema)
+        assert UnitRecord.from_schema(schema) == record
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert not hasattr(record, "__dict__")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""
+test_repetitions.py
+
+Tests du comptage des répétitions (MemoryRepetitionCounter,
+RedisRepetitionCounter) et de RULE-REPETITION-ALERT dans le pipeline
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.pipelines.repetitions import (
+    MemoryRepetitionCounter,
+    RedisRepetitionCounter,
+    RepetitionCounter,
+    document_fingerprints,
+    normalize_subject,
+)
+from analysis.tests.factories import make_unit
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def ofii_unit(unit_id, subject="Convocation OFII", days_ago=0, content=None):
+    return make_unit(
+        unit_id,
+        content or f"Courrier {unit_id}",
+        received_at=NOW - timedelta(days=days_ago),
+        source_metadata={"sender_email": "accueil@ofii.fr", "subject": subject},
+    )
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def pfadd(self, key, *members):
+        self.calls.append(("pfadd", key, members))
+
+    def expire(self, key, seconds):
+        self.calls.append(("expire", key, seconds))
+
+    def pfcount(self, *keys):
+        self.calls.append(("pfcount", keys))
+
+    def execute(self):
+        results = []
+        for call in self.calls:
+            if call[0] == "pfadd":
+                self.redis.sets.setdefault(call[1], set()).update(call[2])
+                results.append(1)
+            elif call[0] == "expire":
+                results.append(True)
+            else:
+                union = set()
+                for key in call[1]:
+                    union |= self.redis.sets.get(key, set())
+                results.append(len(union))
+        self.redis.round_trips += 1
+        return results
+
+
+class FakeRedis:
+    """HyperLogLog exact (ensembles) en mémoire, pipelines comptés"""
+
+    def __init__(self):
+        self.sets = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def counter(request):
+    if request.param == "memory":
+        return MemoryRepetitionCounter(window_days=30)
+    return RedisRepetitionCounter(window_days=30, redis_client=FakeRedis())
+
+
+class TestFingerprints:
+    """Tests des empreintes de document"""
+
+    def test_subject_normalization(self):
+        assert normalize_subject("RE: TR:  Convocation   OFII ") == "convocation ofii"
+        first = document_fingerprints(ofii_unit("a", "Fwd: Convocation OFII"))
+        second = document_fingerprints(ofii_unit("b", "convocation ofii"))
+
+        assert first[0] != second[0]  # content_hash
+        assert first[1] == second[1]  # objet + domaine
+
+
+class TestRepetitionCounters:
+    """Comportement commun aux deux implémentations"""
+
+    def test_counts_within_sliding_window(self, counter):
+        old = [ofii_unit("old", days_ago=40)]
+        recent = [ofii_unit(f"u{i}", days_ago=i) for i in range(3)]
+
+        assert counter.observe_batch("tenant1", old) == [1]
+        counts = counter.observe_batch("tenant1", recent)
+
+        # Fenêtre finissant à la réception de chaque unité
+        assert counts == [3, 2, 1]
+        assert counter.observe_batch("tenant2", [ofii_unit("u0")]) == [1]
+
+    def test_replayed_units_are_not_recounted(self, counter):
+        units = [ofii_unit("u1"), ofii_unit("u2")]
+
+        assert counter.observe_batch("tenant1", units) == [2, 2]
+        assert counter.observe_batch("tenant1", units) == [2, 2]
+
+    def test_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            RepetitionCounter()
+
+
+class TestMemoryRepetitionCounter:
+    """Tests pour MemoryRepetitionCounter"""
+
+    def test_ring_bucket_reused_after_window(self):
+        counter = MemoryRepetitionCounter(window_days=7)
+        counter.observe_batch("tenant1", [ofii_unit("old", days_ago=10)])
+
+        # Même seau (10 - 3 = 7 jours): l'ancien compte est remplacé
+        assert counter.observe_batch("tenant1", [ofii_unit("new", days_ago=3)]) == [1]
+        # "old" serait dans la fenêtre de "late", mais son seau est réutilisé
+        late = ofii_unit("late", days_ago=9)
+        assert counter.observe_batch("tenant1", [late]) == [1]
+
+    def test_lru_bounds_fingerprints(self):
+        counter = MemoryRepetitionCounter(max_fingerprints=4)
+        counter.observe_batch(
+            "tenant1", [ofii_unit(f"u{i}", subject=f"objet {i}") for i in range(5)]
+        )
+
+        assert len(counter) == 4
+
+
+class TestRedisRepetitionCounter:
+    """Tests pour RedisRepetitionCounter"""
+
+    def test_one_round_trip_per_update_and_lookup(self):
+        redis = FakeRedis()
+        counter = RedisRepetitionCounter(window_days=30, redis_client=redis)
+
+        counter.observe_batch("tenant1", [ofii_unit(f"u{i}") for i in range(50)])
+
+        assert redis.round_trips == 2
+
+
+class TestPipelineRepetitions:
+    """RULE-REPETITION-ALERT avec le compteur du pipeline"""
+
+    def test_repeated_subject_triggers_rule(self):
+        units = make_raw_units(6)
+        for unit in units[:3]:
+            unit["subject"] = "RE: Convocation OFII"
+
+        with StubAnalysisAPI(units=units) as api:
+            result = AnalysisPipeline(
+                "tenant1",
+                api.base_url,
+                repetition_counter=MemoryRepetitionCounter(),
+            ).execute(persist=False)
+
+        repeated = {
+            c.information_unit_id
+            for c in result.classifications
+            if any(r.rule_id == "RULE-REPETITION-ALERT" for r in c.applied_rules)
+        }
+        assert repeated == {"unit-0000", "unit-0001", "unit-0002"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
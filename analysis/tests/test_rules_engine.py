@@ -4,11 +4,16 @@ test_rules_engine.py
 Tests unitaires pour le moteur de règles
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 import pytest
 
-from analysis.pipelines.rules_engine import DeadlineExtractor, RuleEngine
+from analysis.pipelines.rules_engine import (
+    DEADLINE_EXTRACTOR,
+    CompiledRulePlan,
+    DeadlineExtractor,
+    RuleEngine,
+)
 from analysis.schemas.models import InformationUnitSchema, PriorityEnum
 
 
@@ -154,6 +159,185 @@ class TestDeadlineExtraction:
         # Should identify delay
         assert len(deadlines) >= 0  # Depends on implementation
 
+    def test_parses_all_formats_in_text_order(self):
+        """JJ/MM/AAAA, ISO et mois en lettres convertis en date"""
+        content = (
+            "Audience le 1er Août 2026, OQTF notifiée le 15/02/2026 "
+            "(réf. 2026-03-09), appel avant le 12 decembre 2026."
+        )
+
+        deadlines = DEADLINE_EXTRACTOR.extract_deadlines(content)
+
+        assert [d["date"] for d in deadlines] == [
+            date(2026, 8, 1),
+            date(2026, 2, 15),
+            date(2026, 3, 9),
+            date(2026, 12, 12),
+        ]
+        assert deadlines[1]["matched_text"] == "15/02/2026"
+        assert "context" not in deadlines[0]
+
+    def test_links_nearest_procedure_keyword(self):
+        content = (
+            "Le tribunal administratif a statué le 02/01/2026 (audience). "
+            "Par ailleurs, une OQTF du 10/01/2026 a été notifiée. "
+            "Rappel: rien le 11/01/2026."
+        )
+
+        deadlines = DEADLINE_EXTRACTOR.extract_deadlines(content, with_context=True)
+
+        assert [(d["procedure_type"], d["keyword"]) for d in deadlines] == [
+            ("RECOURS_CONTENTIEUX", "tribunal administratif"),
+            ("OQTF", "oqtf"),
+            ("OQTF", "oqtf"),  # "Rappel" n'est pas le mot-clé "appel"
+        ]
+        assert deadlines[1]["keyword_distance"] == len(" du ")
+        assert deadlines[0]["context"].startswith("Le tribunal")
+
+    def test_impossible_dates_and_no_keyword(self):
+        extractor = DeadlineExtractor()
+
+        deadlines = extractor.extract_deadlines("Le 31/02/2026 ou le 30/04/2026")
+
+        assert [d["date"] for d in deadlines] == [date(2026, 4, 30)]
+        assert deadlines[0]["procedure_type"] is None
+
+
+class TestCompiledRulePlan:
+    """Tests pour CompiledRulePlan (résultats identiques au mode règle par règle)"""
+
+    @pytest.mark.parametrize(
+        "content,sender",
+        [
+            ("OQTF prononcée. Délai: 3 jours pour appel.", "tribunal@justice.fr"),
+            ("RÉFÉRÉ devant le Tribunal Administratif", "contact@cabinet-avocat.fr"),
+            ("Recours administratif, 30 JOURS", "greffe@ta-lyon.fr"),
+            ("Bonjour, pièces jointes.", "client@example.com"),
+            ("recourſ contentieux sous 0 jours", "a@ofii.fr"),
+        ],
+    )
+    def test_same_results_as_uncompiled(self, content, sender):
+        unit = InformationUnitSchema(
+            id="plan-1",
+            source="EMAIL",
+            content=content,
+            content_hash="hash-plan",
+            tenant_id="tenant1",
+            received_at=datetime.now(),
+            source_metadata={"sender_email": sender},
+        )
+
+        compiled = RuleEngine().apply_all_rules(unit)
+        reference = RuleEngine(compiled=False).apply_all_rules(unit)
+
+        assert compiled[0] == reference[0]
+        assert compiled[2] == reference[2]
+        assert [r.rule_id for r in compiled[1]] == [r.rule_id for r in reference[1]]
+        assert [r.rule_name for r in compiled[1]] == [
+            r.rule_name for r in reference[1]
+        ]
+
+    def test_regex_patterns_fall_back_to_compiled_search(self):
+        plan = CompiledRulePlan(
+            {"DATE": {"regex": r"\d{2}/\d{2}"}, "OQTF": {"regex": "OQTF"}},
+            {},
+        )
+
+        assert plan.patterns[0][1] is None
+        assert plan.scan_content("oqtf du 12/03, 15 jours") == (15, ["DATE", "OQTF"])
+
+
+class TestApplyRulesBatch:
+    """Tests pour RuleEngine.apply_rules_batch"""
+
+    def test_same_results_as_apply_all_rules(self):
+        engine = RuleEngine()
+        contents = [
+            "OQTF prononcée. Délai: 3 jours pour appel.",
+            "Courrier administratif. Délai: 30 jours.",
+            "Bonjour, pièces jointes.",
+            "OQTF prononcée. Délai: 3 jours pour appel.",
+        ]
+        senders = [
+            "tribunal@justice.fr",
+            "contact@cabinet-avocat.fr",
+            "client@example.com",
+            "client@example.com",
+        ]
+        units = [
+            InformationUnitSchema(
+                id=f"batch-{i}",
+                source="EMAIL",
+                content=content,
+                content_hash=f"hash-batch-{i}",
+                tenant_id="tenant1",
+                received_at=datetime.now(),
+                source_metadata={"sender_email": sender},
+            )
+            for i, (content, sender) in enumerate(zip(contents, senders))
+        ]
+        metadata_list = [None, {"repetition_count": 3}, None, None]
+
+        batch = engine.apply_rules_batch(units, metadata_list)
+        single = [
+            engine.apply_all_rules(unit, metadata)
+            for unit, metadata in zip(units, metadata_list)
+        ]
+
+        assert len(batch) == len(units)
+        for (priority, rules, score), (ref_priority, ref_rules, ref_score) in zip(
+            batch, single
+        ):
+            assert priority == ref_priority
+            assert score == ref_score
+            assert isinstance(score, int)
+            assert [r.rule_id for r in rules] == [r.rule_id for r in ref_rules]
+
+    def test_deadline_and_repetition_variants(self):
+        engine = RuleEngine()
+        now = datetime.now()
+        deadlines = [
+            {"due_date": (now + timedelta(days=days, hours=1)).isoformat()}
+            for days in (-1, 0, 1, 3, 4)
+        ] + [{"due_date": now + timedelta(days=2, hours=1)}, {}]
+        units = [
+            InformationUnitSchema(
+                id=f"rules-{i}",
+                source="EMAIL",
+                content="Bonjour",
+                content_hash=f"hash-rules-{i}",
+                tenant_id="tenant1",
+                received_at=now,
+                source_metadata={},
+            )
+            for i in range(len(deadlines))
+        ]
+        metadata_list = [
+            {"deadline": deadline, "repetition_count": i % 4}
+            for i, deadline in enumerate(deadlines)
+        ]
+
+        batch = engine.apply_rules_batch(units, metadata_list)
+        single = [
+            engine.apply_all_rules(unit, metadata)
+            for unit, metadata in zip(units, metadata_list)
+        ]
+
+        assert [
+            (priority, [(r.rule_id, r.justification) for r in rules], score)
+            for priority, rules, score in batch
+        ] == [
+            (priority, [(r.rule_id, r.justification) for r in rules], score)
+            for priority, rules, score in single
+        ]
+        assert [
+            "RULE-DEADLINE-CRITICAL" in [r.rule_id for r in rules]
+            for _, rules, _ in batch
+        ] == [False, False, True, True, False, True, False]
+
+    def test_empty_batch(self):
+        assert RuleEngine().apply_rules_batch([]) == []
+
 
 class TestRuleIntegration:
     """Tests d'intégration"""
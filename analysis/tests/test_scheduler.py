@@ -0,0 +1,135 @@
+"""
+test_scheduler.py
+
+Tests du scheduler multi-tenant (TenantScheduler)
+"""
+
+import threading
+import time
+
+import pytest
+
+from analysis.pipelines.scheduler import TenantScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler(run_tenant, tenant_ids=("a", "b", "c"), **kwargs):
+    options = {
+        "workers": 2,
+        "min_interval": 60,
+        "max_interval": 3600,
+        "busy_units": 100,
+        "clock": FakeClock(),
+    }
+    options.update(kwargs)
+    return TenantScheduler(run_tenant, tenant_ids, **options)
+
+
+class TestTenantScheduler:
+    """Tests pour TenantScheduler"""
+
+    def test_round_robin_one_run_per_due_tenant(self):
+        order = []
+        scheduler = make_scheduler(lambda tenant_id: order.append(tenant_id) or 0)
+
+        assert scheduler.run_pending() == 3
+        assert order == ["a", "b", "c"]
+        assert scheduler.run_pending() == 0
+
+    def test_trigger_during_run_is_replayed_not_overlapped(self):
+        runs = []
+
+        def run_tenant(tenant_id):
+            runs.append(tenant_id)
+            if len(runs) == 1:
+                assert scheduler.trigger(tenant_id) is False
+            return 0
+
+        scheduler = make_scheduler(run_tenant, tenant_ids=["a"])
+
+        assert scheduler.run_pending() == 2
+        assert runs == ["a", "a"]
+
+    def test_adaptive_interval(self):
+        units = {"a": 500}
+        scheduler = make_scheduler(lambda tenant_id: units[tenant_id], ["a"])
+        interval = lambda: scheduler.status()["tenants"][0]["interval_seconds"]  # noqa: E731
+
+        scheduler.run_pending()
+        assert interval() == 60
+
+        units["a"] = 0
+        for expected in [120, 240, 480]:
+            scheduler.clock.now += 10_000
+            scheduler.run_pending()
+            assert interval() == expected
+
+        units["a"] = 10
+        scheduler.clock.now += 10_000
+        scheduler.run_pending()
+        assert interval() == 240
+
+    def test_failure_backs_off_and_is_reported(self):
+        def run_tenant(tenant_id):
+            raise RuntimeError("API indisponible")
+
+        scheduler = make_scheduler(run_tenant, ["a"])
+        scheduler.run_pending()
+        tenant = scheduler.status()["tenants"][0]
+
+        assert tenant["failures"] == 1
+        assert tenant["last_error"] == "API indisponible"
+        assert tenant["interval_seconds"] == 120
+
+    def test_status_reports_lag_and_queue_depth(self):
+        scheduler = make_scheduler(lambda tenant_id: 0)
+        scheduler.run_pending()
+        scheduler.clock.now += 200  # intervalle 120s après un run vide
+        scheduler._dispatch_due()
+        status = scheduler.status()
+
+        assert status["queue_depth"] == 3
+        assert status["max_lag_seconds"] == pytest.approx(80)
+        assert [t["state"] for t in status["tenants"]] == ["queued"] * 3
+
+    def test_worker_pool_never_overlaps_a_tenant(self):
+        active, overlaps, runs = set(), [], []
+        lock = threading.Lock()
+
+        def run_tenant(tenant_id):
+            with lock:
+                if tenant_id in active:
+                    overlaps.append(tenant_id)
+                active.add(tenant_id)
+                runs.append(tenant_id)
+            time.sleep(0.02)
+            with lock:
+                active.discard(tenant_id)
+            return 0
+
+        scheduler = TenantScheduler(
+            run_tenant, ["a", "b"], workers=4, tick_seconds=0.01
+        )
+        scheduler.start()
+        try:
+            for _ in range(20):
+                scheduler.trigger("a")
+                time.sleep(0.005)
+        finally:
+            time.sleep(0.1)
+            scheduler.stop()
+
+        assert overlaps == []
+        assert runs.count("a") >= 2
+        assert "b" in runs
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,333 @@
+"""
+test_storage.py
+
+Tests du mode base directe (SqlStorage) contre SQLite: parité avec le
+chemin HTTP (StubAnalysisAPI), renvoi idempotent des EventLog, pagination
+par curseur serveur et checkpoints
+
+Les tables sont créées par le DDL des migrations Prisma, pas par
+create_schema(): le mapping SQLAlchemy est vérifié contre le vrai schéma.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from analysis.pipelines.checkpoints import CheckpointStore
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.pipelines.storage import (
+    SqlStorage,
+    event_logs,
+    information_units,
+)
+from analysis.schemas.models import InformationUnitSchema
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+PRISMA_DIR = Path(__file__).resolve().parents[2] / "prisma"
+MIGRATIONS = {
+    "InformationUnit": PRISMA_DIR / "migrations" / "20260209000000_init",
+    "event_logs": (
+        PRISMA_DIR
+        / "migrations_legacy_20260209"
+        / "20260201192049_add_eventlog_immutable"
+    ),
+}
+
+
+def migration_ddl(table):
+    """
+    CREATE TABLE et CREATE INDEX de `table` tels que dans la migration
+    (SQLite accepte les noms de types Postgres). L'index unique sur
+    contentHash est omis: les tests d'historique insèrent des copies.
+    """
+    sql = (MIGRATIONS[table] / "migration.sql").read_text(encoding="utf-8")
+    statements = re.findall(rf'CREATE TABLE "{table}" \(.*?\n\);', sql, re.S)
+    statements += re.findall(rf'CREATE INDEX "\w+" ON "{table}"\(.*?\);', sql)
+    return statements
+
+
+def migration_enum(name):
+    """Valeurs du type enum Postgres `name` (CREATE TYPE + ALTER TYPE)"""
+    values = []
+    for path in sorted(PRISMA_DIR.glob("migrations*/*/migration.sql")):
+        sql = path.read_text(encoding="utf-8")
+        created = re.search(rf'CREATE TYPE "{name}" AS ENUM \((.*?)\);', sql)
+        if created:
+            values += re.findall(r"'(\w+)'", created.group(1))
+        values += re.findall(rf"ALTER TYPE \"{name}\" ADD VALUE '(\w+)'", sql)
+    return set(values)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SqlStorage(f"sqlite:///{tmp_path / 'memolib.sqlite3'}")
+    with storage.engine.begin() as conn:
+        for table in MIGRATIONS:
+            for statement in migration_ddl(table):
+                conn.exec_driver_sql(statement)
+    yield storage
+    storage.dispose()
+
+
+def seed(storage, raw_units, tenant_id="tenant1", status="RECEIVED"):
+    """Insère les unités brutes (format fetch-units) dans InformationUnit"""
+    rows = [
+        {
+            "id": unit["id"],
+            "tenantId": tenant_id,
+            "source": unit["source"],
+            "content": unit["content"],
+            "contentHash": hashlib.sha256(unit["content"].encode("utf-8")).hexdigest(),
+            "currentStatus": status,
+            "sourceMetadata": json.dumps({"sender_email": unit.get("senderEmail")}),
+            "receivedAt": datetime.fromisoformat(unit["receivedAt"].rstrip("Z")),
+        }
+        for unit in raw_units
+    ]
+    with storage.engine.begin() as conn:
+        conn.execute(information_units.insert(), rows)
+
+
+def event_log_count(storage):
+    with storage.engine.connect() as conn:
+        return conn.execute(sa.select(sa.func.count()).select_from(event_logs)).scalar()
+
+
+def count_queries(engine):
+    """Compteur des requêtes SELECT exécutées sur l'engine"""
+    counter = {"select": 0}
+
+    @sa.event.listens_for(engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            counter["select"] += 1
+
+    return counter
+
+
+def summary(result):
+    return sorted(
+        (
+            c.information_unit_id,
+            c.final_priority,
+            tuple(r.rule_id for r in c.applied_rules),
+        )
+        for c in result.classifications
+    )
+
+
+class TestMigrationSchema:
+    """Mapping SQLAlchemy de storage.py contre les migrations Prisma"""
+
+    @pytest.mark.parametrize("table", [information_units, event_logs])
+    def test_columns_match_migration(self, storage, table):
+        columns = sa.inspect(storage.engine).get_columns(table.name)
+        nullable = {column["name"]: column["nullable"] for column in columns}
+        required = {
+            column["name"]
+            for column in columns
+            if not column["nullable"] and column["default"] is None
+        }
+
+        assert {c.name: nullable.get(c.name) for c in table.columns} == {
+            c.name: c.nullable for c in table.columns
+        }
+        # NOT NULL sans DEFAULT: à fournir par l'INSERT, donc mappées
+        assert required <= set(table.c.keys())
+
+    @pytest.mark.parametrize(
+        "table, column, enum_name",
+        [
+            (information_units, "source", "InformationUnitSource"),
+            (information_units, "currentStatus", "InformationUnitStatus"),
+            (event_logs, "eventType", "EventType"),
+            (event_logs, "actorType", "ActorType"),
+        ],
+    )
+    def test_enum_columns_match_postgres_types(self, table, column, enum_name):
+        column_type = table.c[column].type.dialect_impl(postgresql.dialect())
+
+        assert column_type.name == enum_name
+        assert set(column_type.enums) <= migration_enum(enum_name)
+
+
+class TestSqlPipeline:
+    """AnalysisPipeline(storage=...) de bout en bout"""
+
+    def test_matches_api_path_and_writes_event_logs(self, storage):
+        raw_units = make_raw_units(40)
+        seed(storage, raw_units)
+
+        with StubAnalysisAPI(units=raw_units) as api:
+            via_api = AnalysisPipeline("tenant1", api.base_url).execute(limit=100)
+            api_events = len(api.created_events)
+        via_sql = AnalysisPipeline("tenant1", storage=storage).execute(limit=100)
+
+        assert via_sql.units_ingested == via_api.units_ingested == 40
+        assert summary(via_sql) == summary(via_api)
+        assert via_sql.events_generated == via_api.events_generated
+        assert event_log_count(storage) == api_events == via_sql.events_generated
+
+    def test_streaming_with_checkpoints_resumes(self, storage):
+        seed(storage, make_raw_units(60))
+
+        with CheckpointStore(":memory:") as store:
+            first = AnalysisPipeline(
+                "tenant1", storage=storage, checkpoints=store
+            ).execute_streaming(page_size=25)
+            second = AnalysisPipeline(
+                "tenant1", storage=storage, checkpoints=store
+            ).execute_streaming(page_size=25)
+
+            assert store.pending_events("tenant1") == []
+
+        assert first.units_ingested == 60
+        assert second.units_ingested == 0
+        assert event_log_count(storage) == first.events_generated
+
+    def test_async_pipeline_uses_storage_and_checkpoints(self, storage):
+        pytest.importorskip("httpx")
+        from analysis.pipelines.async_pipeline import AsyncAnalysisPipeline
+
+        seed(storage, make_raw_units(60))
+
+        async def run(store):
+            async with AsyncAnalysisPipeline(
+                "tenant1", storage=storage, checkpoints=store
+            ) as pipeline:
+                return await pipeline.execute_streaming(page_size=25)
+
+        with CheckpointStore(":memory:") as store:
+            first = asyncio.run(run(store))
+            second = asyncio.run(run(store))
+
+            assert store.pending_events("tenant1") == []
+
+        assert first.units_ingested == 60
+        assert second.units_ingested == 0
+        assert event_log_count(storage) == first.events_generated
+
+
+class TestSqlEventPreparer:
+    """Tests pour SqlEventPreparer"""
+
+    def test_pages_match_api_pagination(self, storage):
+        raw_units = make_raw_units(30)
+        seed(storage, raw_units)
+        preparer = storage.event_preparer()
+
+        with StubAnalysisAPI(units=raw_units) as api:
+            expected = api.fetch_units("RECEIVED", 30, tenant_id="tenant1")["units"]
+
+        ids, cursor = [], None
+        while True:
+            page, cursor = preparer.fetch_page("tenant1", limit=8, cursor=cursor)
+            ids.extend(unit["id"] for unit in page)
+            if cursor is None:
+                break
+
+        # Même receivedAt partout: ordre par id décroissant, sans trou
+        assert ids == sorted((u["id"] for u in expected), reverse=True)
+        assert page[0]["receivedAt"] == "2026-02-01T10:00:00.000Z"
+        assert page[0]["senderEmail"] == "greffe@justice.fr"
+
+    def test_stream_pages_single_query_after_watermark(self, storage):
+        seed(storage, make_raw_units(50))
+        other_tenant = [
+            {**unit, "id": f"t2-{unit['id']}"} for unit in make_raw_units(5, "tenant2")
+        ]
+        seed(storage, other_tenant, tenant_id="tenant2")
+        preparer = storage.event_preparer()
+        queries = count_queries(storage.engine)
+
+        pages = list(
+            preparer.stream_pages(
+                "tenant1",
+                page_size=20,
+                since=("2026-02-01T10:00:00.000Z", "unit-0009"),
+            )
+        )
+
+        assert [len(page) for page in pages] == [20, 20]
+        assert pages[0][0]["id"] == "unit-0010"
+        assert queries["select"] == 1
+
+
+class TestSqlDuplicateChecker:
+    """Tests pour SqlDuplicateChecker"""
+
+    def test_history_matches_excluding_the_unit_itself(self, storage):
+        raw_units = make_raw_units(6)
+        seed(storage, raw_units)
+        # Copie historique de unit-0000 (même contenu, autre id)
+        seed(storage, [{**raw_units[0], "id": "old-0000"}])
+
+        units = [
+            InformationUnitSchema(
+                id=unit["id"],
+                source="EMAIL",
+                content=unit["content"],
+                content_hash=hashlib.sha256(unit["content"].encode()).hexdigest(),
+                tenant_id="tenant1",
+                received_at=datetime(2026, 2, 1, 10, 2, 0),
+                source_metadata={"sender_email": "greffe@justice.fr"},
+            )
+            for unit in raw_units
+        ]
+        checker = storage.duplicate_checker()
+        checker.history_chunk_size = 4
+        queries = count_queries(storage.engine)
+
+        duplicates = checker._check_against_history_batch(units, "tenant1")
+
+        assert [(d.primary_unit_id, d.duplicate_unit_id) for d in duplicates] == [
+            ("old-0000", "unit-0000")
+        ]
+        assert duplicates[0].detection_method == "EXACT_MATCH"
+        assert duplicates[0].match_criteria["sender_match"] is True
+        assert duplicates[0].match_criteria["time_window_seconds"] == 120
+        assert queries["select"] == 2  # Un SELECT par chunk de 4
+
+
+class TestSqlEventLogger:
+    """Tests pour SqlEventLogger"""
+
+    def test_resend_is_idempotent(self, storage):
+        event_logger = storage.event_logger()
+        event_logger.chunk_size = 3
+        payloads = [
+            {
+                "id": f"evt-{i}",
+                "timestamp": "2026-02-01T10:00:00",
+                "eventType": "FLOW_CLASSIFIED",
+                "entityType": "information_unit",
+                "entityId": f"unit-{i}",
+                "actorType": "SYSTEM",
+                "actorId": None,
+                "metadata": {"index": i},
+                "immutable": True,
+                "checksum": f"checksum-{i}",
+                "previousEventId": None,
+            }
+            for i in range(7)
+        ]
+
+        first = event_logger.persist_payloads(payloads, "tenant1")
+        second = event_logger.persist_payloads(payloads, "tenant1")
+
+        assert first["created_count"] == 7
+        assert len(first["chunks"]) == 3
+        assert second["created_count"] == 0
+        assert second["success"] is True
+        assert event_log_count(storage) == 7
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+test_streaming.py
+
+Tests de l'ingestion paginée (EventPreparer.stream_batches) et de
+l'exécution page par page (AnalysisPipeline.execute_streaming)
+"""
+
+import pytest
+
+from analysis.pipelines.pipeline import AnalysisPipeline
+from analysis.pipelines.prepare_events import EventPreparer
+from analysis.tests.stub_api import StubAnalysisAPI, make_raw_units
+
+FETCH_UNITS = ("GET", "/api/analysis/fetch-units")
+
+
+class TestStreamBatches:
+    """Tests pour EventPreparer.stream_batches"""
+
+    def test_pages_through_all_units(self):
+        with StubAnalysisAPI(units=make_raw_units(250)) as api:
+            preparer = EventPreparer(api.base_url)
+            pages = list(preparer.stream_batches("tenant1", page_size=100))
+            fetches = api.requests[FETCH_UNITS]
+
+        assert [page["count"] for page in pages] == [100, 100, 50]
+        ids = [unit.id for page in pages for unit in page["units"]]
+        assert ids == [f"unit-{i:04d}" for i in range(250)]
+        assert fetches == 3
+
+    def test_exact_multiple_ends_on_empty_page(self):
+        with StubAnalysisAPI(units=make_raw_units(200)) as api:
+            pages = list(
+                EventPreparer(api.base_url).stream_batches("tenant1", page_size=100)
+            )
+            fetches = api.requests[FETCH_UNITS]
+
+        assert [page["count"] for page in pages] == [100, 100]
+        assert fetches == 3
+
+    def test_max_units_caps_last_page(self):
+        with StubAnalysisAPI(units=make_raw_units(250)) as api:
+            pages = list(
+                EventPreparer(api.base_url).stream_batches(
+                    "tenant1", page_size=100, max_units=130
+                )
+            )
+
+        assert [page["count"] for page in pages] == [100, 30]
+
+    def test_generator_is_lazy(self):
+        with StubAnalysisAPI(units=make_raw_units(250)) as api:
+            batches = EventPreparer(api.base_url).stream_batches(
+                "tenant1", page_size=100
+            )
+            next(batches)
+            fetches = api.requests[FETCH_UNITS]
+
+        assert fetches == 1
+
+
+class TestExecuteStreaming:
+    """Tests pour AnalysisPipeline.execute_streaming"""
+
+    def test_counts_match_single_batch(self):
+        with StubAnalysisAPI(units=make_raw_units(120)) as api:
+            single = AnalysisPipeline("tenant1", api.base_url).execute(
+                limit=120, persist=False
+            )
+            streamed = AnalysisPipeline("tenant1", api.base_url).execute_streaming(
+                page_size=40, persist=True
+            )
+            persisted = len(api.created_events)
+
+        assert streamed.units_ingested == streamed.units_classified == 120
+        # Doublons intra-batch cherchés par page uniquement
+        classification_events = streamed.events_generated - streamed.duplicates_detected
+        assert classification_events == single.units_classified
+        assert persisted == streamed.events_generated
+        assert streamed.classifications == []
+        assert streamed.events == []
+
+    def test_keep_details(self):
+        with StubAnalysisAPI(units=make_raw_units(30)) as api:
+            result = AnalysisPipeline("tenant1", api.base_url).execute_streaming(
+                page_size=20, persist=False, keep_details=True
+            )
+
+        assert len(result.classifications) == 30
+        assert len(result.events) == result.events_generated
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
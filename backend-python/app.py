@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 import sys
 from datetime import datetime, timedelta
@@ -6,7 +7,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from apscheduler.schedulers.background import BackgroundScheduler
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
@@ -32,6 +32,12 @@ except ImportError:
 # Add Python pipeline path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+# Logs du pipeline d'analyse (niveau par logger: PIPELINE_LOG_LEVEL)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
 app = Flask(__name__)
 CORS(
     app,
@@ -45,8 +51,10 @@ CORS(
     },
 )
 
-# Initialize scheduler
-scheduler = BackgroundScheduler()
+# Scheduler multi-tenant et moniteur d'échéances du pipeline (initialisés
+# plus bas si disponibles)
+scheduler = None
+deadline_monitor = None
 
 # Configuration
 DATA_DIR = Path("data")
@@ -469,9 +477,23 @@ def list_templates():
 # ============================================================================
 
 try:
-    from analysis.config import get_config
+    from analysis.config import (
+        DEFAULT_TENANT_ID,
+        PIPELINE_API_BASE_URL,
+        PIPELINE_CHECKPOINT_DB,
+        PIPELINE_RUN_MAX_UNITS,
+        PIPELINE_TENANT_IDS,
+        get_config,
+    )
+    from analysis.pipelines.checkpoints import CheckpointStore
+    from analysis.pipelines.classification_cache import get_shared_cache
+    from analysis.pipelines.repetitions import get_shared_counter
+    from analysis.pipelines.deadline_index import DeadlineIndex, DeadlineMonitor
+    from analysis.pipelines.generate_events import EventLogger
+    from analysis.pipelines.merkle import BatchSealer, verify_proof
     from analysis.pipelines.pipeline import AnalysisPipeline
-    from analysis.pipelines.rules_engine import DeadlineExtractor, RuleEngine
+    from analysis.pipelines.scheduler import TenantScheduler
+    from analysis.pipelines.rules_engine import DEADLINE_EXTRACTOR, RuleEngine
     from analysis.schemas.models import InformationUnitSchema
 
     PIPELINE_AVAILABLE = True
@@ -516,6 +538,10 @@ def execute_pipeline():
                     "duplicates_detected": result.duplicates_detected,
                     "processing_time_seconds": result.processing_time_seconds,
                     "rules_applied": result.rules_applied,
+                    "stage_metrics": [
+                        stage.model_dump() for stage in result.stage_metrics
+                    ],
+                    "counters": result.counters,
                     "errors": result.errors,
                 }
             ),
@@ -525,6 +551,17 @@ def execute_pipeline():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/analysis/metrics", methods=["GET"])
+def analysis_metrics():
+    """Histogrammes Prometheus par étape du pipeline (format texte)"""
+    try:
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    except ImportError:
+        return jsonify({"error": "prometheus-client not installed"}), 501
+
+    return generate_latest(), 200, {"Content-Type": CONTENT_TYPE_LATEST}
+
+
 @app.route("/analysis/test-rules", methods=["POST"])
 def test_rules():
     """Tester les règles sur une unité unique"""
@@ -550,8 +587,12 @@ def test_rules():
         )
 
         # Extraire les deadlines
-        extractor = DeadlineExtractor()
-        deadlines = extractor.extract_deadlines(unit.content)
+        deadlines = [
+            {**deadline, "date": deadline["date"].isoformat()}
+            for deadline in DEADLINE_EXTRACTOR.extract_deadlines(
+                unit.content, with_context=True
+            )
+        ]
 
         return (
             jsonify(
@@ -576,6 +617,7 @@ def analysis_stats():
         return jsonify({"error": "Pipeline not available"}), 500
 
     try:
+        classification_cache = get_shared_cache()
         # TODO: Implémenter en lisant depuis Prisma EventLog
         return (
             jsonify(
@@ -592,6 +634,10 @@ def analysis_stats():
                         "duplicates_found": 0,
                         "avg_processing_time": 0,
                     },
+                    "classification_cache": (
+                        classification_cache.stats() if classification_cache else None
+                    ),
+                    "repetition_counter": get_shared_counter().stats(),
                     "configuration": get_config(),
                 }
             ),
@@ -601,6 +647,20 @@ def analysis_stats():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/analysis/events/<event_id>/proof", methods=["GET"])
+def event_inclusion_proof(event_id):
+    """Preuve d'inclusion d'un EventLog dans son batch scellé (Merkle)"""
+    if not PIPELINE_AVAILABLE:
+        return jsonify({"error": "Pipeline not available"}), 500
+
+    tenant_id = request.args.get("tenant_id", DEFAULT_TENANT_ID)
+    proof = batch_sealer.inclusion_proof(tenant_id, event_id)
+    if proof is None:
+        return jsonify({"error": "EventLog non scellé"}), 404
+
+    return jsonify({**proof, "verified": verify_proof(proof)}), 200
+
+
 # ============================================================================
 # AUTO MODE ENDPOINTS (SCHEDULER CONTROL)
 # ============================================================================
@@ -608,23 +668,29 @@ def analysis_stats():
 
 @app.route("/api/auto/status", methods=["GET"])
 def auto_status():
-    """Check if auto mode (scheduler) is running"""
-    try:
-        jobs = scheduler.get_jobs()
-        pipeline_job = next(
-            (job for job in jobs if job.id == "analysis_pipeline"), None
+    """État du scheduler: file, retard et dernier run par tenant"""
+    if scheduler is None:
+        return jsonify(
+            {
+                "auto_mode_enabled": False,
+                "timestamp": datetime.now().isoformat(),
+            }
         )
 
+    try:
+        status = scheduler.status()
+        if deadline_monitor is not None:
+            next_wake_at = deadline_monitor.index.next_wake_at()
+            status["deadlines"] = {
+                "running": deadline_monitor.running,
+                "tracked": len(deadline_monitor.index),
+                "next_threshold_at": next_wake_at and next_wake_at.isoformat(),
+                "events_emitted": deadline_monitor.events_emitted,
+            }
         return jsonify(
             {
-                "auto_mode_enabled": scheduler.running,
-                "pipeline_job_active": pipeline_job is not None,
-                "next_run": (
-                    pipeline_job.next_run_time.isoformat()
-                    if pipeline_job and pipeline_job.next_run_time
-                    else None
-                ),
-                "job_count": len(jobs),
+                "auto_mode_enabled": status["running"],
+                **status,
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -635,30 +701,11 @@ def auto_status():
 @app.route("/api/auto/start", methods=["POST"])
 def auto_start():
     """Start the scheduler for auto mode"""
-    if not PIPELINE_AVAILABLE:
+    if scheduler is None:
         return jsonify({"error": "Pipeline not available"}), 500
 
     try:
-        if not scheduler.running:
-            scheduler.start()
-            print("✅ APScheduler started (auto mode enabled)")
-
-        # Ensure the pipeline job is added
-        jobs = scheduler.get_jobs()
-        pipeline_job = next(
-            (job for job in jobs if job.id == "analysis_pipeline"), None
-        )
-
-        if not pipeline_job:
-            scheduler.add_job(
-                func=scheduled_pipeline_job,
-                trigger="interval",
-                hours=4,
-                id="analysis_pipeline",
-                name="Analysis Pipeline (4h interval)",
-                replace_existing=True,
-            )
-            print("✅ Analysis pipeline job added")
+        scheduler.start()
 
         return jsonify(
             {
@@ -675,9 +722,8 @@ def auto_start():
 def auto_stop():
     """Stop the scheduler for auto mode"""
     try:
-        if scheduler.running:
-            scheduler.shutdown(wait=False)
-            print("✅ APScheduler stopped (auto mode disabled)")
+        if scheduler is not None and scheduler.running:
+            scheduler.stop(wait=False)
 
         return jsonify(
             {
@@ -692,59 +738,79 @@ def auto_stop():
 
 @app.route("/api/auto/trigger", methods=["POST"])
 def auto_trigger():
-    """Manually trigger the analysis pipeline"""
-    if not PIPELINE_AVAILABLE:
+    """
+    Met en file un run immédiat (asynchrone)
+
+    Body optionnel: {"tenant_id": "..."}; sans tenant, tous les tenants
+    planifiés sont déclenchés.
+    """
+    if scheduler is None:
         return jsonify({"error": "Pipeline not available"}), 500
 
     try:
-        pipeline = AnalysisPipeline()
-        result = pipeline.execute()
+        data = request.get_json(silent=True) or {}
+        tenant_id = data.get("tenant_id")
+        tenant_ids = (
+            [tenant_id]
+            if tenant_id
+            else [tenant["tenant_id"] for tenant in scheduler.status()["tenants"]]
+        )
+        queued = [tenant for tenant in tenant_ids if scheduler.trigger(tenant)]
 
-        return jsonify(
-            {
-                "status": "triggered",
-                "events_generated": result.events_generated,
-                "duplicates_detected": result.duplicates_detected,
-                "processing_time_seconds": result.processing_time_seconds,
-                "rules_applied": result.rules_applied,
-                "errors": result.errors,
-                "timestamp": datetime.now().isoformat(),
-            }
+        return (
+            jsonify(
+                {
+                    "status": "queued",
+                    "queued": queued,
+                    "already_pending": sorted(set(tenant_ids) - set(queued)),
+                    "queue_depth": scheduler.status()["queue_depth"],
+                    "timestamp": datetime.now().isoformat(),
+                }
+            ),
+            202,
         )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 # ============================================================================
-# SCHEDULED JOBS (APScheduler)
+# SCHEDULED RUNS (TenantScheduler)
 # ============================================================================
 
 
-def scheduled_pipeline_job():
-    """Job exécuté toutes les 4 heures pour analyser les flux"""
-    try:
-        pipeline = AnalysisPipeline()
-        result = pipeline.execute()
-        print(
-            f"✅ Scheduled pipeline executed: {result.events_generated} events generated"
-        )
-    except Exception as e:
-        print(f"❌ Scheduled pipeline error: {e}")
+def run_scheduled_tenant(tenant_id):
+    """
+    Run incrémental d'un tenant (appelé par les workers du scheduler)
+
+    Reprend après le watermark du run précédent (checkpoints SQLite), même
+    si celui-ci a été interrompu. Le nombre d'unités traitées règle
+    l'intervalle du prochain run. Les échéances détectées sont confiées au
+    moniteur d'échéances (pas de reclassification périodique).
+    """
+    with AnalysisPipeline(
+        tenant_id,
+        PIPELINE_API_BASE_URL,
+        checkpoints=checkpoint_store,
+        deadline_index=deadline_index,
+        sealer=batch_sealer,
+    ) as pipeline:
+        result = pipeline.execute_streaming(max_units=PIPELINE_RUN_MAX_UNITS or None)
+    return result.units_ingested
 
 
-# Initialiser le scheduler
-scheduler = BackgroundScheduler()
 if PIPELINE_AVAILABLE:
-    scheduler.add_job(
-        func=scheduled_pipeline_job,
-        trigger="interval",
-        hours=4,
-        id="analysis_pipeline",
-        name="Analysis Pipeline (4h interval)",
-        replace_existing=True,
+    checkpoint_store = CheckpointStore(PIPELINE_CHECKPOINT_DB)
+    deadline_index = DeadlineIndex(store=checkpoint_store)
+    batch_sealer = BatchSealer(store=checkpoint_store)
+    deadline_monitor = DeadlineMonitor(
+        deadline_index, EventLogger(PIPELINE_API_BASE_URL)
+    )
+    deadline_monitor.start()
+    scheduler = TenantScheduler(
+        run_scheduled_tenant, PIPELINE_TENANT_IDS or [DEFAULT_TENANT_ID]
     )
     scheduler.start()
-    print("✅ APScheduler initialized (4-hour interval for analysis pipeline)")
+    print("✅ Scheduler initialized (per-tenant queue for analysis pipeline)")
 
 
 # ============================================================================
@@ -178,6 +178,56 @@ class TestInputValidator(unittest.TestCase):
         self.assertTrue(strong["valid"])
         log_test("Password fort accepté", strong["valid"])
 
+    def test_scanner_matches_per_pattern_search(self):
+        """Test ATTACK_SCANNER identique à un re.search par pattern"""
+        if not self.available:
+            self.skipTest("Validator non disponible")
+
+        import re
+
+        from src.backend.security.input_validator import ATTACK_SCANNER
+
+        values = [
+            "' UNION SELECT * FROM passwords --",
+            '<img src=x onerror=alert("XSS")>',
+            "http://127.0.0.1/admin; cat /etc/passwd",
+            "{{7*7}} ${7*7}",
+            "Sophie",
+            "bash",
+            "0xdeadbeef",
+            "Bonjour, je souhaite un rendez-vous lundi.",
+        ]
+
+        for value in values:
+            expected = [
+                attack_type
+                for attack_type, patterns, flags in self.validator.ATTACK_PATTERNS
+                if any(re.search(pattern, value, flags) for pattern in patterns)
+            ]
+            self.assertEqual(list(ATTACK_SCANNER.scan(value)), expected, value)
+        log_test("Scanner équivalent aux patterns", True)
+
+    def test_scanner_cache(self):
+        """Test cache LRU du scanner (valeurs courtes uniquement)"""
+        if not self.available:
+            self.skipTest("Validator non disponible")
+
+        from src.backend.security.input_validator import (
+            SCAN_CACHE_MAX_LENGTH,
+            AttackScanner,
+        )
+
+        scanner = AttackScanner(
+            self.validator.ATTACK_PATTERNS, self.validator.ALNUM_RISK_PATTERN
+        )
+        scanner.scan("'; DROP TABLE users; --")
+        scanner.scan("'; DROP TABLE users; --")
+        scanner.scan("a" * (SCAN_CACHE_MAX_LENGTH + 1))
+
+        info = scanner._cached_scan.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        log_test("Cache du scanner", info.hits == 1)
+
 
 class TestSecurityMiddleware(unittest.TestCase):
     """Tests du middleware de sécurité"""
@@ -249,6 +299,119 @@ class TestSecurityMiddleware(unittest.TestCase):
             log_test(f"Rate Limit {cat}: {limit}/{window}s", True)
 
 
+class TestRateLimiter(unittest.TestCase):
+    """Tests du rate limiting GCRA"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from src.backend.security.gcra import GCRALimiter, RedisGCRALimiter
+
+            cls.limiter_class = GCRALimiter
+            cls.redis_limiter_class = RedisGCRALimiter
+            cls.available = True
+        except ImportError as e:
+            print(f"{Colors.YELLOW}⚠️ Rate limiter non disponible: {e}{Colors.RESET}")
+            cls.available = False
+
+    def setUp(self):
+        if not self.available:
+            self.skipTest("Rate limiter non disponible")
+        self.now = 1000.0
+        self.limiter = self.limiter_class(sweep_interval=0, clock=lambda: self.now)
+
+    def test_burst_then_limited(self):
+        """Test rafale de `limit` requêtes puis blocage"""
+        results = [self.limiter.hit("auth:client", 5, 60) for _ in range(6)]
+
+        self.assertEqual([r[1] for r in results[:5]], [4, 3, 2, 1, 0])
+        self.assertFalse(any(r[0] for r in results[:5]))
+        self.assertTrue(results[5][0])
+        # Prochaine requête acceptée après un intervalle d'émission (60/5)
+        self.assertAlmostEqual(results[5][2], 12.0)
+        log_test("GCRA: rafale puis blocage", results[5][0])
+
+    def test_refill_over_time(self):
+        """Test libération d'une requête par intervalle d'émission"""
+        for _ in range(5):
+            self.limiter.hit("auth:client", 5, 60)
+
+        self.now += 11.9
+        self.assertTrue(self.limiter.hit("auth:client", 5, 60)[0])
+        self.now += 0.2
+        self.assertEqual(self.limiter.hit("auth:client", 5, 60)[:2], (False, 0))
+        log_test("GCRA: recharge progressive", True)
+
+    def test_keys_are_independent_and_resettable(self):
+        """Test isolation des clients et reset"""
+        for _ in range(5):
+            self.limiter.hit("auth:a", 5, 60)
+
+        self.assertFalse(self.limiter.hit("auth:b", 5, 60)[0])
+        self.limiter.reset("auth:a")
+        self.assertEqual(self.limiter.hit("auth:a", 5, 60)[1], 4)
+
+    def test_sweep_evicts_idle_keys(self):
+        """Test éviction des clés dont le seau est plein"""
+        for i in range(1000):
+            self.limiter.hit(f"api:{i}", 60, 60)
+        self.limiter.hit("api:busy", 1, 60)
+
+        self.now += 30
+        self.assertEqual(self.limiter.sweep(), 1000)
+        self.assertEqual(len(self.limiter), 1)
+        log_test("GCRA: éviction des clés inactives", len(self.limiter) == 1)
+
+    def test_concurrent_hits_never_exceed_limit(self):
+        """Test: pas de requête en trop sous accès concurrents"""
+        import threading
+
+        accepted = []
+
+        def worker():
+            for _ in range(100):
+                if not self.limiter.hit("upload:client", 50, 300)[0]:
+                    accepted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(accepted), 50)
+
+    def test_shards_power_of_two(self):
+        """Test validation du nombre de shards"""
+        with self.assertRaises(ValueError):
+            self.limiter_class(shards=12)
+
+    def test_redis_backend_shares_limits(self):
+        """Test backend Redis (script Lua) partagé entre workers"""
+        try:
+            import fakeredis
+        except ImportError:
+            self.skipTest("fakeredis non installé")
+
+        server = fakeredis.FakeServer()
+        worker_a = self.redis_limiter_class(fakeredis.FakeRedis(server=server))
+        worker_b = self.redis_limiter_class(fakeredis.FakeRedis(server=server))
+
+        results = [
+            worker.hit("auth:client", 5, 60)
+            for worker in (worker_a, worker_b, worker_a, worker_b, worker_a, worker_b)
+        ]
+
+        self.assertEqual([r[1] for r in results[:5]], [4, 3, 2, 1, 0])
+        self.assertTrue(results[5][0])
+        self.assertAlmostEqual(results[5][2], 12.0, delta=0.5)
+        self.assertGreater(worker_a.redis.pttl("ratelimit:auth:client"), 0)
+
+        worker_b.reset("auth:client")
+        self.assertEqual(worker_a.hit("auth:client", 5, 60)[1], 4)
+        log_test("GCRA Redis: limites partagées", results[5][0])
+
+
 class TestEncryption(unittest.TestCase):
     """Tests du module de chiffrement"""
 
@@ -305,6 +468,7 @@ def run_security_tests():
     # Ajouter les tests
     suite.addTests(loader.loadTestsFromTestCase(TestInputValidator))
     suite.addTests(loader.loadTestsFromTestCase(TestSecurityMiddleware))
+    suite.addTests(loader.loadTestsFromTestCase(TestRateLimiter))
     suite.addTests(loader.loadTestsFromTestCase(TestEncryption))
 
     # Runner personnalisé
@@ -0,0 +1,141 @@
+"""
+Benchmark de la détection d'attaques (security.input_validator)
+Compare le chemin historique (un re.search par pattern, 12 check_*) à
+ATTACK_SCANNER, sur les payloads de security/attack-simulation*.py et sur
+des valeurs de formulaire saines
+
+Usage:
+    python benchmark_input_validator.py [--clean 5000] [--rounds 5]
+"""
+import argparse
+import ast
+import glob
+import html
+import logging
+import os
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from security.input_validator import ATTACK_SCANNER, InputValidator
+
+CORPUS_GLOB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "security", "attack-simulation*.py"
+)
+
+FIRST_NAMES = ["Sophie", "Thomas", "Amina", "Lucas", "Jean", "Chloé", "Karim", "Léa"]
+WORDS = (
+    "bonjour maître je vous contacte au sujet de mon dossier de licenciement "
+    "mon employeur refuse de payer les heures supplémentaires depuis mars"
+).split()
+
+
+def load_corpus() -> List[str]:
+    """Listes *_PAYLOADS / *_PASSWORDS des scripts de simulation (sans les exécuter)"""
+    payloads = []
+    for path in sorted(glob.glob(CORPUS_GLOB)):
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if (
+                isinstance(node, ast.Assign)
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id.endswith(("_PAYLOADS", "_PASSWORDS"))
+            ):
+                payloads.extend(ast.literal_eval(node.value))
+    return payloads
+
+
+def make_clean_values(count: int, seed: int = 42) -> List[str]:
+    """Valeurs de formulaire réalistes : noms, ids, emails, phrases"""
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            values.append(rng.choice(FIRST_NAMES))
+        elif kind == 1:
+            values.append(str(rng.randrange(10**8)))
+        elif kind == 2:
+            values.append(f"{rng.choice(FIRST_NAMES).lower()}.{rng.randrange(999)}@example.fr")
+        else:
+            values.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40))))
+    return values
+
+
+def legacy_scan(value: str) -> List[str]:
+    """Chemin historique de validate_input : un re.search par pattern"""
+    return [
+        attack_type
+        for attack_type, patterns, flags in InputValidator.ATTACK_PATTERNS
+        if any(re.search(pattern, value, flags) for pattern in patterns)
+    ]
+
+
+def legacy_sanitize(value: str) -> str:
+    sanitized = html.escape(value)
+    for pattern in InputValidator.XSS_PATTERNS:
+        sanitized = re.sub(pattern, "", sanitized, flags=re.IGNORECASE | re.DOTALL)
+    return sanitized
+
+
+def scanner_uncached(value: str):
+    return ATTACK_SCANNER._scan(value)
+
+
+def measure(scan: Callable[[str], object], values: List[str], rounds: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for value in values:
+            scan(value)
+        timings.append((time.perf_counter() - start) / len(values))
+    return {"us_per_value": statistics.median(timings) * 1e6}
+
+
+def run_benchmark(clean: int = 5000, rounds: int = 5) -> Tuple[Dict[str, Dict[str, Dict[str, float]]], Dict[str, int]]:
+    datasets = {"attaques": load_corpus(), "saines": make_clean_values(clean)}
+
+    # Mêmes résultats que le chemin historique avant de comparer les temps
+    for values in datasets.values():
+        for value in values:
+            assert list(scanner_uncached(value)) == legacy_scan(value), value
+            assert InputValidator.sanitize_html(value) == legacy_sanitize(value), value
+
+    report = {}
+    for name, values in datasets.items():
+        ATTACK_SCANNER.cache_clear()  # vide au premier tour, chaud ensuite
+        report[name] = {
+            "legacy": measure(legacy_scan, values, rounds),
+            "scanner": measure(scanner_uncached, values, rounds),
+            "scanner+lru": measure(ATTACK_SCANNER.scan, values, rounds),
+            "validate_input (legacy)": measure(
+                lambda v: (legacy_scan(v), legacy_sanitize(v)), values, rounds
+            ),
+            "validate_input": measure(InputValidator.validate_input, values, rounds),
+        }
+    return report, {name: len(values) for name, values in datasets.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clean", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # validate_input journalise chaque attaque détectée
+    logging.getLogger("security.input_validator").setLevel(logging.ERROR)
+
+    report, sizes = run_benchmark(args.clean, args.rounds)
+    for name, results in report.items():
+        print(f"Valeurs {name} ({sizes[name]})")
+        for path, stats in results.items():
+            print(f"  {path:<24} {stats['us_per_value']:8.2f} µs/valeur")
+        speedup = results["legacy"]["us_per_value"] / results["scanner"]["us_per_value"]
+        print(f"  gain détection (sans cache): x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark du rate limiting (security.middleware.RateLimiter)
+Compare la fenêtre glissante historique (liste d'horodatages par client,
+verrou global) au GCRALimiter (une TAT par client, verrous par shard), sur
+50 000 clients distincts
+
+Usage:
+    python benchmark_rate_limit.py [--clients 50000] [--requests 500000]
+"""
+import argparse
+import random
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from security.gcra import GCRALimiter
+
+LIMIT, WINDOW = 60, 60  # catégorie "api"
+
+
+class LegacySlidingWindow:
+    """Chemin historique de RateLimiter.is_rate_limited"""
+
+    def __init__(self):
+        self.storage: Dict[str, List[float]] = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float) -> Tuple[bool, int, float]:
+        now = time.time()
+        window_start = now - window
+        with self.lock:
+            self.storage[key] = [t for t in self.storage[key] if t > window_start]
+            current_count = len(self.storage[key])
+            if current_count >= limit:
+                oldest = min(self.storage[key])
+                return True, 0, oldest + window - now
+            self.storage[key].append(now)
+            return False, limit - current_count - 1, window
+
+    def __len__(self) -> int:
+        return len(self.storage)
+
+
+def make_keys(clients: int, requests: int, seed: int = 42) -> List[str]:
+    """Trafic réaliste : 20 % des clients font 80 % des requêtes"""
+    rng = random.Random(seed)
+    hot = max(1, clients // 5)
+    keys = []
+    for _ in range(requests):
+        client = rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(clients)
+        keys.append(f"api:10.{client >> 16}.{(client >> 8) & 255}.{client & 255}:ua")
+    return keys
+
+
+def measure(make_limiter: Callable[[], object], keys: List[str]) -> Dict[str, float]:
+    """Temps par requête, puis mémoire retenue (second passage sous tracemalloc)"""
+    limiter = make_limiter()
+    start = time.perf_counter()
+    for key in keys:
+        limiter.hit(key, LIMIT, WINDOW)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    limiter = make_limiter()
+    for key in keys:
+        limiter.hit(key, LIMIT, WINDOW)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "us_per_hit": elapsed / len(keys) * 1e6,
+        "retained_mb": retained / 1e6,
+        "keys": len(limiter),
+    }
+
+
+def measure_threads(hit: Callable[[str, int, float], object], keys: List[str], threads: int) -> float:
+    """Débit (hits/s) de `threads` threads se partageant le trafic"""
+    chunks = [keys[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        for key in chunk:
+            hit(key, LIMIT, WINDOW)
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return len(keys) / (time.perf_counter() - start)
+
+
+def run_benchmark(clients: int = 50000, requests: int = 500000, threads: int = 8) -> Dict[str, Dict[str, float]]:
+    keys = make_keys(clients, requests)
+
+    def make_gcra():
+        return GCRALimiter(sweep_interval=0)
+
+    report = {
+        "legacy": measure(LegacySlidingWindow, keys),
+        "gcra": measure(make_gcra, keys),
+    }
+    report["legacy"]["threads_hits_per_s"] = measure_threads(LegacySlidingWindow().hit, keys, threads)
+    report["gcra"]["threads_hits_per_s"] = measure_threads(make_gcra().hit, keys, threads)
+
+    # Balayage : une fenêtre plus tard, toutes les clés sont inactives
+    clock = [0.0]
+    swept = GCRALimiter(sweep_interval=0, clock=lambda: clock[0])
+    for key in keys:
+        swept.hit(key, LIMIT, WINDOW)
+    clock[0] = WINDOW
+    start = time.perf_counter()
+    evicted = swept.sweep()
+    report["gcra"]["sweep_ms"] = (time.perf_counter() - start) * 1000
+    report["gcra"]["evicted"] = evicted
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=500000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    report = run_benchmark(args.clients, args.requests, args.threads)
+    print(f"Rate limiting — {args.requests} requêtes de {args.clients} clients ({LIMIT}/{WINDOW}s)")
+    for name, stats in report.items():
+        print(
+            f"  {name:<7} {stats['us_per_hit']:.2f} µs/requête"
+            f"  {stats['threads_hits_per_s']:,.0f} req/s ({args.threads} threads)"
+            f"  mémoire {stats['retained_mb']:.1f} Mo pour {stats['keys']} clés"
+        )
+    print(
+        f"  balayage GCRA : {report['gcra']['evicted']} clés évincées"
+        f" en {report['gcra']['sweep_ms']:.1f} ms"
+    )
+    speedup = report["legacy"]["us_per_hit"] / report["gcra"]["us_per_hit"]
+    print(f"  gain: x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional, Dict, Any
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
 import os
 import sys
 from datetime import datetime
@@ -19,12 +22,49 @@ from voice_service import VoiceService
 
 # Import routers
 from routes.client_portal import router as client_portal_router
-from routes.triage import router as triage_router
+from routes.triage import router as triage_router, configure_jurist_pool
 from routes.payments import (
     router as payments_router,
     verify_admin_access,
     _admin_rate_limit_headers_from_request,
 )
+from database import SessionLocal, engine
+from models import Base
+
+# Rafraîchissement du pool de juristes (triage) depuis la DB
+JURIST_POOL_REFRESH_SECONDS = float(os.getenv("TRIAGE_JURIST_REFRESH_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Pool de juristes chargé depuis la DB puis rafraîchi en tâche de fond
+
+    Les charges ne sont réécrites à l'arrêt que si elles sont partagées
+    (Redis) : des charges locales à un worker écraseraient celles des autres.
+    """
+    refresh_task = None
+    try:
+        Base.metadata.create_all(bind=engine)
+        jurist_pool = configure_jurist_pool(SessionLocal)
+        if not jurist_pool.engine.shared:
+            logger.warning(
+                "⚠️ TRIAGE_ASSIGNMENT_REDIS_URL absent : charges des juristes "
+                "locales au processus, non réécrites à l'arrêt"
+            )
+        refresh_task = asyncio.create_task(jurist_pool.run(JURIST_POOL_REFRESH_SECONDS))
+    except Exception as e:
+        logger.warning("⚠️ Pool de juristes non chargé depuis la DB: %s", e)
+    yield
+    if refresh_task:
+        refresh_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresh_task
+        if jurist_pool.engine.shared:
+            await asyncio.to_thread(jurist_pool.persist)
+
 
 # Initialize FastAPI
 app = FastAPI(
@@ -32,7 +72,8 @@ app = FastAPI(
     description="Production-ready email automation API with AI and Voice",
     version="2.3.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Initialize services
@@ -171,3 +171,16 @@ class PaymentEvent(Base):
 
     # Relations
     case = relationship("Case", backref="payment_events")
+
+
+class Jurist(Base):
+    """Modèle juriste - US12 pool d'assignation du triage"""
+    __tablename__ = "jurists"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    specialties = Column(Text, nullable=False, default="[]")  # JSON array de catégories
+    workload = Column(Integer, default=0)  # Dossiers en cours
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
@@ -3,11 +3,19 @@ Routes Triage Assistant Priorisé - US12
 Auto-catégorisation et scoring des dossiers entrants
 Attribution intelligente aux juristes disponibles
 """
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import List, Optional, Dict
 from datetime import datetime
-import re
+from threading import Lock
+import asyncio
+import json
+import os
+import uuid
+
+from services.jurist_assignment import Assignment, JuristPoolSync, create_assignment_engine
+from services.keyword_matcher import KeywordAutomaton, normalize
 
 router = APIRouter(prefix="/api/triage", tags=["triage"])
 
@@ -67,7 +75,7 @@ ESCALATION_KEYWORDS = [
     "menace", "huissier", "assignation sous",
 ]
 
-# Juristes disponibles (pool simulé — à remplacer par lecture DB en prod)
+# Pool initial du moteur d'assignation (remplacé par la table jurists au démarrage)
 JURISTS_POOL: List[Dict] = [
     {"id": 1, "name": "Me. Sophie Durand", "specialties": ["droit_travail", "droit_famille"], "workload": 3},
     {"id": 2, "name": "Me. Thomas Bernard", "specialties": ["droit_immobilier", "droit_consommation"], "workload": 5},
@@ -77,6 +85,14 @@ JURISTS_POOL: List[Dict] = [
 
 PRIORITY_ORDER = {"low": 0, "normal": 1, "high": 2, "critical": 3}
 
+# Dossiers acceptés par appel à /analyze-batch
+TRIAGE_BATCH_MAX_ITEMS = int(os.getenv("TRIAGE_BATCH_MAX_ITEMS", "50000"))
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Redis partagé entre workers uvicorn (sinon assignation en mémoire)
+TRIAGE_ASSIGNMENT_REDIS_URL = os.getenv("TRIAGE_ASSIGNMENT_REDIS_URL")
+
 # ---------------------------------------------------------------------------
 # Modèles Pydantic
 # ---------------------------------------------------------------------------
@@ -91,6 +107,9 @@ class TriageRequest(BaseModel):
     deadline: Optional[datetime] = Field(None, description="Echéance si connue")
 
 
+TRIAGE_REQUESTS_ADAPTER = TypeAdapter(List[TriageRequest])
+
+
 class CategoryScore(BaseModel):
     """Score par catégorie juridique"""
     category: str
@@ -126,45 +145,65 @@ class TriageResult(BaseModel):
 
 def _normalize(text: str) -> str:
     """Minuscules + suppression des accents pour comparaison souple"""
-    text = text.lower()
-    replacements = {
-        "é": "e", "è": "e", "ê": "e", "ë": "e",
-        "à": "a", "â": "a", "ä": "a",
-        "ù": "u", "û": "u", "ü": "u",
-        "î": "i", "ï": "i",
-        "ô": "o", "ö": "o",
-        "ç": "c",
-    }
-    for src, dst in replacements.items():
-        text = text.replace(src, dst)
-    return text
+    return normalize(text)
 
 
-def _score_categories(text: str) -> List[CategoryScore]:
-    """Calcule un score de correspondance pour chaque catégorie"""
-    normalized = _normalize(text)
-    scores: List[CategoryScore] = []
+class TriageMatcher:
+    """
+    Scoring des catégories + détection d'escalade en un seul passage
+
+    Construit une fois à l'import : mots-clés normalisés et compilés dans un
+    automate d'Aho-Corasick. Mots-clés de catégorie avec frontières de mot
+    (\\b...\\b), mots-clés d'escalade en simple sous-chaîne.
+    """
+
+    def __init__(
+        self,
+        category_keywords: Dict[str, List[str]],
+        escalation_keywords: List[str],
+    ):
+        patterns: Dict[tuple, int] = {}
 
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        matched = []
-        for kw in keywords:
-            kw_norm = _normalize(kw)
-            if re.search(r"\b" + re.escape(kw_norm) + r"\b", normalized):
-                matched.append(kw)
-        scores.append(CategoryScore(
-            category=category,
-            score=len(matched),
-            matched_keywords=matched,
-        ))
+        def pattern_index(keyword: str, bounded: bool) -> int:
+            return patterns.setdefault((normalize(keyword), bounded), len(patterns))
 
-    scores.sort(key=lambda x: x.score, reverse=True)
-    return scores
+        self.categories = [
+            (category, [(kw, pattern_index(kw, True)) for kw in keywords])
+            for category, keywords in category_keywords.items()
+        ]
+        self.escalation_patterns = frozenset(
+            pattern_index(kw, False) for kw in escalation_keywords
+        )
+        self.automaton = KeywordAutomaton(list(patterns))
+
+    def analyze(self, text: str) -> tuple[List[CategoryScore], bool]:
+        """(scores triés par score décroissant, escalade ?)"""
+        found = self.automaton.scan(normalize(text))
+
+        scores: List[CategoryScore] = []
+        for category, keywords in self.categories:
+            matched = [kw for kw, index in keywords if index in found]
+            scores.append(CategoryScore(
+                category=category,
+                score=len(matched),
+                matched_keywords=matched,
+            ))
+        scores.sort(key=lambda x: x.score, reverse=True)
+
+        return scores, not found.isdisjoint(self.escalation_patterns)
+
+
+TRIAGE_MATCHER = TriageMatcher(CATEGORY_KEYWORDS, ESCALATION_KEYWORDS)
+
+
+def _score_categories(text: str) -> List[CategoryScore]:
+    """Calcule un score de correspondance pour chaque catégorie"""
+    return TRIAGE_MATCHER.analyze(text)[0]
 
 
 def _detect_escalation(text: str) -> bool:
     """Détecte les mots-clés d'escalade de priorité"""
-    normalized = _normalize(text)
-    return any(_normalize(kw) in normalized for kw in ESCALATION_KEYWORDS)
+    return TRIAGE_MATCHER.analyze(text)[1]
 
 
 def _compute_priority(category: str, escalate: bool, deadline: Optional[datetime]) -> tuple[str, int]:
@@ -189,31 +228,58 @@ def _compute_priority(category: str, escalate: bool, deadline: Optional[datetime
     return labels[score], score
 
 
-def _assign_jurist(category: str, priority: str) -> Optional[JuristAssignment]:
-    """
-    Sélectionne le juriste le plus approprié :
-    1. Priorité aux juristes spécialisés dans la catégorie
-    2. Parmi eux, le moins chargé
-    3. Si aucun spécialiste, prend le juriste global le moins chargé
-    """
-    specialists = [j for j in JURISTS_POOL if category in j["specialties"]]
-    candidates = specialists if specialists else JURISTS_POOL
+# ---------------------------------------------------------------------------
+# Assignation des juristes
+# ---------------------------------------------------------------------------
 
-    if not candidates:
-        return None
+_ASSIGNMENT_ENGINE = None
+_ASSIGNMENT_ENGINE_LOCK = Lock()
 
-    best = min(candidates, key=lambda j: j["workload"])
 
-    reason = (
-        f"Spécialiste {category}" if best in specialists else "Juriste généraliste disponible"
-    )
+def _assignment_engine():
+    """Moteur d'assignation partagé (créé au premier usage)"""
+    global _ASSIGNMENT_ENGINE
+    if _ASSIGNMENT_ENGINE is None:
+        with _ASSIGNMENT_ENGINE_LOCK:
+            if _ASSIGNMENT_ENGINE is None:
+                _ASSIGNMENT_ENGINE = create_assignment_engine(
+                    JURISTS_POOL, TRIAGE_ASSIGNMENT_REDIS_URL
+                )
+    return _ASSIGNMENT_ENGINE
+
+
+def configure_jurist_pool(session_factory) -> JuristPoolSync:
+    """Charge le pool depuis la table jurists (démarrage de l'application)"""
+    sync = JuristPoolSync(_assignment_engine(), session_factory)
+    sync.load()
+    return sync
+
+
+def _to_assignment(assignment: Assignment, category: str) -> Optional[JuristAssignment]:
+    if assignment is None:
+        return None
+
+    jurist, specialist = assignment
+    reason = f"Spécialiste {category}" if specialist else "Juriste généraliste disponible"
     return JuristAssignment(
-        jurist_id=best["id"],
-        jurist_name=best["name"],
+        jurist_id=jurist["id"],
+        jurist_name=jurist["name"],
         reason=reason,
     )
 
 
+def _assign_jurist(category: str) -> Optional[JuristAssignment]:
+    """
+    Sélectionne le juriste le plus approprié :
+    1. Priorité aux juristes spécialisés dans la catégorie
+    2. Parmi eux, le moins chargé
+    3. Si aucun spécialiste, prend le juriste global le moins chargé
+
+    La charge du juriste retenu est incrémentée (dossier réservé).
+    """
+    return _to_assignment(_assignment_engine().assign(category), category)
+
+
 def _recommended_actions(priority: str, category: str, deadline: Optional[datetime]) -> List[str]:
     actions = []
 
@@ -289,24 +355,12 @@ def _build_justification(
     return justification
 
 
-# ---------------------------------------------------------------------------
-# Endpoints
-# ---------------------------------------------------------------------------
-
-@router.post("/analyze", response_model=TriageResult, status_code=status.HTTP_200_OK)
-async def analyze_case(request: TriageRequest) -> TriageResult:
-    """
-    US12 — Analyse et priorise automatiquement un dossier entrant.
-
-    - Détecte la catégorie juridique (scoring par mots-clés)
-    - Calcule la priorité (base catégorie + escalade + deadline)
-    - Assigne un juriste disponible
-    - Retourne un plan d'action recommandé
-    """
+def _classify(request: TriageRequest) -> tuple[List[CategoryScore], bool, str, float]:
+    """(scores, escalade texte, catégorie détectée, confiance)"""
     full_text = f"{request.title} {request.description}"
 
-    # 1. Scoring des catégories
-    all_scores = _score_categories(full_text)
+    # Scoring des catégories (et escalade, même passage)
+    all_scores, escalate_text = TRIAGE_MATCHER.analyze(full_text)
     top_score = all_scores[0] if all_scores else None
 
     if top_score and top_score.score > 0:
@@ -318,18 +372,26 @@ async def analyze_case(request: TriageRequest) -> TriageResult:
         detected_category = "autre"
         confidence = 0.0
 
-    # 2. Escalade et priorité
-    escalate = _detect_escalation(full_text) or bool(request.client_urgency_claim)
-    priority, priority_score = _compute_priority(detected_category, escalate, request.deadline)
+    return all_scores, escalate_text, detected_category, confidence
 
-    # 3. Assignation juriste
-    assigned = _assign_jurist(detected_category, priority)
 
-    # 4. Actions & délai
+def _build_result(
+    request: TriageRequest,
+    classification: tuple[List[CategoryScore], bool, str, float],
+    assigned: Optional[JuristAssignment],
+) -> TriageResult:
+    """Priorité, actions et justification d'un dossier classé et assigné"""
+    all_scores, escalate_text, detected_category, confidence = classification
+
+    # Escalade et priorité
+    escalate = escalate_text or bool(request.client_urgency_claim)
+    priority, priority_score = _compute_priority(detected_category, escalate, request.deadline)
+
+    # Actions & délai
     actions = _recommended_actions(priority, detected_category, request.deadline)
     delay = _estimate_delay(detected_category, priority)
 
-    # 5. Justification
+    # Justification
     justification = _build_justification(
         all_scores,
         escalate,
@@ -337,11 +399,8 @@ async def analyze_case(request: TriageRequest) -> TriageResult:
         bool(request.client_urgency_claim),
     )
 
-    import uuid as _uuid
-    triage_id = str(_uuid.uuid4())
-
     return TriageResult(
-        triage_id=triage_id,
+        triage_id=str(uuid.uuid4()),
         analyzed_at=datetime.utcnow(),
         detected_category=detected_category,
         confidence=confidence,
@@ -355,6 +414,91 @@ async def analyze_case(request: TriageRequest) -> TriageResult:
     )
 
 
+def _triage(request: TriageRequest) -> TriageResult:
+    """Triage complet d'un dossier (cf. analyze_case)"""
+    classification = _classify(request)
+    return _build_result(request, classification, _assign_jurist(classification[2]))
+
+
+def _triage_batch(
+    requests: List[TriageRequest],
+) -> tuple[List[tuple[List[CategoryScore], bool, str, float]], List[Assignment]]:
+    """Classement du batch et réservation des juristes en une fois (cf. analyze_batch)"""
+    classifications = [_classify(request) for request in requests]
+    assignments = _assignment_engine().assign_many(c[2] for c in classifications)
+    return classifications, assignments
+
+
+def _parse_batch(body: bytes, content_type: str) -> List[TriageRequest]:
+    """Corps NDJSON (un dossier par ligne) ou tableau JSON → TriageRequest validés"""
+    try:
+        if content_type.split(";")[0].strip() in NDJSON_CONTENT_TYPES:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"JSON invalide : {exc}")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Tableau JSON ou NDJSON attendu")
+    if len(items) > TRIAGE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{len(items)} dossiers (maximum {TRIAGE_BATCH_MAX_ITEMS})",
+        )
+
+    try:
+        return TRIAGE_REQUESTS_ADAPTER.validate_python(items)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=exc.errors(include_url=False, include_context=False),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+@router.post("/analyze", response_model=TriageResult, status_code=status.HTTP_200_OK)
+async def analyze_case(request: TriageRequest) -> TriageResult:
+    """
+    US12 — Analyse et priorise automatiquement un dossier entrant.
+
+    - Détecte la catégorie juridique (scoring par mots-clés)
+    - Calcule la priorité (base catégorie + escalade + deadline)
+    - Assigne un juriste disponible
+    - Retourne un plan d'action recommandé
+    """
+    # Scoring CPU et réservation (aller-retour Redis) hors boucle d'événements
+    return await asyncio.to_thread(_triage, request)
+
+
+@router.post("/analyze-batch", status_code=status.HTTP_200_OK)
+async def analyze_batch(http_request: Request) -> StreamingResponse:
+    """
+    Triage en masse (imports de dossiers en attente)
+
+    - Corps : NDJSON (Content-Type application/x-ndjson) ou tableau JSON
+      de TriageRequest, validé en entier avant tout résultat (422 sinon)
+    - Réponse : un TriageResult par ligne (NDJSON), dans l'ordre du corps
+    - Assignations réservées en une fois pour tout le batch (un verrou ou
+      un aller-retour Redis), avant l'envoi du premier résultat
+    """
+    requests = _parse_batch(
+        await http_request.body(), http_request.headers.get("content-type", "")
+    )
+    # Scoring CPU et réservation (aller-retour Redis) hors boucle d'événements
+    classifications, assignments = await asyncio.to_thread(_triage_batch, requests)
+
+    def results():
+        for request, classification, assignment in zip(requests, classifications, assignments):
+            assigned = _to_assignment(assignment, classification[2])
+            yield _build_result(request, classification, assigned).model_dump_json() + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.get("/categories", status_code=status.HTTP_200_OK)
 async def list_categories():
     """Retourne les catégories juridiques supportées et leurs mots-clés"""
@@ -373,7 +517,8 @@ async def list_categories():
 
 @router.get("/jurists", status_code=status.HTTP_200_OK)
 async def list_jurists():
-    """Retourne la liste des juristes disponibles (pool simulé)"""
+    """Retourne la liste des juristes disponibles et leur charge courante"""
+    jurists = await asyncio.to_thread(_assignment_engine().snapshot)
     return {
         "jurists": [
             {
@@ -382,6 +527,20 @@ async def list_jurists():
                 "specialties": j["specialties"],
                 "current_workload": j["workload"],
             }
-            for j in JURISTS_POOL
+            for j in jurists
         ]
     }
+
+
+@router.post("/jurists/{jurist_id}/complete", status_code=status.HTTP_200_OK)
+async def complete_case(jurist_id: int):
+    """Dossier clôturé par un juriste : libère une unité de charge"""
+    jurist = await asyncio.to_thread(_assignment_engine().complete, jurist_id)
+    if jurist is None:
+        raise HTTPException(status_code=404, detail=f"Juriste {jurist_id} introuvable")
+    return {
+        "id": jurist["id"],
+        "name": jurist["name"],
+        "specialties": jurist["specialties"],
+        "current_workload": jurist["workload"],
+    }
@@ -0,0 +1,218 @@
+"""
+⏱️ Rate limiting GCRA pour MemoLib
+==================================
+
+Generic Cell Rate Algorithm (équivalent d'un token bucket):
+- Une seule valeur par clé: la TAT (theoretical arrival time), instant
+  où le "seau" du client sera de nouveau plein
+- Intervalle d'émission T = window / limit, rafale tolérée = limit requêtes
+- Requête acceptée si now >= TAT + T - window, puis TAT = max(TAT, now) + T
+
+Backends:
+- GCRALimiter: mémoire du processus, verrous par shard, balayage en tâche
+  de fond des clés inactives (TAT dépassée = seau plein = état inutile)
+- RedisGCRALimiter: script Lua atomique, horloge Redis, expiration native
+  des clés; limites partagées entre workers gunicorn
+
+Les deux exposent hit(key, limit, window) -> (is_limited, remaining, reset_time)
+et reset(key).
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from redis import Redis
+    from redis.exceptions import RedisError
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Nombre de shards (puissance de 2) du backend mémoire
+DEFAULT_SHARDS = 64
+
+# Période du balayage des clés inactives (secondes)
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+# Tolérance flottante sur le calcul de remaining
+EPSILON = 1e-9
+
+RateLimitResult = Tuple[bool, int, float]
+
+
+def gcra(
+    tat: float, now: float, limit: int, window: float
+) -> Tuple[bool, float, int, float]:
+    """
+    Décision GCRA pure
+
+    Returns:
+        (is_limited, nouvelle TAT, remaining, reset_time)
+        reset_time: délai avant la prochaine requête acceptée si limité,
+        sinon délai avant que le seau soit de nouveau plein
+    """
+    interval = window / limit
+    new_tat = max(tat, now) + interval
+    allow_at = new_tat - window
+
+    if now < allow_at:
+        return True, tat, 0, allow_at - now
+
+    remaining = int((now + window - new_tat) / interval + EPSILON)
+    return False, new_tat, remaining, new_tat - now
+
+
+class GCRALimiter:
+    """Rate limiter GCRA en mémoire (une TAT flottante par clé)"""
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SHARDS,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if shards <= 0 or shards & (shards - 1):
+            raise ValueError("Le nombre de shards doit être une puissance de 2")
+
+        self._mask = shards - 1
+        self._tats: List[Dict[str, float]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._clock = clock
+
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """Compte une requête pour `key` (limit requêtes par window secondes)"""
+        if self._sweeper is None and self.sweep_interval > 0:
+            self._start_sweeper()
+
+        shard = hash(key) & self._mask
+        tats = self._tats[shard]
+        with self._locks[shard]:
+            now = self._clock()
+            is_limited, tat, remaining, reset_time = gcra(
+                tats.get(key, now), now, limit, window
+            )
+            if not is_limited:
+                tats[key] = tat
+
+        return is_limited, remaining, reset_time
+
+    def reset(self, key: str) -> None:
+        shard = hash(key) & self._mask
+        with self._locks[shard]:
+            self._tats[shard].pop(key, None)
+
+    def sweep(self) -> int:
+        """Evince les clés dont le seau est plein; retourne le nombre évincé"""
+        evicted = 0
+        for tats, lock in zip(self._tats, self._locks):
+            with lock:
+                now = self._clock()
+                idle = [key for key, tat in tats.items() if tat <= now]
+                for key in idle:
+                    del tats[key]
+            evicted += len(idle)
+        return evicted
+
+    def __len__(self) -> int:
+        return sum(len(tats) for tats in self._tats)
+
+    def close(self) -> None:
+        """Arrête le balayage en tâche de fond"""
+        self._stop.set()
+
+    def _start_sweeper(self) -> None:
+        # Démarré au premier hit: après un fork (gunicorn --preload), chaque
+        # worker a son propre thread
+        with self._sweeper_lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="gcra-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                evicted = self.sweep()
+                if evicted:
+                    logger.debug(f"Rate limit: {evicted} clés inactives évincées")
+            except Exception as e:
+                logger.error(f"Erreur balayage rate limit: {e}")
+
+
+# KEYS[1]: clé du client - ARGV: intervalle d'émission, fenêtre (secondes)
+# Horloge Redis: même référence de temps pour tous les workers
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+  return {1, 0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {0, math.floor((now + window - new_tat) / interval + 1e-9), tostring(new_tat - now)}
+"""
+
+
+class RedisGCRALimiter:
+    """
+    Rate limiter GCRA partagé via Redis (un script Lua par requête)
+
+    La clé expire quand le seau est plein: aucun balayage nécessaire.
+    Si Redis est indisponible, repli sur un GCRALimiter local plutôt
+    que de laisser passer toutes les requêtes.
+    """
+
+    def __init__(self, client: "Redis", prefix: str = "ratelimit:"):
+        self.redis = client
+        self.prefix = prefix
+        self._script = client.register_script(GCRA_SCRIPT)
+        self.fallback = GCRALimiter()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisGCRALimiter":
+        return cls(Redis.from_url(url), **kwargs)
+
+    def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        try:
+            is_limited, remaining, reset_time = self._script(
+                keys=[self.prefix + key], args=[window / limit, window]
+            )
+        except RedisError as e:
+            logger.error(f"Rate limit Redis indisponible, repli local: {e}")
+            return self.fallback.hit(key, limit, window)
+
+        return bool(is_limited), int(remaining), float(reset_time)
+
+    def reset(self, key: str) -> None:
+        try:
+            self.redis.delete(self.prefix + key)
+        except RedisError as e:
+            logger.error(f"Rate limit Redis indisponible: {e}")
+        self.fallback.reset(key)
+
+
+def create_rate_limiter(redis_url: Optional[str] = None):
+    """Backend Redis si `redis_url` est fourni (et redis installé), sinon mémoire"""
+    if redis_url and REDIS_AVAILABLE:
+        logger.info("⏱️ Rate limiting partagé via Redis")
+        return RedisGCRALimiter.from_url(redis_url)
+    if redis_url:
+        logger.warning("⚠️ redis non installé - rate limiting en mémoire")
+    return GCRALimiter()
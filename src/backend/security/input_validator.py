@@ -15,8 +15,8 @@ import html
 import logging
 import os
 import re
-from functools import wraps
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache, wraps
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from flask import abort, jsonify, request
 
@@ -33,6 +33,59 @@ class SecurityError(Exception):
         super().__init__(f"Attaque {attack_type} détectée")
 
 
+# Valeurs dont le résultat de détection est mis en cache (LRU)
+SCAN_CACHE_SIZE = int(os.getenv("INPUT_VALIDATOR_CACHE_SIZE", "4096"))
+SCAN_CACHE_MAX_LENGTH = 1024  # les valeurs plus longues ne sont pas cachées
+
+
+class AttackScanner:
+    """
+    Détection de toutes les attaques d'une valeur, patterns compilés une fois
+
+    Chaque pattern est compilé séparément: le moteur re garde ainsi son
+    préfixe littéral (recherche rapide), perdu dans une alternation ou une
+    regex combinée à groupes nommés (mesuré ~2x plus lent sur du texte).
+    Un type s'arrête à son premier pattern trouvé. Résultat identique à
+    un re.search par pattern.
+    """
+
+    def __init__(
+        self,
+        attack_patterns: Sequence[Tuple[str, Sequence[str], int]],
+        alnum_risk: str,
+        cache_size: int = SCAN_CACHE_SIZE,
+    ):
+        self.types = [attack_type for attack_type, _, _ in attack_patterns]
+        self.patterns = {
+            attack_type: [re.compile(pattern, flags) for pattern in patterns]
+            for attack_type, patterns, flags in attack_patterns
+        }
+        self.alnum_risk = re.compile(alnum_risk, re.IGNORECASE)
+        self._cached_scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def check(self, attack_type: str, value: str) -> bool:
+        return any(pattern.search(value) for pattern in self.patterns[attack_type])
+
+    def scan(self, value: str) -> Tuple[str, ...]:
+        """Types d'attaque détectés, dans l'ordre de self.types"""
+        if len(value) <= SCAN_CACHE_MAX_LENGTH:
+            return self._cached_scan(value)
+        return self._scan(value)
+
+    def _scan(self, value: str) -> Tuple[str, ...]:
+        # Préfiltre: un mot ASCII alphanumérique ne peut correspondre
+        # qu'aux patterns repris dans alnum_risk
+        if value.isascii() and value.isalnum() and not self.alnum_risk.search(value):
+            return ()
+
+        return tuple(
+            attack_type for attack_type in self.types if self.check(attack_type, value)
+        )
+
+    def cache_clear(self) -> None:
+        self._cached_scan.cache_clear()
+
+
 class InputValidator:
     """Validateur d'entrées avec détection d'attaques"""
 
@@ -212,16 +265,38 @@ class InputValidator:
         r"\\r|\\n",  # Escaped CRLF
     ]
 
+    # Ordre des attaques dans validate_input: (type, patterns, flags)
+    ATTACK_PATTERNS = (
+        ("SQL_INJECTION", SQL_PATTERNS, re.IGNORECASE),
+        ("XSS", XSS_PATTERNS, re.IGNORECASE | re.DOTALL),
+        ("NOSQL_INJECTION", NOSQL_PATTERNS, re.IGNORECASE),
+        ("COMMAND_INJECTION", CMD_PATTERNS, re.IGNORECASE),
+        ("PATH_TRAVERSAL", PATH_PATTERNS, re.IGNORECASE),
+        ("SSRF", SSRF_PATTERNS, re.IGNORECASE),
+        ("XXE", XXE_PATTERNS, re.IGNORECASE),
+        ("JWT_ATTACK", JWT_PATTERNS, re.IGNORECASE),
+        ("OPEN_REDIRECT", REDIRECT_PATTERNS, re.IGNORECASE),
+        ("SSTI", SSTI_PATTERNS, re.IGNORECASE),
+        ("LDAP_INJECTION", LDAP_PATTERNS, re.IGNORECASE),
+        ("HEADER_INJECTION", HEADER_PATTERNS, re.IGNORECASE),
+    )
+
+    # Patterns ci-dessus qui peuvent correspondre à un mot ASCII
+    # alphanumérique (sans espace ni ponctuation): à tenir à jour
+    ALNUM_RISK_PATTERN = (
+        r"^(?:exec|execute|extractvalue|updatexml"
+        r"|cat|ls|rm|wget|curl|sh|bash|python|perl|ruby|nc|netcat)$"
+        r"|0x[0-9a-f]"
+        r"|eyJhbGciOiJub25lI"
+    )
+
     @classmethod
     def check_sql_injection(cls, value: str) -> bool:
         """Vérifie la présence de patterns SQL dangereux"""
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.SQL_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("SQL_INJECTION", value)
 
     @classmethod
     def check_xss(cls, value: str) -> bool:
@@ -229,10 +304,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.XSS_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE | re.DOTALL):
-                return True
-        return False
+        return ATTACK_SCANNER.check("XSS", value)
 
     @classmethod
     def check_nosql_injection(cls, value: str) -> bool:
@@ -240,10 +312,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.NOSQL_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("NOSQL_INJECTION", value)
 
     @classmethod
     def check_command_injection(cls, value: str) -> bool:
@@ -251,10 +320,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.CMD_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("COMMAND_INJECTION", value)
 
     @classmethod
     def check_path_traversal(cls, value: str) -> bool:
@@ -262,10 +328,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.PATH_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("PATH_TRAVERSAL", value)
 
     @classmethod
     def check_ssrf(cls, value: str) -> bool:
@@ -273,10 +336,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.SSRF_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("SSRF", value)
 
     @classmethod
     def check_xxe(cls, value: str) -> bool:
@@ -284,10 +344,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.XXE_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("XXE", value)
 
     @classmethod
     def check_jwt_attack(cls, value: str) -> bool:
@@ -295,10 +352,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.JWT_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("JWT_ATTACK", value)
 
     @classmethod
     def check_open_redirect(cls, value: str) -> bool:
@@ -306,10 +360,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.REDIRECT_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("OPEN_REDIRECT", value)
 
     @classmethod
     def check_ssti(cls, value: str) -> bool:
@@ -317,10 +368,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.SSTI_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("SSTI", value)
 
     @classmethod
     def check_ldap_injection(cls, value: str) -> bool:
@@ -328,10 +376,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.LDAP_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("LDAP_INJECTION", value)
 
     @classmethod
     def check_header_injection(cls, value: str) -> bool:
@@ -339,10 +384,7 @@ class InputValidator:
         if not isinstance(value, str):
             return False
 
-        for pattern in cls.HEADER_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return ATTACK_SCANNER.check("HEADER_INJECTION", value)
 
     @classmethod
     def sanitize_html(cls, value: str) -> str:
@@ -353,9 +395,11 @@ class InputValidator:
         # Échapper les caractères HTML spéciaux
         sanitized = html.escape(value)
 
-        # Supprimer les patterns XSS résiduels
-        for pattern in cls.XSS_PATTERNS:
-            sanitized = re.sub(pattern, "", sanitized, flags=re.IGNORECASE | re.DOTALL)
+        # Supprimer les patterns XSS résiduels: substitutions sautées si
+        # aucun pattern XSS compilé ne trouve de correspondance
+        if ATTACK_SCANNER.check("XSS", sanitized):
+            for pattern in ATTACK_SCANNER.patterns["XSS"]:
+                sanitized = pattern.sub("", sanitized)
 
         return sanitized
 
@@ -419,33 +463,9 @@ class InputValidator:
         Returns:
             {"valid": bool, "sanitized": value, "attacks": list}
         """
-        attacks_detected = []
-
-        if isinstance(value, str):
-            if cls.check_sql_injection(value):
-                attacks_detected.append("SQL_INJECTION")
-            if cls.check_xss(value):
-                attacks_detected.append("XSS")
-            if cls.check_nosql_injection(value):
-                attacks_detected.append("NOSQL_INJECTION")
-            if cls.check_command_injection(value):
-                attacks_detected.append("COMMAND_INJECTION")
-            if cls.check_path_traversal(value):
-                attacks_detected.append("PATH_TRAVERSAL")
-            if cls.check_ssrf(value):
-                attacks_detected.append("SSRF")
-            if cls.check_xxe(value):
-                attacks_detected.append("XXE")
-            if cls.check_jwt_attack(value):
-                attacks_detected.append("JWT_ATTACK")
-            if cls.check_open_redirect(value):
-                attacks_detected.append("OPEN_REDIRECT")
-            if cls.check_ssti(value):
-                attacks_detected.append("SSTI")
-            if cls.check_ldap_injection(value):
-                attacks_detected.append("LDAP_INJECTION")
-            if cls.check_header_injection(value):
-                attacks_detected.append("HEADER_INJECTION")
+        attacks_detected = (
+            list(ATTACK_SCANNER.scan(value)) if isinstance(value, str) else []
+        )
 
         if attacks_detected:
             logger.warning(
@@ -505,6 +525,12 @@ class InputValidator:
         return {"valid": is_valid, "sanitized": sanitized_data, "attacks": all_attacks}
 
 
+# Compilé une fois à l'import
+ATTACK_SCANNER = AttackScanner(
+    InputValidator.ATTACK_PATTERNS, InputValidator.ALNUM_RISK_PATTERN
+)
+
+
 def validate_request_inputs(strict: bool = True):
     """
     Décorateur pour valider automatiquement les entrées d'une requête Flask
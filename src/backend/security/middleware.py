@@ -16,7 +16,6 @@ import json
 import logging
 import os
 import secrets
-import threading
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta
@@ -25,6 +24,8 @@ from typing import Dict, List, Optional, Set
 
 from flask import g, jsonify, make_response, request, session
 
+from .gcra import create_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,10 +38,11 @@ class SecurityConfig:
     CSRF_TOKEN_LENGTH = 64
     CSRF_EXEMPT_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-    # Rate Limiting
+    # Rate Limiting (GCRA: une échéance par client, partagée via Redis si
+    # RATE_LIMIT_REDIS_URL est défini)
     RATE_LIMIT_ENABLED = True
-    RATE_LIMIT_STORAGE: Dict[str, List[float]] = defaultdict(list)
-    RATE_LIMIT_LOCK = threading.Lock()
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+    RATE_LIMITER = create_rate_limiter(RATE_LIMIT_REDIS_URL)
 
     # Limites par défaut (requêtes par fenêtre de temps)
     RATE_LIMITS = {
@@ -130,7 +132,7 @@ class CSRFProtection:
 
 
 class RateLimiter:
-    """Rate limiting en mémoire avec fenêtre glissante"""
+    """Rate limiting GCRA (mémoire du processus ou Redis)"""
 
     @staticmethod
     def get_client_id() -> str:
@@ -161,28 +163,7 @@ class RateLimiter:
             category, SecurityConfig.RATE_LIMITS["default"]
         )
 
-        now = time.time()
-        window_start = now - window
-
-        with SecurityConfig.RATE_LIMIT_LOCK:
-            # Nettoyer les anciennes requêtes
-            SecurityConfig.RATE_LIMIT_STORAGE[key] = [
-                t for t in SecurityConfig.RATE_LIMIT_STORAGE[key] if t > window_start
-            ]
-
-            current_count = len(SecurityConfig.RATE_LIMIT_STORAGE[key])
-
-            if current_count >= limit:
-                # Rate limité
-                oldest = min(SecurityConfig.RATE_LIMIT_STORAGE[key])
-                reset_time = oldest + window - now
-                return True, 0, reset_time
-
-            # Ajouter la requête actuelle
-            SecurityConfig.RATE_LIMIT_STORAGE[key].append(now)
-            remaining = limit - current_count - 1
-
-            return False, remaining, window
+        return SecurityConfig.RATE_LIMITER.hit(key, limit, window)
 
     @staticmethod
     def reset_limit(category: str = "default", client_id: str = None):
@@ -190,10 +171,7 @@ class RateLimiter:
         if client_id is None:
             client_id = RateLimiter.get_client_id()
 
-        key = f"{category}:{client_id}"
-
-        with SecurityConfig.RATE_LIMIT_LOCK:
-            SecurityConfig.RATE_LIMIT_STORAGE[key] = []
+        SecurityConfig.RATE_LIMITER.reset(f"{category}:{client_id}")
 
 
 class IntrusionDetector:
@@ -0,0 +1,469 @@
+"""
+Moteur d'assignation des juristes (US12 Triage)
+File de priorité par spécialité, indexée par la charge réelle de chaque
+juriste : assignation et clôture de dossier en O(log n)
+
+- JuristAssignmentEngine : tas binaires en mémoire sous verrou (un processus)
+- RedisJuristAssignmentEngine : sorted sets + scripts Lua atomiques, partagés
+  entre workers uvicorn (pas de double réservation)
+- JuristPoolSync : chargement depuis la table `jurists` au démarrage, puis
+  rafraîchissement incrémental (updated_at) et écriture des charges
+
+Un juriste est un dict {"id", "name", "specialties", "workload"}.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from redis import Redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from models import Jurist
+
+logger = logging.getLogger(__name__)
+
+# File globale (repli généraliste quand aucun spécialiste n'existe)
+GENERALIST_QUEUE = "*"
+
+# Entrées périmées tolérées dans un tas avant reconstruction
+COMPACT_SLACK = 64
+
+# (juriste, spécialiste ?) ou None si le pool est vide
+Assignment = Optional[Tuple[Dict, bool]]
+HeapEntry = Tuple[int, int, int]  # (charge, id, version)
+
+
+def _jurist_record(jurist: Dict) -> Dict:
+    return {
+        "id": int(jurist["id"]),
+        "name": jurist["name"],
+        "specialties": tuple(jurist["specialties"]),
+        "workload": int(jurist.get("workload") or 0),
+    }
+
+
+def _public(jurist: Dict) -> Dict:
+    return {**jurist, "specialties": list(jurist["specialties"])}
+
+
+# ---------------------------------------------------------------------------
+# Moteur en mémoire
+# ---------------------------------------------------------------------------
+
+class JuristAssignmentEngine:
+    """
+    Assignation en mémoire, sûre entre threads d'un même processus
+
+    Un tas (charge, id, version) par spécialité + un tas global. Changer la
+    charge d'un juriste pousse de nouvelles entrées et périme les anciennes
+    (version) : O(k log n), k = nombre de spécialités du juriste. À charge
+    égale, le plus petit id l'emporte (ordre de JURISTS_POOL).
+    """
+
+    # Etat propre au processus : au démarrage, la DB fait foi
+    shared = False
+
+    def __init__(self, jurists: Iterable[Dict] = ()):
+        self._lock = threading.Lock()
+        self._jurists: Dict[int, Dict] = {}
+        self._versions: Dict[int, int] = {}
+        self._heaps: Dict[str, List[HeapEntry]] = {}
+        self.load(jurists)
+
+    def load(self, jurists: Iterable[Dict]) -> None:
+        """Remplace tout le pool"""
+        with self._lock:
+            for jurist_id in self._jurists:
+                self._versions[jurist_id] += 1
+            self._jurists.clear()
+            self._heaps.clear()
+            for jurist in jurists:
+                self._put(_jurist_record(jurist))
+
+    def upsert(self, jurist: Dict, keep_workload: bool = True) -> Dict:
+        """Ajoute ou met à jour un juriste (charge vivante conservée par défaut)"""
+        record = _jurist_record(jurist)
+        with self._lock:
+            current = self._jurists.get(record["id"])
+            if current is not None and keep_workload:
+                record["workload"] = current["workload"]
+            self._put(record)
+            return _public(record)
+
+    def remove(self, jurist_id: int) -> bool:
+        with self._lock:
+            if self._jurists.pop(jurist_id, None) is None:
+                return False
+            self._versions[jurist_id] += 1
+            return True
+
+    def retain(self, jurist_ids: Iterable[int]) -> None:
+        """Retire les juristes absents de `jurist_ids`"""
+        keep = set(jurist_ids)
+        with self._lock:
+            for jurist_id in [i for i in self._jurists if i not in keep]:
+                del self._jurists[jurist_id]
+                self._versions[jurist_id] += 1
+
+    def assign(self, category: str) -> Assignment:
+        """Réserve le juriste le moins chargé pour `category` (charge + 1)"""
+        with self._lock:
+            return self._assign(category)
+
+    def assign_many(self, categories: Iterable[str]) -> List[Assignment]:
+        """Assignations d'un batch, sous un seul verrou"""
+        with self._lock:
+            return [self._assign(category) for category in categories]
+
+    def complete(self, jurist_id: int) -> Optional[Dict]:
+        """Dossier clôturé : charge - 1 (None si juriste inconnu)"""
+        with self._lock:
+            jurist = self._jurists.get(jurist_id)
+            if jurist is None:
+                return None
+            if jurist["workload"] > 0:
+                jurist["workload"] -= 1
+                self._push(jurist)
+            return _public(jurist)
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [_public(self._jurists[i]) for i in sorted(self._jurists)]
+
+    def _assign(self, category: str) -> Assignment:
+        jurist = self._top(category)
+        specialist = jurist is not None
+        if jurist is None:
+            jurist = self._top(GENERALIST_QUEUE)
+        if jurist is None:
+            return None
+
+        jurist["workload"] += 1
+        self._push(jurist)
+        return _public(jurist), specialist
+
+    def _put(self, jurist: Dict) -> None:
+        self._jurists[jurist["id"]] = jurist
+        self._push(jurist)
+
+    def _push(self, jurist: Dict) -> None:
+        version = self._versions.get(jurist["id"], 0) + 1
+        self._versions[jurist["id"]] = version
+        entry = (jurist["workload"], jurist["id"], version)
+        for queue in (GENERALIST_QUEUE, *jurist["specialties"]):
+            heap = self._heaps.setdefault(queue, [])
+            heapq.heappush(heap, entry)
+            if len(heap) > 2 * len(self._jurists) + COMPACT_SLACK:
+                self._heaps[queue] = [e for e in heap if self._is_live(e)]
+                heapq.heapify(self._heaps[queue])
+
+    def _top(self, queue: str) -> Optional[Dict]:
+        """Juriste le moins chargé de la file (entrées périmées dépilées)"""
+        heap = self._heaps.get(queue)
+        while heap:
+            if self._is_live(heap[0]):
+                return self._jurists[heap[0][1]]
+            heapq.heappop(heap)
+        return None
+
+    def _is_live(self, entry: HeapEntry) -> bool:
+        return self._versions.get(entry[1]) == entry[2] and entry[1] in self._jurists
+
+
+# ---------------------------------------------------------------------------
+# Moteur Redis (plusieurs workers)
+# ---------------------------------------------------------------------------
+
+# KEYS: file de la spécialité, file globale — ARGV: préfixe
+ASSIGN_SCRIPT = """
+local member, specialist = redis.call('ZRANGE', KEYS[1], 0, 0)[1], 1
+if not member then
+  member, specialist = redis.call('ZRANGE', KEYS[2], 0, 0)[1], 0
+end
+if not member then return false end
+local jurist = ARGV[1] .. ':jurist:' .. member
+for _, specialty in ipairs(cjson.decode(redis.call('HGET', jurist, 'specialties'))) do
+  redis.call('ZINCRBY', ARGV[1] .. ':queue:' .. specialty, 1, member)
+end
+redis.call('ZINCRBY', KEYS[2], 1, member)
+redis.call('HINCRBY', jurist, 'workload', 1)
+return {specialist, redis.call('HMGET', jurist, 'id', 'name', 'specialties', 'workload')}
+"""
+
+# KEYS: file globale — ARGV: préfixe, membre
+COMPLETE_SCRIPT = """
+local jurist = ARGV[1] .. ':jurist:' .. ARGV[2]
+if redis.call('EXISTS', jurist) == 0 then return false end
+if tonumber(redis.call('HGET', jurist, 'workload')) > 0 then
+  for _, specialty in ipairs(cjson.decode(redis.call('HGET', jurist, 'specialties'))) do
+    redis.call('ZINCRBY', ARGV[1] .. ':queue:' .. specialty, -1, ARGV[2])
+  end
+  redis.call('ZINCRBY', KEYS[1], -1, ARGV[2])
+  redis.call('HINCRBY', jurist, 'workload', -1)
+end
+return redis.call('HMGET', jurist, 'id', 'name', 'specialties', 'workload')
+"""
+
+# KEYS: file globale — ARGV: préfixe, membre, id, nom, spécialités (JSON),
+# charge, conserver la charge vivante (1/0)
+UPSERT_SCRIPT = """
+local jurist = ARGV[1] .. ':jurist:' .. ARGV[2]
+local workload = tonumber(ARGV[6])
+local previous = redis.call('HGET', jurist, 'specialties')
+if previous then
+  if ARGV[7] == '1' then workload = tonumber(redis.call('HGET', jurist, 'workload')) end
+  for _, specialty in ipairs(cjson.decode(previous)) do
+    redis.call('ZREM', ARGV[1] .. ':queue:' .. specialty, ARGV[2])
+  end
+end
+redis.call('HSET', jurist, 'id', ARGV[3], 'name', ARGV[4], 'specialties', ARGV[5], 'workload', workload)
+for _, specialty in ipairs(cjson.decode(ARGV[5])) do
+  redis.call('ZADD', ARGV[1] .. ':queue:' .. specialty, workload, ARGV[2])
+end
+redis.call('ZADD', KEYS[1], workload, ARGV[2])
+return workload
+"""
+
+# KEYS: file globale — ARGV: préfixe, membre
+REMOVE_SCRIPT = """
+local jurist = ARGV[1] .. ':jurist:' .. ARGV[2]
+local specialties = redis.call('HGET', jurist, 'specialties')
+if not specialties then return 0 end
+for _, specialty in ipairs(cjson.decode(specialties)) do
+  redis.call('ZREM', ARGV[1] .. ':queue:' .. specialty, ARGV[2])
+end
+redis.call('ZREM', KEYS[1], ARGV[2])
+redis.call('DEL', jurist)
+return 1
+"""
+
+
+class RedisJuristAssignmentEngine:
+    """
+    Assignation partagée entre workers : un sorted set par spécialité
+    (score = charge) et un hash par juriste
+
+    Chaque assignation / clôture est un script Lua (atomique côté Redis) :
+    lecture du minimum et ZINCRBY dans toutes les files du juriste, en
+    O(k log n). Les membres sont les ids complétés à 10 chiffres, pour
+    qu'à charge égale l'ordre lexicographique de Redis suive l'id. Le
+    préfixe contient un hash tag ({...}) : toutes les clés sur le même
+    slot en Redis Cluster.
+
+    Le client doit être créé avec decode_responses=True.
+    """
+
+    # Charges vivantes partagées et persistantes : conservées au démarrage
+    shared = True
+
+    def __init__(self, client: "Redis", prefix: str = "triage:{jurists}"):
+        self.redis = client
+        self.prefix = prefix
+        self._global_queue = self._queue(GENERALIST_QUEUE)
+        self._assign_script = client.register_script(ASSIGN_SCRIPT)
+        self._complete_script = client.register_script(COMPLETE_SCRIPT)
+        self._upsert_script = client.register_script(UPSERT_SCRIPT)
+        self._remove_script = client.register_script(REMOVE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisJuristAssignmentEngine":
+        return cls(Redis.from_url(url, decode_responses=True), **kwargs)
+
+    def load(self, jurists: Iterable[Dict]) -> None:
+        """Remplace tout le pool (charges comprises)"""
+        jurists = [_jurist_record(jurist) for jurist in jurists]
+        self.retain(jurist["id"] for jurist in jurists)
+        for jurist in jurists:
+            self.upsert(jurist, keep_workload=False)
+
+    def upsert(self, jurist: Dict, keep_workload: bool = True) -> Dict:
+        record = _jurist_record(jurist)
+        record["workload"] = int(self._upsert_script(
+            keys=[self._global_queue],
+            args=[
+                self.prefix,
+                self._member(record["id"]),
+                record["id"],
+                record["name"],
+                json.dumps(list(record["specialties"])),
+                record["workload"],
+                int(keep_workload),
+            ],
+        ))
+        return _public(record)
+
+    def remove(self, jurist_id: int) -> bool:
+        return bool(self._remove_script(
+            keys=[self._global_queue], args=[self.prefix, self._member(jurist_id)]
+        ))
+
+    def retain(self, jurist_ids: Iterable[int]) -> None:
+        keep = {self._member(jurist_id) for jurist_id in jurist_ids}
+        for member in self.redis.zrange(self._global_queue, 0, -1):
+            if member not in keep:
+                self.remove(int(member))
+
+    def assign(self, category: str) -> Assignment:
+        return self._assignment(self._assign_script(
+            keys=[self._queue(category), self._global_queue], args=[self.prefix]
+        ))
+
+    def assign_many(self, categories: Iterable[str]) -> List[Assignment]:
+        """Un script par dossier, envoyés en un seul aller-retour"""
+        pipe = self.redis.pipeline(transaction=False)
+        for category in categories:
+            self._assign_script(
+                keys=[self._queue(category), self._global_queue],
+                args=[self.prefix],
+                client=pipe,
+            )
+        return [self._assignment(reply) for reply in pipe.execute()]
+
+    def complete(self, jurist_id: int) -> Optional[Dict]:
+        reply = self._complete_script(
+            keys=[self._global_queue], args=[self.prefix, self._member(jurist_id)]
+        )
+        return self._record(reply) if reply else None
+
+    def snapshot(self) -> List[Dict]:
+        pipe = self.redis.pipeline(transaction=False)
+        for member in self.redis.zrange(self._global_queue, 0, -1):
+            pipe.hmget(self._jurist_key(member), "id", "name", "specialties", "workload")
+        records = [self._record(reply) for reply in pipe.execute() if reply[0]]
+        return sorted(records, key=lambda jurist: jurist["id"])
+
+    def _assignment(self, reply) -> Assignment:
+        if not reply:
+            return None
+        specialist, fields = reply
+        return self._record(fields), bool(specialist)
+
+    @staticmethod
+    def _record(fields: List[str]) -> Dict:
+        jurist_id, name, specialties, workload = fields
+        return {
+            "id": int(jurist_id),
+            "name": name,
+            "specialties": json.loads(specialties),
+            "workload": int(workload),
+        }
+
+    @staticmethod
+    def _member(jurist_id: int) -> str:
+        return f"{int(jurist_id):010d}"
+
+    def _queue(self, category: str) -> str:
+        return f"{self.prefix}:queue:{category}"
+
+    def _jurist_key(self, member: str) -> str:
+        return f"{self.prefix}:jurist:{member}"
+
+
+def create_assignment_engine(jurists: Iterable[Dict], redis_url: Optional[str] = None):
+    """
+    Moteur Redis si `redis_url` est fourni (et redis installé), sinon en
+    mémoire. Le pool initial ne remplace pas les charges déjà dans Redis.
+    """
+    if redis_url and REDIS_AVAILABLE:
+        engine = RedisJuristAssignmentEngine.from_url(redis_url)
+        for jurist in jurists:
+            engine.upsert(jurist, keep_workload=True)
+        logger.info("✅ Assignation des juristes partagée via Redis")
+        return engine
+    if redis_url:
+        logger.warning("⚠️ redis non installé — assignation des juristes en mémoire")
+    return JuristAssignmentEngine(jurists)
+
+
+# ---------------------------------------------------------------------------
+# Synchronisation avec la table jurists
+# ---------------------------------------------------------------------------
+
+def _row_to_jurist(row: Jurist) -> Dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "specialties": json.loads(row.specialties or "[]"),
+        "workload": row.workload or 0,
+    }
+
+
+class JuristPoolSync:
+    """
+    Pool du moteur alimenté par la table `jurists`
+
+    - load() : juristes actifs au démarrage (pool remplacé ; avec Redis,
+      les charges vivantes des juristes connus sont conservées)
+    - refresh() : lignes modifiées depuis le dernier passage (updated_at) ;
+      nouveau juriste → charge de la DB, juriste connu → charge vivante,
+      juriste désactivé → retiré
+    - persist() : charges vivantes écrites dans la table
+    """
+
+    def __init__(self, engine, session_factory):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.watermark: Optional[datetime] = None
+
+    def load(self) -> int:
+        with self.session_factory() as db:
+            rows = db.query(Jurist).filter(Jurist.is_active.is_(True)).all()
+        if not rows:
+            logger.warning("⚠️ Table jurists vide — pool de juristes inchangé")
+            return 0
+
+        self.engine.retain(row.id for row in rows)
+        for row in rows:
+            self.engine.upsert(_row_to_jurist(row), keep_workload=self.engine.shared)
+        self.watermark = max(row.updated_at for row in rows)
+        logger.info("✅ %d juristes chargés depuis la base", len(rows))
+        return len(rows)
+
+    def refresh(self) -> int:
+        """Applique les lignes modifiées depuis le dernier passage"""
+        if self.watermark is None:
+            return self.load()
+
+        with self.session_factory() as db:
+            # >= : une ligne modifiée dans la même seconde n'est pas perdue
+            # (upsert idempotent)
+            rows = db.query(Jurist).filter(Jurist.updated_at >= self.watermark).all()
+        for row in rows:
+            if row.is_active:
+                self.engine.upsert(_row_to_jurist(row), keep_workload=True)
+            else:
+                self.engine.remove(row.id)
+        if rows:
+            self.watermark = max(row.updated_at for row in rows)
+        return len(rows)
+
+    def persist(self) -> int:
+        """Ecrit les charges vivantes qui diffèrent de la table"""
+        workloads = {jurist["id"]: jurist["workload"] for jurist in self.engine.snapshot()}
+        with self.session_factory() as db:
+            rows = db.query(Jurist).filter(Jurist.id.in_(list(workloads))).all()
+            changed = [row for row in rows if row.workload != workloads[row.id]]
+            for row in changed:
+                row.workload = workloads[row.id]
+            db.commit()
+        return len(changed)
+
+    def synchronize(self) -> None:
+        self.persist()
+        self.refresh()
+
+    async def run(self, interval: float) -> None:
+        """Boucle de synchronisation (tâche de fond du lifespan)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.synchronize)
+            except Exception as exc:
+                logger.error("❌ Synchronisation du pool de juristes: %s", exc)
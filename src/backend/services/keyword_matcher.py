@@ -0,0 +1,99 @@
+"""
+Automate multi-mots-clés (Aho-Corasick) pour le scoring par mots-clés
+Construit une fois, il trouve en un seul passage toutes les occurrences
+d'un ensemble de mots-clés, avec contrôle optionnel des frontières de mot
+(équivalent de \\b...\\b sur le texte normalisé)
+"""
+from collections import deque
+from typing import Dict, List, Sequence, Set, Tuple
+
+# Minuscules accentuées → lettre de base (appliqué après str.lower)
+ACCENT_TABLE = str.maketrans({
+    "é": "e", "è": "e", "ê": "e", "ë": "e",
+    "à": "a", "â": "a", "ä": "a",
+    "ù": "u", "û": "u", "ü": "u",
+    "î": "i", "ï": "i",
+    "ô": "o", "ö": "o",
+    "ç": "c",
+})
+
+
+def normalize(text: str) -> str:
+    """Minuscules + suppression des accents (une passe str.translate)"""
+    return text.lower().translate(ACCENT_TABLE)
+
+
+def _is_word_char(char: str) -> bool:
+    """Caractère de mot au sens de \\w (regex Unicode)"""
+    return char.isalnum() or char == "_"
+
+
+class KeywordAutomaton:
+    """
+    Automate d'Aho-Corasick déterminisé : un seul accès dict par caractère
+
+    Chaque motif est un couple (mot-clé normalisé, frontières de mot ?) ;
+    scan() renvoie les indices des motifs trouvés au moins une fois.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, bool]]):
+        if any(not keyword for keyword, _ in patterns):
+            raise ValueError("Mot-clé vide")
+
+        self.patterns = list(patterns)
+        self._lengths = [len(keyword) for keyword, _ in self.patterns]
+        self._bounded = [bounded for _, bounded in self.patterns]
+
+        # 1. Trie
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, (keyword, _) in enumerate(self.patterns):
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(index)
+
+        # 2. Liens d'échec (BFS) et transitions complètes (DFA)
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{}] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs: List[Tuple[int, ...]] = [tuple(out) for out in outputs]
+
+    def scan(self, text: str) -> Set[int]:
+        """Indices des motifs présents dans `text` (déjà normalisé)"""
+        delta, outputs = self._delta, self._outputs
+        lengths, bounded = self._lengths, self._bounded
+        size = len(text)
+        found: Set[int] = set()
+        state = 0
+
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for index in outputs[state]:
+                if index in found:
+                    continue
+                if bounded[index]:
+                    start = end - lengths[index]
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if end < size and _is_word_char(text[end]):
+                        continue
+                found.add(index)
+
+        return found
+
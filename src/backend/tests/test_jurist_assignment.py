@@ -0,0 +1,248 @@
+"""
+Tests unitaires - moteur d'assignation des juristes (US12 Triage)
+Couvre: files par spécialité, clôture, synchronisation DB, moteur Redis
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, Jurist
+from services.jurist_assignment import (
+    JuristAssignmentEngine,
+    JuristPoolSync,
+    RedisJuristAssignmentEngine,
+)
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+
+POOL = [
+    {"id": 1, "name": "Me. Durand", "specialties": ["droit_travail", "droit_famille"], "workload": 3},
+    {"id": 2, "name": "Me. Bernard", "specialties": ["droit_immobilier"], "workload": 5},
+    {"id": 3, "name": "Me. Khelifa", "specialties": ["urgence_judiciaire"], "workload": 2},
+    {"id": 4, "name": "Me. Petit", "specialties": ["droit_travail"], "workload": 4},
+]
+
+
+def _memory_engine():
+    return JuristAssignmentEngine(POOL)
+
+
+def _redis_engine():
+    engine = RedisJuristAssignmentEngine(fakeredis.FakeRedis(decode_responses=True))
+    engine.load(POOL)
+    return engine
+
+
+ENGINES = [pytest.param(_memory_engine, id="memory")]
+if FAKEREDIS_AVAILABLE:
+    ENGINES.append(pytest.param(_redis_engine, id="redis"))
+
+
+def _workloads(engine):
+    return {j["id"]: j["workload"] for j in engine.snapshot()}
+
+
+# ---------------------------------------------------------------------------
+# Moteurs (mémoire et Redis, même contrat)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("make_engine", ENGINES)
+class TestAssignmentEngine:
+    def test_least_loaded_specialist_then_tie_by_id(self, make_engine):
+        engine = make_engine()
+        picks = [engine.assign("droit_travail") for _ in range(4)]
+        assert [(j["id"], specialist) for j, specialist in picks] == [
+            (1, True), (1, True), (4, True), (1, True),
+        ]
+        assert _workloads(engine) == {1: 6, 2: 5, 3: 2, 4: 5}
+
+    def test_generalist_fallback(self, make_engine):
+        engine = make_engine()
+        jurist, specialist = engine.assign("autre")
+        assert (jurist["id"], specialist) == (3, False)
+
+    def test_complete_releases_and_floors_at_zero(self, make_engine):
+        engine = make_engine()
+        for _ in range(3):
+            engine.complete(3)
+        assert engine.complete(3)["workload"] == 0
+        assert engine.complete(99) is None
+        assert engine.assign("droit_immobilier")[0]["id"] == 2
+
+    def test_assign_many(self, make_engine):
+        engine = make_engine()
+        picks = engine.assign_many(["urgence_judiciaire", "droit_travail", "urgence_judiciaire"])
+        assert [j["id"] for j, _ in picks] == [3, 1, 3]
+        assert _workloads(engine)[3] == 4
+
+    def test_upsert_keeps_live_workload_and_moves_queues(self, make_engine):
+        engine = make_engine()
+        engine.assign("droit_travail")
+        engine.upsert({"id": 1, "name": "Me. Durand", "specialties": ["droit_famille"], "workload": 0})
+        assert _workloads(engine)[1] == 4
+        assert engine.assign("droit_travail")[0]["id"] == 4
+
+        engine.upsert({"id": 5, "name": "Me. Roux", "specialties": ["droit_travail"], "workload": 1})
+        assert engine.assign("droit_travail")[0]["id"] == 5
+
+    def test_remove(self, make_engine):
+        engine = make_engine()
+        assert engine.remove(3) is True
+        assert engine.remove(3) is False
+        assert engine.assign("urgence_judiciaire")[0]["id"] == 1
+        assert 3 not in _workloads(engine)
+
+    def test_empty_pool(self, make_engine):
+        engine = make_engine()
+        engine.load([])
+        assert engine.assign("droit_travail") is None
+        assert engine.snapshot() == []
+
+
+class TestMemoryEngine:
+    def test_concurrent_assignments_are_not_double_booked(self):
+        engine = JuristAssignmentEngine(POOL)
+
+        def worker():
+            for _ in range(250):
+                engine.assign("droit_travail")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        workloads = _workloads(engine)
+        assert workloads[1] + workloads[4] == 3 + 4 + 2000
+        assert abs(workloads[1] - workloads[4]) <= 1
+
+    def test_stale_entries_are_compacted(self):
+        engine = JuristAssignmentEngine(POOL)
+        for _ in range(1000):
+            engine.assign("droit_travail")
+            engine.complete(1)
+        assert max(len(heap) for heap in engine._heaps.values()) < 100
+
+
+# ---------------------------------------------------------------------------
+# JuristPoolSync
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        for jurist in POOL[:3]:
+            db.add(Jurist(
+                id=jurist["id"],
+                name=jurist["name"],
+                specialties=json.dumps(jurist["specialties"]),
+                workload=jurist["workload"] + 10,
+            ))
+        db.commit()
+    return factory
+
+
+class TestJuristPoolSync:
+    def test_load_replaces_seed_pool(self, session_factory):
+        engine = JuristAssignmentEngine(POOL)
+        sync = JuristPoolSync(engine, session_factory)
+        assert sync.load() == 3
+        assert _workloads(engine) == {1: 13, 2: 15, 3: 12}
+
+    def test_refresh_is_incremental(self, session_factory):
+        engine = JuristAssignmentEngine()
+        sync = JuristPoolSync(engine, session_factory)
+        sync.load()
+        engine.assign("urgence_judiciaire")
+
+        time.sleep(0.01)
+        with session_factory() as db:
+            db.add(Jurist(id=7, name="Me. Roux", specialties='["droit_travail"]', workload=1))
+            db.get(Jurist, 2).is_active = False
+            db.get(Jurist, 3).name = "Me. Amina Khelifa"
+            db.commit()
+
+        assert sync.refresh() >= 3
+        snapshot = {j["id"]: j for j in engine.snapshot()}
+        assert set(snapshot) == {1, 3, 7}
+        assert snapshot[3]["name"] == "Me. Amina Khelifa"
+        assert snapshot[3]["workload"] == 13  # charge vivante conservée
+        assert snapshot[7]["workload"] == 1
+
+    def test_persist_writes_live_workload(self, session_factory):
+        engine = JuristAssignmentEngine()
+        sync = JuristPoolSync(engine, session_factory)
+        sync.load()
+        engine.assign("urgence_judiciaire")
+        engine.complete(1)
+
+        assert sync.persist() == 2
+        with session_factory() as db:
+            assert {row.id: row.workload for row in db.query(Jurist)} == {1: 12, 2: 15, 3: 13}
+        assert sync.persist() == 0
+
+    def test_empty_table_keeps_pool(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        assignment = JuristAssignmentEngine(POOL)
+        sync = JuristPoolSync(assignment, sessionmaker(bind=engine))
+        assert sync.load() == 0
+        assert len(assignment.snapshot()) == 4
+
+
+@pytest.mark.skipif(not FAKEREDIS_AVAILABLE, reason="fakeredis non installé")
+class TestRedisEngine:
+    def test_shared_between_workers(self):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        worker_a = RedisJuristAssignmentEngine(client)
+        worker_a.load(POOL)
+        worker_b = RedisJuristAssignmentEngine(client)
+
+        assert worker_a.assign("droit_travail")[0]["id"] == 1
+        assert worker_b.assign("droit_travail")[0]["id"] == 1
+        assert worker_b.assign("droit_travail")[0]["id"] == 4
+        assert _workloads(worker_a) == _workloads(worker_b)
+
+    def test_load_from_db_keeps_shared_workload(self, session_factory):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        engine = RedisJuristAssignmentEngine(client)
+        engine.load(POOL)
+        engine.assign("urgence_judiciaire")
+
+        JuristPoolSync(engine, session_factory).load()
+        assert _workloads(engine) == {1: 3, 2: 5, 3: 3}
+
+    def test_ids_ordered_numerically_on_ties(self):
+        engine = RedisJuristAssignmentEngine(fakeredis.FakeRedis(decode_responses=True))
+        engine.load([
+            {"id": 10, "name": "A", "specialties": ["x"], "workload": 0},
+            {"id": 9, "name": "B", "specialties": ["x"], "workload": 0},
+        ])
+        assert engine.assign("x")[0]["id"] == 9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from routes import triage as triage_module
 from routes.triage import (
     _normalize,
     _score_categories,
@@ -18,7 +19,15 @@ from routes.triage import (
     _recommended_actions,
     _estimate_delay,
     PRIORITY_ORDER,
+    TRIAGE_MATCHER,
 )
+from services.keyword_matcher import KeywordAutomaton
+
+
+@pytest.fixture(autouse=True)
+def _reset_assignment_engine(monkeypatch):
+    """Chaque test repart du pool initial"""
+    monkeypatch.setattr(triage_module, "_ASSIGNMENT_ENGINE", None)
 
 
 # ---------------------------------------------------------------------------
@@ -73,6 +82,33 @@ class TestScoreCategories:
             assert scores[i].score >= scores[i + 1].score
 
 
+# ---------------------------------------------------------------------------
+# TriageMatcher / KeywordAutomaton
+# ---------------------------------------------------------------------------
+
+class TestTriageMatcher:
+    def test_word_boundaries_on_category_keywords(self):
+        scores, _ = TRIAGE_MATCHER.analyze("Un rappel du bailleur, puis l'appel au tribunal")
+        matched = {kw for s in scores for kw in s.matched_keywords}
+        assert "appel" in matched  # "l'appel" : apostrophe = frontière
+        assert "bail" not in matched  # "bailleur"
+        assert "tribunal" in matched
+
+    def test_keyword_in_two_categories(self):
+        scores, _ = TRIAGE_MATCHER.analyze("Procédure d'expulsion engagée")
+        categories = {s.category for s in scores if "expulsion" in s.matched_keywords}
+        assert categories == {"droit_immobilier", "droit_administratif"}
+
+    def test_escalation_is_substring_match(self):
+        # Comme l'ancien `in` : "urgent" est trouvé dans "urgentissime"
+        assert TRIAGE_MATCHER.analyze("dossier urgentissime")[1] is True
+
+    def test_overlapping_patterns(self):
+        automaton = KeywordAutomaton([("assignation", True), ("assignation sous", False), ("nation", False)])
+        assert automaton.scan("une assignation sous 8 jours") == {0, 1, 2}
+        assert automaton.scan("assignations") == {2}
+
+
 # ---------------------------------------------------------------------------
 # _detect_escalation
 # ---------------------------------------------------------------------------
@@ -125,20 +161,29 @@ class TestComputePriority:
 
 class TestAssignJurist:
     def test_assigns_specialist_for_travail(self):
-        result = _assign_jurist("droit_travail", "high")
+        result = _assign_jurist("droit_travail")
         assert result is not None
         assert "droit_travail" in result.reason or "Spécialiste" in result.reason
 
     def test_assigns_jurist_for_unknown_category(self):
-        result = _assign_jurist("autre", "low")
+        result = _assign_jurist("autre")
         assert result is not None  # retourne le moins chargé du pool
 
     def test_result_has_required_fields(self):
-        result = _assign_jurist("droit_famille", "normal")
+        result = _assign_jurist("droit_famille")
         assert result.jurist_id is not None
         assert result.jurist_name != ""
         assert result.reason != ""
 
+    def test_workload_spreads_critical_cases(self):
+        # Khelifa (charge 2) seule spécialiste urgence : chaque dossier l'occupe
+        ids = [_assign_jurist("urgence_judiciaire").jurist_id for _ in range(3)]
+        assert ids == [3, 3, 3]
+        workloads = {j["id"]: j["workload"] for j in triage_module._assignment_engine().snapshot()}
+        assert workloads[3] == 5
+        # Sans spécialiste, le moins chargé du pool : Durand (3) puis Petit (4)
+        assert [_assign_jurist("autre").jurist_id for _ in range(3)] == [1, 1, 4]
+
 
 # ---------------------------------------------------------------------------
 # _recommended_actions
@@ -252,6 +297,12 @@ try:
             prio_urgent = PRIORITY_ORDER.get(resp_urgent.json()["priority"], 0)
             assert prio_urgent >= prio_normal
 
+        def test_complete_releases_workload(self):
+            resp = client.post("/api/triage/jurists/3/complete")
+            assert resp.status_code == 200
+            assert resp.json()["current_workload"] == 1
+            assert client.post("/api/triage/jurists/99/complete").status_code == 404
+
         def test_triage_id_is_unique(self):
             payload = {
                 "title": "Dossier famille",
@@ -260,5 +311,53 @@ try:
             ids = {client.post("/api/triage/analyze", json=payload).json()["triage_id"] for _ in range(3)}
             assert len(ids) == 3  # 3 UUIDs différents
 
+    class TestAnalyzeBatchEndpoint:
+        TRAVAIL = {
+            "title": "Licenciement",
+            "description": "Licenciement sans préavis, salaire impayé depuis deux mois.",
+        }
+
+        def test_ndjson_in_ndjson_out(self):
+            import json
+            body = "\n".join(json.dumps(item) for item in [self.TRAVAIL] * 3) + "\n"
+            resp = client.post(
+                "/api/triage/analyze-batch",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("application/x-ndjson")
+            results = [json.loads(line) for line in resp.text.splitlines()]
+            assert [r["detected_category"] for r in results] == ["droit_travail"] * 3
+            assert len({r["triage_id"] for r in results}) == 3
+
+        def test_json_array_spreads_workload(self):
+            import json
+            from routes.triage import JURISTS_POOL
+            before = [j["workload"] for j in JURISTS_POOL]
+            resp = client.post("/api/triage/analyze-batch", json=[self.TRAVAIL] * 3)
+            results = [json.loads(line) for line in resp.text.splitlines()]
+            # Spécialistes travail : Durand (charge 3) et Petit (charge 4)
+            assert [r["assigned_jurist"]["jurist_id"] for r in results] == [1, 1, 4]
+            jurists = client.get("/api/triage/jurists").json()["jurists"]
+            assert {j["id"]: j["current_workload"] for j in jurists} == {1: 5, 2: 5, 3: 2, 4: 5}
+            assert [j["workload"] for j in JURISTS_POOL] == before
+
+        def test_invalid_item_rejects_whole_batch(self):
+            resp = client.post(
+                "/api/triage/analyze-batch",
+                json=[self.TRAVAIL, {"title": "ab", "description": "court"}],
+            )
+            assert resp.status_code == 422
+            assert {e["loc"][0] for e in resp.json()["detail"]} == {1}
+
+        def test_malformed_body(self):
+            resp = client.post(
+                "/api/triage/analyze-batch",
+                content=b"{pas du json",
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert resp.status_code == 400
+
 except ImportError:
     pass  # httpx/starlette non installé, tests d'intégration sautés
@@ -8,10 +8,12 @@
  * - POST /api/analysis/create-events
  * - POST /api/analysis/propose-duplicate-link
  * - GET /api/analysis/find-duplicate-candidates
+ * - POST /api/analysis/find-duplicate-candidates/batch
  */
 
 import { prisma } from '@/lib/prisma';
 import { NextRequest, NextResponse } from 'next/server';
+import { gunzipSync } from 'zlib';
 
 /**
  * POST /api/analysis/execute
@@ -69,6 +71,12 @@ async function postLegacyRoutes(req: NextRequest) {
  *
  * Charge les InformationUnit depuis Prisma
  * pour le pipeline d'analyse
+ *
+ * Pagination: passer `cursor` (id de la dernière unité reçue) pour obtenir
+ * la page suivante; `nextCursor` vaut null sur la dernière page.
+ *
+ * Reprise incrémentale: `afterReceivedAt` + `afterId` (watermark du
+ * pipeline) limitent aux unités suivantes, par ordre croissant.
  */
 export async function GET(req: NextRequest) {
   try {
@@ -76,6 +84,19 @@ export async function GET(req: NextRequest) {
     const tenantId = searchParams.get('tenantId');
     const status = searchParams.get('status') || 'RECEIVED';
     const limit = parseInt(searchParams.get('limit') || '100');
+    const cursor = searchParams.get('cursor');
+    const afterReceivedAt = searchParams.get('afterReceivedAt');
+    const afterId = searchParams.get('afterId');
+    const watermark =
+      afterReceivedAt && afterId
+        ? {
+            OR: [
+              { receivedAt: { gt: new Date(afterReceivedAt) } },
+              { receivedAt: new Date(afterReceivedAt), id: { gt: afterId } },
+            ],
+          }
+        : {};
+    const direction = afterReceivedAt && afterId ? 'asc' : 'desc';
 
     if (!tenantId) {
       return NextResponse.json({ error: 'tenantId required' }, { status: 400 });
@@ -86,6 +107,7 @@ export async function GET(req: NextRequest) {
       where: {
         tenantId,
         currentStatus: status as any,
+        ...watermark,
       },
       select: {
         id: true,
@@ -97,13 +119,13 @@ export async function GET(req: NextRequest) {
         linkedWorkspaceId: true,
       },
       take: limit,
-      orderBy: {
-        receivedAt: 'desc',
-      },
+      ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {}),
+      orderBy: [{ receivedAt: direction }, { id: direction }],
     });
 
     return NextResponse.json({
       count: units.length,
+      nextCursor: units.length === limit ? units[units.length - 1].id : null,
       units: units.map(u => ({
         id: u.id,
         tenantId,
@@ -132,37 +154,38 @@ export async function POST(req: NextRequest) {
 
   if (pathname === '/api/analysis/create-events') {
     try {
-      const { tenantId, events } = await req.json();
+      // Le pipeline envoie des chunks gzip (Content-Encoding: gzip)
+      const { tenantId, events } =
+        req.headers.get('content-encoding') === 'gzip'
+          ? JSON.parse(gunzipSync(Buffer.from(await req.arrayBuffer())).toString('utf-8'))
+          : await req.json();
 
       if (!tenantId || !events) {
         return NextResponse.json({ error: 'tenantId and events required' }, { status: 400 });
       }
 
-      // Insère les événements
-      const created = await Promise.all(
-        events.map(event =>
-          prisma.eventLog.create({
-            data: {
-              id: event.id,
-              tenantId,
-              timestamp: new Date(event.timestamp),
-              eventType: event.eventType,
-              entityType: event.entityType,
-              entityId: event.entityId,
-              actorType: event.actorType as any,
-              actorId: event.actorId,
-              metadata: event.metadata as any,
-              immutable: event.immutable,
-              checksum: event.checksum,
-              previousEventId: event.previousEventId,
-            },
-          })
-        )
-      );
+      // Insertion groupée; skipDuplicates rend le renvoi d'un chunk idempotent
+      const created = await prisma.eventLog.createMany({
+        data: events.map(event => ({
+          id: event.id,
+          tenantId,
+          timestamp: new Date(event.timestamp),
+          eventType: event.eventType,
+          entityType: event.entityType,
+          entityId: event.entityId,
+          actorType: event.actorType as any,
+          actorId: event.actorId,
+          metadata: event.metadata as any,
+          immutable: event.immutable,
+          checksum: event.checksum,
+          previousEventId: event.previousEventId,
+        })),
+        skipDuplicates: true,
+      });
 
       return NextResponse.json({
         success: true,
-        created_count: created.length,
+        created_count: created.count,
         failed_count: 0,
         errors: [],
       });
@@ -213,6 +236,69 @@ export async function POST(req: NextRequest) {
     }
   }
 
+  /**
+   * POST /api/analysis/find-duplicate-candidates/batch
+   *
+   * Candidats doublons pour un lot d'unités (une seule requête Prisma)
+   * Body: { tenantId, limit, queries: [{ key, contentHash, senderEmail, receivedAt }] }
+   * Réponse: { results: [{ key, candidates }] }, candidats au format du GET unitaire
+   */
+  if (pathname === '/api/analysis/find-duplicate-candidates/batch') {
+    try {
+      const { tenantId, limit = 10, queries = [] } = await req.json();
+
+      if (!tenantId) {
+        return NextResponse.json({ error: 'tenantId required' }, { status: 400 });
+      }
+
+      const hashes: string[] = Array.from(
+        new Set(queries.map(q => q.contentHash).filter(Boolean))
+      );
+
+      const rows = hashes.length
+        ? await prisma.informationUnit.findMany({
+            where: {
+              tenantId,
+              contentHash: { in: hashes },
+            },
+            select: {
+              id: true,
+              contentHash: true,
+              sourceMetadata: true,
+              receivedAt: true,
+            },
+          })
+        : [];
+
+      const byHash = new Map<string, typeof rows>();
+      for (const row of rows) {
+        const group = byHash.get(row.contentHash) ?? [];
+        group.push(row);
+        byHash.set(row.contentHash, group);
+      }
+
+      // Même enrichissement (expéditeur, écart temporel) que le GET unitaire
+      const results = queries.map(q => ({
+        key: q.key,
+        candidates: (byHash.get(q.contentHash) ?? []).slice(0, Math.min(limit, 10)).map(c => ({
+          id: c.id,
+          content_hash: c.contentHash,
+          senderEmail: (c.sourceMetadata as any)?.sender_email,
+          receivedAt: c.receivedAt.toISOString(),
+          reason: 'exact_hash_match',
+          timeDiffSeconds: q.receivedAt
+            ? Math.abs((new Date(q.receivedAt).getTime() - c.receivedAt.getTime()) / 1000)
+            : 0,
+        })),
+      }));
+
+      return NextResponse.json({ results });
+    } catch (error) {
+      console.error('[ANALYSIS/FIND-DUPLICATES-BATCH]', error);
+      return NextResponse.json({ error: 'Failed to find duplicates' }, { status: 500 });
+    }
+  }
+
   /**
    * GET /api/analysis/find-duplicate-candidates
    *